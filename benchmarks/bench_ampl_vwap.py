@@ -0,0 +1,172 @@
+"""AMPL/USD VWAP from a day of Bitfinex trades
+
+Replays recorded trades (one JSON file of [id, timestamp, amount, price]
+rows per route) through a fake Bitfinex API, and compares:
+
+- bucketing and merging the trade lists with Python dicts and a slot-by-slot
+  search (the original implementation) against the NumPy buckets
+- fetching and computing the day's VWAP cold, against again with the same
+  end (cached), and with an end a few minutes later (only the latest
+  bucket refetched)
+
+Record fixtures once (needs network access; mind the 30 req/min rate limit):
+
+    python benchmarks/bench_ampl_vwap.py --record fixtures/bitfinex
+
+then replay them:
+
+    python benchmarks/bench_ampl_vwap.py --fixtures fixtures/bitfinex
+
+Without --fixtures, a synthetic day of --trades trades per route is used.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any
+from unittest import mock
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+
+import requests
+
+from telliot_feeds.sources.ampleforth import bitfinex
+from telliot_feeds.sources.ampleforth.bitfinex import get_value_from_bitfinex
+from telliot_feeds.sources.ampleforth.bitfinex import THOUSAND_MIN
+from telliot_feeds.sources.ampleforth.bitfinex import volume_weighted_average_price
+from telliot_feeds.sources.ampleforth.symbols import SYMBOLS
+
+START = 1675296000000
+END = 1675382399000
+ROUTES = {"tAMPUSD": 1.1, "tAMPUST": 1.1, "tUSTUSD": 1.0, "tAMPBTC": 0.00005, "tBTCUSD": 23000.0}
+
+
+def legacy_buckets(start: int, a_list: list[list[Any]]) -> dict[int, dict[str, Any]]:
+    buckets: dict[int, dict[str, Any]] = {}
+    for i in a_list:
+        slot = (i[1] - start) // THOUSAND_MIN
+        amount, price = float(i[2]), float(i[3])
+        bucket = buckets.get(slot)
+        if bucket:
+            bucket["trades"] += abs(amount * price)
+            bucket["volume"] += abs(amount)
+        else:
+            buckets[slot] = {"timestamp": i[1], "trades": abs(amount * price), "volume": abs(amount)}
+    for bucket in buckets.values():
+        bucket["vwap"] = bucket["trades"] / bucket["volume"] if bucket["trades"] and bucket["volume"] else 0
+    return buckets
+
+
+def legacy_vwap(start: int, from_list: list[list[Any]], to_list: list[list[Any]]) -> float:
+    """Original dict buckets and slot-by-slot merge"""
+    from_map, to_map = legacy_buckets(start, from_list), legacy_buckets(start, to_list)
+    trades = volume = 0.0
+    for slot, from_slot in from_map.items():
+        s, to_slot = slot, None
+        while not to_slot:
+            if s < 0:
+                break
+            to_slot = to_map.get(s)
+            s = s - 1
+        if to_slot:
+            trades += abs((to_slot["vwap"] * from_slot["vwap"]) * from_slot["volume"])
+            volume += from_slot["volume"]
+    return trades / volume
+
+
+def synthetic_trades(price: float, n: int, seed: int) -> list[list[Any]]:
+    rng = random.Random(seed)
+    timestamps = sorted(rng.randint(START, END) for _ in range(n))
+    return [
+        [seed * 10_000_000 + i, ts, rng.uniform(-500, 500), price * rng.uniform(0.95, 1.05)]
+        for i, ts in enumerate(timestamps)
+    ]
+
+
+def record(directory: Path) -> None:
+    """Download the day's trades of every route"""
+    directory.mkdir(parents=True, exist_ok=True)
+    for route in ROUTES:
+        trades: list[list[Any]] = []
+        start = START
+        while True:
+            url = f"https://api-pub.bitfinex.com/v2/trades/{route}/hist?limit=10000&sort=1&start={start}&end={END}"
+            page = requests.get(url, timeout=10).json()
+            seen = {trade[0] for trade in trades[-10000:]}
+            trades.extend(trade for trade in page if trade[0] not in seen)
+            if len(page) < 10000:
+                break
+            start = page[-1][1]
+            time.sleep(3)
+        (directory / f"{route}.json").write_text(json.dumps(trades))
+        print(f"{route}: {len(trades)} trades")
+        time.sleep(3)
+
+
+class ReplayBitfinex:
+    """Serves recorded trades as the Bitfinex trades API would"""
+
+    def __init__(self, trades: dict[str, list[list[Any]]]) -> None:
+        self.trades = trades
+        self.requests = 0
+
+    async def get_json(self, url: str, timeout: float, headers: Any = None) -> dict[str, Any]:
+        self.requests += 1
+        route = urlsplit(url).path.split("/")[3]
+        params = {k: int(v[0]) for k, v in parse_qs(urlsplit(url).query).items()}
+        in_range = [t for t in self.trades[route] if params["start"] <= t[1] <= params["end"]]
+        return {"response": in_range[: params["limit"]]}
+
+
+async def timed_vwap(api: ReplayBitfinex, end: int) -> tuple[float, float, int]:
+    before = api.requests
+    start_time = time.perf_counter()
+    result = await get_value_from_bitfinex(SYMBOLS["AMPL_USD_via_ALL"], START, end, False)
+    return result["overall_vwap"], time.perf_counter() - start_time, api.requests - before
+
+
+async def replay(trades: dict[str, list[list[Any]]]) -> None:
+    api = ReplayBitfinex(trades)
+    with mock.patch.object(bitfinex, "async_http_transport", api), mock.patch.object(bitfinex, "SCROLL_DELAY", 0):
+        # end some minutes before the last trade, then the full day
+        partial_end = END - 10 * THOUSAND_MIN
+        for label, end in (("cold", partial_end), ("cached", partial_end), ("+10 min", END)):
+            vwap, elapsed, n_requests = await timed_vwap(api, end)
+            print(f"{label:8} {elapsed * 1e3:8.1f}ms  {n_requests:3} requests  vwap {vwap}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", type=Path, help="directory of recorded trades to replay")
+    parser.add_argument("--record", type=Path, help="download trades into this directory and exit")
+    parser.add_argument("--trades", type=int, default=50_000, help="synthetic trades per route")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record)
+        return
+    if args.fixtures:
+        trades = {route: json.loads((args.fixtures / f"{route}.json").read_text()) for route in ROUTES}
+    else:
+        trades = {route: synthetic_trades(price, args.trades, i) for i, (route, price) in enumerate(ROUTES.items())}
+
+    print(f"{'route':16} {'trades':>8} {'dicts':>10} {'numpy':>10}")
+    for from_route, to_route in (("tAMPUST", "tUSTUSD"), ("tAMPBTC", "tBTCUSD")):
+        from_list, to_list = trades[from_route], trades[to_route]
+        start_time = time.perf_counter()
+        before = legacy_vwap(START, from_list, to_list)
+        t_before = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        after = volume_weighted_average_price(START, from_list, to_list)["vwap"]
+        t_after = time.perf_counter() - start_time
+        n_trades = len(from_list) + len(to_list)
+        timings = f"{t_before * 1e3:8.1f}ms {t_after * 1e3:8.1f}ms"
+        print(f"{from_route}>{to_route:8} {n_trades:8} {timings}  ({before} / {after})")
+
+    asyncio.run(replay(trades))
+
+
+if __name__ == "__main__":
+    main()
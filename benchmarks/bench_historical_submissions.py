@@ -0,0 +1,98 @@
+"""Time FundedFeedFilter.filter_historical_submissions on synthetic month-long histories
+
+Compares the vectorized filter with a pairwise reference loop that removes
+ineligible submissions from the list one at a time.
+
+    python benchmarks/bench_historical_submissions.py [--feeds 5] [--report-interval 600]
+"""
+import argparse
+import copy
+import random
+import time
+
+from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import Values
+from telliot_feeds.reporters.tips.listener.funded_feeds_filter import FundedFeedFilter
+
+MONTH = 2_592_000
+
+
+def month_of_reports(report_interval: int, start: int = 1_700_000_000) -> list[Values]:
+    """One report every ~report_interval seconds for a month"""
+    timestamps = range(start, start + MONTH, report_interval)
+    return [
+        Values(value=random.randint(1, 10**21).to_bytes(32, "big"), timestamp=ts + random.randint(0, 30))
+        for ts in timestamps
+    ]
+
+
+def make_feeds(count: int, report_interval: int) -> list[QueryIdandFeedDetails]:
+    feeds = []
+    for _ in range(count):
+        feeds.append(
+            QueryIdandFeedDetails(
+                params=FeedDetails(
+                    reward=10**18,
+                    balance=10**21,
+                    startTime=1_700_000_000,
+                    interval=3_600,
+                    window=600,
+                    priceThreshold=0,
+                    rewardIncreasePerSecond=0,
+                ),
+                queryid_timestamps_values_list=month_of_reports(report_interval),
+            )
+        )
+    return feeds
+
+
+def pairwise_filter(filtr: FundedFeedFilter, feeds: list[QueryIdandFeedDetails]) -> list[QueryIdandFeedDetails]:
+    """Pairwise reference for the priceThreshold == 0 path
+
+    Not the baseline: that loop tested the (eligible, diff) tuple returned by
+    is_timestamp_first_in_window, which is always truthy, so it never removed
+    anything. This is the corrected loop, unpacking the eligibility flag.
+    """
+    for feed in feeds:
+        values = feed.queryid_timestamps_values_list
+        for current, previous in zip(values[::-1], values[-2::-1]):
+            eligible, _ = filtr.is_timestamp_first_in_window(
+                previous.timestamp, current.timestamp, feed.params.startTime, feed.params.window, feed.params.interval
+            )
+            if not eligible:
+                values.remove(current)
+    return feeds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--feeds", type=int, default=5)
+    parser.add_argument("--report-interval", type=int, default=600, help="seconds between synthetic reports")
+    parser.add_argument("--skip-pairwise", action="store_true", help="don't time the pairwise reference")
+    args = parser.parse_args()
+
+    random.seed(0)
+    filtr = FundedFeedFilter()
+    feeds = make_feeds(args.feeds, args.report_interval)
+    size = len(feeds[0].queryid_timestamps_values_list)
+    print(f"{args.feeds} feeds x {size} reports")
+
+    vectorized_feeds = copy.deepcopy(feeds)
+    start = time.perf_counter()
+    filtr.filter_historical_submissions(vectorized_feeds)
+    vectorized = time.perf_counter() - start
+    print(f"vectorized: {vectorized:.3f}s")
+
+    if not args.skip_pairwise:
+        start = time.perf_counter()
+        pairwise_filter(filtr, feeds)
+        pairwise = time.perf_counter() - start
+        print(f"pairwise:   {pairwise:.3f}s ({pairwise / vectorized:.0f}x)")
+        assert [f.queryid_timestamps_values_list for f in feeds] == [
+            f.queryid_timestamps_values_list for f in vectorized_feeds
+        ]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Measure the import cost of telliot-feeds entry points with `python -X importtime`
+
+Each run imports the module in a fresh interpreter, so nothing is cached in
+`sys.modules`. Reports the cumulative import time of the module (best of
+--repeat runs), how many modules it pulls in, and the slowest imports of
+the best run.
+
+    python benchmarks/bench_import_time.py [--module telliot_feeds.cli.main] [--repeat 5] [--top 15]
+"""
+import argparse
+import subprocess
+import sys
+from typing import List
+from typing import NamedTuple
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def import_times(module: str) -> List[ImportTime]:
+    """Import module in a fresh interpreter and parse its -X importtime report"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode:
+        sys.exit(f"import {module} failed:\n{proc.stderr.splitlines()[-1]}")
+    times = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times.append(ImportTime(name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", action="append", help="module to import (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    args = parser.parse_args()
+
+    for module in args.module or ["telliot_feeds.cli.main", "telliot_feeds.feeds"]:
+        runs = [import_times(module) for _ in range(args.repeat)]
+        best = min(runs, key=lambda times: times[-1].cumulative_us)
+        total = best[-1]
+        print(f"{module}: {total.cumulative_us / 1e6:.3f}s, {len(best)} modules (best of {args.repeat})")
+        for t in sorted(best, key=lambda t: t.self_us, reverse=True)[: args.top]:
+            print(f"  {t.self_us / 1e3:8.1f}ms self {t.cumulative_us / 1e3:8.1f}ms cumulative  {t.module}")
+
+
+if __name__ == "__main__":
+    main()
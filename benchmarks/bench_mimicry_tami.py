@@ -0,0 +1,139 @@
+"""TAMI and market cap of a synthetic NFT collection's sales history
+
+Compares the original TAMI calculation (re-summing every item's last sale
+price on each sale) and market cap (a list scan per sale) against the
+current implementations, then times a `TamiIndex` applying a few new sales
+against recomputing the TAMI from the whole history.
+
+The original TAMI is quadratic in the number of items, so it's only run on
+the first --legacy-sales sales.
+
+    python benchmarks/bench_mimicry_tami.py [--sales 100000] [--items 5000] [--legacy-sales 20000]
+"""
+import argparse
+import datetime
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from telliot_feeds.sources.mimicry.collection_stat import MimicryCollectionStatSource
+from telliot_feeds.sources.mimicry.collection_stat import TransactionList
+from telliot_feeds.sources.mimicry.tami import tami
+from telliot_feeds.sources.mimicry.tami import TamiIndex
+from telliot_feeds.sources.mimicry.types import Transaction
+from telliot_feeds.sources.mimicry.utils import filter_valid_transactions
+from telliot_feeds.sources.mimicry.utils import sort_transactions
+
+
+def synthetic_sales(n_sales: int, n_items: int, now: datetime.datetime, seed: int = 1) -> List[Transaction]:
+    """Sales spread over the last 18 months, so some items aren't valid"""
+    rng = random.Random(seed)
+    span = 548 * 86400
+    return [
+        Transaction(
+            itemId=str(rng.randrange(n_items)),
+            price=round(rng.lognormvariate(6, 0.5), 2),
+            date=now - datetime.timedelta(seconds=rng.randrange(span)),
+        )
+        for _ in range(n_sales)
+    ]
+
+
+def legacy_tami(transaction_history: List[Transaction]) -> Optional[float]:
+    """TAMI as originally calculated"""
+    valid = filter_valid_transactions(sort_transactions(transaction_history))
+    transaction_map: Dict[Union[float, int, str], Transaction] = {}
+    ratios: Dict[Union[float, int, str], float] = {}
+    last_index_value = 0.0
+    last_divisor = 1.0
+    for i, transaction in enumerate(valid):
+        is_first_sale = transaction.itemId not in transaction_map
+        transaction_map[transaction.itemId] = transaction
+        item_count = len(transaction_map)
+        all_last_sold_value = sum([transaction_map[item].price for item in transaction_map])
+        index_value = all_last_sold_value / (item_count * last_divisor)
+        if i:
+            if is_first_sale:
+                last_divisor = last_divisor * (index_value / last_index_value)
+            index_value = all_last_sold_value / (item_count * last_divisor)
+        last_index_value = index_value
+        ratios[transaction.itemId] = transaction.price / index_value
+    if not valid:
+        return None
+    return sum([last_index_value * ratio for ratio in ratios.values()])
+
+
+def legacy_market_cap(transaction_history: TransactionList) -> float:
+    """Market cap as originally calculated"""
+    values: List[Union[int, float]] = []
+    last_sale_found: List[Union[float, int, str]] = []
+    for sale in reversed(sort_transactions(transaction_history.transactions)):
+        if sale.itemId in last_sale_found:
+            continue
+        values.append(max(sale.price, transaction_history.floor_price))
+        last_sale_found.append(sale.itemId)
+    return sum(values)
+
+
+def timed(fn: Callable[[], Any]) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sales", type=int, default=100_000, help="sales in the collection's history")
+    parser.add_argument("--items", type=int, default=5_000, help="items in the collection")
+    parser.add_argument("--legacy-sales", type=int, default=20_000, help="sales to run the original TAMI on")
+    parser.add_argument("--new-sales", type=int, default=20, help="sales added for the incremental update")
+    args = parser.parse_args()
+
+    now = datetime.datetime.now(datetime.UTC)
+    history = synthetic_sales(args.sales, args.items, now)
+    new_sales = [
+        Transaction(itemId=tx.itemId, price=tx.price, date=now + datetime.timedelta(seconds=i))
+        for i, tx in enumerate(synthetic_sales(args.new_sales, args.items, now, seed=2))
+    ]
+
+    subset = history[: args.legacy_sales]
+    before, t_before = timed(lambda: legacy_tami(subset))
+    after, t_after = timed(lambda: tami(subset))
+    print(f"TAMI, {len(subset)} sales:        original {t_before:8.3f}s  linear {t_after:8.3f}s  ({before} / {after})")
+
+    _, t_full = timed(lambda: tami(history))
+    print(f"TAMI, {len(history)} sales:       linear {t_full:8.3f}s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "tami.npz"
+        index = TamiIndex()
+        _, t_build = timed(lambda: index.update(history, now=now))
+        index.save(path)
+        loaded, t_load = timed(lambda: TamiIndex.load(path))
+        incremental, t_update = timed(lambda: loaded.update(new_sales, now=now))
+        recomputed, t_recompute = timed(lambda: tami(history + new_sales))
+    print(
+        f"TamiIndex: build {t_build:.3f}s, load {t_load * 1e3:.1f}ms, "
+        f"+{len(new_sales)} sales {t_update * 1e3:.1f}ms vs full recompute {t_recompute:.3f}s "
+        f"({incremental} / {recomputed})"
+    )
+
+    sales = TransactionList(transactions=history, floor_price=300)
+    source = MimicryCollectionStatSource()
+    before, t_before = timed(lambda: legacy_market_cap(sales))
+    after, t_after = timed(lambda: source.get_collection_market_cap(sales))
+    print(
+        f"market cap, {len(history)} sales:  original {t_before:8.3f}s  current {t_after:8.3f}s  ({before} / {after})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Time descriptor / query_data / query_id access for every registered query type
+
+For each OracleQuery subclass (taking an example query from the query
+catalog, or from EXTRA_EXAMPLES for types the catalog doesn't use), compares
+repeated property access on one query object against recomputing the
+encoding every time (the behaviour before encodings were cached).
+
+    python benchmarks/bench_query_encoding.py [--reads 1000]
+"""
+import argparse
+import functools
+import importlib
+import operator
+import pkgutil
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+
+from clamfig.base import Registry
+
+import telliot_feeds.queries
+from telliot_feeds.queries.inflation_data import InflationData
+from telliot_feeds.queries.legacy_query import LegacyRequest
+from telliot_feeds.queries.manual_query import FileCID
+from telliot_feeds.queries.query import OracleQuery
+from telliot_feeds.queries.query_catalog import query_catalog
+from telliot_feeds.queries.tellor.autopay_addresses import AutopayAddresses
+from telliot_feeds.queries.tellor.tellor_oracle_address import TellorOracleAddress
+
+PROPERTIES = ("descriptor", "query_data", "query_id")
+
+#: Base classes without an encoding of their own
+ABSTRACT_TYPES = ("OracleQuery", "AbiQuery", "JsonQuery")
+
+EXTRA_EXAMPLES = [
+    AutopayAddresses(),
+    FileCID(url="ipfs://bafybeigdyrzt5sfp7udm7hu76uh7y26nf3efuylqabf3oclgtqy55fbzdi"),
+    InflationData(location="US", agency="BLS", category="cpi", description="nonseasonally adjusted"),
+    LegacyRequest(legacy_id=1),
+    TellorOracleAddress(),
+]
+
+
+def import_query_modules() -> None:
+    """Import every query module so all query types are registered"""
+    for module in pkgutil.walk_packages(telliot_feeds.queries.__path__, "telliot_feeds.queries."):
+        if not module.name.endswith("export_query_catalog"):
+            importlib.import_module(module.name)
+
+
+def uncached(query: OracleQuery, name: str) -> Callable[[], Any]:
+    """Recompute a property without its cache, calling cached inner encodings uncached too"""
+    fget = getattr(type(query), name).fget
+
+    def compute() -> Any:
+        query.__dict__.pop("_encodings", None)
+        return fget(query)
+
+    return compute
+
+
+def per_read_us(fn: Callable[[], Any], reads: int) -> float:
+    start = time.perf_counter()
+    for _ in range(reads):
+        fn()
+    return (time.perf_counter() - start) / reads * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reads", type=int, default=1000, help="property reads per query type")
+    args = parser.parse_args()
+
+    import_query_modules()
+    query_types = sorted(
+        name
+        for name, cls in Registry.registry.items()
+        if isinstance(cls, type) and issubclass(cls, OracleQuery) and name not in ABSTRACT_TYPES
+    )
+    examples: Dict[str, OracleQuery] = {type(q).__name__: q for q in EXTRA_EXAMPLES}
+    for entry in query_catalog.find():
+        examples.setdefault(entry.query_type, entry.query)
+
+    print(f"{'query type':28} {'property':11} {'uncached':>10} {'cached':>10}")
+    for query_type in query_types:
+        query = examples.get(query_type)
+        if query is None:
+            print(f"{query_type:28} (no example)")
+            continue
+        for name in PROPERTIES:
+            before = per_read_us(uncached(query, name), args.reads)
+            after = per_read_us(functools.partial(operator.attrgetter(name), query), args.reads)
+            print(f"{query_type:28} {name:11} {before:8.1f}us {after:8.2f}us")
+
+
+if __name__ == "__main__":
+    main()
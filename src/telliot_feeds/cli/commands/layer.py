@@ -13,6 +13,7 @@ from telliot_feeds.cli.utils import reporter_cli_core
 from telliot_feeds.datafeed import DataFeed
 from telliot_feeds.feeds import CATALOG_FEEDS
 from telliot_feeds.queries.query_catalog import query_catalog
+from telliot_feeds.reporters.layer.layer_reporter import DEFAULT_MAX_BATCH_GAS
 from telliot_feeds.reporters.layer.layer_reporter import LayerReporter
 from telliot_feeds.utils.cfg import check_endpoint
 from telliot_feeds.utils.cfg import setup_config
@@ -47,6 +48,26 @@ def reporter() -> None:
     nargs=1,
     type=click.Choice([q.tag for q in query_catalog.find()]),
 )
+@click.option(
+    "--rpc-url",
+    "rpc_url",
+    help="Tendermint RPC url (e.g. http://127.0.0.1:26657) to follow new blocks and txs over its websocket",
+    required=False,
+    type=str,
+)
+@click.option(
+    "--batch-tipped/--no-batch-tipped",
+    "batch_tipped",
+    help="report all supported tipped queries each loop, several per tx",
+    default=False,
+)
+@click.option(
+    "--max-batch-gas",
+    "max_batch_gas",
+    help="upper bound on the gas of one batched report tx",
+    type=int,
+    default=DEFAULT_MAX_BATCH_GAS,
+)
 @click.pass_context
 @async_run  # type: ignore[untyped-decorator]
 async def layer(
@@ -71,6 +92,9 @@ async def layer(
     max_priority_fee_range: int,
     unsafe: bool,
     skip_manual_feeds: bool,
+    rpc_url: Optional[str],
+    batch_tipped: bool,
+    max_batch_gas: int,
 ) -> None:
     """Report values to Layer"""
     ctx.obj["ACCOUNT_NAME"] = account_str
@@ -117,8 +141,17 @@ async def layer(
         if not unsafe:
             _ = input("Press [ENTER] to confirm settings.")
 
-        reporter = LayerReporter(endpoint=endpoint, account=account, query_tag=query_tag, wait_period=wait_period)
+        reporter = LayerReporter(
+            endpoint=endpoint,
+            account=account,
+            query_tag=query_tag,
+            wait_period=wait_period,
+            rpc_url=rpc_url,
+            batch_tipped=batch_tipped,
+            max_batch_gas=max_batch_gas,
+        )
         if submit_once:
+            await reporter.start_event_stream()
             _, _ = await reporter.report_once()
         else:
             await reporter.report()
@@ -1,5 +1,6 @@
 from typing import Any
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 import click
@@ -20,6 +21,7 @@ from telliot_feeds.datafeed import DataFeed
 from telliot_feeds.feeds import CATALOG_FEEDS
 from telliot_feeds.feeds.tellor_rng_feed import assemble_rng_datafeed
 from telliot_feeds.reporters.flashbot import FlashbotsReporter
+from telliot_feeds.reporters.multi_feed import MultiFeedReporter
 from telliot_feeds.reporters.rng_interval import RNGReporter
 from telliot_feeds.reporters.tellor_360 import Tellor360Reporter
 from telliot_feeds.utils.cfg import check_endpoint
@@ -105,6 +107,14 @@ def reporter() -> None:
     default=False,
     help="Reporter will use a random datafeed from the catalog.",
 )
+@click.option(
+    "--multi-feed-tag",
+    "-mft",
+    "multi_feed_tags",
+    help="query tag of a datafeed to report with the multi-feed reporter (repeatable)",
+    multiple=True,
+    type=click.Choice(list(CATALOG_FEEDS)),
+)
 @click.option("--rng-auto/--rng-auto-off", default=False)
 @click.option("-spwd", "--signature-password", type=str)
 @click.option(
@@ -112,6 +122,18 @@ def reporter() -> None:
     help="optionaly ignore time based rewards in profit calculations. relevant only on eth-mainnet/eth-testnets",
     default=False,
 )
+@click.option(
+    "--async-web3/--sync-web3",
+    "use_async_web3",
+    help="query the node and wait for transaction receipts without blocking the event loop",
+    default=False,
+)
+@click.option(
+    "--event-listener/--no-event-listener",
+    "use_event_listener",
+    help="track autopay tips from contract event logs instead of polling autopay view functions every report",
+    default=False,
+)
 @click.pass_context
 @async_run  # type: ignore[untyped-decorator]
 async def report(
@@ -145,6 +167,9 @@ async def report(
     ignore_tbr: bool,
     unsafe: bool,
     skip_manual_feeds: bool,
+    use_async_web3: bool,
+    use_event_listener: bool,
+    multi_feed_tags: Tuple[str, ...],
 ) -> None:
     """Report values to Tellor oracle"""
     ctx.obj["ACCOUNT_NAME"] = account_str
@@ -202,7 +227,7 @@ async def report(
 
         print_reporter_settings(
             signature_address=sig_acct_addr,
-            query_tag=query_tag,
+            query_tag=", ".join(multi_feed_tags) if multi_feed_tags else query_tag,
             transaction_type=tx_type,
             gas_limit=gas_limit,
             max_fee=base_fee_per_gas,
@@ -280,8 +305,10 @@ async def report(
             "max_priority_fee_range": max_priority_fee_range,
             "ignore_tbr": ignore_tbr,
             "skip_manual_feeds": skip_manual_feeds,
+            "use_async_web3": use_async_web3,
+            "use_event_listener": use_event_listener,
         }
-        reporter: Union[FlashbotsReporter, RNGReporter, Tellor360Reporter]
+        reporter: Union[FlashbotsReporter, RNGReporter, MultiFeedReporter, Tellor360Reporter]
         if sig_acct_addr:
             reporter = FlashbotsReporter(
                 signature_account=sig_account,
@@ -292,6 +319,11 @@ async def report(
             reporter = RNGReporter(
                 **common_reporter_kwargs,
             )
+        elif multi_feed_tags:
+            reporter = MultiFeedReporter(
+                datafeeds=[CATALOG_FEEDS[tag] for tag in multi_feed_tags],
+                **common_reporter_kwargs,
+            )
         else:
             reporter = Tellor360Reporter(
                 **common_reporter_kwargs,
@@ -0,0 +1,131 @@
+"""Shared non-blocking HTTP transport for web price services
+
+Price sources are fetched concurrently with `asyncio.gather`, so the
+transport they share must not block the event loop. `AsyncHTTPTransport`
+keeps one pooled `aiohttp.ClientSession` per host (keep-alive connections
+are reused across report cycles) and caps the number of in-flight requests
+per host so a burst of feeds cannot trip an API's rate limit.
+"""
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import Optional
+from urllib.parse import urlsplit
+
+from aiohttp import ClientSession
+from aiohttp import ClientTimeout
+from aiohttp import TCPConnector
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Max simultaneous connections kept open to a single host
+DEFAULT_LIMIT_PER_HOST = 10
+
+#: Seconds an idle keep-alive connection is held open
+DEFAULT_KEEPALIVE_TIMEOUT = 60.0
+
+
+@dataclass
+class _HostClient:
+    """Pooled session and concurrency cap for one host on one event loop"""
+
+    loop: asyncio.AbstractEventLoop
+    session: ClientSession
+    semaphore: asyncio.Semaphore
+
+
+class AsyncHTTPTransport:
+    """Registry of pooled aiohttp sessions keyed by host
+
+    Sessions are bound to the event loop that created them, so a session
+    is transparently replaced if it is requested from a different loop
+    (e.g. after `asyncio.run` is called a second time).
+    """
+
+    def __init__(
+        self,
+        limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+    ) -> None:
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._clients: Dict[str, _HostClient] = {}
+
+    def _client(self, host: str, max_concurrency: Optional[int] = None) -> _HostClient:
+        """Return the pooled client for a host, creating it if necessary"""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(host)
+        if client is not None and client.loop is loop and not client.session.closed:
+            return client
+
+        connector = TCPConnector(
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        client = _HostClient(
+            loop=loop,
+            session=ClientSession(connector=connector),
+            semaphore=asyncio.Semaphore(max_concurrency or self.limit_per_host),
+        )
+        self._clients[host] = client
+        return client
+
+    async def get_json(
+        self,
+        url: str,
+        timeout: float,
+        headers: Optional[Dict[str, str]] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Fetch a URL and decode its JSON body without blocking the event loop
+
+        Args:
+            url: Full URL to fetch
+            timeout: Total request timeout in seconds
+            headers: Optional request headers
+            max_concurrency: Cap on simultaneous requests to the URL's host;
+                only applied when the host's client is first created
+
+        Returns:
+            A dictionary with the same keys as `WebPriceService.get_url`:
+                response (dict or list): Result, if no error occurred
+                error (str): A description of the error, if one occurred
+                exception (Exception): The exception, if one occurred
+        """
+        host = urlsplit(url).netloc
+        client = self._client(host, max_concurrency)
+
+        async with client.semaphore:
+            try:
+                async with client.session.get(url, headers=headers, timeout=ClientTimeout(total=timeout)) as r:
+                    if r.status >= 400:
+                        text = await r.text()
+                        return {"error": f"HTTP Error {r.status}", "exception": Exception(text)}
+                    json_data = await r.json(content_type=None)
+                    return {"response": json_data}
+
+            except asyncio.TimeoutError as e:
+                return {"error": "Timeout Error", "exception": e}
+
+            except json.JSONDecodeError as e:
+                return {"error": "JSON Decode Error", "exception": e}
+
+            except Exception as e:
+                return {"error": str(type(e)), "exception": e}
+
+    async def close(self) -> None:
+        """Close every session owned by the running event loop"""
+        loop = asyncio.get_running_loop()
+        for host, client in list(self._clients.items()):
+            if client.loop is loop:
+                await client.session.close()
+            del self._clients[host]
+
+
+#: Process-wide transport shared by all web price services
+async_http_transport = AsyncHTTPTransport()
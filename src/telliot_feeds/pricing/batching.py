@@ -0,0 +1,129 @@
+"""Coalesce concurrent price lookups into batched upstream requests
+
+Several price APIs accept a list of assets in one call (CoinGecko
+`simple/price?ids=a,b,c`, CoinMarketCap `quotes/latest?id=1,2,3`, Kraken
+`Ticker?pair=a,b,c`). When many feeds are evaluated at once, a
+`RequestBatcher` collects the keys requested within a short window and
+hands them to a single batch fetch, then fans the per-key results back out
+to each waiting caller.
+"""
+import asyncio
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Generic
+from typing import Hashable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import TypeVar
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+
+#: Batch fetch callable: takes the requested keys, returns results keyed by them
+BatchFetcher = Callable[[List[K]], Awaitable[Dict[K, Any]]]
+
+#: Seconds to wait for more keys before sending a batch
+DEFAULT_BATCH_WINDOW = 0.05
+
+#: Max keys sent upstream in a single batch
+DEFAULT_MAX_BATCH_SIZE = 50
+
+
+class _Batch(Generic[K]):
+    """Keys collected for one fetcher while its batch is open"""
+
+    def __init__(self, fetcher: BatchFetcher[K]) -> None:
+        self.fetcher = fetcher
+        self.pending: Dict[K, "asyncio.Future[Any]"] = {}
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class RequestBatcher(Generic[K]):
+    """Merge concurrent single-key lookups into batched fetches
+
+    Keys requested while a batch is open are collected; the batch is sent
+    when the window elapses or `max_batch_size` distinct keys are pending.
+    Duplicate keys in the same window share one result. Lookups with
+    different fetchers (or groups) go into separate batches.
+    """
+
+    def __init__(self, window: float = DEFAULT_BATCH_WINDOW, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE) -> None:
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._batches: Dict[Hashable, _Batch[K]] = {}
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    async def fetch(self, key: K, fetch_batch: BatchFetcher[K], group: Optional[Hashable] = None) -> Any:
+        """Return the result for `key`, batched with other concurrent requests
+
+        Args:
+            key: Lookup key, e.g. (coin id, currency)
+            fetch_batch: Called with all keys of the batch
+            group: Identifies lookups whose fetchers are interchangeable, e.g.
+                the same service's method on different instances. Defaults to
+                `fetch_batch` itself. The first caller's fetcher in a group is
+                used for the whole batch.
+
+        Returns:
+            The value `fetch_batch` returned for `key`, or None if it was missing
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # futures and timers from a previous event loop cannot be reused
+            self._loop = loop
+            self._batches = {}
+
+        group = fetch_batch if group is None else group
+        batch = self._batches.get(group)
+        if batch is None:
+            batch = _Batch(fetch_batch)
+            self._batches[group] = batch
+
+        fut = batch.pending.get(key)
+        if fut is None:
+            fut = loop.create_future()
+            batch.pending[key] = fut
+            if len(batch.pending) >= self.max_batch_size:
+                self._flush(group)
+            elif batch.timer is None:
+                batch.timer = loop.call_later(self.window, self._flush, group)
+
+        # shield so one caller's cancellation doesn't cancel the shared result
+        return await asyncio.shield(fut)
+
+    def _flush(self, group: Hashable) -> None:
+        """Send a group's pending keys as one batch"""
+        batch = self._batches.pop(group, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        if not batch.pending:
+            return
+
+        task = asyncio.ensure_future(self._run(batch.pending, batch.fetcher))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: Dict[K, "asyncio.Future[Any]"], fetcher: BatchFetcher[K]) -> None:
+        keys = list(batch)
+        logger.debug(f"Sending batched request for {len(keys)} keys")
+        try:
+            results = await fetcher(keys)
+        except Exception as e:
+            for fut in batch.values():
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        for key, fut in batch.items():
+            if not fut.done():
+                fut.set_result(results.get(key))
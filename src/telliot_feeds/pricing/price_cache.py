@@ -0,0 +1,119 @@
+"""Short-lived cache of price lookups shared by all price sources
+
+The same (service, asset, currency) is often requested several times in
+one report cycle: the reported feed, the profitability check's native
+token and TRB prices, the tips filter's price-change check, and composite
+sources that build their own aggregators. `PriceCache` keeps each result
+for `ttl` seconds, makes concurrent misses for one key share a single
+request, and evicts least-recently-used keys beyond `max_entries`.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+
+from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+
+
+#: Seconds a fetched price is reused; shorter than a report loop so
+#: each cycle still starts from fresh data
+DEFAULT_PRICE_CACHE_TTL = 5.0
+
+#: Max (service, asset, currency) keys kept
+DEFAULT_PRICE_CACHE_MAX_ENTRIES = 1024
+
+
+@dataclass
+class _CacheEntry:
+    datapoint: OptionalDataPoint[float]
+    expires: float
+
+
+class PriceCache:
+    """TTL + LRU cache with request coalescing for price datapoints"""
+
+    def __init__(
+        self, ttl: float = DEFAULT_PRICE_CACHE_TTL, max_entries: int = DEFAULT_PRICE_CACHE_MAX_ENTRIES
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Dict[Hashable, "asyncio.Future[OptionalDataPoint[float]]"] = {}
+
+    def get(self, key: Hashable) -> Optional[OptionalDataPoint[float]]:
+        """Return a fresh cached datapoint, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry.datapoint
+
+    def put(self, key: Hashable, datapoint: OptionalDataPoint[float]) -> None:
+        """Store a datapoint, evicting the least recently used keys if full"""
+        self._entries[key] = _CacheEntry(datapoint=datapoint, expires=time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_fetch(
+        self, key: Hashable, fetch: Callable[[], Awaitable[OptionalDataPoint[float]]]
+    ) -> OptionalDataPoint[float]:
+        """Return the cached datapoint for `key`, fetching it on a miss
+
+        Concurrent misses for the same key await one shared fetch. Failed
+        lookups (a None value) are not cached so the next call retries.
+        """
+        if self.ttl <= 0:
+            return await fetch()
+
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._inflight = {}
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        fut: "asyncio.Future[OptionalDataPoint[float]]" = loop.create_future()
+        self._inflight[key] = fut
+        try:
+            datapoint = await fetch()
+            if datapoint[0] is not None:
+                self.put(key, datapoint)
+            fut.set_result(datapoint)
+            return datapoint
+        except Exception as e:
+            fut.set_exception(e)
+            # mark retrieved so an exception nobody else awaited isn't logged
+            fut.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+            if not fut.done():
+                # fetch was cancelled; release anyone waiting on it
+                fut.cancel()
+
+    def clear(self) -> None:
+        """Drop all cached datapoints"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+#: Process-wide cache consulted by `PriceSource.fetch_new_datapoint`
+price_cache = PriceCache()
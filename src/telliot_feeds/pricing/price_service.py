@@ -2,10 +2,14 @@ from abc import ABC
 from abc import abstractmethod
 from typing import Any
 from typing import Dict
+from typing import Hashable
+from typing import Optional
 
 import requests
 
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.pricing.async_http import async_http_transport
+from telliot_feeds.utils.http_sessions import pooled_session
 
 
 class PriceServiceInterface(ABC):
@@ -37,11 +41,33 @@ class PriceServiceInterface(ABC):
 class WebPriceService(PriceServiceInterface):
     """Abstract Base CLass for a Web-based Pricing Service"""
 
-    def __init__(self, name: str, url: str, timeout: float = 5.0):
+    #: Cap on simultaneous requests to this service's host
+    max_concurrency: Optional[int] = None
+
+    #: Whether prices from this service may be shared through the price cache.
+    #: Services whose result depends on more than (asset, currency), such as
+    #: historical services parametrized by timestamp, must set this to False.
+    cacheable: bool = True
+
+    def __init__(self, name: str, url: str, timeout: float = 5.0, max_concurrency: Optional[int] = None):
 
         self.name = name
         self.url = url
         self.timeout = timeout
+        if max_concurrency is not None:
+            self.max_concurrency = max_concurrency
+
+    def cache_key(self, asset: str, currency: str) -> Hashable:
+        """Key identifying this service's price for an asset in the price cache"""
+        return (type(self).__qualname__, self.url, asset.lower(), currency.lower())
+
+    def batch_group(self) -> Hashable:
+        """Key under which this service's lookups may share a `RequestBatcher` batch
+
+        Instances of the same service calling the same host are interchangeable,
+        so their concurrent lookups can go out as one request.
+        """
+        return (type(self).__qualname__, self.url, self.timeout)
 
     def get_url(self, url: str = "") -> Dict[str, Any]:
         """Helper function to get URL JSON response while handling exceptions
@@ -58,7 +84,7 @@ class WebPriceService(PriceServiceInterface):
 
         request_url = self.url + url
 
-        with requests.Session() as s:
+        with pooled_session(request_url) as s:
             try:
                 r = s.get(request_url, timeout=self.timeout)
                 json_data = r.json()
@@ -72,3 +98,27 @@ class WebPriceService(PriceServiceInterface):
 
             except Exception as e:
                 return {"error": str(type(e)), "exception": e}
+
+    async def fetch_url(self, url: str = "", headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Non-blocking version of `get_url`
+
+        Requests go through the process-wide pooled transport, so
+        connections to the service's host are kept alive between calls
+        and concurrent price fetches do not hold up the event loop.
+
+        Args:
+            url: URL to fetch, relative to the service URL
+            headers: Optional request headers
+
+        Returns:
+            A dictionary with the same keys as `get_url`
+        """
+
+        request_url = self.url + url
+
+        return await async_http_transport.get_json(
+            request_url,
+            timeout=self.timeout,
+            headers=headers,
+            max_concurrency=self.max_concurrency,
+        )
@@ -3,6 +3,7 @@ from dataclasses import field
 
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.pricing.price_cache import price_cache
 from telliot_feeds.pricing.price_service import WebPriceService
 
 
@@ -12,6 +13,10 @@ class PriceSource(DataSource[float]):
 
     The Current Asset Price data source retrieves the price of a asset
     in the specified current from a `WebPriceService`.
+
+    Prices from cacheable services are shared through `price_cache`, so
+    sources (and feeds) that ask the same service for the same pair within
+    the cache TTL send only one request.
     """
 
     #: Asset symbol
@@ -29,7 +34,13 @@ class PriceSource(DataSource[float]):
         Returns:
             New datapoint
         """
-        datapoint = await self.service.get_price(self.asset, self.currency)
+        if getattr(self.service, "cacheable", False):
+            datapoint = await price_cache.get_or_fetch(
+                self.service.cache_key(self.asset, self.currency),
+                lambda: self.service.get_price(self.asset, self.currency),
+            )
+        else:
+            datapoint = await self.service.get_price(self.asset, self.currency)
         v, t = datapoint
         if v is not None and t is not None:
             self.store_datapoint((v, t))
@@ -6,6 +6,7 @@ from clamfig.base import Registry
 from eth_abi import decode
 from eth_abi import encode
 
+from telliot_feeds.queries.query import cached_encoding
 from telliot_feeds.queries.query import OracleQuery
 from telliot_feeds.utils.log import get_logger
 
@@ -31,6 +32,7 @@ class AbiQuery(OracleQuery):
     abi: ClassVar[list[dict[str, str]]] = []
 
     @property
+    @cached_encoding
     def query_data(self) -> bytes:
         """Encode the query type and parameters to create the query data.
 
@@ -4,6 +4,7 @@ from dataclasses import field
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Set
 
 import clamfig
 import yaml
@@ -12,6 +13,22 @@ from telliot_core.model.base import Base
 from telliot_feeds.queries.abi_query import AbiQuery
 from telliot_feeds.queries.query import OracleQuery
 
+#: Length of the tag substrings indexed for tag search
+TAG_NGRAM = 3
+
+
+def normalize_query_id(query_id: str) -> str:
+    """Lowercase, 0x-prefixed query id as used for catalog lookups"""
+    query_id = query_id.lower()
+    if not query_id.startswith("0x"):
+        query_id = "0x" + query_id
+    return query_id
+
+
+def tag_ngrams(tag: str) -> Set[str]:
+    """All substrings of length TAG_NGRAM in a tag"""
+    return {tag[start:end] for start, end in zip(range(len(tag)), range(TAG_NGRAM, len(tag) + 1))}
+
 
 @dataclass
 class CatalogEntry(Base):
@@ -46,6 +63,14 @@ class Catalog(Base):
 
     _entries: Dict[str, CatalogEntry] = field(default_factory=dict)
 
+    # lookup indexes, kept in catalog order and not part of the serialized state
+    _indexed: Optional[Dict[str, CatalogEntry]] = field(default=None, init=False, repr=False, compare=False)
+    _indexed_count: int = field(default=0, init=False, repr=False, compare=False)
+    _by_query_id: Dict[str, List[CatalogEntry]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _by_query_type: Dict[str, List[CatalogEntry]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _by_active: Dict[bool, List[CatalogEntry]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _by_tag_ngram: Dict[str, List[CatalogEntry]] = field(default_factory=dict, init=False, repr=False, compare=False)
+
     def add_entry(self, tag: str, title: str, q: OracleQuery, active: bool = True) -> None:
         """Add a new entry to the catalog."""
 
@@ -67,7 +92,37 @@ class Catalog(Base):
             abi=abi,
         )
 
+        self._ensure_indexes()
         self._entries[tag] = entry
+        self._index_entry(entry)
+
+    def _index_entry(self, entry: CatalogEntry) -> None:
+        self._indexed_count += 1
+        self._by_query_id.setdefault(normalize_query_id(entry.query_id), []).append(entry)
+        self._by_query_type.setdefault(entry.query_type.lower(), []).append(entry)
+        self._by_active.setdefault(entry.active, []).append(entry)
+        for ngram in tag_ngrams(entry.tag):
+            self._by_tag_ngram.setdefault(ngram, []).append(entry)
+
+    def _ensure_indexes(self) -> None:
+        """Rebuild the indexes if entries were replaced, e.g. by restoring serialized state"""
+        if self._indexed is self._entries and self._indexed_count == len(self._entries):
+            return
+        self._indexed = self._entries
+        self._indexed_count = 0
+        self._by_query_id = {}
+        self._by_query_type = {}
+        self._by_active = {}
+        self._by_tag_ngram = {}
+        for entry in self._entries.values():
+            self._index_entry(entry)
+
+    def _tag_candidates(self, tag: str) -> List[CatalogEntry]:
+        """Entries sharing the tag's rarest substring, a superset of the entries containing tag"""
+        ngrams = tag_ngrams(tag)
+        if not ngrams:
+            return list(self._entries.values())
+        return min((self._by_tag_ngram.get(ngram, []) for ngram in ngrams), key=len)
 
     def find(
         self,
@@ -76,30 +131,39 @@ class Catalog(Base):
         query_id: Optional[str] = None,
         query_type: Optional[str] = None,
         active: Optional[bool] = None,
-    ) -> List[OracleQuery]:
-        """Search the query catalog for matching entries."""
-
-        entries = []
-        for entry in self._entries.values():
-            if tag is not None:
-                if tag not in entry.tag:  # includes search for substring
-                    continue
-            if query_id is not None:
-                # Add 0x if necessary for match
-                if query_id[:2] not in ["0x", "0X"]:
-                    query_id = "0x" + query_id
-                if query_id.lower() != entry.query_id.lower():
-                    continue
-            if query_type is not None:
-                if query_type.lower() != entry.query_type.lower():
-                    continue
-            if active is not None:
-                if active != entry.active:
-                    continue
-
-            entries.append(entry)
-
-        return entries
+    ) -> List[CatalogEntry]:
+        """Search the query catalog for matching entries.
+
+        Matches entries whose tag contains `tag`, with the given query id
+        (with or without 0x, case-insensitive), query type (case-insensitive)
+        and active flag. Results are in catalog order.
+        """
+        self._ensure_indexes()
+
+        # start from the narrowest index, then check every criterion
+        indexed: List[List[CatalogEntry]] = []
+        if query_id is not None:
+            query_id = normalize_query_id(query_id)
+            indexed.append(self._by_query_id.get(query_id, []))
+        if query_type is not None:
+            query_type = query_type.lower()
+            indexed.append(self._by_query_type.get(query_type, []))
+        if active is not None:
+            indexed.append(self._by_active.get(active, []))
+        if tag is not None and (not indexed or min(map(len, indexed)) > 1):
+            indexed.append(self._tag_candidates(tag))
+        if not indexed:
+            return list(self._entries.values())
+        candidates = min(indexed, key=len)
+
+        return [
+            entry
+            for entry in candidates
+            if (tag is None or tag in entry.tag)  # includes search for substring
+            and (query_id is None or query_id == normalize_query_id(entry.query_id))
+            and (query_type is None or query_type == entry.query_type.lower())
+            and (active is None or active == entry.active)
+        ]
 
     def to_yaml(self) -> str:
         all_entries = self.find()
@@ -117,7 +181,7 @@ class Catalog(Base):
             lines.append(f"| Type | `{entry.query_type}` |")
             lines.append(f"| Descriptor | `{entry.descriptor}` |")
             lines.append(f"| Encoding ABI | `{entry.abi}` |")
-            lines.append(f"| Query ID | `{entry.query_id}` |")  # type: ignore
+            lines.append(f"| Query ID | `{entry.query_id}` |")
             lines.append(f"| Query data | `0x{entry.query.query_data.hex()}` |")
             lines.append("")
 
@@ -1,7 +1,7 @@
 from telliot_feeds.queries.query_catalog import query_catalog
 
 for q in query_catalog.find(active=True):
-    print(f"{q.tag:15} 0x{q.query_id.hex()} {q.descriptor}")
+    print(f"{q.tag:15} {q.query_id} {q.descriptor}")
 
 with open("query_catalog.md", "w") as f:
     f.write(query_catalog.to_markdown())
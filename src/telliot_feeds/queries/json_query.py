@@ -1,3 +1,4 @@
+from telliot_feeds.queries.query import cached_encoding
 from telliot_feeds.queries.query import OracleQuery
 from telliot_feeds.queries.query import query_from_descriptor
 
@@ -6,6 +7,7 @@ class JsonQuery(OracleQuery):
     """An Oracle Query that uses JSON-encoding to compute the query_data."""
 
     @property
+    @cached_encoding
     def query_data(self) -> bytes:
         """Encode the query `descriptor` to create the query `data` field for
         use in the ``TellorX.Oracle.tipQuery()`` contract call.
@@ -3,10 +3,14 @@
 """
 from __future__ import annotations
 
+import functools
 import json
 from typing import Any
+from typing import Callable
+from typing import cast
 from typing import Dict
 from typing import Optional
+from typing import TypeVar
 
 from clamfig import deserialize
 from clamfig import Serializable
@@ -14,6 +18,28 @@ from web3 import Web3
 
 from telliot_feeds.dtypes.value_type import ValueType
 
+T = TypeVar("T")
+
+
+def cached_encoding(method: Callable[[Any], T]) -> Callable[[Any], T]:
+    """Compute an encoding of a query once and reuse it until a query attribute is set
+
+    Parameters mutated in place (e.g. appending to a list parameter) are not
+    detected; assign a new value instead.
+    """
+    key = method.__qualname__
+
+    @functools.wraps(method)
+    def wrapper(self: Any) -> T:
+        cache: Dict[str, Any] = self.__dict__.setdefault("_encodings", {})
+        try:
+            return cast(T, cache[key])
+        except KeyError:
+            value = cache[key] = method(self)
+            return value
+
+    return wrapper
+
 
 class OracleQuery(Serializable):
     """Oracle Query
@@ -44,8 +70,15 @@ class OracleQuery(Serializable):
     - Encoding of the `descriptor` string to compute the `query_data` attribute,
     which is used for the `data` field of a `TellorX.Oracle.tipQuery()` contract call.
 
+    The descriptor, query data and query id are computed on first access and
+    cached until any attribute of the query is set.
     """
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        # parameters changed: drop cached descriptor, query data and query id
+        self.__dict__.pop("_encodings", None)
+        super().__setattr__(name, value)
+
     @property
     def value_type(self) -> ValueType:
         """Returns the ValueType expected by the current Query configuration
@@ -59,6 +92,7 @@ class OracleQuery(Serializable):
         raise NotImplementedError
 
     @property
+    @cached_encoding
     def descriptor(self) -> str:
         """Get the query descriptor string.
 
@@ -71,6 +105,7 @@ class OracleQuery(Serializable):
         return json_str
 
     @property
+    @cached_encoding
     def query_id(self) -> bytes:
         """Returns the query ``id`` for use with the
         ``TellorX.Oracle.tipQuery()`` and ``TellorX.Oracle.submitValue()``
@@ -42,6 +42,10 @@ class FlashbotsReporter(Tellor360Reporter):
         logger.info(f"Flashbots provider endpoint: {flashbots_uri}")
         flashbot(self.endpoint._web3, self.signature_account, flashbots_uri)
 
+    async def sign_n_send_transaction_async(self, built_tx: Any) -> Tuple[Optional[TxReceipt], ResponseStatus]:
+        # bundles go through the flashbots middleware on the blocking web3 instance
+        return self.sign_n_send_transaction(built_tx)
+
     def sign_n_send_transaction(self, built_tx: Any) -> Tuple[Optional[TxReceipt], ResponseStatus]:
         status = ResponseStatus()
         # Create bundle of one pre-signed, EIP-1559 (type 2) transaction
@@ -63,6 +67,7 @@ class FlashbotsReporter(Tellor360Reporter):
         try:
             result = self.endpoint._web3.flashbots.send_bundle(bundle, target_block_number=block + 1)
         except HTTPError as e:
+            self.nonces.reset()
             msg = "Unable to send bundle to miners due to HTTP error"
             return None, error_status(note=msg, e=e, log=logger.error)
 
@@ -74,6 +79,8 @@ class FlashbotsReporter(Tellor360Reporter):
             tx_receipt = result.receipts()[0]
             print(f"Bundle was executed in block {tx_receipt.blockNumber}")
         except TransactionNotFound as e:
+            # the bundle's nonce was never used
+            self.nonces.reset()
             status.error = "Bundle was not executed: " + str(e)
             logger.error(status.error)
             status.e = e
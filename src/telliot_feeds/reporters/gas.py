@@ -10,10 +10,15 @@ from typing import Union
 from chained_accounts import ChainedAccount
 from eth_utils import to_checksum_address
 from telliot_core.apps.core import RPCEndpoint
+from telliot_core.contract.contract import Contract
 from telliot_core.utils.response import error_status
 from telliot_core.utils.response import ResponseStatus
+from web3 import AsyncHTTPProvider
+from web3 import AsyncWeb3
 from web3 import Web3
+from web3.contract import AsyncContract
 from web3.contract import ContractConstructor
+from web3.contract.async_contract import AsyncContractFunction
 from web3.types import FeeHistory
 from web3.types import Wei
 
@@ -35,6 +40,10 @@ class GasFees:
     then call get_gas_prices() to get the gas prices for a transaction assembled manually
     or call get_gas_params_core() to get the gas prices for a transaction assembled by telliot_core
     returns gas_info for the transaction type
+
+    With use_async_web3=True the `*_async` methods query the node through an AsyncWeb3
+    connection instead of the blocking web3 instance, so gas estimation doesn't stall the event loop.
+    Otherwise they fall back to their blocking counterparts.
     """
 
     gas_info: GasParams = {
@@ -101,6 +110,7 @@ class GasFees:
         reward_percentile: Optional[List[float]] = None,
         block_count: int = 10,  # Number of blocks to use for gas price calculation
         min_native_token_balance: int = 0,  # Minimum native token balance to be considered for gas price calculation
+        use_async_web3: bool = False,  # Query the node with AsyncWeb3 in the *_async methods
     ):
         self.endpoint = endpoint
         self.account = account
@@ -119,6 +129,24 @@ class GasFees:
         self.acct_address = to_checksum_address(account.address)
         self.web3: Web3 = endpoint._web3
         assert self.web3 is not None, f"Web3 is not initialized, check endpoint {endpoint}"
+        self.use_async_web3 = use_async_web3
+        self._async_web3: Optional[AsyncWeb3[AsyncHTTPProvider]] = None
+        self._async_contracts: Dict[str, AsyncContract] = {}
+
+    @property
+    def async_web3(self) -> AsyncWeb3[AsyncHTTPProvider]:
+        """AsyncWeb3 connection to the same RPC url as the blocking web3 instance"""
+        if self._async_web3 is None:
+            self._async_web3 = AsyncWeb3(AsyncHTTPProvider(self.endpoint.url))
+        return self._async_web3
+
+    def async_contract(self, contract: Contract) -> AsyncContract:
+        """Return an AsyncWeb3 contract for a telliot_core contract wrapper"""
+        async_contract = self._async_contracts.get(contract.address)
+        if async_contract is None:
+            async_contract = self.async_web3.eth.contract(address=contract.address, abi=contract.abi)
+            self._async_contracts[contract.address] = async_contract
+        return async_contract
 
     def set_gas_info(self, fees: FEES) -> None:
         """Set class variable gas_info keys to values in fees"""
@@ -168,6 +196,30 @@ class GasFees:
         except Exception as e:
             return None, error_status("Error estimating gas amount:", e, logger.error)
 
+    async def estimate_gas_amount_async(
+        self, pre_built_transaction: Union[ContractConstructor, AsyncContractFunction]
+    ) -> Tuple[Optional[int], ResponseStatus]:
+        """Non-blocking version of `estimate_gas_amount`
+
+        Expects an AsyncContractFunction in async web3 mode.
+        """
+        if self.gas_limit is not None or not self.use_async_web3:
+            return self.estimate_gas_amount(pre_built_transaction)  # type: ignore[arg-type]
+        try:
+            gas = await pre_built_transaction.estimate_gas({"from": self.acct_address})
+            self.set_gas_info({"gas": gas})
+            return gas, ResponseStatus()
+        except Exception as e:
+            return None, error_status("Error estimating gas amount:", e, logger.error)
+
+    def _legacy_gas_fees(self, gas_price: Optional[Wei]) -> Tuple[Optional[FEES], ResponseStatus]:
+        """Apply the gas multiplier to the node's gas price"""
+        if gas_price is None:
+            return None, error_status("Error fetching legacy gas price, rpc returned None", log=logger.error)
+        multiplier = 1.0 + (self.gas_multiplier / 100.0)  # 1 percent default extra
+        legacy_gas_price = int(gas_price * multiplier)
+        return {"gasPrice": Wei(legacy_gas_price)}, ResponseStatus()
+
     def get_legacy_gas_price(self) -> Tuple[Optional[FEES], ResponseStatus]:
         """Fetch the legacy gas price for a type 0 (legacy) transaction from the node
 
@@ -178,12 +230,17 @@ class GasFees:
             return {"gasPrice": self.legacy_gas_price}, ResponseStatus()
 
         try:
-            gas_price = self.web3.eth.gas_price
-            if gas_price is None:
-                return None, error_status("Error fetching legacy gas price, rpc returned None", log=logger.error)
-            multiplier = 1.0 + (self.gas_multiplier / 100.0)  # 1 percent default extra
-            legacy_gas_price = int(gas_price * multiplier)
-            return {"gasPrice": Wei(legacy_gas_price)}, ResponseStatus()
+            return self._legacy_gas_fees(self.web3.eth.gas_price)
+        except Exception as e:
+            return None, error_status("Error fetching legacy gas price", e=e, log=logger.error)
+
+    async def get_legacy_gas_price_async(self) -> Tuple[Optional[FEES], ResponseStatus]:
+        """Non-blocking version of `get_legacy_gas_price`"""
+        if self.legacy_gas_price is not None:
+            return {"gasPrice": self.legacy_gas_price}, ResponseStatus()
+
+        try:
+            return self._legacy_gas_fees(await self.async_web3.eth.gas_price)
         except Exception as e:
             return None, error_status("Error fetching legacy gas price", e=e, log=logger.error)
 
@@ -207,6 +264,18 @@ class GasFees:
         except Exception as e:
             return None, error_status("Error fetching fee history", e=e, log=logger.error)
 
+    async def fee_history_async(self) -> Tuple[Optional[FeeHistory], ResponseStatus]:
+        """Non-blocking version of `fee_history`"""
+        try:
+            fee_history = await self.async_web3.eth.fee_history(
+                block_count=self.block_count, newest_block="latest", reward_percentiles=self.reward_percentile
+            )
+            if fee_history is None:
+                return None, error_status("unable to fetch fee history from node")
+            return fee_history, ResponseStatus()
+        except Exception as e:
+            return None, error_status("Error fetching fee history", e=e, log=logger.error)
+
     def get_max_fee(self, base_fee: Wei) -> Wei:
         """Calculate the max fee for a type 2 (EIP1559) transaction"""
         if self.max_fee_per_gas is not None:
@@ -248,6 +317,26 @@ class GasFees:
             else:
                 return fee_history_priority_fee_estimate(fee_history, max_range), ResponseStatus()
 
+    async def get_max_priority_fee_async(
+        self, fee_history: Optional[FeeHistory] = None
+    ) -> Tuple[Optional[Wei], ResponseStatus]:
+        """Non-blocking version of `get_max_priority_fee`"""
+        priority_fee = self.priority_fee_per_gas
+        max_range = self.max_priority_fee_range
+        if priority_fee is not None:
+            return priority_fee, ResponseStatus()
+        try:
+            max_priority_fee = await self.async_web3.eth._max_priority_fee()
+            return max_priority_fee if max_priority_fee < max_range else max_range, ResponseStatus()
+        except ValueError:
+            logger.warning("unable to fetch max priority fee from node using eth._max_priority_fee_per_gas method.")
+        if fee_history is None:
+            fee_history, status = await self.fee_history_async()
+            if fee_history is None:
+                msg = "unable to fetch history to calculate max priority fee"
+                return None, error_status(msg, e=status.error, log=logger.error)
+        return fee_history_priority_fee_estimate(fee_history, max_range), ResponseStatus()
+
     def get_base_fee(self) -> Tuple[Optional[Union[Wei, FeeHistory]], ResponseStatus]:
         """Return the base fee for a type 2 (EIP1559) transaction.
         if base fee is provided then return the provided base fee
@@ -264,6 +353,49 @@ class GasFees:
             else:
                 return fee_history, ResponseStatus()
 
+    async def get_base_fee_async(self) -> Tuple[Optional[Union[Wei, FeeHistory]], ResponseStatus]:
+        """Non-blocking version of `get_base_fee`"""
+        if self.base_fee_per_gas is not None:
+            return self.base_fee_per_gas, ResponseStatus()
+        fee_history, status = await self.fee_history_async()
+        if fee_history is None:
+            msg = "unable to fetch history to set base fee"
+            return None, error_status(msg, e=status.error, log=logger.error)
+        return fee_history, ResponseStatus()
+
+    def _needs_fee_estimate(self) -> bool:
+        """True if fewer than two of the base, priority and max fee args were provided"""
+        fee_args = [self.base_fee_per_gas, self.priority_fee_per_gas, self.max_fee_per_gas]
+        provided_fee_args = [arg for arg in fee_args if arg is not None]
+        return len(provided_fee_args) < 2
+
+    @staticmethod
+    def _split_base_fee(_base_fee: Union[Wei, FeeHistory]) -> Tuple[Wei, Optional[FeeHistory]]:
+        """Return the base fee and, if it was read from one, the fee history"""
+        if not isinstance(_base_fee, int):
+            return _base_fee["baseFeePerGas"][-1], _base_fee
+        return _base_fee, None
+
+    def _provided_eip1559_fees(self) -> Tuple[Optional[Tuple[Wei, Wei]], ResponseStatus]:
+        """Calculate the priority and max fee when at least two fee args were provided"""
+        # if two args are given then we can calculate the third
+        if self.base_fee_per_gas is not None and self.priority_fee_per_gas is not None:
+            # calculate max fee
+            return (self.priority_fee_per_gas, self.get_max_fee(self.base_fee_per_gas)), ResponseStatus()
+        elif self.base_fee_per_gas is not None and self.max_fee_per_gas is not None:
+            # calculate priority fee
+            return (Wei(self.max_fee_per_gas - self.base_fee_per_gas), self.max_fee_per_gas), ResponseStatus()
+        elif self.priority_fee_per_gas is not None and self.max_fee_per_gas is not None:
+            return (self.priority_fee_per_gas, self.max_fee_per_gas), ResponseStatus()
+        return None, error_status("Error calculating EIP1559 gas price no args provided", logger.error)
+
+    @staticmethod
+    def _eip1559_fees(priority_fee: Wei, max_fee: Wei) -> FEES:
+        return {
+            "maxPriorityFeePerGas": priority_fee,
+            "maxFeePerGas": max_fee if max_fee > priority_fee else priority_fee,
+        }
+
     def get_eip1559_gas_price(self) -> Tuple[Optional[FEES], ResponseStatus]:
         """Get the gas price for a type 2 (EIP1559) transaction
         if at least two user args for gas aren't provided then fetch fee history and assemble the gas params
@@ -273,50 +405,48 @@ class GasFees:
             - Dict[str, Wei]; {priority_fee_per_gas: Wei, max_fee_per_gas: Wei}
             - ResponseStatus
         """
-        fee_args = [self.base_fee_per_gas, self.priority_fee_per_gas, self.max_fee_per_gas]
-        provided_fee_args = [arg for arg in fee_args if arg is not None]
-        if len(provided_fee_args) < 2:
-            # Get base fee
-            _base_fee, status = self.get_base_fee()  # returns FeeHistory if base fee is not provided
-            if _base_fee is None:
-                msg = "no base fee set"
-                return None, error_status(msg, e=status.error, log=logger.error)
-            else:
-                if not isinstance(_base_fee, int):
-                    base_fee = _base_fee["baseFeePerGas"][-1]
-                    fee_history = _base_fee
-                else:
-                    fee_history = None
-                    base_fee = _base_fee
-            # Get priority fee
-            priority_fee, status = self.get_max_priority_fee(fee_history)
-            if priority_fee is None:
-                msg = "no priority fee set"
-                return None, error_status(msg, e=status.error, log=logger.error)
-            # Get max fee
-            max_fee = self.get_max_fee(base_fee)
-            logger.debug(f"base fee: {base_fee}, priority fee: {priority_fee}, max fee: {max_fee}")
-        else:
-            # if two args are given then we can calculate the third
-            if self.base_fee_per_gas is not None and self.priority_fee_per_gas is not None:
-                # calculate max fee
-                max_fee = self.get_max_fee(self.base_fee_per_gas)
-                priority_fee = self.priority_fee_per_gas
-
-            elif self.base_fee_per_gas is not None and self.max_fee_per_gas is not None:
-                # calculate priority fee
-                priority_fee = Wei(self.max_fee_per_gas - self.base_fee_per_gas)
-                max_fee = self.max_fee_per_gas
-            elif self.priority_fee_per_gas is not None and self.max_fee_per_gas is not None:
-                priority_fee = self.priority_fee_per_gas
-                max_fee = self.max_fee_per_gas
-            else:
-                return None, error_status("Error calculating EIP1559 gas price no args provided", logger.error)
-
-        return {
-            "maxPriorityFeePerGas": priority_fee,
-            "maxFeePerGas": max_fee if max_fee > priority_fee else priority_fee,
-        }, ResponseStatus()
+        if not self._needs_fee_estimate():
+            fees, status = self._provided_eip1559_fees()
+            if fees is None:
+                return None, status
+            return self._eip1559_fees(*fees), status
+
+        # Get base fee
+        _base_fee, status = self.get_base_fee()  # returns FeeHistory if base fee is not provided
+        if _base_fee is None:
+            msg = "no base fee set"
+            return None, error_status(msg, e=status.error, log=logger.error)
+        base_fee, fee_history = self._split_base_fee(_base_fee)
+        # Get priority fee
+        priority_fee, status = self.get_max_priority_fee(fee_history)
+        if priority_fee is None:
+            msg = "no priority fee set"
+            return None, error_status(msg, e=status.error, log=logger.error)
+        # Get max fee
+        max_fee = self.get_max_fee(base_fee)
+        logger.debug(f"base fee: {base_fee}, priority fee: {priority_fee}, max fee: {max_fee}")
+        return self._eip1559_fees(priority_fee, max_fee), ResponseStatus()
+
+    async def get_eip1559_gas_price_async(self) -> Tuple[Optional[FEES], ResponseStatus]:
+        """Non-blocking version of `get_eip1559_gas_price`"""
+        if not self._needs_fee_estimate():
+            fees, status = self._provided_eip1559_fees()
+            if fees is None:
+                return None, status
+            return self._eip1559_fees(*fees), status
+
+        _base_fee, status = await self.get_base_fee_async()
+        if _base_fee is None:
+            msg = "no base fee set"
+            return None, error_status(msg, e=status.error, log=logger.error)
+        base_fee, fee_history = self._split_base_fee(_base_fee)
+        priority_fee, status = await self.get_max_priority_fee_async(fee_history)
+        if priority_fee is None:
+            msg = "no priority fee set"
+            return None, error_status(msg, e=status.error, log=logger.error)
+        max_fee = self.get_max_fee(base_fee)
+        logger.debug(f"base fee: {base_fee}, priority fee: {priority_fee}, max fee: {max_fee}")
+        return self._eip1559_fees(priority_fee, max_fee), ResponseStatus()
 
     def update_gas_fees(self) -> ResponseStatus:
         """Update class gas_info with the latest gas fees whenever called"""
@@ -343,3 +473,31 @@ class GasFees:
         else:
             msg = f"Failed to update gas fees: invalid transaction type: {self.transaction_type}"
             return error_status(msg, log=logger.error)
+
+    async def update_gas_fees_async(self) -> ResponseStatus:
+        """Non-blocking version of `update_gas_fees`"""
+        if not self.use_async_web3:
+            return self.update_gas_fees()
+        self._reset_gas_info()
+        self.set_gas_info({"gas": self.gas_limit})
+        if self.transaction_type == 0:
+            legacy_gas_fees, status = await self.get_legacy_gas_price_async()
+            if legacy_gas_fees is None:
+                return error_status(
+                    "Failed to update gas fees for legacy type transaction", e=status.error, log=logger.error
+                )
+            self.set_gas_info(legacy_gas_fees)
+            logger.debug(f"Legacy transaction gas price: {legacy_gas_fees} status: {status}")
+            return status
+        elif self.transaction_type == 2:
+            eip1559_gas_fees, status = await self.get_eip1559_gas_price_async()
+            if eip1559_gas_fees is None:
+                return error_status(
+                    "Failed to update gas fees for EIP1559 type transaction", e=status.error, log=logger.debug
+                )
+            self.set_gas_info(eip1559_gas_fees)
+            logger.debug(f"Gas fees: {eip1559_gas_fees} status: {status}")
+            return status
+        else:
+            msg = f"Failed to update gas fees: invalid transaction type: {self.transaction_type}"
+            return error_status(msg, log=logger.error)
@@ -2,14 +2,15 @@ import asyncio
 import base64
 from typing import Any
 from typing import Dict
+from typing import List
 from typing import Optional
+from typing import Set
 from typing import Tuple
 
 from chained_accounts import ChainedAccount
 from telliot_core.apps.core import RPCEndpoint
 from telliot_core.utils.response import error_status
 from telliot_core.utils.response import ResponseStatus
-from terra_sdk.client.lcd.api.tx import CreateTxOptions
 from terra_sdk.core.coins import Coin
 
 from telliot_feeds.datafeed import DataFeed
@@ -18,12 +19,22 @@ from telliot_feeds.reporters.layer.client import LCDClient  # type: ignore[attr-
 from telliot_feeds.reporters.layer.msg_submit_value import MsgSubmitValue  # type: ignore[attr-defined]
 from telliot_feeds.reporters.layer.msg_tip import MsgTip  # type: ignore[attr-defined]
 from telliot_feeds.reporters.layer.raw_key import RawKey  # type: ignore[attr-defined]
+from telliot_feeds.reporters.layer.submitter import BroadcastResult
+from telliot_feeds.reporters.layer.submitter import LayerTxSubmitter
+from telliot_feeds.reporters.layer.tendermint_events import AdaptiveBackoff
+from telliot_feeds.reporters.layer.tendermint_events import TendermintEventStream
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.query_search_utils import feed_from_catalog_feeds
 from telliot_feeds.utils.reporter_utils import is_online
 
 logger = get_logger(__name__)
 
+#: Gas assumed per MsgSubmitValue when packing reports into one tx
+DEFAULT_GAS_PER_REPORT = 200_000
+
+#: Upper bound on the gas of one batched report tx
+DEFAULT_MAX_BATCH_GAS = 2_000_000
+
 
 class LayerReporter:
     def __init__(
@@ -35,8 +46,19 @@ class LayerReporter:
         datafeed: Optional[DataFeed[Any]] = None,
         ignore_tbr: bool = False,
         gas: str = "auto",
+        rpc_url: Optional[str] = None,
+        tx_timeout: float = 10.0,
+        batch_tipped: bool = False,
+        gas_per_report: int = DEFAULT_GAS_PER_REPORT,
+        max_batch_gas: int = DEFAULT_MAX_BATCH_GAS,
     ) -> None:
-        """Initialize LayerReporter"""
+        """Initialize LayerReporter
+
+        rpc_url: Tendermint RPC url; when set, new blocks and tx results are
+        followed over its websocket instead of polling the LCD
+        batch_tipped: report every supported tipped query each loop, packing
+        up to max_batch_gas / gas_per_report MsgSubmitValue messages per tx
+        """
         self.account = account
         self.datafeed = datafeed
         self.query_tag = query_tag
@@ -50,16 +72,47 @@ class LayerReporter:
         self.previously_reported_id: Optional[int] = None
         # needed for queries that have a long reporting window
         self.previously_reported_tipped_query: Dict[str, bool] = {"init": True}
-
-    async def fetch_cycle_list_query(self) -> Tuple[Optional[str], ResponseStatus]:
+        self.tx_timeout = tx_timeout
+        # one wallet and locally tracked account sequence for every tx this reporter sends
+        self.submitter = LayerTxSubmitter(self.client, RawKey(self.account.local_account.key), gas=gas)
+        self.events = TendermintEventStream(rpc_url) if rpc_url else None
+        self.batch_tipped = batch_tipped
+        self.gas_per_report = gas_per_report
+        self.max_batch_gas = max_batch_gas
+
+    async def start_event_stream(self) -> None:
+        """Subscribe to Tendermint events if an rpc url was given"""
+        if self.events is None:
+            return
+        self.events.start()
+        if not await self.events.wait_connected(timeout=5):
+            logger.warning("Tendermint websocket not connected yet; polling until it is")
+
+    async def wait_for_next_block(self, backoff: AdaptiveBackoff) -> None:
+        """Wait until the chain may have changed: the next block if subscribed, else a backoff delay"""
+        if self.events is not None and self.events.connected:
+            if await self.events.wait_for_block(timeout=backoff.max_delay) is not None:
+                return
+        await backoff.sleep()
+
+    async def fetch_cycle_list_query(self, wait: bool = True) -> Tuple[Optional[str], ResponseStatus]:
+        """Fetch the current cycle list query data
+
+        wait: if the current query was already reported, wait for the next one;
+        otherwise return None with an ok status
+        """
         print("SPUD STARTING fetch_cycle_list_query")
         query_res = await self.client._get("/tellor-io/layer/oracle/current_cyclelist_query")
         querymeta = query_res.get("query_meta")
         if querymeta is None:
             return None, error_status("failed to get cycle list query", log=logger.error)
         current_id = querymeta["id"]
-        # if already reported id, keep trying until you get a new id
+        if not wait and current_id == self.previously_reported_id:
+            return None, ResponseStatus()
+        # if already reported id, check again once a new block is in until you get a new id
+        backoff = AdaptiveBackoff()
         while current_id == self.previously_reported_id:
+            await self.wait_for_next_block(backoff)
             query_res = await self.client._get("/tellor-io/layer/oracle/current_cyclelist_query")
             querymeta = query_res.get("query_meta")
             if querymeta is None:
@@ -83,6 +136,28 @@ class LayerReporter:
         tip = querymeta[0].get("amount")
         return querydata, tip
 
+    async def fetch_tipped_datafeeds(self) -> List[Tuple[str, DataFeed[Any]]]:
+        """Every tipped query with a catalog feed that hasn't been reported yet
+
+        Queries are only marked as reported once a tx carrying their report
+        succeeds, so a tip whose report fails is tried again next loop.
+
+        Returns: list of (query data as returned by the chain, datafeed)
+        """
+        query_res = await self.client._get("/tellor-io/layer/oracle/tipped_queries")
+        datafeeds = []
+        for querymeta in query_res.get("queries") or []:
+            querydata = querymeta.get("query_data")
+            if querydata in self.previously_reported_tipped_query:
+                continue
+            datafeed = feed_from_catalog_feeds(base64.b64decode(querydata))
+            if datafeed is None:
+                logger.info(f"No catalog feed for tipped query {querydata}, skipping")
+                continue
+            datafeeds.append((querydata, datafeed))
+        logger.info(f"Found {len(datafeeds)} new supported tipped queries")
+        return datafeeds
+
     async def fetch_datafeed(self) -> Optional[DataFeed[Any]]:
         print("SPUD STARTING fetch_datafeed")
         query, tip = await self.fetch_tipped_query()
@@ -96,23 +171,70 @@ class LayerReporter:
 
         return datafeed
 
+    async def fetch_datafeeds(self) -> List[Tuple[DataFeed[Any], bool]]:
+        """Fetch the tipped query and the cycle list query to report in the same block
+
+        The cycle list is only waited on when there is no tipped query to report.
+
+        Returns: list of (datafeed, is cycle list query)
+        """
+        query, tip = await self.fetch_tipped_query()
+        logger.debug(f"Tipped query: {query}, tip: {tip}")
+        queries = [(query, False)] if query is not None else []
+        cycle_query, status = await self.fetch_cycle_list_query(wait=query is None)
+        if status.ok and cycle_query is not None and cycle_query != query:
+            queries.append((cycle_query, True))
+
+        datafeeds = []
+        for query_data, is_cycle_list in queries:
+            datafeed = feed_from_catalog_feeds(base64.b64decode(query_data))
+            if datafeed is not None:
+                datafeeds.append((datafeed, is_cycle_list))
+            elif is_cycle_list:
+                # unsupported; don't skip the query if it comes around again
+                self.previously_reported_id = None
+        return datafeeds
+
+    async def broadcast(
+        self, msgs: List[Any], gas: Optional[int] = None
+    ) -> Tuple[Optional[Dict[str, Any]], ResponseStatus]:
+        """Sign and broadcast msgs, then wait for the tx to be included"""
+        try:
+            response: BroadcastResult = await self.submitter.submit(msgs, gas=gas)
+        except Exception as e:
+            msg = "Error creating/broadcasting transaction"
+            return None, error_status(msg, e=e, log=logger.error)
+        if not response.ok:
+            msg = f"Transaction rejected with code {response.code}: {response.raw_log}"
+            return None, error_status(msg, log=logger.error)
+        logger.debug(f"Broadcast response: {response}")
+        return await self.fetch_tx_info(response), ResponseStatus()
+
     async def fetch_tx_info(self, response: Any) -> Optional[Dict[str, Any]]:
-        for _ in range(10):
+        if self.events is not None and self.events.connected:
+            # look the tx up once the block including it has been pushed
+            if await self.events.wait_for_tx(response.txhash, timeout=self.tx_timeout) is None:
+                logger.warning(f"No tx result for {response.txhash} from websocket, polling instead")
+        backoff = AdaptiveBackoff(min_delay=0.5, max_delay=4.0)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.tx_timeout
+        while True:
             try:
                 tx_info = await self.client._get(f"/cosmos/tx/v1beta1/txs/{response.txhash}")
                 return tx_info  # type: ignore[no-any-return]
             except Exception as e:
                 if "tx not found" in str(e):
+                    if loop.time() + backoff.delay > deadline:
+                        return None
                     print("tx not found, retrying...")
-                    await asyncio.sleep(1)
+                    await backoff.sleep()
                     continue
                 else:
                     # TODO: Handle other potential exceptions
                     raise e
-        return None
 
-    async def direct_submit_txn(self, datafeed: DataFeed[Any]) -> Tuple[Optional[Dict[str, Any]], ResponseStatus]:
-        print("SPUD STARTING direct_submit_txn")
+    async def submit_value_msg(self, datafeed: DataFeed[Any]) -> Tuple[Optional[Any], ResponseStatus]:
+        """Fetch the datafeed's value and build its MsgSubmitValue"""
         await datafeed.source.fetch_new_datapoint()
         latest_data = datafeed.source.latest
         if latest_data[0] is None:
@@ -127,61 +249,63 @@ class LayerReporter:
             msg = f"Error encoding response value {latest_data[0]}"
             return None, error_status(msg, e=e, log=logger.error)
 
-        wallet = self.client.wallet(RawKey(self.account.local_account.key))
         msg = MsgSubmitValue(
-            creator=wallet.key.acc_address,
+            creator=self.submitter.address,
             query_data=datafeed.query.query_data,
             value=value.hex(),
         )
-        print(f"submit value options: {msg}")
-        options = CreateTxOptions(msgs=[msg], gas=self.gas)
-        print(f"submit value options: {options}")
-        try:
-            tx = wallet.create_and_sign_tx(options)
-            response = self.client.tx.broadcast_async(tx)
-            return await self.fetch_tx_info(response), ResponseStatus()
-        except Exception as e:
-            msg = "Error submitting transaction"
-            print(msg, e.__str__())
-            return None, error_status(msg, e=e, log=logger.error)
+        logger.debug(f"Submit value msg: {msg}")
+        return msg, ResponseStatus()
+
+    async def direct_submit_txn(self, datafeed: DataFeed[Any]) -> Tuple[Optional[Dict[str, Any]], ResponseStatus]:
+        print("SPUD STARTING direct_submit_txn")
+        msg, status = await self.submit_value_msg(datafeed)
+        if msg is None:
+            return None, status
+        return await self.broadcast([msg])
+
+    async def batch_submit_txns(
+        self, datafeeds: List[DataFeed[Any]]
+    ) -> List[Tuple[List[DataFeed[Any]], Optional[Dict[str, Any]]]]:
+        """Report several datafeeds with as few txs as the gas bound allows
+
+        Values are fetched concurrently; feeds whose value can't be fetched
+        are left out. Each tx carries at most max_batch_gas / gas_per_report
+        MsgSubmitValue messages, and all txs are broadcast together.
+
+        Returns: the datafeeds each broadcast tx carried and its tx info, None where it failed
+        """
+        built = await asyncio.gather(*(self.submit_value_msg(datafeed) for datafeed in datafeeds))
+        reports = [(datafeed, msg) for datafeed, (msg, _) in zip(datafeeds, built) if msg is not None]
+        if not reports:
+            return []
+        # a fixed gas limit is per report; "auto" simulates each batch tx for its actual gas
+        fixed_gas = self.submitter.gas_limit
+        gas_per_report = fixed_gas or self.gas_per_report
+        per_tx = max(1, self.max_batch_gas // gas_per_report)
+        batches = []
+        for start in range(0, len(reports), per_tx):
+            end = start + per_tx
+            batches.append(reports[start:end])
+        logger.info(f"Reporting {len(reports)} values in {len(batches)} txs")
+
+        results = await asyncio.gather(
+            *(self.broadcast([msg for _, msg in batch], gas=fixed_gas and fixed_gas * len(batch)) for batch in batches)
+        )
+        return [([datafeed for datafeed, _ in batch], txn_info) for batch, (txn_info, _) in zip(batches, results)]
 
     async def direct_tip_txn(self, datafeed: DataFeed[Any]) -> Tuple[Optional[Dict[str, Any]], ResponseStatus]:
         """Submit a direct tip transaction for a query"""
         print("SPUD STARTING direct_tip_txn")
-        try:
-            wallet = self.client.wallet(RawKey(self.account.local_account.key))
-            tip_amount = Coin.from_str("1000loya")
-            msg = MsgTip(
-                tipper=wallet.key.acc_address,
-                query_data=datafeed.query.query_data,
-                amount=tip_amount.to_data(),
-            )
-
-            print(f"Tip message: {msg}")
-
-            # Get account sequence and number
-            account_info = self.client.auth.account_info(wallet.key.acc_address)
-            sequence = account_info.sequence
-            account_number = account_info.account_number
-
-            print(f"Account info - sequence: {sequence}, number: {account_number}")
-
-            options = CreateTxOptions(
-                msgs=[msg],
-                gas=self.gas,
-            )
-
-            print(f"Tip options: {options}")
-
-            tx = wallet.create_and_sign_tx(options)
-            print(f"tx: {tx}")
-            response = self.client.tx.broadcast_async(tx)
-            print(f"response: {response}")
-            return await self.fetch_tx_info(response), ResponseStatus()
-        except Exception as e:
-            msg = "Error creating/broadcasting transaction"
-            logger.error(f"{msg}: {str(e)}")
-            return None, error_status(msg, e=e, log=logger.error)
+        tip_amount = Coin.from_str("1000loya")
+        msg = MsgTip(
+            tipper=self.submitter.address,
+            query_data=datafeed.query.query_data,
+            amount=tip_amount.to_data(),
+        )
+
+        print(f"Tip message: {msg}")
+        return await self.broadcast([msg])
 
     async def direct_tip_and_report_txn(
         self, datafeed: DataFeed[Any]
@@ -204,41 +328,23 @@ class LayerReporter:
             msg = f"Error encoding response value {latest_data[0]}"
             return None, error_status(msg, e=e, log=logger.error)
 
-        try:
-            wallet = self.client.wallet(RawKey(self.account.local_account.key))
-
-            # Tip message
-            tip_amount = Coin.from_str("1000loya")
-            tip_msg = MsgTip(
-                tipper=wallet.key.acc_address,
-                query_data=datafeed.query.query_data,
-                amount=tip_amount.to_data(),
-            )
-
-            # Report message
-            report_msg = MsgSubmitValue(
-                creator=wallet.key.acc_address,
-                query_data=datafeed.query.query_data,
-                value=value.hex(),
-            )
-
-            # Single tx with both messages
-            options = CreateTxOptions(
-                msgs=[tip_msg, report_msg],
-                gas=self.gas,
-            )
-            print(f"Combined options: {options}")
-
-            tx = wallet.create_and_sign_tx(options)
-            print(f"tx: {tx}")
-            response = self.client.tx.broadcast_async(tx)
-            print(f"response: {response}")
-            return await self.fetch_tx_info(response), ResponseStatus()
+        # Tip message
+        tip_amount = Coin.from_str("1000loya")
+        tip_msg = MsgTip(
+            tipper=self.submitter.address,
+            query_data=datafeed.query.query_data,
+            amount=tip_amount.to_data(),
+        )
 
-        except Exception as e:
-            msg = "Error creating/broadcasting transaction"
-            logger.error(f"{msg}: {str(e)}")
-            return None, error_status(msg, e=e, log=logger.error)
+        # Report message
+        report_msg = MsgSubmitValue(
+            creator=self.submitter.address,
+            query_data=datafeed.query.query_data,
+            value=value.hex(),
+        )
+
+        # Single tx with both messages
+        return await self.broadcast([tip_msg, report_msg])
 
     async def report_once(
         self,
@@ -255,33 +361,91 @@ class LayerReporter:
             txn_info, status = await self.direct_tip_and_report_txn(datafeed)
             if txn_info is None or not status.ok:
                 return None, error_status("Tip+Report transaction failed", e=status.e, log=logger.error)
-
-        else:
-            # Otherwise fetch from chain
-            datafeed = await self.fetch_datafeed()
-            if not datafeed:
-                return None, error_status(note="Unable to suggest datafeed", log=logger.info)
-
-            txn_info, status = await self.direct_submit_txn(datafeed)
+            if txn_info.get("tx_response") is None:
+                return None, error_status("Failed to get transaction response", log=logger.error)
+            if not self.check_txn_info(txn_info):
+                self.previously_reported_id = None
+            return txn_info, ResponseStatus()
+
+        if self.batch_tipped:
+            return await self.report_batched()
+
+        # Otherwise fetch from chain; the tipped and cycle list reports are in flight together
+        datafeeds = await self.fetch_datafeeds()
+        if not datafeeds:
+            return None, error_status(note="Unable to suggest datafeed", log=logger.info)
+
+        results = await asyncio.gather(*(self.direct_submit_txn(datafeed) for datafeed, _ in datafeeds))
+        txn_infos = []
+        for (datafeed, is_cycle_list), (txn_info, status) in zip(datafeeds, results):
             if txn_info is None or not status.ok:
-                return None, error_status("Failed to submit transaction", e=status.e, log=logger.error)
+                error_status(f"Failed to submit {datafeed.query.descriptor}", e=status.e, log=logger.error)
+                continue
+            if not self.check_txn_info(txn_info) and is_cycle_list:
+                self.previously_reported_id = None
+            txn_infos.append(txn_info)
+        if not txn_infos:
+            return None, error_status("Failed to submit transaction", log=logger.error)
+        return txn_infos[0] if len(txn_infos) == 1 else txn_infos, ResponseStatus()
+
+    async def report_batched(self) -> Tuple[Optional[Any], ResponseStatus]:
+        """Report every new tipped query and the cycle list query in batched txs"""
+        tipped = await self.fetch_tipped_datafeeds()
+        datafeeds = [datafeed for _, datafeed in tipped]
+        cycle_feed = None
+        cycle_query, status = await self.fetch_cycle_list_query(wait=not datafeeds)
+        if status.ok and cycle_query is not None:
+            cycle_feed = feed_from_catalog_feeds(base64.b64decode(cycle_query))
+            if cycle_feed is None:
+                self.previously_reported_id = None
+            elif cycle_feed in datafeeds:
+                # also tipped; its tipped report covers the cycle list query
+                cycle_feed = datafeeds[datafeeds.index(cycle_feed)]
+            else:
+                datafeeds.append(cycle_feed)
+        if not datafeeds:
+            return None, error_status(note="Unable to suggest datafeed", log=logger.info)
+
+        txn_infos = []
+        # ids of the datafeeds whose report was included in a successful tx
+        reported: Set[int] = set()
+        for batch, txn_info in await self.batch_submit_txns(datafeeds):
+            if txn_info is None:
+                continue
+            txn_infos.append(txn_info)
+            if self.check_txn_info(txn_info):
+                reported.update(id(datafeed) for datafeed in batch)
+
+        for querydata, datafeed in tipped:
+            if id(datafeed) in reported:
+                self.previously_reported_tipped_query[querydata] = True
+        if cycle_feed is not None and id(cycle_feed) not in reported:
+            # report the cycle list query again if the tx carrying it failed
+            self.previously_reported_id = None
+        if not txn_infos:
+            return None, error_status("Failed to submit transaction", log=logger.error)
+        return txn_infos, ResponseStatus()
+
+    def check_txn_info(self, txn_info: Dict[str, Any]) -> bool:
+        """Log the outcome of an included tx; True if it succeeded"""
         txn_response = txn_info.get("tx_response")
         if txn_response is None:
-            return None, error_status("Failed to get transaction response", log=logger.error)
+            logger.error("Failed to get transaction response")
+            return False
         code = txn_response.get("code")
         if code == 0:
             txn_hash = txn_response.get("txhash")
             print(f"Txn hash: {txn_hash}; Transaction successful with status code {code}")
-        else:
-            print(f"Transaction failed with status code {code}")
-            self.previously_reported_id = None
-        return txn_info, ResponseStatus()
+            return True
+        print(f"Transaction failed with status code {code}")
+        return False
 
     async def is_online(self) -> bool:
         return await is_online()
 
     async def report(self) -> None:
         """Submit values to Tellor oracles on an interval."""
+        await self.start_event_stream()
         while True:
             if await self.is_online():
                 _, _ = await self.report_once()
@@ -0,0 +1,149 @@
+"""Sign and broadcast Layer transactions with locally tracked account sequence
+
+`Wallet.create_and_sign_tx` looks up the account number and sequence on
+every call, and each direct_* reporter method built a fresh wallet. The
+`LayerTxSubmitter` looks the account up once, hands out sequence numbers
+itself and only goes back to the chain when a broadcast is rejected for a
+sequence mismatch. Signing and broadcasting are serialized so sequences
+stay in order, but confirmations are awaited outside the lock, so several
+transactions can be in flight (and land in the same block) at once.
+"""
+import asyncio
+import base64
+import re
+from dataclasses import dataclass
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Union
+
+from terra_sdk.client.lcd.api.tx import CreateTxOptions
+from terra_sdk.core.fee import Fee
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Cosmos SDK error code for an account sequence mismatch
+SEQUENCE_MISMATCH_CODE = 32
+
+_EXPECTED_SEQUENCE = re.compile(r"expected (\d+)")
+
+
+@dataclass
+class BroadcastResult:
+    """CheckTx result of a broadcast tx"""
+
+    txhash: str
+    code: int
+    raw_log: str = ""
+    sequence: Optional[int] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.code == 0
+
+
+class LayerTxSubmitter:
+    """Build, sign and broadcast txs for one account without per-tx account lookups
+
+    Args:
+        client: LCDClient for the Layer chain
+        key: signing key, e.g. RawKey
+        gas: gas limit, or "auto" to simulate each tx for a fee estimate
+    """
+
+    def __init__(self, client: Any, key: Any, gas: Union[str, int] = "auto") -> None:
+        self.client = client
+        self.wallet = client.wallet(key)
+        self.address: str = self.wallet.key.acc_address
+        self.gas = gas
+        self.account_number: Optional[int] = None
+        self.sequence: Optional[int] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+
+    async def sync_account(self) -> None:
+        """Fetch account number and sequence from the chain"""
+        res = await self.client._get(f"/cosmos/auth/v1beta1/accounts/{self.address}")
+        account = res["account"]
+        # vesting and module accounts nest the base account
+        account = account.get("base_account", account)
+        self.account_number = int(account["account_number"])
+        self.sequence = int(account.get("sequence") or 0)
+        logger.debug(f"Layer account {self.address}: number {self.account_number}, sequence {self.sequence}")
+
+    @property
+    def gas_limit(self) -> Optional[int]:
+        """Fixed gas limit, or None when gas is estimated per tx"""
+        if isinstance(self.gas, str) and not self.gas.isdigit():
+            return None
+        return int(self.gas)
+
+    def fee(self, gas: Optional[int] = None) -> Optional[Any]:
+        """Fee for a fixed gas limit, computed locally so signing needs no simulation"""
+        gas = gas if gas is not None else self.gas_limit
+        if gas is None:
+            return None
+        return Fee(gas, self.client.gas_prices.mul(gas).to_int_ceil_coins())
+
+    def sign(self, msgs: List[Any], sequence: int, gas: Optional[int] = None) -> Any:
+        assert self.account_number is not None
+        options = CreateTxOptions(
+            msgs=msgs,
+            gas=str(self.gas),
+            fee=self.fee(gas),
+            account_number=self.account_number,
+            sequence=sequence,
+        )
+        return self.wallet.create_and_sign_tx(options)
+
+    async def broadcast_tx(self, tx: Any) -> BroadcastResult:
+        """Broadcast a signed tx and return its CheckTx result"""
+        tx_bytes = base64.b64encode(bytes(tx.to_proto())).decode()
+        res = await self.client._post("/cosmos/tx/v1beta1/txs", {"tx_bytes": tx_bytes, "mode": "BROADCAST_MODE_SYNC"})
+        tx_response = res.get("tx_response") or {}
+        return BroadcastResult(
+            txhash=tx_response.get("txhash", ""),
+            code=int(tx_response.get("code") or 0),
+            raw_log=tx_response.get("raw_log", ""),
+        )
+
+    async def submit(self, msgs: List[Any], gas: Optional[int] = None) -> BroadcastResult:
+        """Sign msgs with the next sequence and broadcast them
+
+        gas: gas limit for this tx, overriding a fixed `gas`
+        Returns once the tx has passed CheckTx; await its inclusion separately.
+        A sequence mismatch resyncs the account and retries once.
+        """
+        async with self._get_lock():
+            if self.account_number is None or self.sequence is None:
+                await self.sync_account()
+
+            for attempt in range(2):
+                assert self.sequence is not None
+                sequence = self.sequence
+                tx = self.sign(msgs, sequence, gas)
+                result = await self.broadcast_tx(tx)
+                result.sequence = sequence
+                if result.ok:
+                    self.sequence = sequence + 1
+                    return result
+                if result.code != SEQUENCE_MISMATCH_CODE or attempt:
+                    return result
+
+                expected = _EXPECTED_SEQUENCE.search(result.raw_log)
+                logger.info(f"Account sequence mismatch at {sequence}, resyncing: {result.raw_log}")
+                if expected is not None:
+                    self.sequence = int(expected.group(1))
+                else:
+                    await self.sync_account()
+            return result
@@ -0,0 +1,202 @@
+"""Push-based block and tx notifications from a Tendermint RPC websocket
+
+The cycle list query can only change when a block is committed, and a
+broadcast tx can only be found once the block including it is. Instead of
+repeatedly asking the LCD, `TendermintEventStream` subscribes to `NewBlock`
+and `Tx` events on the node's `/websocket` endpoint and wakes up waiters
+when they arrive. Oracle module events (reports, tips, cycle list
+rotation) are delivered as part of those block and tx events.
+
+When no websocket is available, `AdaptiveBackoff` spaces out polling:
+short delays right after a change, growing while nothing changes.
+"""
+import asyncio
+import json
+from collections import OrderedDict
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+import websockets
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Event queries subscribed to on connect
+SUBSCRIPTIONS = ("tm.event='NewBlock'", "tm.event='Tx'")
+
+#: Max tx results kept for waiters that start waiting after the tx was included
+MAX_RECENT_TXS = 1_000
+
+
+class AdaptiveBackoff:
+    """Polling delay that doubles while nothing changes, up to max_delay"""
+
+    def __init__(self, min_delay: float = 0.5, max_delay: float = 8.0, factor: float = 2.0) -> None:
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.delay = min_delay
+
+    def reset(self) -> None:
+        """Go back to polling quickly, e.g. after the polled value changed"""
+        self.delay = self.min_delay
+
+    async def sleep(self) -> None:
+        """Sleep for the current delay, then increase it"""
+        await asyncio.sleep(self.delay)
+        self.delay = min(self.delay * self.factor, self.max_delay)
+
+
+def websocket_url(rpc_url: str) -> str:
+    """Tendermint websocket endpoint for an RPC url, e.g. http://host:26657 -> ws://host:26657/websocket"""
+    url = rpc_url.rstrip("/")
+    if url.startswith("http"):
+        url = "ws" + url.removeprefix("http")
+    if not url.endswith("/websocket"):
+        url += "/websocket"
+    return url
+
+
+class TendermintEventStream:
+    """Follow new blocks and tx results over a Tendermint RPC websocket
+
+    Reconnects with exponential backoff; `connected` tells callers whether
+    they can rely on push notifications or should poll instead.
+    """
+
+    def __init__(self, url: str, reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0) -> None:
+        self.url = websocket_url(url)
+        self.reconnect = AdaptiveBackoff(min_delay=reconnect_delay, max_delay=max_reconnect_delay)
+        #: height of the latest block seen
+        self.height = 0
+        self.connected = False
+        self._block_event = asyncio.Event()
+        self._connected_event = asyncio.Event()
+        self._txs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._tx_waiters: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def start(self) -> None:
+        """Connect in the background; safe to call more than once"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._set_connected(False)
+
+    async def wait_connected(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for the subscription to be live"""
+        try:
+            await asyncio.wait_for(self._connected_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.connected
+
+    async def wait_for_block(self, after_height: Optional[int] = None, timeout: float = 30.0) -> Optional[int]:
+        """Wait for a block higher than after_height (default: the latest seen)
+
+        Returns: the new height, or None on timeout or disconnect
+        """
+        after = self.height if after_height is None else after_height
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.height <= after:
+            remaining = deadline - loop.time()
+            if remaining <= 0 or not self.connected:
+                return None
+            event = self._block_event
+            try:
+                await asyncio.wait_for(event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+        return self.height
+
+    async def wait_for_tx(self, txhash: str, timeout: float = 30.0) -> Optional[Dict[str, Any]]:
+        """Wait for a tx to be included in a block
+
+        Returns: the tx result (height, code, log, ...) or None on timeout
+        """
+        txhash = txhash.upper()
+        result = self._txs.get(txhash)
+        if result is not None:
+            return result
+        fut = self._tx_waiters.get(txhash)
+        if fut is None:
+            fut = self._tx_waiters[txhash] = asyncio.get_running_loop().create_future()
+        try:
+            return await asyncio.wait_for(asyncio.shield(fut), timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._tx_waiters.pop(txhash, None)
+
+    def _set_connected(self, connected: bool) -> None:
+        self.connected = connected
+        if connected:
+            self._connected_event.set()
+        else:
+            self._connected_event.clear()
+            # wake block waiters so they can fall back to polling
+            self._notify_block()
+
+    def _notify_block(self) -> None:
+        event, self._block_event = self._block_event, asyncio.Event()
+        event.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with websockets.connect(self.url) as ws:
+                    for i, query in enumerate(SUBSCRIPTIONS):
+                        request = {"jsonrpc": "2.0", "method": "subscribe", "id": i, "params": {"query": query}}
+                        await ws.send(json.dumps(request))
+                    logger.info(f"Subscribed to Tendermint events at {self.url}")
+                    self._set_connected(True)
+                    self.reconnect.reset()
+                    async for message in ws:
+                        self.handle_message(json.loads(message))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Tendermint websocket {self.url} unavailable: {e}")
+            self._set_connected(False)
+            await self.reconnect.sleep()
+
+    def handle_message(self, message: Dict[str, Any]) -> None:
+        """Dispatch one JSON-RPC message from the websocket"""
+        result = message.get("result") or {}
+        data = result.get("data")
+        if not data:
+            # subscription acknowledgements and errors carry no event
+            if "error" in message:
+                logger.warning(f"Tendermint subscription error: {message['error']}")
+            return
+        event_type = data.get("type", "")
+        value = data.get("value") or {}
+        if event_type.endswith("/NewBlock"):
+            height = int(value["block"]["header"]["height"])
+            if height > self.height:
+                self.height = height
+                self._notify_block()
+        elif event_type.endswith("/Tx"):
+            tx_result = value.get("TxResult") or {}
+            for txhash in result.get("events", {}).get("tx.hash", []):
+                self._on_tx(txhash.upper(), tx_result)
+
+    def _on_tx(self, txhash: str, tx_result: Dict[str, Any]) -> None:
+        self._txs[txhash] = tx_result
+        while len(self._txs) > MAX_RECENT_TXS:
+            self._txs.popitem(last=False)
+        fut = self._tx_waiters.pop(txhash, None)
+        if fut is not None and not fut.done():
+            fut.set_result(tx_result)
@@ -0,0 +1,186 @@
+"""Report several catalog feeds from one account
+
+Running one `telliot report` per query tag means every process checks the
+same stake, fetches the same token prices and gas fees and, worst of all,
+races the others for the account nonce. `MultiFeedReporter` owns a set of
+datafeeds instead: each cycle it checks staking once, fetches tips and
+values for all feeds concurrently, shares source fetches (a feed's source
+and the profitability check's price feeds are often the same object) and
+gas fees between them, and submits for the most rewarding feed that can be
+reported profitably.
+
+Transactions from one reporter don't need a lock to stay ordered: each is
+built with a nonce handed out by the reporter's `NonceManager`, and a
+transaction that is built but not sent gives its nonce back.
+"""
+import asyncio
+import time
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from eth_abi.exceptions import EncodingTypeError
+from telliot_core.utils.response import error_status
+from telliot_core.utils.response import ResponseStatus
+from web3.types import TxReceipt
+
+from telliot_feeds.datafeed import DataFeed
+from telliot_feeds.datasource import DataSource
+from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.reporters.pipeline import StageTimer
+from telliot_feeds.reporters.tellor_360 import Tellor360Reporter
+from telliot_feeds.reporters.tips.listener.event_listener import sync_event_listener
+from telliot_feeds.reporters.tips.tip_amount import fetch_feed_tip
+from telliot_feeds.reporters.types import GasParams
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class MultiFeedReporter(Tellor360Reporter):
+    """Reports whichever of a set of datafeeds is eligible and most profitable
+
+    Only one value is submitted per cycle: a submission starts the reporter
+    lock, so the rest of the feeds wait for the next cycle anyway.
+    """
+
+    def __init__(self, datafeeds: List[DataFeed[Any]], **kwargs: Any) -> None:
+        kwargs.pop("datafeed", None)
+        super().__init__(**kwargs)
+        self.datafeeds = datafeeds
+        self.qtag_selected = True
+        #: query id -> time of this reporter's last submission for it
+        self.last_reported: Dict[bytes, float] = {}
+        self._fetches: Dict[int, "asyncio.Future[OptionalDataPoint[Any]]"] = {}
+        self._gas_fees: Optional[Tuple[GasParams, ResponseStatus]] = None
+
+    def _reset_cycle(self) -> None:
+        """Drop source values and gas fees fetched in the previous cycle"""
+        for fetch in self._fetches.values():
+            if not fetch.done():
+                fetch.cancel()
+        self._fetches = {}
+        self._gas_fees = None
+
+    def _fetch(self, source: DataSource[Any]) -> "asyncio.Future[OptionalDataPoint[Any]]":
+        """Start fetching a source unless it's already been fetched this cycle"""
+        fetch = self._fetches.get(id(source))
+        if fetch is None:
+            fetch = asyncio.ensure_future(super().fetch_latest(source))
+            self._fetches[id(source)] = fetch
+        return fetch
+
+    async def fetch_latest(self, source: DataSource[Any]) -> OptionalDataPoint[Any]:
+        """Fetch each source at most once per cycle, however many feeds use it"""
+        return await asyncio.shield(self._fetch(source))
+
+    async def update_gas_fees_async(self) -> ResponseStatus:
+        """Fetch gas fees once per cycle and reuse them for every transaction built in it"""
+        if self._gas_fees is not None:
+            fees, status = self._gas_fees
+            self.gas_info = fees.copy()
+            return status
+        status = await super().update_gas_fees_async()
+        if status.ok:
+            self._gas_fees = self.gas_info.copy(), status
+        return status
+
+    async def feed_tip(self, datafeed: DataFeed[Any]) -> int:
+        """Current autopay tip for a feed, or 0 if its query can't be encoded"""
+        try:
+            return await fetch_feed_tip(self.autopay, datafeed)
+        except EncodingTypeError:
+            logger.warning(f"Unable to generate data/id for query: {datafeed.query}")
+            return 0
+
+    async def rank_feeds(self) -> List[Tuple[DataFeed[Any], int]]:
+        """Order feeds by reward, most rewarding first, with their rewards
+
+        Time based rewards are the same whichever feed is reported, so they're
+        fetched once and added to every feed's tip. Ties (and every feed, if
+        rewards aren't checked) go to the feed reported least recently.
+        """
+        if not self.check_rewards:
+            rewards = [0] * len(self.datafeeds)
+        else:
+            # every feed's tip lookup reads the autopay event listener's state, if one is registered
+            await sync_event_listener(self.autopay)
+            *tips, tbr = await asyncio.gather(
+                *[self.feed_tip(feed) for feed in self.datafeeds], self.time_based_rewards()
+            )
+            rewards = [tip + tbr for tip in tips]
+
+        ranked = sorted(
+            zip(self.datafeeds, rewards),
+            key=lambda feed_reward: (-feed_reward[1], self.last_reported.get(feed_reward[0].query.query_id, 0.0)),
+        )
+        for feed, reward in ranked:
+            logger.debug(f"{feed.query.descriptor}: reward {self.to_ether(reward)}")
+        return ranked
+
+    async def report_once(
+        self,
+    ) -> Tuple[Optional[TxReceipt], ResponseStatus]:
+        """Report the most rewarding eligible feed once
+
+        Staking checks run first: while the reporter is locked or can't
+        stake there's nothing worth fetching. Feed tips, every feed's value
+        and token prices are then fetched concurrently, and candidates are
+        tried in order of reward: a feed is skipped if its value can't be
+        fetched, its transaction can't be built or reporting it wouldn't be
+        profitable.
+
+        Transactions are only built once staking checks (which may send
+        approve/deposit transactions) are done. Nonces come from the
+        reporter's `NonceManager`, and a built transaction that isn't sent
+        gives its nonce back.
+        """
+        self._reset_cycle()
+        timer = StageTimer()
+        try:
+            status = await timer.run("staking", self.staking_stage())
+            if not status.ok:
+                return None, status
+
+            ranking = timer.start("rank feeds", self.rank_feeds())
+            for feed in self.datafeeds:
+                self._fetch(feed.source)
+            token_prices = timer.start("token prices", self.fetch_token_prices()) if self.check_rewards else None
+            ranked = await ranking
+            if not ranked:
+                return None, error_status("No datafeeds to report", log=logger.info)
+            prices = await token_prices if token_prices is not None else None
+            for datafeed, reward in ranked:
+                self.datafeed = datafeed
+                self.autopaytip = reward
+                logger.info(f"Trying datafeed: {datafeed.query.descriptor}")
+
+                params, status = await timer.run("datafeed", self.submission_txn_params(datafeed))
+                if not status.ok or params is None:
+                    continue
+
+                build_tx, status = await timer.run(
+                    "build transaction", self.build_transaction_async("submitValue", **params)
+                )
+                if not status.ok or build_tx is None:
+                    continue
+
+                status = await timer.run("profitability", self.ensure_profitable(prices))
+                if not status.ok:
+                    self.nonces.release(build_tx["nonce"])
+                    continue
+
+                logger.debug("Sending submitValue transaction")
+                tx_receipt, status = await timer.run("send", self.sign_n_send_transaction_async(build_tx))
+                if status.ok:
+                    self.last_reported[datafeed.query.query_id] = time.time()
+                return tx_receipt, status
+
+            return None, status
+        finally:
+            timer.cancel_pending()
+            self._reset_cycle()
+            logger.info(f"Report cycle stage timings: {timer.summary()}")
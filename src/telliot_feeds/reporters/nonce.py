@@ -0,0 +1,57 @@
+"""Local account nonce tracking
+
+Reading the account's transaction count before every transaction costs a
+round trip, and when transactions go out back to back (approve, deposit,
+submitValue) the count doesn't include the ones still pending, so they
+would all get the same nonce. `NonceManager` reads the count once and hands
+out the following nonces locally. Whenever local state may be wrong (a send
+failed, a transaction was dropped or replaced, something outside the
+reporter sent from the account) it is reset, and the next nonce is read from
+the chain again.
+"""
+from typing import Optional
+
+
+class NonceManager:
+    """Hands out consecutive nonces for one account"""
+
+    def __init__(self) -> None:
+        self._next: Optional[int] = None
+
+    @property
+    def synced(self) -> bool:
+        """Whether the next nonce is known without asking the chain"""
+        return self._next is not None
+
+    def sync(self, chain_nonce: int) -> None:
+        """Reconcile with the account's pending transaction count
+
+        A higher count means transactions were sent from elsewhere, so
+        local nonces skip ahead. A lower one is ignored: nonces handed out
+        here may not have reached the node yet.
+        """
+        if self._next is None or chain_nonce > self._next:
+            self._next = chain_nonce
+
+    def take(self) -> int:
+        """Reserve the next nonce"""
+        if self._next is None:
+            raise ValueError("Nonce manager must be synced with the chain before taking a nonce")
+        nonce = self._next
+        self._next += 1
+        return nonce
+
+    def release(self, nonce: int) -> None:
+        """Give back a nonce whose transaction won't be sent
+
+        Only the most recent nonce can be reused directly; if later ones were
+        handed out, sending them would leave a gap, so resync instead.
+        """
+        if self._next is not None and nonce == self._next - 1:
+            self._next = nonce
+        else:
+            self.reset()
+
+    def reset(self) -> None:
+        """Forget local state; the next nonce is read from the chain"""
+        self._next = None
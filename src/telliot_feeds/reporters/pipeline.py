@@ -0,0 +1,62 @@
+"""Helpers for running report cycle stages concurrently
+
+A report cycle is a small dependency graph. Nothing is worth doing until
+the staking checks pass, since the reporter is usually in its reporting
+lock. After that, choosing a feed and fetching its value, and token prices
+for the profitability check, don't depend on each other, while building the
+transaction needs the submission params. `StageTimer` runs stages as tasks,
+records how long each took and cancels whatever is still running when the
+cycle ends early, so only stages without side effects should be left
+running at that point.
+"""
+import asyncio
+import time
+from typing import Any
+from typing import Awaitable
+from typing import Dict
+from typing import List
+from typing import TypeVar
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class StageTimer:
+    """Run and time the stages of one report cycle"""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+        self._tasks: List["asyncio.Future[Any]"] = []
+
+    async def run(self, name: str, aw: Awaitable[T]) -> T:
+        """Await a stage and record its duration"""
+        start = time.perf_counter()
+        try:
+            return await aw
+        finally:
+            self.durations[name] = time.perf_counter() - start
+
+    def start(self, name: str, aw: Awaitable[T]) -> "asyncio.Future[T]":
+        """Start a stage in the background; await the returned task for its result"""
+        task = asyncio.ensure_future(self.run(name, aw))
+        self._tasks.append(task)
+        return task
+
+    def cancel_pending(self) -> None:
+        """Cancel background stages whose result is no longer needed"""
+        for task in self._tasks:
+            if not task.done():
+                task.cancel()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def summary(self) -> str:
+        stages = ", ".join(f"{name}: {duration:.2f}s" for name, duration in self.durations.items())
+        return f"{stages} (total: {self.elapsed:.2f}s)"
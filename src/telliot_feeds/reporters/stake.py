@@ -1,17 +1,26 @@
-import time
+import asyncio
 from typing import Any
+from typing import List
 from typing import Optional
 from typing import Tuple
 
+from hexbytes import HexBytes
 from telliot_core.contract.contract import Contract
+from telliot_core.utils.key_helpers import lazy_unlock_account
 from telliot_core.utils.response import error_status
 from telliot_core.utils.response import ResponseStatus
+from web3.types import TxParams
+from web3.types import TxReceipt
 
 from telliot_feeds.reporters.gas import GasFees
+from telliot_feeds.reporters.nonce import NonceManager
 from telliot_feeds.utils.log import get_logger
 
 logger = get_logger(__name__)
 
+#: Gas limit for a deposit queued behind its approval, which can't be estimated until the approval is mined
+QUEUED_DEPOSIT_GAS_LIMIT = 500_000
+
 
 class Stake(GasFees):
     """Stake tokens to tellor oracle"""
@@ -26,11 +35,34 @@ class Stake(GasFees):
         super().__init__(*args, **kwargs)
         self.oracle = oracle
         self.token = token
+        self.nonces = NonceManager()
+
+    async def read_async(self, contract: Contract, func_name: str, **kwargs: Any) -> Tuple[Any, ResponseStatus]:
+        """Read from a contract, through AsyncWeb3 in async web3 mode
+
+        Falls back to telliot_core's blocking `Contract.read` otherwise.
+        """
+        if not self.use_async_web3:
+            result: Tuple[Any, ResponseStatus] = await contract.read(func_name, **kwargs)
+            return result
+        try:
+            contract_function = self.async_contract(contract).get_function_by_name(func_name)
+            output = await contract_function(**kwargs).call()
+            return output, ResponseStatus()
+        except ValueError as e:
+            msg = f"function '{func_name}' not found in contract abi"
+            return None, ResponseStatus(ok=False, e=e, error=msg)
+        except asyncio.TimeoutError as e:
+            msg = "timeout reading from contract"
+            return None, ResponseStatus(ok=False, e=e, error=msg)
+        except Exception as e:
+            msg = "error reading from contract"
+            return None, ResponseStatus(ok=False, e=e, error=msg)
 
     async def get_current_token_balance(self) -> Tuple[Optional[int], ResponseStatus]:
         """Reads the current balance of the account"""
         wallet_balance: int
-        wallet_balance, status = await self.token.read("balanceOf", account=self.acct_address)
+        wallet_balance, status = await self.read_async(self.token, "balanceOf", account=self.acct_address)
         if not status.ok:
             msg = f"Unable to read account balance: {status.error}"
             return None, error_status(msg, status.e, log=logger.error)
@@ -40,8 +72,8 @@ class Stake(GasFees):
 
     async def check_allowance(self, amount: int) -> Tuple[Optional[int], ResponseStatus]:
         """ "Read the spender allowance for the accounts TRB"""
-        allowance, allowance_status = await self.token.read(
-            "allowance", owner=self.acct_address, spender=self.oracle.address
+        allowance, allowance_status = await self.read_async(
+            self.token, "allowance", owner=self.acct_address, spender=self.oracle.address
         )
         if not allowance_status.ok:
             msg = "Unable to check allowance:"
@@ -50,9 +82,146 @@ class Stake(GasFees):
         logger.debug(f"Current allowance: {self.to_ether(allowance):.04f}")
         return allowance, allowance_status
 
+    async def get_acct_nonce_async(self) -> Tuple[Optional[int], ResponseStatus]:
+        """Get the nonce for the account without blocking the event loop"""
+        try:
+            return await self.async_web3.eth.get_transaction_count(self.acct_address, "pending"), ResponseStatus()
+        except ValueError as e:
+            return None, error_status("Account nonce request timed out", e=e, log=logger.warning)
+        except Exception as e:
+            return None, error_status("Unable to retrieve account nonce", e=e, log=logger.error)
+
+    async def next_nonce_async(self) -> Tuple[Optional[int], ResponseStatus]:
+        """Reserve the next account nonce, reading it from the chain only if not tracked locally"""
+        if not self.nonces.synced:
+            nonce, status = await self.get_acct_nonce_async()
+            if nonce is None:
+                return None, status
+            self.nonces.sync(nonce)
+        return self.nonces.take(), ResponseStatus()
+
+    async def send_raw_transaction_async(self, built_tx: Any) -> Tuple[Optional[HexBytes], ResponseStatus]:
+        """Sign and send a built transaction without waiting for it to be mined"""
+        lazy_unlock_account(self.account)
+        tx_signed = self.account.local_account.sign_transaction(built_tx)
+        try:
+            tx_hash = await self.async_web3.eth.send_raw_transaction(tx_signed.raw_transaction)
+        except Exception as e:
+            # nonce too low, replacement underpriced, ...: get back in step with the chain
+            self.nonces.reset()
+            note = "Send transaction failed"
+            return None, error_status(note, log=logger.error, e=e)
+        return tx_hash, ResponseStatus()
+
+    async def wait_for_receipt_async(self, tx_hash: HexBytes) -> Tuple[Optional[TxReceipt], ResponseStatus]:
+        """Await the receipt of a sent transaction
+
+        Receipt polling yields to the event loop, so other feeds and
+        chains keep running while the transaction confirms.
+        """
+        try:
+            tx_receipt = await self.async_web3.eth.wait_for_transaction_receipt(tx_hash, timeout=360)
+
+            tx_url = f"{self.endpoint.explorer}/tx/{tx_hash.hex()}"
+
+            if tx_receipt["status"] == 0:
+                msg = f"Transaction reverted. ({tx_url})"
+                return tx_receipt, error_status(msg, log=logger.error)
+
+            logger.info(f"View transaction: \n{tx_url}")
+            return tx_receipt, ResponseStatus()
+        except Exception as e:
+            # the transaction may have been dropped or replaced
+            self.nonces.reset()
+            note = "Failed to confirm transaction"
+            return None, error_status(note, log=logger.error, e=e)
+
+    async def send_transaction_async(self, built_tx: Any) -> Tuple[Optional[TxReceipt], ResponseStatus]:
+        """Sign and send a built transaction, then await its receipt"""
+        tx_hash, status = await self.send_raw_transaction_async(built_tx)
+        if tx_hash is None:
+            return None, status
+        return await self.wait_for_receipt_async(tx_hash)
+
+    async def send_transactions_async(self, built_txs: List[Any]) -> Tuple[List[TxReceipt], ResponseStatus]:
+        """Send transactions back to back, then await all their receipts
+
+        Transactions must have consecutive nonces. Stops sending at the
+        first failure; receipts of transactions already sent are still
+        awaited.
+        """
+        tx_hashes: List[HexBytes] = []
+        send_status = ResponseStatus()
+        for built_tx in built_txs:
+            tx_hash, send_status = await self.send_raw_transaction_async(built_tx)
+            if tx_hash is None:
+                break
+            tx_hashes.append(tx_hash)
+
+        results = await asyncio.gather(*[self.wait_for_receipt_async(tx_hash) for tx_hash in tx_hashes])
+        receipts = [receipt for receipt, _ in results if receipt is not None]
+        for _, status in results:
+            if not status.ok:
+                return receipts, status
+        return receipts, send_status
+
+    async def build_write_async(
+        self, contract: Contract, func_name: str, gas: Optional[int] = None, **kwargs: Any
+    ) -> Tuple[Optional[TxParams], ResponseStatus]:
+        """Build a contract write transaction with the next account nonce
+
+        Gas fees must already be set with `update_gas_fees_async`. The gas
+        amount is estimated unless given (or set with the gas limit option).
+        """
+        try:
+            contract_function = self.async_contract(contract).get_function_by_name(func_name)(**kwargs)
+        except Exception as e:
+            return None, error_status(f"Error assembling function {func_name}", e, logger.error)
+
+        if gas is None:
+            _, status = await self.estimate_gas_amount_async(contract_function)
+            if not status.ok:
+                return None, error_status(f"Error estimating gas for {func_name}", status.e, logger.error)
+        else:
+            self.set_gas_info({"gas": self.gas_limit or gas})
+
+        nonce, status = await self.next_nonce_async()
+        if nonce is None:
+            return None, status
+
+        try:
+            params = {"from": self.acct_address, "nonce": nonce, "chainId": self.endpoint.chain_id}
+            return await contract_function.build_transaction({**params, **self.get_gas_info()}), ResponseStatus()
+        except Exception as e:
+            self.nonces.release(nonce)
+            return None, error_status(f"Error building {func_name} transaction", e, logger.error)
+
+    async def write_async(
+        self, contract: Contract, func_name: str, **kwargs: Any
+    ) -> Tuple[Optional[TxReceipt], ResponseStatus]:
+        """Async web3 counterpart of telliot_core's `Contract.write`
+
+        Gas fees must already be set with `update_gas_fees_async`.
+        """
+        built_tx, status = await self.build_write_async(contract, func_name, **kwargs)
+        if built_tx is None:
+            return None, status
+        return await self.send_transaction_async(built_tx)
+
     async def approve_spending(self, amount: int) -> Tuple[bool, ResponseStatus]:
         """Approve contract to spend TRB tokens"""
         logger.info(f"Approving {self.oracle.address} token spending: {amount}...")
+        if self.use_async_web3:
+            status = await self.update_gas_fees_async()
+            if not status.ok:
+                return False, error_status("unable to calculate fees for approve txn", e=status.error, log=logger.error)
+            _, approve_status = await self.write_async(
+                self.token, "approve", spender=self.oracle.address, amount=amount
+            )
+            if not approve_status.ok:
+                return False, error_status("Unable to approve staking: ", e=approve_status.error, log=logger.error)
+            return True, approve_status
+
         # calculate and set gas params
         status = self.update_gas_fees()
         if not status.ok:
@@ -67,6 +236,7 @@ class Stake(GasFees):
             amount=amount,
             **fees,
         )
+        self.nonces.reset()
         if not approve_status.ok:
             msg = "Unable to approve staking: "
             return False, error_status(msg, e=approve_status.error, log=logger.error)
@@ -93,13 +263,16 @@ class Stake(GasFees):
         if allowance is None or not allowance_status.ok:
             return False, allowance_status
 
+        if self.use_async_web3:
+            return await self.deposit_stake_async(amount, approve_amount=max(amount - allowance, 0))
+
         # if allowance is less than amount_to_stake then approve
         if allowance < amount:
             approve_receipt, approve_status = await self.approve_spending(amount - allowance)
             if not approve_receipt or not approve_status.ok:
                 return False, approve_status
             # Add this to avoid nonce error from txn happening too fast
-            time.sleep(1)
+            await asyncio.sleep(1)
 
         # deposit stake
         logger.info(f"Now depositing stake: {amount}...")
@@ -114,8 +287,45 @@ class Stake(GasFees):
             _amount=amount,
             **fees,
         )
+        # telliot_core picked the nonce itself
+        self.nonces.reset()
         if not deposit_status.ok:
             msg = "Unable to deposit stake!"
             return False, error_status(msg, e=deposit_status.error, log=logger.error)
         logger.debug(f"Deposit transaction status: {deposit_receipt.status}, block: {deposit_receipt.blockNumber}")
         return True, deposit_status
+
+    async def deposit_stake_async(self, amount: int, approve_amount: int = 0) -> Tuple[bool, ResponseStatus]:
+        """Approve (if needed) and deposit stake without waiting on the approval's receipt
+
+        Both transactions are sent back to back with consecutive nonces and
+        their receipts awaited together, saving a confirmation round trip.
+        """
+        status = await self.update_gas_fees_async()
+        if not status.ok:
+            return False, error_status("unable to calculate fees for deposit txn", e=status.error, log=logger.error)
+
+        built_txs = []
+        if approve_amount > 0:
+            logger.info(f"Approving {self.oracle.address} token spending: {approve_amount}...")
+            approve_tx, status = await self.build_write_async(
+                self.token, "approve", spender=self.oracle.address, amount=approve_amount
+            )
+            if approve_tx is None:
+                return False, error_status("Unable to approve staking: ", e=status.error, log=logger.error)
+            built_txs.append(approve_tx)
+
+        logger.info(f"Now depositing stake: {amount}...")
+        deposit_tx, status = await self.build_write_async(
+            self.oracle, "depositStake", gas=QUEUED_DEPOSIT_GAS_LIMIT if built_txs else None, _amount=amount
+        )
+        if deposit_tx is None:
+            for built_tx in reversed(built_txs):
+                self.nonces.release(built_tx["nonce"])
+            return False, error_status("Unable to deposit stake!", e=status.error, log=logger.error)
+        built_txs.append(deposit_tx)
+
+        receipts, status = await self.send_transactions_async(built_txs)
+        if not status.ok or len(receipts) < len(built_txs):
+            return False, error_status("Unable to deposit stake!", e=status.error, log=logger.error)
+        return True, status
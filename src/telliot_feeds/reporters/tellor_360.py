@@ -19,10 +19,16 @@ from web3.types import TxParams
 from web3.types import TxReceipt
 
 from telliot_feeds.constants import CHAINS_WITH_TBR
+from telliot_feeds.datasource import DataSource
+from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.feeds import DataFeed
 from telliot_feeds.feeds.trb_usd_feed import trb_usd_median_feed
+from telliot_feeds.reporters.pipeline import StageTimer
 from telliot_feeds.reporters.rewards.time_based_rewards import get_time_based_rewards
 from telliot_feeds.reporters.stake import Stake
+from telliot_feeds.reporters.tips.listener.event_listener import AutopayEventListener
+from telliot_feeds.reporters.tips.listener.event_listener import register_event_listener
+from telliot_feeds.reporters.tips.listener.event_listener import sync_event_listener
 from telliot_feeds.reporters.tips.suggest_datafeed import get_feed_and_tip
 from telliot_feeds.reporters.tips.tip_amount import fetch_feed_tip
 from telliot_feeds.reporters.types import GasParams
@@ -30,6 +36,7 @@ from telliot_feeds.reporters.types import StakerInfo
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.reporter_utils import get_native_token_feed
 from telliot_feeds.utils.reporter_utils import has_native_token_funds
+from telliot_feeds.utils.reporter_utils import has_native_token_funds_async
 from telliot_feeds.utils.reporter_utils import is_online
 from telliot_feeds.utils.reporter_utils import suggest_random_feed
 from telliot_feeds.utils.reporter_utils import tkn_symbol
@@ -53,6 +60,7 @@ class Tellor360Reporter(Stake):
         stake: float = 0,
         use_random_feeds: bool = False,
         skip_manual_feeds: bool = False,
+        use_event_listener: bool = False,
         **kwargs: Any,
     ) -> None:
         super().__init__(**kwargs)
@@ -71,6 +79,9 @@ class Tellor360Reporter(Stake):
         self.chain_id = chain_id
         self.acct_addr = to_checksum_address(self.account.address)
         logger.info(f"Reporting with account: {self.acct_addr}")
+        if use_event_listener and check_rewards:
+            # tip lookups for this autopay contract follow event logs instead of polling view functions
+            register_event_listener(AutopayEventListener(autopay, oracle_address=self.oracle.address))
 
     async def get_stake_amount(self) -> Tuple[Optional[int], ResponseStatus]:
         """Reads the current stake amount from the oracle contract
@@ -79,7 +90,7 @@ class Tellor360Reporter(Stake):
         - (int, ResponseStatus) the current stake amount in TellorFlex
         """
         stake_amount: int
-        stake_amount, status = await self.oracle.read("getStakeAmount")
+        stake_amount, status = await self.read_async(self.oracle, "getStakeAmount")
         if not status.ok:
             msg = f"Unable to read current stake amount: {status.error}"
             return None, error_status(msg, status.e, log=logger.error)
@@ -91,7 +102,7 @@ class Tellor360Reporter(Stake):
         Returns:
         - (StakerInfo, ResponseStatus) the staker details for the account
         """
-        response, status = await self.oracle.read("getStakerInfo", _stakerAddress=self.acct_addr)
+        response, status = await self.read_async(self.oracle, "getStakerInfo", _stakerAddress=self.acct_addr)
         if not status.ok:
             msg = f"Unable to read account staker info: {status.error}"
             return None, error_status(msg, status.e, log=logger.error)
@@ -196,16 +207,21 @@ class Tellor360Reporter(Stake):
                 self.autopaytip += await fetch_feed_tip(self.autopay, datafeed)
             except EncodingTypeError:
                 logger.warning(f"Unable to generate data/id for query: {self.datafeed.query}")
+        self.autopaytip += await self.time_based_rewards()
+        return self.autopaytip
+
+    async def time_based_rewards(self) -> int:
+        """Fetches time based rewards, or 0 if ignored or not available on this chain"""
         if self.ignore_tbr:
             logger.info("Ignoring time based rewards")
-            return self.autopaytip
+            return 0
         elif self.chain_id in CHAINS_WITH_TBR:
             logger.info("Fetching time based rewards")
             time_based_rewards = await get_time_based_rewards(self.oracle)
             logger.info(f"Time based rewards: {self.to_ether(time_based_rewards):.04f}")
             if time_based_rewards is not None:
-                self.autopaytip += time_based_rewards
-        return self.autopaytip
+                return time_based_rewards
+        return 0
 
     async def fetch_datafeed(self) -> Optional[DataFeed[Any]]:
         """Fetches datafeed
@@ -245,7 +261,26 @@ class Tellor360Reporter(Stake):
 
         return self.datafeed
 
-    async def ensure_profitable(self) -> ResponseStatus:
+    async def fetch_token_prices(self) -> Tuple[Optional[float], Optional[float]]:
+        """Fetch the native token and TRB prices in USD used by the profitability check"""
+        native_token_feed = get_native_token_feed(self.chain_id)
+        price_feeds = [native_token_feed, trb_usd_median_feed]
+        native_token, trb = await asyncio.gather(*[self.fetch_latest(feed.source) for feed in price_feeds])
+        return native_token[0], trb[0]
+
+    async def fetch_latest(self, source: DataSource[Any]) -> OptionalDataPoint[Any]:
+        """Fetch a new datapoint from a source and return it"""
+        await source.fetch_new_datapoint()
+        return source.latest
+
+    async def ensure_profitable(
+        self, token_prices: Optional[Tuple[Optional[float], Optional[float]]] = None
+    ) -> ResponseStatus:
+        """Check the estimated profit of reporting the current datafeed
+
+        Args:
+        - token_prices: (native token, TRB) USD prices if already fetched
+        """
 
         status = ResponseStatus()
         if not self.check_rewards:
@@ -253,11 +288,9 @@ class Tellor360Reporter(Stake):
 
         tip = self.to_ether(self.autopaytip)
         # Fetch token prices in USD
-        native_token_feed = get_native_token_feed(self.chain_id)
-        price_feeds = [native_token_feed, trb_usd_median_feed]
-        _ = await asyncio.gather(*[feed.source.fetch_new_datapoint() for feed in price_feeds])
-        price_native_token = native_token_feed.source.latest[0]
-        price_trb_usd = trb_usd_median_feed.source.latest[0]
+        if token_prices is None:
+            token_prices = await self.fetch_token_prices()
+        price_native_token, price_trb_usd = token_prices
 
         if price_native_token is None or price_trb_usd is None:
             return error_status("Unable to fetch token price", log=logger.warning)
@@ -306,7 +339,7 @@ class Tellor360Reporter(Stake):
         return status
 
     async def get_num_reports_by_id(self, query_id: bytes) -> Tuple[int, ResponseStatus]:
-        count, read_status = await self.oracle.read(func_name="getNewValueCountbyQueryId", _queryId=query_id)
+        count, read_status = await self.read_async(self.oracle, "getNewValueCountbyQueryId", _queryId=query_id)
         return count, read_status
 
     async def submission_txn_params(self, datafeed: DataFeed[Any]) -> Tuple[Optional[Dict[str, Any]], ResponseStatus]:
@@ -317,8 +350,7 @@ class Tellor360Reporter(Stake):
         Returns a tuple of the web3 function object and a ResponseStatus object
         """
         # Update datafeed value
-        await datafeed.source.fetch_new_datapoint()
-        latest_data = datafeed.source.latest
+        latest_data = await self.fetch_latest(datafeed.source)
         if latest_data[0] is None:
             msg = "Unable to retrieve updated datafeed value."
             return None, error_status(msg, log=logger.info)
@@ -376,7 +408,46 @@ class Tellor360Reporter(Stake):
         if params is None:
             return None, error_status("Error getting transaction parameters", status.e, logger.error)
 
-        return contract_function.build_transaction(params), ResponseStatus()
+        try:
+            return contract_function.build_transaction(params), ResponseStatus()
+        except Exception as e:
+            self.nonces.release(params["nonce"])
+            return None, error_status("Error building transaction", e, logger.error)
+
+    async def build_transaction_async(
+        self, function_name: str, **transaction_params: Any
+    ) -> Tuple[Optional[TxParams], ResponseStatus]:
+        """Non-blocking version of `build_transaction`"""
+        if not self.use_async_web3:
+            return self.build_transaction(function_name, **transaction_params)
+
+        try:
+            contract_function = self.async_contract(self.oracle).get_function_by_name(function_name)(
+                **transaction_params
+            )
+        except Exception as e:
+            return None, error_status("Error building function to estimate gas", e, logger.error)
+
+        # set gas parameters globally
+        status = await self.update_gas_fees_async()
+        logger.debug(status)
+        if not status.ok:
+            return None, error_status("Error setting gas parameters", status.e, logger.error)
+
+        _, status = await self.estimate_gas_amount_async(contract_function)
+        if not status.ok:
+            return None, error_status(f"Error estimating gas for function: {contract_function}", status.e, logger.error)
+
+        params, status = await self.tx_params_async(**self.get_gas_info())
+        logger.debug(f"Transaction parameters: {params}")
+        if params is None:
+            return None, error_status("Error getting transaction parameters", status.e, logger.error)
+
+        try:
+            return await contract_function.build_transaction(params), ResponseStatus()
+        except Exception as e:
+            self.nonces.release(params["nonce"])
+            return None, error_status("Error building transaction", e, logger.error)
 
     def sign_n_send_transaction(self, built_tx: Any) -> Tuple[Optional[TxReceipt], ResponseStatus]:
         """Send a signed transaction to the blockchain and wait for confirmation
@@ -392,6 +463,7 @@ class Tellor360Reporter(Stake):
         try:
             tx_hash = self.web3.eth.send_raw_transaction(tx_signed.raw_transaction)
         except Exception as e:
+            self.nonces.reset()
             note = "Send transaction failed"
             return None, error_status(note, log=logger.error, e=e)
 
@@ -408,21 +480,54 @@ class Tellor360Reporter(Stake):
             logger.info(f"View reported data: \n{tx_url}")
             return tx_receipt, ResponseStatus()
         except Exception as e:
+            self.nonces.reset()
             note = "Failed to confirm transaction"
             return None, error_status(note, log=logger.error, e=e)
 
+    async def sign_n_send_transaction_async(self, built_tx: Any) -> Tuple[Optional[TxReceipt], ResponseStatus]:
+        """Non-blocking version of `sign_n_send_transaction`
+
+        The receipt is awaited instead of blocking for up to six minutes,
+        so the event loop stays free while the transaction confirms.
+        """
+        if not self.use_async_web3:
+            return self.sign_n_send_transaction(built_tx)
+        return await self.send_transaction_async(built_tx)
+
     def get_acct_nonce(self) -> Tuple[Optional[int], ResponseStatus]:
         """Get the nonce for the account"""
         try:
-            return self.web3.eth.get_transaction_count(self.acct_address), ResponseStatus()
+            return self.web3.eth.get_transaction_count(self.acct_address, "pending"), ResponseStatus()
         except ValueError as e:
             return None, error_status("Account nonce request timed out", e=e, log=logger.warning)
         except Exception as e:
             return None, error_status("Unable to retrieve account nonce", e=e, log=logger.error)
 
+    def next_nonce(self) -> Tuple[Optional[int], ResponseStatus]:
+        """Reserve the next account nonce, reading it from the chain only if not tracked locally"""
+        if not self.nonces.synced:
+            nonce, status = self.get_acct_nonce()
+            if nonce is None:
+                return None, status
+            self.nonces.sync(nonce)
+        return self.nonces.take(), ResponseStatus()
+
     def tx_params(self, **gas_fees: GasParams) -> Tuple[Optional[Dict[str, Any]], ResponseStatus]:
         """Return transaction parameters"""
-        nonce, status = self.get_acct_nonce()
+        nonce, status = self.next_nonce()
+        if nonce is None:
+            return None, status
+        return {
+            "nonce": nonce,
+            "chainId": self.chain_id,
+            **gas_fees,
+        }, ResponseStatus()
+
+    async def tx_params_async(self, **gas_fees: GasParams) -> Tuple[Optional[Dict[str, Any]], ResponseStatus]:
+        """Non-blocking version of `tx_params`"""
+        if not self.use_async_web3:
+            return self.tx_params(**gas_fees)
+        nonce, status = await self.next_nonce_async()
         if nonce is None:
             return None, status
         return {
@@ -436,23 +541,26 @@ class Tellor360Reporter(Stake):
         of at least min_native_token_balance that is set in the cli"""
         return has_native_token_funds(self.acct_addr, self.web3, min_balance=self.min_native_token_balance)
 
-    async def report_once(
-        self,
-    ) -> Tuple[Optional[TxReceipt], ResponseStatus]:
-        """Report query value once
-        This method checks to see if a user is able to submit
-        values to the oracle, given their staker status
-        and last submission time. Also, this method does not
-        submit values if doing so won't make a profit."""
-        # Check staker status
+    async def has_native_token_async(self) -> bool:
+        """Non-blocking version of `has_native_token`"""
+        if not self.use_async_web3:
+            return self.has_native_token()
+        return await has_native_token_funds_async(
+            self.acct_addr, self.async_web3, min_balance=self.min_native_token_balance
+        )
+
+    async def staking_stage(self) -> ResponseStatus:
+        """Check staker status and reporter lock"""
         staked, status = await self.ensure_staked()
         if not staked or not status.ok:
-            return None, status
+            return status
 
-        status = await self.check_reporter_lock()
-        if not status.ok:
-            return None, status
+        return await self.check_reporter_lock()
 
+    async def datafeed_stage(self) -> Tuple[Optional[Dict[str, Any]], ResponseStatus]:
+        """Choose a datafeed and assemble its submitValue params"""
+        # tip lookups in this cycle read the autopay event listener's state, if one is registered
+        await sync_event_listener(self.autopay)
         # Get suggested datafeed if none provided
         datafeed = await self.fetch_datafeed()
         if not datafeed:
@@ -462,24 +570,60 @@ class Tellor360Reporter(Stake):
         params, status = await self.submission_txn_params(datafeed)
         if not status.ok or params is None:
             return None, status
+        return params, status
 
-        build_tx, status = self.build_transaction("submitValue", **params)
-        if not status.ok or build_tx is None:
-            return None, status
-
-        # Check if profitable if not YOLO
-        status = await self.ensure_profitable()
-        logger.debug(f"Ensure profitibility method status: {status}")
-        if not status.ok:
-            return None, status
-
-        logger.debug("Sending submitValue transaction")
-        tx_receipt, status = self.sign_n_send_transaction(build_tx)
-        # reset datafeed for a new suggestion if qtag wasn't selected in cli
-        if self.qtag_selected is False:
-            self.datafeed = None
+    async def report_once(
+        self,
+    ) -> Tuple[Optional[TxReceipt], ResponseStatus]:
+        """Report query value once
+        This method checks to see if a user is able to submit
+        values to the oracle, given their staker status
+        and last submission time. Also, this method does not
+        submit values if doing so won't make a profit.
 
-        return tx_receipt, status
+        Staking checks come first: the reporter is usually in its reporting
+        lock, and then there is nothing else to do this cycle. Once it may
+        report, choosing and fetching the datafeed runs concurrently with
+        fetching token prices for the profitability check. The transaction is
+        built once the submission params are ready.
+        """
+        timer = StageTimer()
+        try:
+            status = await timer.run("staking", self.staking_stage())
+            if not status.ok:
+                return None, status
+
+            datafeed = timer.start("datafeed", self.datafeed_stage())
+            token_prices = timer.start("token prices", self.fetch_token_prices()) if self.check_rewards else None
+            params, status = await datafeed
+            if not status.ok or params is None:
+                return None, status
+
+            build_tx, status = await timer.run(
+                "build transaction", self.build_transaction_async("submitValue", **params)
+            )
+            if not status.ok or build_tx is None:
+                return None, status
+
+            # Check if profitable if not YOLO
+            prices = await token_prices if token_prices is not None else None
+            status = await timer.run("profitability", self.ensure_profitable(prices))
+            logger.debug(f"Ensure profitibility method status: {status}")
+            if not status.ok:
+                # the transaction won't be sent, so its nonce is free again
+                self.nonces.release(build_tx["nonce"])
+                return None, status
+
+            logger.debug("Sending submitValue transaction")
+            tx_receipt, status = await timer.run("send", self.sign_n_send_transaction_async(build_tx))
+            # reset datafeed for a new suggestion if qtag wasn't selected in cli
+            if self.qtag_selected is False:
+                self.datafeed = None
+
+            return tx_receipt, status
+        finally:
+            timer.cancel_pending()
+            logger.info(f"Report cycle stage timings: {timer.summary()}")
 
     async def is_online(self) -> bool:
         return await is_online()
@@ -489,7 +633,7 @@ class Tellor360Reporter(Stake):
 
         while report_count is None or report_count > 0:
             if await self.is_online():
-                if self.has_native_token():
+                if await self.has_native_token_async():
                     _, _ = await self.report_once()
             else:
                 logger.warning("Unable to connect to the internet!")
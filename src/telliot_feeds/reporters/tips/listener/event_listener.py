@@ -0,0 +1,454 @@
+"""Follow Autopay and Oracle event logs to keep tip state in memory
+
+Polling `getFundedFeedDetails`, `getFundedSingleTipsInfo` and the per-query
+multicalls every loop re-reads state that rarely changes. The
+`AutopayEventListener` seeds an `AutopayState` from those view functions
+once, then applies only new `NewDataFeed`, `DataFeedFunded`, `TipClaimed`,
+`TipAdded`, `NewReport` and `ValueRemoved` logs fetched with `eth_getLogs`.
+
+Logs up to `confirmations` blocks behind the head are applied to the
+confirmed state and checkpointed. The unconfirmed tail is re-read on every
+sync and applied to a copy, so a reorg within the confirmation depth can't
+leave stale events behind.
+"""
+import copy
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Mapping
+from typing import Optional
+
+from eth_utils import event_abi_to_log_topic
+from eth_utils import to_checksum_address
+from hexbytes import HexBytes
+from telliot_core.tellor.tellorflex.autopay import TellorFlexAutopayContract
+from telliot_core.utils.response import error_status
+from telliot_core.utils.response import ResponseStatus
+from web3 import AsyncHTTPProvider
+from web3 import AsyncWeb3
+from web3 import Web3
+
+from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
+from telliot_feeds.reporters.tips.listener.funded_feeds_filter import FundedFeedFilter
+from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.query_search_utils import feed_in_feed_builder_mapping
+from telliot_feeds.utils.query_search_utils import qtype_name_in_registry
+
+
+logger = get_logger(__name__)
+
+#: Blocks behind the head before a log is treated as final
+DEFAULT_CONFIRMATIONS = 3
+
+#: Max blocks requested per eth_getLogs call
+DEFAULT_MAX_BLOCK_RANGE = 2_000
+
+#: Seconds after a report during which it can be disputed; older report times are dropped
+DISPUTE_WINDOW = 43_200
+
+
+def _event_abi(name: str, inputs: list[tuple[str, str, bool]]) -> dict[str, Any]:
+    return {
+        "anonymous": False,
+        "name": name,
+        "type": "event",
+        "inputs": [{"name": n, "type": t, "indexed": i} for n, t, i in inputs],
+    }
+
+
+_FEED_DETAILS = {
+    "name": "_feedDetails",
+    "type": "tuple",
+    "indexed": False,
+    "components": [
+        {"name": n, "type": "uint256"}
+        for n in (
+            "reward",
+            "balance",
+            "startTime",
+            "interval",
+            "window",
+            "priceThreshold",
+            "rewardIncreasePerSecond",
+            "feedsWithFundingIndex",
+        )
+    ],
+}
+
+_data_feed_funded = _event_abi(
+    "DataFeedFunded",
+    [("_queryId", "bytes32", True), ("_feedId", "bytes32", True), ("_amount", "uint256", True)],
+)
+_data_feed_funded["inputs"] += [{"name": "_feedFunder", "type": "address", "indexed": False}, _FEED_DETAILS]
+
+#: Autopay events the listener follows
+AUTOPAY_EVENTS_ABI = [
+    _data_feed_funded,
+    _event_abi(
+        "NewDataFeed",
+        [
+            ("_queryId", "bytes32", True),
+            ("_feedId", "bytes32", True),
+            ("_queryData", "bytes", False),
+            ("_feedCreator", "address", False),
+        ],
+    ),
+    _event_abi(
+        "TipAdded",
+        [
+            ("_queryId", "bytes32", True),
+            ("_amount", "uint256", True),
+            ("_queryData", "bytes", False),
+            ("_tipper", "address", False),
+        ],
+    ),
+    _event_abi(
+        "TipClaimed",
+        [
+            ("_feedId", "bytes32", True),
+            ("_queryId", "bytes32", True),
+            ("_amount", "uint256", True),
+            ("_reporter", "address", False),
+        ],
+    ),
+]
+
+_NEW_REPORT_INPUTS = [
+    ("_queryId", "bytes32", True),
+    ("_time", "uint256", True),
+    ("_value", "bytes", False),
+    ("_nonce", "uint256", False),
+    ("_queryData", "bytes", False),
+    ("_reporter", "address", True),
+]
+
+#: Oracle events the listener follows; TellorFlex indexes NewReport topics, TellorPlayground doesn't
+ORACLE_EVENTS_ABI = [
+    _event_abi("NewReport", _NEW_REPORT_INPUTS),
+    _event_abi("ValueRemoved", [("_queryId", "bytes32", False), ("_timestamp", "uint256", False)]),
+]
+_UNINDEXED_NEW_REPORT_ABI = _event_abi("NewReport", [(n, t, False) for n, t, _ in _NEW_REPORT_INPUTS])
+
+
+@dataclass
+class FeedState:
+    query_id: bytes
+    query_data: Optional[bytes]
+    details: FeedDetails
+
+
+@dataclass
+class OneTimeTip:
+    """Latest entry of a query id's tips array"""
+
+    query_data: bytes
+    amount: int
+    timestamp: int
+
+
+@dataclass
+class AutopayState:
+    """In-memory model of autopay funding and the oracle reports that consume it"""
+
+    feeds: dict[bytes, FeedState] = field(default_factory=dict)
+    tips: dict[bytes, OneTimeTip] = field(default_factory=dict)
+    #: undisputed report timestamps per query id, pruned to the dispute window
+    report_times: dict[bytes, list[int]] = field(default_factory=dict)
+    #: set when a feed's query data is unknown and the state must be re-seeded
+    stale: bool = False
+
+    def latest_report(self, query_id: bytes) -> int:
+        times = self.report_times.get(query_id)
+        return times[-1] if times else 0
+
+    def current_tip(self, query_id: bytes) -> int:
+        """Same result as Autopay.getCurrentTip"""
+        tip = self.tips.get(query_id)
+        if tip is None or self.latest_report(query_id) >= tip.timestamp:
+            return 0
+        return tip.amount
+
+    def on_new_data_feed(self, query_id: bytes, feed_id: bytes, query_data: bytes) -> None:
+        feed = self.feeds.get(feed_id)
+        if feed is None:
+            self.feeds[feed_id] = FeedState(
+                query_id=query_id, query_data=query_data, details=FeedDetails(0, 0, 0, 0, 0, 0, 0)
+            )
+        else:
+            feed.query_data = query_data
+
+    def on_data_feed_funded(self, query_id: bytes, feed_id: bytes, details: FeedDetails) -> None:
+        feed = self.feeds.get(feed_id)
+        if feed is None:
+            # feed was set up before the listener was seeded and wasn't funded then
+            self.feeds[feed_id] = FeedState(query_id=query_id, query_data=None, details=details)
+            self.stale = True
+        else:
+            feed.details = details
+
+    def on_tip_claimed(self, feed_id: bytes, amount: int) -> None:
+        feed = self.feeds.get(feed_id)
+        if feed is not None:
+            feed.details.balance = max(feed.details.balance - amount, 0)
+
+    def on_tip_added(self, query_id: bytes, amount: int, query_data: bytes, timestamp: int) -> None:
+        tip = self.tips.get(query_id)
+        if tip is not None and self.latest_report(query_id) < tip.timestamp:
+            # previous tip is still unclaimed by a report; Autopay adds to it
+            tip.amount += amount
+            tip.timestamp = timestamp
+        else:
+            self.tips[query_id] = OneTimeTip(query_data=query_data, amount=amount, timestamp=timestamp)
+
+    def on_new_report(self, query_id: bytes, timestamp: int) -> None:
+        times = self.report_times.setdefault(query_id, [])
+        if not times or times[-1] < timestamp:
+            times.append(timestamp)
+        elif timestamp not in times:
+            times.append(timestamp)
+            times.sort()
+        # keep the latest report plus anything that could still be disputed
+        cutoff = times[-1] - DISPUTE_WINDOW
+        while len(times) > 1 and times[0] < cutoff:
+            times.pop(0)
+
+    def on_value_removed(self, query_id: bytes, timestamp: int) -> None:
+        times = self.report_times.get(query_id)
+        if times and timestamp in times:
+            times.remove(timestamp)
+
+    def funded_feeds(self) -> list[QueryIdandFeedDetails]:
+        """Funded feeds with telliot support, like FundedFeeds.get_funded_feed_queries"""
+        return [
+            QueryIdandFeedDetails(
+                params=copy.copy(feed.details),
+                feed_id=feed_id,
+                query_id=feed.query_id,
+                query_data=feed.query_data,
+            )
+            for feed_id, feed in self.feeds.items()
+            if feed.details.balance > 0 and feed.query_data and feed_in_feed_builder_mapping(feed.query_data)
+        ]
+
+    def feeds_for_query(self, query_id: bytes) -> list[QueryIdandFeedDetails]:
+        """Funded feeds of one query id, like getCurrentFeeds followed by getDataFeed"""
+        return [
+            QueryIdandFeedDetails(
+                params=copy.copy(feed.details),
+                feed_id=feed_id,
+                query_id=feed.query_id,
+                query_data=feed.query_data or b"",
+            )
+            for feed_id, feed in self.feeds.items()
+            if feed.query_id == query_id and feed.details.balance > 0
+        ]
+
+    def one_time_tips(self) -> Optional[dict[bytes, int]]:
+        """Current one time tips with telliot support, like get_funded_one_time_tips"""
+        tips = {
+            tip.query_data: amount
+            for query_id, tip in self.tips.items()
+            if (amount := self.current_tip(query_id)) > 0 and tip.query_data and qtype_name_in_registry(tip.query_data)
+        }
+        return tips or None
+
+
+class AutopayEventListener:
+    """Keep an `AutopayState` in sync with the chain from event logs"""
+
+    def __init__(
+        self,
+        autopay: TellorFlexAutopayContract,
+        oracle_address: Optional[str] = None,
+        confirmations: int = DEFAULT_CONFIRMATIONS,
+        max_block_range: int = DEFAULT_MAX_BLOCK_RANGE,
+        web3: Optional[AsyncWeb3[Any]] = None,
+    ) -> None:
+        self.autopay = autopay
+        self.oracle_address = to_checksum_address(oracle_address) if oracle_address else None
+        self.confirmations = confirmations
+        self.max_block_range = max_block_range
+        self.web3 = web3 if web3 is not None else AsyncWeb3(AsyncHTTPProvider(autopay.node.url))
+        #: state including the unconfirmed tail; what callers should read
+        self.state = AutopayState()
+        self._confirmed = AutopayState()
+        #: last block applied to the confirmed state
+        self.checkpoint: Optional[int] = None
+        #: whether the last sync succeeded; tip lookups fall back to view functions if not
+        self.healthy = False
+        self._events = self._event_decoders()
+        self._block_timestamps: dict[int, int] = {}
+
+    @staticmethod
+    def _event_decoders() -> dict[tuple[bytes, int], Any]:
+        """Map (topic0, topic count) to the contract event that decodes it"""
+        w3 = Web3()
+        decoders: dict[tuple[bytes, int], Any] = {}
+        for abi in AUTOPAY_EVENTS_ABI + ORACLE_EVENTS_ABI + [_UNINDEXED_NEW_REPORT_ABI]:
+            topic_count = 1 + len([i for i in abi["inputs"] if i["indexed"]])
+            event = w3.eth.contract(abi=[abi]).events[abi["name"]]()
+            topic = bytes(event_abi_to_log_topic(abi))  # type: ignore[arg-type]
+            decoders[(topic, topic_count)] = event
+        return decoders
+
+    @property
+    def synced(self) -> bool:
+        return self.checkpoint is not None
+
+    async def seed(self, block: int) -> None:
+        """Load funded feeds and one time tips from view functions at a block"""
+        contract = self.web3.eth.contract(address=self.autopay.address, abi=self.autopay.abi)
+        if self.oracle_address is None:
+            self.oracle_address = to_checksum_address(await contract.functions.tellor().call())
+        funded = await contract.functions.getFundedFeedDetails().call(block_identifier=block)
+        single_tips = await contract.functions.getFundedSingleTipsInfo().call(block_identifier=block)
+        seed_time = await self._block_timestamp(block)
+
+        state = AutopayState()
+        feeds = FundedFeedFilter().generate_ids(
+            [
+                QueryIdandFeedDetails(params=FeedDetails(*details), query_data=query_data)
+                for details, query_data in funded
+            ]
+        )
+        for feed in feeds:
+            state.feeds[feed.feed_id] = FeedState(
+                query_id=feed.query_id, query_data=feed.query_data, details=feed.params
+            )
+        for query_data, amount in single_tips:
+            if amount > 0:
+                query_id = bytes(Web3.keccak(query_data))
+                state.tips[query_id] = OneTimeTip(query_data=query_data, amount=amount, timestamp=seed_time)
+
+        self._confirmed = state
+        self.checkpoint = block
+        logger.info(f"Seeded autopay listener at block {block}: {len(feeds)} funded feeds, {len(state.tips)} tips")
+
+    async def _block_timestamp(self, block: int) -> int:
+        timestamp = self._block_timestamps.get(block)
+        if timestamp is None:
+            timestamp = (await self.web3.eth.get_block(block))["timestamp"]
+            self._block_timestamps[block] = timestamp
+        return timestamp
+
+    async def _get_logs(self, from_block: int, to_block: int) -> list[Any]:
+        """Fetch followed logs in block ranges of at most max_block_range"""
+        assert self.oracle_address is not None
+        topics = list({HexBytes(topic) for topic, _ in self._events})
+        logs: list[Any] = []
+        start = from_block
+        while start <= to_block:
+            end = min(start + self.max_block_range - 1, to_block)
+            logs += await self.web3.eth.get_logs(
+                {
+                    "address": [self.autopay.address, self.oracle_address],
+                    "fromBlock": start,
+                    "toBlock": end,
+                    "topics": [topics],
+                }
+            )
+            start = end + 1
+        return sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"]))
+
+    async def apply_logs(self, state: AutopayState, logs: list[Any]) -> None:
+        """Apply decoded logs to a state in chain order"""
+        for log in logs:
+            event = self._events.get((bytes(log["topics"][0]), len(log["topics"])))
+            if event is None:
+                continue
+            decoded = event.process_log(log)
+            name, args = decoded["event"], decoded["args"]
+            if name == "NewDataFeed":
+                state.on_new_data_feed(args["_queryId"], args["_feedId"], args["_queryData"])
+            elif name == "DataFeedFunded":
+                details = args["_feedDetails"]
+                # web3 decodes named struct components to a mapping
+                details = FeedDetails(**details) if isinstance(details, Mapping) else FeedDetails(*details)
+                state.on_data_feed_funded(args["_queryId"], args["_feedId"], details)
+            elif name == "TipClaimed":
+                state.on_tip_claimed(args["_feedId"], args["_amount"])
+            elif name == "TipAdded":
+                timestamp = await self._block_timestamp(log["blockNumber"])
+                state.on_tip_added(args["_queryId"], args["_amount"], args["_queryData"], timestamp)
+            elif name == "NewReport":
+                state.on_new_report(args["_queryId"], args["_time"])
+            elif name == "ValueRemoved":
+                state.on_value_removed(args["_queryId"], args["_timestamp"])
+
+    async def sync(self) -> ResponseStatus:
+        """Apply logs emitted since the last sync
+
+        Logs are applied to copies of the state, which replace the current
+        ones together with the checkpoint once every log has been applied.
+
+        Returns:
+            ResponseStatus; on failure (or cancellation) the previous state is kept
+        """
+        # lookups fall back to view functions unless this sync completes
+        self.healthy = False
+        try:
+            head = await self.web3.eth.block_number
+            safe_head = max(head - self.confirmations, 0)
+            if self.checkpoint is None or self._confirmed.stale or self.checkpoint > safe_head:
+                await self.seed(safe_head)
+            confirmed, checkpoint = self._confirmed, self.checkpoint
+            assert checkpoint is not None
+
+            if safe_head > checkpoint:
+                logs = await self._get_logs(checkpoint + 1, safe_head)
+                confirmed = copy.deepcopy(confirmed)
+                await self.apply_logs(confirmed, logs)
+                checkpoint = safe_head
+                logger.debug(f"Applied {len(logs)} confirmed autopay logs up to block {safe_head}")
+
+            state = copy.deepcopy(confirmed)
+            if head > checkpoint:
+                await self.apply_logs(state, await self._get_logs(checkpoint + 1, head))
+        except Exception as e:
+            return error_status("Unable to sync autopay event listener", e=e, log=logger.warning)
+
+        # no awaits from here on, so the state and checkpoint change together
+        self._confirmed, self.checkpoint, self.state = confirmed, checkpoint, state
+        # don't let the block timestamp cache grow without bound
+        self._block_timestamps = {b: t for b, t in self._block_timestamps.items() if b > checkpoint}
+        self.healthy = True
+        return ResponseStatus()
+
+
+_listeners: dict[tuple[Optional[int], str], AutopayEventListener] = {}
+
+
+def _listener_key(autopay: TellorFlexAutopayContract) -> tuple[Optional[int], str]:
+    return getattr(autopay.node, "chain_id", None), autopay.address
+
+
+def register_event_listener(listener: AutopayEventListener) -> None:
+    """Make tip lookups for the listener's autopay contract use its state"""
+    _listeners[_listener_key(listener.autopay)] = listener
+
+
+def get_event_listener(autopay: TellorFlexAutopayContract) -> Optional[AutopayEventListener]:
+    return _listeners.get(_listener_key(autopay))
+
+
+async def sync_event_listener(autopay: TellorFlexAutopayContract) -> Optional[ResponseStatus]:
+    """Bring the registered listener for an autopay contract up to date
+
+    Reporters call this once per report cycle; tip lookups in the cycle
+    then read the synced state through `synced_event_listener`.
+
+    Returns:
+        The sync's ResponseStatus, or None if no listener is registered
+    """
+    listener = get_event_listener(autopay)
+    if listener is None:
+        return None
+    return await listener.sync()
+
+
+def synced_event_listener(autopay: TellorFlexAutopayContract) -> Optional[AutopayEventListener]:
+    """Return the registered listener for an autopay contract if its last sync
+    succeeded, or None if there is none or it couldn't be synced"""
+    listener = get_event_listener(autopay)
+    return listener if listener is not None and listener.healthy else None
@@ -0,0 +1,201 @@
+"""Incrementally synced index of autopay report history and reward claim status
+
+Tip suggestion needs, for every funded query id, the reports of the past
+month and whether the tips for them have been claimed. Rather than pull the
+whole month with `getMultipleValuesBefore` on every loop, `FundedFeedIndex`
+seeds each query id's history once and afterwards only requests reports
+from the still-disputable tail onwards. Timestamps whose reward is known to
+be claimed are never checked again.
+"""
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Optional
+
+from telliot_core.tellor.tellorflex.autopay import TellorFlexAutopayContract
+from telliot_core.utils.response import error_status
+from telliot_core.utils.response import ResponseStatus
+
+from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import Values
+from telliot_feeds.reporters.tips.multicall_functions.multicall_autopay import MulticallAutopay
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Seconds after a report during which it can still be disputed (and removed);
+#: reports this recent are refetched on every sync
+DISPUTE_WINDOW = 43_200
+
+#: Max values requested per query id
+MAX_COUNT = 40_000
+
+
+@dataclass
+class QueryReports:
+    """Reports seen for one query id, oldest first"""
+
+    values: list[Values] = field(default_factory=list)
+    #: now_timestamp of the last successful sync
+    synced_at: int = 0
+
+
+class FundedFeedIndex:
+    """Per-autopay cache of query id reports and claimed reward timestamps"""
+
+    def __init__(self, dispute_window: int = DISPUTE_WINDOW) -> None:
+        self.dispute_window = dispute_window
+        self.reports: dict[bytes, QueryReports] = {}
+        self.claimed: dict[tuple[bytes, bytes], set[int]] = {}
+
+    def _sync_start(self, query_id: bytes, now_timestamp: int, month_old_timestamp: int) -> Optional[int]:
+        """Timestamp after which reports for a query id must be (re)fetched, None for a full seed"""
+        reports = self.reports.get(query_id)
+        if reports is None or reports.synced_at > now_timestamp:
+            return None
+        start = min(reports.synced_at - 1, now_timestamp - self.dispute_window)
+        if start <= month_old_timestamp:
+            return None
+        return start
+
+    async def sync_reports(
+        self,
+        call: MulticallAutopay,
+        feeds: list[QueryIdandFeedDetails],
+        now_timestamp: int,
+        month_old_timestamp: int,
+    ) -> tuple[Optional[list[QueryIdandFeedDetails]], ResponseStatus]:
+        """Bring every feed's query id history up to date and fill in the feeds
+
+        Drop-in replacement for `MulticallAutopay.month_of_timestamps_and_values`:
+        sets current_queryid_value, current_value_timestamp and
+        queryid_timestamps_values_list on each feed.
+        """
+        starts = {
+            qid: self._sync_start(qid, now_timestamp, month_old_timestamp) for qid in {feed.query_id for feed in feeds}
+        }
+        calls = [
+            call.get_multiple_values_before(
+                query_id=qid,
+                now_timestamp=now_timestamp,
+                # a full seed keeps the original month_old_timestamp argument
+                max_age=month_old_timestamp if start is None else now_timestamp - start,
+                max_count=MAX_COUNT,
+            )
+            for qid, start in starts.items()
+        ]
+        if not len(calls):
+            return None, error_status("Unable to assemble getMultipleValues Call object")
+
+        multiple_values_response, status = await call.multi_call(calls)
+
+        if not status.ok:
+            return None, status
+
+        if not multiple_values_response:
+            return None, error_status("No response returned from getMultipleValuesBefore batch multicall")
+
+        fetched: dict[bytes, list[Values]] = {}
+        for qid in starts:
+            values_tup = ("values_array", qid)
+            timestamps_tup = ("timestamps_array", qid)
+            if values_tup not in multiple_values_response:
+                note = f"values_tup not in multiple_values_response: ('values_array', 0x{qid.hex()})"
+                return None, error_status(note)
+            if timestamps_tup not in multiple_values_response:
+                note = f"timestamps_tup not in multiple_values_response: ('timestamps_array', 0x{qid.hex()})"
+                return None, error_status(note)
+            values = multiple_values_response[values_tup]
+            # short circuit since None means failed response and can't calculate tip accurately
+            if values is None:
+                note = "getMultipleValuesBefore call failed"
+                return None, error_status(note)
+            timestamps = multiple_values_response[timestamps_tup] or []
+            fetched[qid] = list(map(Values, values, timestamps))
+
+        # only update the index once every response is known to be valid
+        for qid, new_values in fetched.items():
+            start = starts[qid]
+            kept = [] if start is None else [v for v in self.reports[qid].values if v.timestamp <= start]
+            self.reports[qid] = QueryReports(
+                values=[v for v in kept + new_values if v.timestamp > month_old_timestamp],
+                synced_at=now_timestamp,
+            )
+        self._prune_claimed(month_old_timestamp)
+
+        seeded = sum(start is None for start in starts.values())
+        logger.debug(f"Synced reports for {len(starts)} query ids ({seeded} seeded, {len(starts) - seeded} delta)")
+
+        for feed in feeds:
+            values_list = [v for v in self.reports[feed.query_id].values if v.timestamp >= feed.params.startTime]
+            feed.current_value_timestamp = values_list[-1].timestamp if values_list else 0
+            feed.current_queryid_value = values_list[-1].value if values_list else b""
+            feed.queryid_timestamps_values_list = values_list
+
+        return feeds, status
+
+    def _prune_claimed(self, month_old_timestamp: int) -> None:
+        for key, timestamps in list(self.claimed.items()):
+            timestamps.difference_update([ts for ts in timestamps if ts <= month_old_timestamp])
+            if not timestamps:
+                del self.claimed[key]
+
+    async def unclaimed_counts(
+        self, call: MulticallAutopay, feeds: list[QueryIdandFeedDetails]
+    ) -> tuple[Optional[dict[tuple[bytes, bytes], int]], ResponseStatus]:
+        """Count each feed's unclaimed eligible timestamps
+
+        Drop-in replacement for `MulticallAutopay.rewards_claimed_status_call`
+        that only asks the contract about timestamps not already known to be claimed.
+        """
+        counts: dict[tuple[bytes, bytes], int] = {}
+        to_check: dict[tuple[bytes, bytes], list[int]] = {}
+        for feed in feeds:
+            if not feed.queryid_timestamps_values_list:
+                continue
+            key = (feed.feed_id, feed.query_id)
+            claimed = self.claimed.get(key, set())
+            counts[key] = 0
+            timestamps = [v.timestamp for v in feed.queryid_timestamps_values_list if v.timestamp not in claimed]
+            if timestamps:
+                to_check[key] = timestamps
+
+        if not counts:
+            return None, error_status("No getRewardClaimStatusList Calls to assemble")
+        if not to_check:
+            return counts, ResponseStatus()
+
+        calls = [
+            call.get_reward_claimed_status(feed_id, qid, timestamps) for (feed_id, qid), timestamps in to_check.items()
+        ]
+        reward_claimed_status_resp, status = await call.multi_call(calls, success=True)
+
+        if not status.ok:
+            return None, status
+
+        if not reward_claimed_status_resp:
+            return None, error_status("No response returned from getRewardClaimStatusList batch multicall")
+
+        for key, timestamps in to_check.items():
+            claim_statuses = reward_claimed_status_resp.get(key)
+            if claim_statuses is None:
+                del counts[key]
+                continue
+            self.claimed.setdefault(key, set()).update(
+                ts for ts, is_claimed in zip(timestamps, claim_statuses) if is_claimed
+            )
+            counts[key] = len([is_claimed for is_claimed in claim_statuses if is_claimed is not True])
+
+        return counts, status
+
+
+_indexes: dict[tuple[Optional[int], str], FundedFeedIndex] = {}
+
+
+def get_funded_feed_index(autopay: TellorFlexAutopayContract) -> FundedFeedIndex:
+    """Return the process-wide index for an autopay contract"""
+    key = (getattr(autopay.node, "chain_id", None), autopay.address)
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = FundedFeedIndex()
+    return index
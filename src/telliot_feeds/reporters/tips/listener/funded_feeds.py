@@ -10,6 +10,9 @@ from telliot_core.utils.timestamp import TimeStamp
 
 from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
 from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
+from telliot_feeds.reporters.tips.listener.event_listener import synced_event_listener
+from telliot_feeds.reporters.tips.listener.funded_feed_index import FundedFeedIndex
+from telliot_feeds.reporters.tips.listener.funded_feed_index import get_funded_feed_index
 from telliot_feeds.reporters.tips.listener.funded_feeds_filter import FundedFeedFilter
 from telliot_feeds.reporters.tips.multicall_functions.multicall_autopay import MulticallAutopay
 from telliot_feeds.utils.log import get_logger
@@ -22,9 +25,16 @@ logger = get_logger(__name__)
 class FundedFeeds(FundedFeedFilter):
     """Fetch Feeds from autopay and filter"""
 
-    def __init__(self, autopay: TellorFlexAutopayContract, multi_call: MulticallAutopay) -> None:
+    def __init__(
+        self,
+        autopay: TellorFlexAutopayContract,
+        multi_call: MulticallAutopay,
+        index: Optional[FundedFeedIndex] = None,
+    ) -> None:
         self.multi_call = multi_call
         self.autopay = self.multi_call.autopay = autopay
+        # report history and claim status carried over between calls
+        self.index = index if index is not None else get_funded_feed_index(autopay)
 
     async def get_funded_feed_queries(self) -> tuple[Optional[list[QueryIdandFeedDetails]], ResponseStatus]:
         """Call getFundedFeedDetails autopay function filter response data
@@ -32,6 +42,13 @@ class FundedFeeds(FundedFeedFilter):
         Return: list of tuples of only feed_details and query data
         that exist in telliot registry
         """
+        listener = synced_event_listener(self.autopay)
+        if listener is not None:
+            listener_feeds = listener.state.funded_feeds()
+            if not listener_feeds:
+                return None, error_status(note="No funded feeds with telliot support found in autopay")
+            return listener_feeds, ResponseStatus()
+
         funded_feeds: list[tuple[FeedDetails, bytes]]
         funded_feeds, status = await self.autopay.read("getFundedFeedDetails")
 
@@ -65,9 +82,12 @@ class FundedFeeds(FundedFeedFilter):
         # assemble both feed id and query id
         qtype_supported_feeds = self.generate_ids(feeds=qtype_supported_feeds)
 
-        # make the first multicall and values and timestamps for the past month
-        feeds_timestsamps_and_values_lis, status = await self.multi_call.month_of_timestamps_and_values(
-            feeds=qtype_supported_feeds, now_timestamp=now_timestamp, max_age=month_old_timestamp, max_count=40_000
+        # values and timestamps for the past month; only new reports are fetched once seeded
+        feeds_timestsamps_and_values_lis, status = await self.index.sync_reports(
+            call=self.multi_call,
+            feeds=qtype_supported_feeds,
+            now_timestamp=now_timestamp,
+            month_old_timestamp=month_old_timestamp,
         )
 
         if not status.ok or not feeds_timestsamps_and_values_lis:
@@ -82,9 +102,9 @@ class FundedFeeds(FundedFeedFilter):
             feeds=feeds_timestsamps_and_values_filtered
         )
 
-        # get claim status count for every query ids eligible timestamp
-        reward_claimed_status, status = await self.multi_call.rewards_claimed_status_call(
-            feeds=historical_timestamps_list_filtered
+        # get unclaimed count for every query ids eligible timestamp not already known to be claimed
+        reward_claimed_status, status = await self.index.unclaimed_counts(
+            call=self.multi_call, feeds=historical_timestamps_list_filtered
         )
 
         if reward_claimed_status is None:
@@ -1,18 +1,19 @@
+import itertools
 import math
 from typing import Optional
 
+import numpy as np
+import numpy.typing as npt
 from eth_abi import encode
 from telliot_core.utils.response import error_status
 from web3 import Web3 as w3
 
 from telliot_feeds.feeds import CATALOG_FEEDS
-from telliot_feeds.feeds import DATAFEED_BUILDER_MAPPING
 from telliot_feeds.reporters.tips import TYPES_WITH_GENERIC_SOURCE
 from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
 from telliot_feeds.utils.log import get_logger
-from telliot_feeds.utils.query_search_utils import decode_typ_name
+from telliot_feeds.utils.query_search_utils import decoded_query
 from telliot_feeds.utils.query_search_utils import get_query_from_qtyp_name
-from telliot_feeds.utils.query_search_utils import qtag_from_query_catalog
 from telliot_feeds.utils.query_search_utils import query_from_query_catalog
 
 logger = get_logger(__name__)
@@ -81,17 +82,18 @@ class FundedFeedFilter:
 
         Returns: float
         """
+        decoded = decoded_query(query_data)
         query_id = bytes(w3.keccak(query_data))
         query_entry = query_from_query_catalog(qid=query_id.hex())
         if query_entry is not None:
             query = query_entry.query
-            datafeed = CATALOG_FEEDS.get(query_entry.tag)
+            datafeed = decoded.catalog_feed
             if datafeed is None:
                 logger.info(f"{query_entry.tag} not found in telliot CATALOG_FEEDS needed for priceThreshold check")
                 return None
         else:
-            qtype_name = decode_typ_name(query_data)
-            datafeed = DATAFEED_BUILDER_MAPPING.get(qtype_name) if qtype_name in TYPES_WITH_GENERIC_SOURCE else None
+            qtype_name = decoded.qtype_name
+            datafeed = decoded.builder_feed if qtype_name in TYPES_WITH_GENERIC_SOURCE else None
             if datafeed is None:
                 logger.info(f"No API source found for {query_id.hex()} to check priceThreshold")
                 return None
@@ -145,32 +147,48 @@ class FundedFeedFilter:
             # in case a query id has has none or too few to compare
             if len(feed.queryid_timestamps_values_list) < 2:
                 continue
-            for current, previous in zip(
-                feed.queryid_timestamps_values_list[::-1], feed.queryid_timestamps_values_list[-2::-1]
-            ):
-                in_eligibile_window = self.is_timestamp_first_in_window(
-                    timestamp_before=previous.timestamp,
-                    timestamp_to_check=current.timestamp,
-                    feed_start_timestamp=feed.params.startTime,
-                    feed_window=feed.params.window,
-                    feed_interval=feed.params.interval,
-                )
-                if not in_eligibile_window:
-                    if feed.params.priceThreshold == 0:
-                        feed.queryid_timestamps_values_list.remove(current)
-                    else:
-                        try:
-                            previous_value = int(int(previous.value.hex(), 16) / 1e18)
-                        except ValueError:
-                            _ = error_status("Error decoding current query id value")
-                            continue
+            keep = self.historical_submissions_mask(feed)
+            feed.queryid_timestamps_values_list = list(itertools.compress(feed.queryid_timestamps_values_list, keep))
 
-                        price_change = _get_price_change(previous_val=previous_value, current_val=current.value)
+        return feeds
 
-                        if price_change < feed.params.priceThreshold:
-                            feed.queryid_timestamps_values_list.remove(current)
+    def historical_submissions_mask(self, feed: QueryIdandFeedDetails) -> npt.NDArray[np.bool_]:
+        """Flag which of a feed's past submissions could have earned a tip
 
-        return feeds
+        Each submission is compared with the one reported right before it,
+        using the same rules as `is_timestamp_first_in_window` and
+        `_get_price_change`, for the whole history at once.
+        The oldest submission has nothing to compare to and is always kept.
+
+        Returns: boolean array, one entry per queryid_timestamps_values_list item
+        """
+        values_list = feed.queryid_timestamps_values_list
+        timestamps = np.fromiter((v.timestamp for v in values_list), dtype=np.int64, count=len(values_list))
+        current, previous = timestamps[1:], timestamps[:-1]
+
+        num_intervals = (current - feed.params.startTime) // feed.params.interval
+        current_window_start = feed.params.startTime + feed.params.interval * num_intervals
+        in_eligible_window = (current - current_window_start < feed.params.window) & (previous < current_window_start)
+
+        keep = np.ones(len(values_list), dtype=np.bool_)
+        if feed.params.priceThreshold == 0:
+            keep[1:] = in_eligible_window
+            return keep
+
+        # decode every value once; a submission next to an empty value can't be compared, so it's kept
+        decoded = np.fromiter(
+            (_decode_uint_value(v.value) for v in values_list), dtype=np.float64, count=len(values_list)
+        )
+        previous_values, current_values = decoded[:-1], decoded[1:]
+        undecodable = np.isnan(previous_values) | np.isnan(current_values)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            price_change = np.where(
+                previous_values == 0,
+                10000,
+                np.trunc(10000 * np.abs(current_values - previous_values) / previous_values),
+            )
+        keep[1:] = in_eligible_window | undecodable | (price_change >= feed.params.priceThreshold)
+        return keep
 
     def calculate_true_feed_balance(
         self, feeds: list[QueryIdandFeedDetails], unclaimed_timestamps_count: dict[tuple[bytes, bytes], int]
@@ -183,16 +201,16 @@ class FundedFeedFilter:
 
         Returns: list of feeds
         """
-        for feed in list(feeds):
-            key = (feed.feed_id, feed.query_id)
-            if key not in unclaimed_timestamps_count:
-                continue
-            unclaimed_count = unclaimed_timestamps_count[key]
-            feed.params.balance -= feed.params.reward * unclaimed_count
-            # if remaining balance is zero filter out the feed from the list
-            if feed.params.balance <= 0:
-                feeds.remove(feed)
-        return feeds
+        funded = []
+        for feed in feeds:
+            unclaimed_count = unclaimed_timestamps_count.get((feed.feed_id, feed.query_id))
+            if unclaimed_count is not None:
+                feed.params.balance -= feed.params.reward * unclaimed_count
+                # if remaining balance is zero filter out the feed from the list
+                if feed.params.balance <= 0:
+                    continue
+            funded.append(feed)
+        return funded
 
     async def window_and_priceThreshold_unmet_filter(
         self, feeds: list[QueryIdandFeedDetails], now_timestamp: int
@@ -238,8 +256,9 @@ class FundedFeedFilter:
 
             if price_threshold != 0 and not in_eligible_window:
                 # See if query type has API source to check price threshold
-                if qtag_from_query_catalog(qid=feed.query_id.hex()) not in CATALOG_FEEDS:
-                    qtype = decode_typ_name(feed.query_data)
+                decoded = decoded_query(feed.query_data)
+                if decoded.catalog_tag not in CATALOG_FEEDS:
+                    qtype = decoded.qtype_name
                     if qtype not in TYPES_WITH_GENERIC_SOURCE:
                         logger.info(f"No auto source for feed with query type {qtype} to check threshold")
                         feeds.remove(feed)
@@ -277,3 +296,10 @@ def _get_price_change(previous_val: float, current_val: float) -> int:
         price_change = int((10000 * (previous_val - current_val)) / previous_val)
 
     return price_change
+
+
+def _decode_uint_value(value: bytes) -> float:
+    """Decode a reported uint256 value with 18 decimals, truncated to a whole number; nan if empty"""
+    if not value:
+        return math.nan
+    return float(int(int.from_bytes(value, "big") / 1e18))
@@ -3,6 +3,7 @@ from typing import Optional
 
 from telliot_core.tellor.tellorflex.autopay import TellorFlexAutopayContract
 
+from telliot_feeds.reporters.tips.listener.event_listener import synced_event_listener
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.query_search_utils import qtype_name_in_registry
 
@@ -15,6 +16,13 @@ async def get_funded_one_time_tips(autopay: TellorFlexAutopayContract) -> Option
     Return: list of tuples of only query data and tips
     that exist in telliot registry
     """
+    listener = synced_event_listener(autopay)
+    if listener is not None:
+        single_tips = listener.state.one_time_tips()
+        if not single_tips:
+            logger.info("No one time tip funded queries available")
+        return single_tips
+
     onetime_tips: Optional[list[tuple[bytes, int]]]
     onetime_tips, status = await autopay.read("getFundedSingleTipsInfo")
 
@@ -22,14 +30,8 @@ async def get_funded_one_time_tips(autopay: TellorFlexAutopayContract) -> Option
         logger.info("No one time tip funded queries available")
         return None
 
-    for (query_data, reward) in list(onetime_tips):
-        if query_data == b"":
-            onetime_tips.remove((query_data, reward))
-            continue
-
-        if not qtype_name_in_registry(query_data):
-            onetime_tips.remove((query_data, reward))
-
-    single_tips = {query_data: reward for (query_data, reward) in onetime_tips}
+    single_tips = {
+        query_data: reward for (query_data, reward) in onetime_tips if query_data and qtype_name_in_registry(query_data)
+    }
 
     return single_tips
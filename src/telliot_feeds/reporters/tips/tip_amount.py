@@ -7,6 +7,8 @@ from telliot_core.utils.timestamp import TimeStamp
 
 from telliot_feeds.datafeed import DataFeed
 from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
+from telliot_feeds.reporters.tips.listener.event_listener import synced_event_listener
+from telliot_feeds.reporters.tips.listener.funded_feed_index import get_funded_feed_index
 from telliot_feeds.reporters.tips.listener.funded_feeds_filter import FundedFeedFilter
 from telliot_feeds.reporters.tips.multicall_functions.multicall_autopay import MulticallAutopay
 from telliot_feeds.utils.log import get_logger
@@ -30,23 +32,36 @@ async def fetch_feed_tip(
     call.autopay = autopay
     month_old = int(timestamp - 2_592_000)
     tip_amount: int = 0
-
-    # get tip amount for one time tip if available
-    one_time_tip, status = await autopay.get_current_tip(query_id=datafeed.query.query_id)
-
-    if status.ok:
-        tip_amount += one_time_tip
-
-    # make the first batch call of getCurrentFeeds, getDataBefore, getTimestampbyQueryIdandIndex
-    results, status = await call.currentfeeds_multiple_values_before(
-        datafeed=datafeed, now_timestamp=timestamp, month_old_timestamp=month_old
-    )
-
-    if not status.ok or not results:
-        return tip_amount
-
-    # get query id timestamps list and feed ids datafeed
-    timestamps_list_and_datafeed, status = await call.timestamp_datafeed(results)
+    index = get_funded_feed_index(autopay)
+    listener = synced_event_listener(autopay)
+
+    timestamps_list_and_datafeed: Optional[List[QueryIdandFeedDetails]]
+    if listener is not None:
+        # one time tip and the query's feeds come from the event listener's state
+        tip_amount += listener.state.current_tip(datafeed.query.query_id)
+        query_feeds = listener.state.feeds_for_query(datafeed.query.query_id)
+        if not query_feeds:
+            return tip_amount
+        timestamps_list_and_datafeed, status = await index.sync_reports(
+            call=call, feeds=query_feeds, now_timestamp=timestamp, month_old_timestamp=month_old
+        )
+    else:
+        # get tip amount for one time tip if available
+        one_time_tip, status = await autopay.get_current_tip(query_id=datafeed.query.query_id)
+
+        if status.ok:
+            tip_amount += one_time_tip
+
+        # make the first batch call of getCurrentFeeds, getDataBefore, getTimestampbyQueryIdandIndex
+        results, status = await call.currentfeeds_multiple_values_before(
+            datafeed=datafeed, now_timestamp=timestamp, month_old_timestamp=month_old
+        )
+
+        if not status.ok or not results:
+            return tip_amount
+
+        # get query id timestamps list and feed ids datafeed
+        timestamps_list_and_datafeed, status = await call.timestamp_datafeed(results)
 
     if not status.ok or not timestamps_list_and_datafeed:
         return tip_amount
@@ -61,7 +76,7 @@ async def fetch_feed_tip(
     # filter out query id timestamps not eligible for tip
     feeds_with_timestamps_filtered = filtr.filter_historical_submissions(eligible_feeds)
 
-    unclaimed_count, status = await call.rewards_claimed_status_call(feeds_with_timestamps_filtered)
+    unclaimed_count, status = await index.unclaimed_counts(call, feeds_with_timestamps_filtered)
 
     if not unclaimed_count:
         tip_amount += tip_sum(feeds_with_timestamps_filtered)
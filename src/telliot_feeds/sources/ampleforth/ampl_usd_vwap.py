@@ -12,7 +12,6 @@ from typing import Tuple
 from typing import TypeVar
 
 import requests
-from telliot_core.apps.telliot_config import TelliotConfig
 from telliot_core.utils.response import ResponseStatus
 
 from telliot_feeds.datasource import DataSource
@@ -20,7 +19,9 @@ from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.sources.ampleforth.bitfinex import get_value_from_bitfinex
 from telliot_feeds.sources.ampleforth.symbols import SYMBOLS
+from telliot_feeds.utils.http_sessions import pooled_session
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.shared_config import get_config
 
 
 logger = get_logger(__name__)
@@ -48,7 +49,7 @@ async def get_float_from_api(
 ) -> OptionalDataPoint[float]:
     """Helper function for retrieving datapoint values."""
 
-    with requests.Session() as s:
+    with pooled_session(url) as s:
         try:
             r = None
             if headers:
@@ -118,9 +119,9 @@ class BraveNewCoinSource(DataSource[float]):
     async def get_bearer_token(self) -> Tuple[Optional[str], ResponseStatus]:
         """Get authorization token for using bravenewcoin api."""
 
-        with requests.Session() as s:
+        url = "https://bravenewcoin.p.rapidapi.com/oauth/token"
+        with pooled_session(url) as s:
             try:
-                url = "https://bravenewcoin.p.rapidapi.com/oauth/token"
 
                 payload = """{\r
                     \"audience\": \"https://api.bravenewcoin.com\",\r
@@ -189,7 +190,7 @@ class AmpleforthCustomSpotPriceSource(DataSource[float]):
     sources: List[DataSource[float]] = field(default_factory=list)
 
     def __post_init__(self) -> None:
-        keys = TelliotConfig().api_keys
+        keys = get_config().api_keys
         self.sources = [
             BitfinexSource(),
             BraveNewCoinSource(api_key=keys.find("bravenewcoin")[0].key),
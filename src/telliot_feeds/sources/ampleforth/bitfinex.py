@@ -1,11 +1,27 @@
-"""Bitfinex data source."""
+"""Bitfinex data source.
+
+Trades of each route (trading pair) are summed into fixed-size time
+buckets. The VWAP via an intermediate currency pairs each bucket of the
+first leg with the latest bucket of the second leg at or before it.
+
+Trade pages are summed into NumPy arrays as they arrive rather than kept as
+lists, and each route's buckets are kept between calls: buckets that had
+ended when they were fetched don't change, so only trades from the latest
+partial bucket on are requested again.
+"""
 import asyncio
+import itertools
 import logging
 import time
+from dataclasses import dataclass
+from dataclasses import field
 from typing import Any
+from typing import Optional
 
-import requests
+import numpy as np
+import numpy.typing as npt
 
+from telliot_feeds.pricing.async_http import async_http_transport
 from telliot_feeds.sources.ampleforth.symbols import SYMBOLS
 
 
@@ -15,149 +31,299 @@ logger = logging.getLogger(__name__)
 THOUSAND_MIN = 1000 * 60  # original JS names this variable "TEN_MINUTES"
 NO_TRADES_FOUND = "No trades found"
 
+#: Trades per page (the most Bitfinex returns); a full page means there are more
+PAGE_LIMIT = 10000
+
+#: Seconds to wait between pages when scrolling (rate-limit: 30 req/min)
+SCROLL_DELAY = 2
+
+#: Retries after a rate-limit error
+MAX_RETRIES = 3
+
+#: Most (route, start) pairs whose buckets are kept
+MAX_CACHED_ROUTES = 32
+
+
+def _empty(dtype: Any) -> Any:
+    return field(default_factory=lambda: np.empty(0, dtype=dtype))
+
+
+@dataclass
+class Buckets:
+    """Trade sums per bucket of one route, sorted by slot
+
+    Slot `n` holds the trades from `start + n * bucket_size` up to the next slot.
+    """
+
+    slots: npt.NDArray[np.int64] = _empty(np.int64)
+    #: timestamp of the first trade in each bucket
+    timestamps: npt.NDArray[np.int64] = _empty(np.int64)
+    #: sum of abs(amount * price)
+    trades: npt.NDArray[np.float64] = _empty(np.float64)
+    #: sum of abs(amount)
+    volume: npt.NDArray[np.float64] = _empty(np.float64)
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    @classmethod
+    def from_trades(cls, start: int, trades: npt.NDArray[np.float64], bucket_size: int = THOUSAND_MIN) -> "Buckets":
+        """Bucket trade rows of [id, timestamp, amount, price], sorted by timestamp"""
+        if not len(trades):
+            return cls()
+        timestamps = trades[:, 1].astype(np.int64)
+        slots, first, inverse = np.unique((timestamps - start) // bucket_size, return_index=True, return_inverse=True)
+        amount, price = trades[:, 2], trades[:, 3]
+        notional = np.zeros(len(slots))
+        np.add.at(notional, inverse, np.abs(amount * price))
+        volume = np.zeros(len(slots))
+        np.add.at(volume, inverse, np.abs(amount))
+        return cls(slots, timestamps[first], notional, volume)
+
+    def merge(self, other: "Buckets") -> "Buckets":
+        """Buckets of both sets of trades"""
+        if not len(other):
+            return self
+        if not len(self):
+            return other
+        slots = np.union1d(self.slots, other.slots)
+        merged = Buckets(slots, np.full(len(slots), np.iinfo(np.int64).max), np.zeros(len(slots)), np.zeros(len(slots)))
+        for buckets in (self, other):
+            i = np.searchsorted(slots, buckets.slots)
+            merged.timestamps[i] = np.minimum(merged.timestamps[i], buckets.timestamps)
+            merged.trades[i] += buckets.trades
+            merged.volume[i] += buckets.volume
+        return merged
+
+    def split(self, slot: int) -> tuple["Buckets", "Buckets"]:
+        """Buckets before a slot, and the rest"""
+        i = int(np.searchsorted(self.slots, slot))
+        head = Buckets(self.slots[:i], self.timestamps[:i], self.trades[:i], self.volume[:i])
+        tail = Buckets(self.slots[i:], self.timestamps[i:], self.trades[i:], self.volume[i:])
+        return head, tail
+
+    @property
+    def vwap(self) -> npt.NDArray[np.float64]:
+        """VWAP of each bucket, 0 for buckets without volume"""
+        traded = (self.trades != 0) & (self.volume != 0)
+        return np.divide(self.trades, self.volume, out=np.zeros(len(self.slots)), where=traded)
+
+    def as_dict(self) -> dict[int, dict[str, Any]]:
+        """Buckets by slot, as returned by `build_buckets`"""
+        return {
+            slot: {"timestamp": ts, "trades": trades, "volume": volume, "vwap": vwap}
+            for slot, ts, trades, volume, vwap in zip(
+                self.slots.tolist(),
+                self.timestamps.tolist(),
+                self.trades.tolist(),
+                self.volume.tolist(),
+                self.vwap.tolist(),
+            )
+        }
 
-def build_buckets(start: int, a_list: list[list[int]], bucket_size: int = THOUSAND_MIN) -> dict[int, dict[str, Any]]:
-    """Build buckets for VWAP calculation."""
-    vwap_per_slot: dict[int, dict[str, Any]] = {}
-    for i in a_list:
-        slot = (i[1] - start) // bucket_size
-        amount = float(i[2])
-        price = float(i[3])
-
-        vwap_bucket = vwap_per_slot.get(slot)
-        if vwap_bucket:
-            vwap_bucket["trades"] += abs(amount * price)
-            vwap_bucket["volume"] += abs(amount)
-        else:
-            vwap_bucket = {"timestamp": i[1], "trades": abs(amount * price), "volume": abs(amount)}
-            vwap_per_slot[slot] = vwap_bucket
 
-    for vwap_bucket in vwap_per_slot.values():
-        if vwap_bucket["trades"] == 0 or vwap_bucket["volume"] == 0:
-            vwap_bucket["vwap"] = 0
-        else:
-            vwap_bucket["vwap"] = vwap_bucket["trades"] / vwap_bucket["volume"]
+def trade_array(trades: list[list[Any]]) -> npt.NDArray[np.float64]:
+    """Trade rows of [id, timestamp, amount, price] as an array"""
+    rows = itertools.chain.from_iterable(trades)
+    return np.fromiter(rows, dtype=np.float64, count=4 * len(trades)).reshape(-1, 4)
 
-    return vwap_per_slot
 
+def build_buckets(start: int, a_list: list[list[int]], bucket_size: int = THOUSAND_MIN) -> dict[int, dict[str, Any]]:
+    """Build buckets for VWAP calculation."""
+    return Buckets.from_trades(start, trade_array(a_list), bucket_size).as_dict()
 
-def merge_as_list(from_map: dict[int, dict[str, Any]], to_map: dict[int, dict[str, Any]]) -> list[dict[str, Any]]:
-    """Merge two maps into a list of trades."""
-    merged: list[dict[str, Any]] = []
-    for slot, from_slot in from_map.items():
-        s = slot
-        to_slot = None
-        while not to_slot:
-            if s < 0:
-                break
-            to_slot = to_map.get(s)
-            s = s - 1
-        if to_slot:
-            merged.append(
-                {
-                    "trades": abs((to_slot["vwap"] * from_slot["vwap"]) * from_slot["volume"]),
-                    "volume": from_slot["volume"],
-                }
-            )
-    return merged
+
+def merge_buckets(from_buckets: Buckets, to_buckets: Buckets) -> tuple[float, float]:
+    """Sum of trades and volume of the first leg, priced via the latest bucket of the second leg"""
+    i = np.searchsorted(to_buckets.slots, from_buckets.slots, side="right") - 1
+    matched = i >= 0
+    to_vwap = to_buckets.vwap[i[matched]]
+    from_vwap, from_volume = from_buckets.vwap[matched], from_buckets.volume[matched]
+    return float(np.abs(to_vwap * from_vwap * from_volume).sum()), float(from_volume.sum())
 
 
 def volume_weighted_average_price(start: int, from_list: list[list[int]], to_list: list[list[int]]) -> dict[str, Any]:
     """Calculate volume weighted average price."""
-    from_map = build_buckets(start, from_list)
-    to_map = build_buckets(start, to_list)
-    merged_list = merge_as_list(from_map, to_map)
-    sum_amount_and_prices = sum([m["trades"] for m in merged_list])
-    sum_volume = sum([m["volume"] for m in merged_list])
+    from_buckets = Buckets.from_trades(start, trade_array(from_list))
+    to_buckets = Buckets.from_trades(start, trade_array(to_list))
+    sum_amount_and_prices, sum_volume = merge_buckets(from_buckets, to_buckets)
     return {"vwap": sum_amount_and_prices / sum_volume, "volume": sum_volume}
 
 
-def retrieve_bitfinex_trades(route: str, start: int, end: int, retry_count: int = 0) -> Any:
-    """Retrieve trades from Bitfinex API."""
-    # rate-limit: 30 req/min
-    max_retries = 3
-    url = f"https://api-pub.bitfinex.com/v2/trades/{route}/hist?limit=10000&sort=1&start={start}&end={end}"
-    try:
-        response = requests.get(url)
-    except Exception as e:
-        logger.error(f"Error when retrieving Bitfinex trades for {route}: {e}")
-        return []
-
-    # convert response
-    all_trades = response.json()
-
-    # Check for API error responses (e.g., ["error", 11010, "ratelimit: error"])
-    if isinstance(all_trades, list) and len(all_trades) > 0 and all_trades[0] == "error":
-        error_code = all_trades[1] if len(all_trades) > 1 else "unknown"
-        error_msg = all_trades[2] if len(all_trades) > 2 else "unknown"
-        logger.warning(f"Bitfinex API error for {route}: {error_code} - {error_msg}")
+async def retrieve_trade_page(route: str, start: int, end: int) -> Optional[list[list[float]]]:
+    """Retrieve a page of trades from Bitfinex API, oldest first; None if it couldn't be fetched."""
+    url = f"https://api-pub.bitfinex.com/v2/trades/{route}/hist?limit={PAGE_LIMIT}&sort=1&start={start}&end={end}"
+    for retry_count in range(MAX_RETRIES + 1):
+        d = await async_http_transport.get_json(url, timeout=10)
+        if "error" in d:
+            rate_limited = d["error"] == "HTTP Error 429" or "11010" in str(d["exception"])
+            logger.warning(f"Error when retrieving Bitfinex trades for {route}: {d['error']}: {d['exception']}")
+        else:
+            trades = d["response"]
+            # Check for API error responses (e.g., ["error", 11010, "ratelimit: error"])
+            if not (isinstance(trades, list) and len(trades) > 0 and trades[0] == "error"):
+                break
+            error_code = trades[1] if len(trades) > 1 else "unknown"
+            error_msg = trades[2] if len(trades) > 2 else "unknown"
+            rate_limited = error_code == 11010
+            logger.warning(f"Bitfinex API error for {route}: {error_code} - {error_msg}")
 
         # Retry on rate limit errors
-        if error_code == 11010 and retry_count < max_retries:
-            wait_time = 2**retry_count  # Exponential backoff: 1s, 2s, 4s
-            logger.info(f"Rate limited, waiting {wait_time}s before retry {retry_count + 1}/{max_retries}")
-            time.sleep(wait_time)
-            return retrieve_bitfinex_trades(route, start, end, retry_count + 1)
-        return []
-
-    if not all_trades:
-        logger.warning(f"Could not get Bitfinex trades for {route}")
-        return []
-
+        if not rate_limited or retry_count == MAX_RETRIES:
+            return None
+        wait_time = 2**retry_count  # Exponential backoff: 1s, 2s, 4s
+        logger.info(f"Rate limited, waiting {wait_time}s before retry {retry_count + 1}/{MAX_RETRIES}")
+        await asyncio.sleep(wait_time)
+
+    if not isinstance(trades, list):
+        logger.error(f"Unexpected response format from Bitfinex for {route}: {str(trades)[:100]}")
+        return None
     # Validate that we got actual trade data (each trade should be a list of numbers)
-    if not isinstance(all_trades[0], list):
-        logger.error(f"Unexpected response format from Bitfinex for {route}: {all_trades[:100]}")
-        return []
-
-    if len(all_trades) >= 10000:
-        logger.warning(f"Bitfinex response too big, scrolling: {route} ({start} - {end})")
-        last_timestamp = all_trades[-1][1]
+    if trades and not isinstance(trades[0], list):
+        logger.error(f"Unexpected response format from Bitfinex for {route}: {trades[:100]}")
+        return None
+    return trades
+
+
+async def retrieve_bitfinex_buckets(
+    route: str, start: int, end: int, origin: int, bucket_size: int = THOUSAND_MIN
+) -> Optional[Buckets]:
+    """Retrieve trades between start and end from Bitfinex API, bucketed from origin.
+
+    Pages are bucketed as they arrive. Each page starts at the last
+    timestamp of the one before, so trades at that timestamp are skipped
+    if they were already counted.
+    """
+    buckets = Buckets()
+    page_start = start
+    counted: set[float] = set()
+    n_trades = 0
+    while True:
+        page = await retrieve_trade_page(route, page_start, end)
+        if page is None:
+            return None
+        trades = trade_array(page)
+        if counted:
+            trades = trades[~np.isin(trades[:, 0], list(counted))]
+        buckets = buckets.merge(Buckets.from_trades(origin, trades, bucket_size))
+        n_trades += len(trades)
+        if len(page) < PAGE_LIMIT:
+            break
+
+        logger.warning(f"Bitfinex response too big, scrolling: {route} ({page_start} - {end})")
+        last_timestamp = int(page[-1][1])
+        if last_timestamp == page_start and not len(trades):
+            # a full page of trades at one timestamp, all counted already
+            last_timestamp += 1
+        at_last = {trade[0] for trade in page if trade[1] == last_timestamp}
+        counted = counted | at_last if last_timestamp == page_start else at_last
+        page_start = last_timestamp
         # Add delay to avoid rate limiting when scrolling (30 req/min limit)
-        time.sleep(2)
-        next_frame = retrieve_bitfinex_trades(route, last_timestamp, end)
-        all_trades.extend(next_frame)
-    logger.info(f"Bitfinex trades for {route}: {len(all_trades)}")
-    return all_trades
-
+        await asyncio.sleep(SCROLL_DELAY)
 
-def calculate_all_single_via(symbol: dict[str, Any], start: int, end: int, show_debug: bool) -> dict[str, Any]:
+    if not n_trades:
+        logger.warning(f"Could not get Bitfinex trades for {route}")
+    logger.info(f"Bitfinex trades for {route}: {n_trades}")
+    return buckets
+
+
+class RouteBuckets:
+    """Buckets of one route's trades from a start time, kept between calls"""
+
+    def __init__(self, route: str, start: int, bucket_size: int = THOUSAND_MIN) -> None:
+        self.route = route
+        self.start = start
+        self.bucket_size = bucket_size
+        #: buckets that had ended by covered_until
+        self.final = Buckets()
+        #: the bucket still open at covered_until
+        self.partial = Buckets()
+        #: every trade up to this timestamp is in final or partial
+        self.covered_until: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+    def slot(self, timestamp: int) -> int:
+        return (timestamp - self.start) // self.bucket_size
+
+    async def update(self, end: int) -> Optional[Buckets]:
+        """Buckets of the trades from start to end; None if trades couldn't be fetched"""
+        async with self._lock:
+            if self.covered_until == end:
+                return self.final.merge(self.partial)
+
+            # a bucket has ended by time t if its slot is before slot(t + 1)
+            reused_until = 0
+            if self.covered_until is not None:
+                reused_until = max(min(self.slot(end + 1), self.slot(self.covered_until + 1)), 0)
+            reused, _ = self.final.split(reused_until)
+            fetch_from = self.start + reused_until * self.bucket_size
+
+            fetched = await retrieve_bitfinex_buckets(self.route, fetch_from, end, self.start, self.bucket_size)
+            if fetched is None:
+                return None
+            covered_until = min(end, int(time.time() * 1000))
+            final, self.partial = fetched.split(self.slot(covered_until + 1))
+            self.final = reused.merge(final)
+            self.covered_until = covered_until
+            return self.final.merge(self.partial)
+
+
+_route_buckets: dict[tuple[str, int], RouteBuckets] = {}
+
+
+async def get_route_buckets(route: str, start: int, end: int) -> Optional[Buckets]:
+    """Buckets of a route's trades from start to end, reusing those from previous calls"""
+    key = (route, start)
+    buckets = _route_buckets.pop(key, None) or RouteBuckets(route, start)
+    # most recently used last
+    _route_buckets[key] = buckets
+    while len(_route_buckets) > MAX_CACHED_ROUTES:
+        del _route_buckets[next(iter(_route_buckets))]
+    return await buckets.update(end)
+
+
+def _debug_buckets(buckets: Optional[Buckets]) -> list[dict[str, Any]]:
+    return [{"slot": slot, **bucket} for slot, bucket in (buckets or Buckets()).as_dict().items()]
+
+
+async def calculate_all_single_via(symbol: dict[str, Any], start: int, end: int, show_debug: bool) -> dict[str, Any]:
     """Calculate VWAP for a single symbol via all exchanges."""
-    from_list = retrieve_bitfinex_trades(SYMBOLS[symbol["hops"][0]]["bitFinexSymbol"], start, end)
-    to_list = retrieve_bitfinex_trades(SYMBOLS[symbol["hops"][1]]["bitFinexSymbol"], start, end)
-    result = {}
-
-    if from_list and to_list:
-        result[f"bitFinexVwapVia{symbol['via']}"] = volume_weighted_average_price(start, from_list, to_list)
+    from_buckets, to_buckets = await asyncio.gather(
+        get_route_buckets(SYMBOLS[symbol["hops"][0]]["bitFinexSymbol"], start, end),
+        get_route_buckets(SYMBOLS[symbol["hops"][1]]["bitFinexSymbol"], start, end),
+    )
+    result: dict[str, Any] = {}
+
+    if from_buckets and to_buckets:
+        sum_amount_and_prices, sum_volume = merge_buckets(from_buckets, to_buckets)
+        result[f"bitFinexVwapVia{symbol['via']}"] = {"vwap": sum_amount_and_prices / sum_volume, "volume": sum_volume}
     else:
-        result[f"bitFinexVwapVia{symbol['via']}"] = NO_TRADES_FOUND  # type: ignore
+        result[f"bitFinexVwapVia{symbol['via']}"] = NO_TRADES_FOUND
 
     if show_debug:
         result["source"] = {}
-        result["source"][f"bitFinex_{symbol['from']}to{symbol['via']}"] = [
-            {"slot": slot, **bucket} for slot, bucket in build_buckets(start, from_list).items()
-        ]
-        result["source"][f"bitFinex_{symbol['via']}to{symbol['to']}"] = [
-            {"slot": slot, **bucket} for slot, bucket in build_buckets(start, to_list).items()
-        ]
+        result["source"][f"bitFinex_{symbol['from']}to{symbol['via']}"] = _debug_buckets(from_buckets)
+        result["source"][f"bitFinex_{symbol['via']}to{symbol['to']}"] = _debug_buckets(to_buckets)
 
     return result
 
 
-def calculate_vwap_direct(symbol_route: dict[str, Any], start: int, end: int) -> dict[str, Any]:
+async def calculate_vwap_direct(symbol_route: dict[str, Any], start: int, end: int) -> dict[str, Any]:
     """Calculate VWAP for a single symbol directly."""
-    response = retrieve_bitfinex_trades(symbol_route["bitFinexSymbol"], start, end)
-    if len(response) == 0:
+    buckets = await get_route_buckets(symbol_route["bitFinexSymbol"], start, end)
+    if not buckets:
         raise Exception(f'No trades found for {symbol_route["bitFinexSymbol"]}')
-    sum_amount_and_prices = sum([abs(float(trade[2]) * float(trade[3])) for trade in response])
-    sum_volume = sum([abs(float(trade[2])) for trade in response])
+    sum_amount_and_prices = float(buckets.trades.sum())
+    sum_volume = float(buckets.volume.sum())
     return {"vwap": sum_amount_and_prices / sum_volume, "volume": sum_volume}
 
 
-def calculate_vwap_via_all(symbol: dict[str, Any], start: int, end: int, show_debug: bool) -> dict[str, Any]:
+async def calculate_vwap_via_all(symbol: dict[str, Any], start: int, end: int, show_debug: bool) -> dict[str, Any]:
     """Calculate VWAP for a single symbol via all symbols."""
-    p_result = [calculate_vwap_direct(SYMBOLS[symbol["direct"]], start, end)]
-    for h in symbol["viaHops"]:
-        p_result.append(calculate_all_single_via(SYMBOLS[h], start, end, show_debug))
+    p_result = await asyncio.gather(
+        calculate_vwap_direct(SYMBOLS[symbol["direct"]], start, end),
+        *(calculate_all_single_via(SYMBOLS[h], start, end, show_debug) for h in symbol["viaHops"]),
+    )
     result = {"bitFinexVwapDirect": p_result[0]}
 
     if show_debug:
@@ -182,7 +348,7 @@ def calculate_vwap_via_all(symbol: dict[str, Any], start: int, end: int, show_de
 
 async def get_value_from_bitfinex(symbol: dict[str, Any], start: int, end: int, show_debug: bool) -> dict[str, Any]:
     """Get VWAP for any symbol or group of symbols in SYMBOLS."""
-    result = calculate_vwap_via_all(symbol, start, end, show_debug)
+    result = await calculate_vwap_via_all(symbol, start, end, show_debug)
     return result
 
 
@@ -7,12 +7,13 @@ from typing import cast
 from typing import Optional
 
 import requests
-from telliot_core.apps.telliot_config import TelliotConfig
 
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.utils.http_sessions import pooled_session
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.shared_config import get_config
 
 
 logger = get_logger(__name__)
@@ -25,7 +26,7 @@ PCE_AVERAGE_QUANT = Decimal("0.000000000000000001")
 
 def load_bea_api_key() -> Optional[str]:
     """Load the BEA API key from telliot's api_keys.yaml config."""
-    keys = TelliotConfig().api_keys
+    keys = get_config().api_keys
     for name in ("BEA", "bea"):
         api_keys = keys.find(name=name)
         if api_keys and api_keys[0].key:
@@ -86,7 +87,7 @@ class BEAPCESource(DataSource[Decimal]):
         }
 
         try:
-            with requests.Session() as session:
+            with pooled_session(self.url) as session:
                 response = session.get(self.url, params=params, timeout=self.request_timeout)
                 response.raise_for_status()
                 data = cast(dict[str, Any], response.json())
@@ -1,61 +1,87 @@
 import asyncio
+import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime
 from datetime import timezone
 from typing import Any
+from typing import Dict
 from typing import Optional
 from typing import Tuple
+from typing import Union
 
 import requests
 from requests import JSONDecodeError
-from requests.adapters import HTTPAdapter
 from telliot_core.apps.telliot_config import TelliotConfig
-from urllib3.util import Retry
 from web3 import Web3
 
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.utils.block_index import get_block_index
+from telliot_feeds.utils.http_sessions import pooled_session
 from telliot_feeds.utils.input_timeout import input_timeout
 from telliot_feeds.utils.input_timeout import TimeoutOccurred
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.shared_config import get_config
 
 
 logger = get_logger(__name__)
 
 
-retry_strategy = Retry(
-    total=3,
-    backoff_factor=1,
-    status_forcelist=[429, 500, 502, 503, 504],
-    allowed_methods=["GET"],
-)
-adapter = HTTPAdapter(max_retries=retry_strategy)
+ETHERSCAN_URL = "https://api.etherscan.io/api"
+BLOCKCHAIN_INFO_URL = "https://blockchain.info"
+
+
+#: Resolved (eth hash, btc hash) pairs kept
+MAX_CACHED_HASHES = 64
+
+_mainnet_cfg: Optional[TelliotConfig] = None
+# lookups in the mainnet block index run in worker threads, and the index isn't thread safe
+_block_index_lock = threading.Lock()
 
 
 def get_mainnet_web3() -> Any:
-    """Get mainnet TelliotConfig."""
-    cfg = TelliotConfig()
-    cfg.main.chain_id = 1
+    """Get mainnet TelliotConfig.
+
+    The config and its endpoint connection are created once and reused,
+    so later calls don't reload the config or reconnect.
+    """
+    global _mainnet_cfg
+    cfg = _mainnet_cfg
+    if cfg is None:
+        cfg = TelliotConfig()
+        cfg.main.chain_id = 1
     try:
         cfg.get_endpoint().connect()
-        return cfg
     except ValueError:
         return None
+    _mainnet_cfg = cfg
+    return cfg
+
+
+def get_mainnet_w3() -> Optional[Web3]:
+    """Web3 connection to the pooled mainnet endpoint, or None if there isn't one"""
+    cfg: Optional[TelliotConfig] = get_mainnet_web3()
+    if cfg is None:
+        logger.warning("Web3 not connected")
+        return None
+    w3: Optional[Web3] = cfg.get_endpoint().web3
+    if w3 is None:
+        logger.warning("Web3 not connected")
+    return w3
 
 
 def block_num_from_timestamp(timestamp: int, api_key: str) -> Optional[int]:
-    with requests.Session() as s:
-        s.mount("https://", adapter)
+    params: Dict[str, Union[str, int]] = {
+        "module": "block",
+        "action": "getblocknobytime",
+        "timestamp": timestamp,
+        "closest": "before",
+        "apikey": api_key,
+    }
+    with pooled_session(ETHERSCAN_URL) as s:
         try:
-            rsp = s.get(
-                "https://api.etherscan.io/api"
-                "?module=block"
-                "&action=getblocknobytime"
-                f"&timestamp={timestamp}"
-                "&closest=before"
-                f"&apikey={api_key}"
-            )
+            rsp = s.get(ETHERSCAN_URL, params=params)
         except requests.exceptions.ConnectTimeout:
             logger.error("Connection timeout getting ETH block num from timestamp")
             return None
@@ -86,33 +112,34 @@ def block_num_from_timestamp(timestamp: int, api_key: str) -> Optional[int]:
         return result
 
 
-async def get_eth_hash(timestamp: int) -> Optional[str]:
-    """Fetches next Ethereum blockhash after timestamp from API."""
-    cfg: TelliotConfig = get_mainnet_web3()
-    if cfg is None:
-        logger.warning("Web3 not connected")
-        return None
-    w3: Web3 = cfg.get_endpoint().web3
-    if w3 is None:
-        logger.warning("Web3 not connected")
-        return None
-
+def eth_head_timestamp(w3: Web3) -> Optional[int]:
+    """Timestamp of the latest Ethereum block"""
     try:
         this_block = w3.eth.get_block("latest")
     except Exception as e:
         logger.error(f"Unable to retrieve latest block: {e}")
         return None
+    return int(this_block["timestamp"])
 
-    if this_block["timestamp"] < timestamp:
-        logger.error(f"Timestamp {timestamp} is older than current block timestamp {this_block['timestamp']}")
-        return None
-    api_key = TelliotConfig().api_keys.find(name="etherscan")
-    if not api_key:
-        logger.info("API key required to query Etherscan.")
+
+def eth_hash_at(w3: Web3, timestamp: int, head_timestamp: int) -> Optional[str]:
+    """Hash of the last Ethereum block at or before timestamp
+
+    The block is found with the shared block index, falling back to
+    Etherscan if the index can't find it and an API key is configured.
+    """
+    if head_timestamp < timestamp:
+        logger.error(f"Timestamp {timestamp} is older than current block timestamp {head_timestamp}")
         return None
-    block_num = block_num_from_timestamp(timestamp, api_key=api_key[0].key)
+
+    with _block_index_lock:
+        block_num = get_block_index(1).block_at(w3, timestamp)
     if block_num is None:
-        logger.warning("Unable to retrieve block number from Etherscan API")
+        api_key = get_config().api_keys.find(name="etherscan")
+        if api_key and api_key[0].key:
+            block_num = block_num_from_timestamp(timestamp, api_key[0].key)
+    if block_num is None:
+        logger.warning(f"Unable to find ETH block number for timestamp {timestamp}")
         return None
 
     try:
@@ -125,14 +152,30 @@ async def get_eth_hash(timestamp: int) -> Optional[str]:
     return str(block["hash"].hex())
 
 
+async def get_eth_hash(timestamp: int) -> Optional[str]:
+    """Fetches next Ethereum blockhash after timestamp from API."""
+    w3 = get_mainnet_w3()
+    if w3 is None:
+        return None
+
+    def eth_hash() -> Optional[str]:
+        head_timestamp = eth_head_timestamp(w3)
+        return None if head_timestamp is None else eth_hash_at(w3, timestamp, head_timestamp)
+
+    return await asyncio.to_thread(eth_hash)
+
+
 async def get_btc_hash(timestamp: int) -> Tuple[Optional[str], Optional[int]]:
     """Fetches next Bitcoin blockhash after timestamp from API."""
-    with requests.Session() as s:
-        s.mount("https://", adapter)
+    return await asyncio.to_thread(_get_btc_hash, timestamp)
+
+
+def _get_btc_hash(timestamp: int) -> Tuple[Optional[str], Optional[int]]:
+    with pooled_session(BLOCKCHAIN_INFO_URL) as s:
         ts = timestamp + 480 * 60
 
         try:
-            rsp = s.get(f"https://blockchain.info/blocks/{ts * 1000}?format=json")
+            rsp = s.get(f"{BLOCKCHAIN_INFO_URL}/blocks/{ts * 1000}?format=json")
         except requests.exceptions.ConnectTimeout:
             logger.error("Connection timeout getting BTC block num from timestamp")
             return None, None
@@ -168,6 +211,69 @@ async def get_btc_hash(timestamp: int) -> Tuple[Optional[str], Optional[int]]:
         return str(block["hash"]), block["time"]
 
 
+class RNGResolver:
+    """Resolves the Ethereum and Bitcoin blockhashes a TellorRNG value is built from
+
+    The ETH block used is the last one at or before the BTC block's time,
+    which is only known once the BTC lookup returns. Since that time is at
+    or after the requested timestamp, the ETH head and the block at the
+    requested timestamp are looked up while the BTC lookup runs; the block
+    index then usually needs one more round trip to find the block at the
+    BTC time. Results are remembered per timestamp, so a reporter fetching
+    the same value again makes no requests.
+    """
+
+    def __init__(self) -> None:
+        self._hashes: Dict[int, Tuple[str, str]] = {}
+
+    def _speculate_eth(self, w3: Web3, timestamp: int) -> Optional[int]:
+        """ETH head timestamp, narrowing the block index's search around timestamp on the way"""
+        head_timestamp = eth_head_timestamp(w3)
+        if head_timestamp is not None and head_timestamp >= timestamp:
+            with _block_index_lock:
+                get_block_index(1).block_at(w3, timestamp)
+        return head_timestamp
+
+    async def resolve(self, timestamp: int) -> Optional[Tuple[str, str]]:
+        """(eth hash, btc hash) for a timestamp, or None if either can't be found"""
+        cached = self._hashes.get(timestamp)
+        if cached is not None:
+            return cached
+
+        w3 = await asyncio.to_thread(get_mainnet_w3)
+        if w3 is None:
+            logger.warning("Unable to retrieve Ethereum blockhash")
+            return None
+        (btc_hash, btc_timestamp), head_timestamp = await asyncio.gather(
+            get_btc_hash(timestamp), asyncio.to_thread(self._speculate_eth, w3, timestamp)
+        )
+
+        if btc_hash is None:
+            logger.warning("Unable to retrieve Bitcoin blockhash")
+            return None
+        if btc_timestamp is None:
+            logger.warning("Unable to retrieve Bitcoin timestamp")
+            return None
+        if head_timestamp is not None and head_timestamp < btc_timestamp:
+            # the head was read before the BTC block's time was known; it may have moved on since
+            head_timestamp = await asyncio.to_thread(eth_head_timestamp, w3)
+        eth_hash = None
+        if head_timestamp is not None:
+            eth_hash = await asyncio.to_thread(eth_hash_at, w3, btc_timestamp, head_timestamp)
+        if eth_hash is None:
+            logger.warning("Unable to retrieve Ethereum blockhash")
+            return None
+
+        if len(self._hashes) >= MAX_CACHED_HASHES:
+            del self._hashes[next(iter(self._hashes))]
+        self._hashes[timestamp] = (eth_hash, btc_hash)
+        return eth_hash, btc_hash
+
+
+#: Resolver shared by every TellorRNG source
+rng_resolver = RNGResolver()
+
+
 @dataclass
 class TellorRNGManualSource(DataSource[Any]):
     """DataSource for TellorRNG manually-entered timestamp."""
@@ -232,18 +338,10 @@ class TellorRNGManualSource(DataSource[Any]):
         else:
             timestamp = self.timestamp
 
-        btc_hash, btc_timestamp = await get_btc_hash(timestamp)
-
-        if btc_hash is None:
-            logger.warning("Unable to retrieve Bitcoin blockhash")
-            return None, None
-        if btc_timestamp is None:
-            logger.warning("Unable to retrieve Bitcoin timestamp")
-            return None, None
-        eth_hash = await get_eth_hash(btc_timestamp)
-        if eth_hash is None:
-            logger.warning("Unable to retrieve Ethereum blockhash")
+        hashes = await rng_resolver.resolve(timestamp)
+        if hashes is None:
             return None, None
+        eth_hash, btc_hash = hashes
 
         data = Web3.solidity_keccak(["string", "string"], [eth_hash, btc_hash])
         dt = datetime.fromtimestamp(self.timestamp, tz=timezone.utc)
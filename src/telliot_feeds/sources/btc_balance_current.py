@@ -4,24 +4,15 @@ from typing import Optional
 
 import requests
 from requests import JSONDecodeError
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
 
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.utils.http_sessions import pooled_session
 from telliot_feeds.utils.log import get_logger
 
 logger = get_logger(__name__)
 
-retry_strategy = Retry(
-    total=3,
-    backoff_factor=1,
-    status_forcelist=[429, 500, 502, 503, 504],
-    allowed_methods=["GET"],
-)
-adapter = HTTPAdapter(max_retries=retry_strategy)
-
 
 @dataclass
 class BTCBalanceCurrentSource(DataSource[Any]):
@@ -40,8 +31,8 @@ class BTCBalanceCurrentSource(DataSource[Any]):
         if block_num is None:
             return None, None
 
-        with requests.Session() as s:
-            url = f"https://blockchain.info/multiaddr?active={self.btcAddress}|{self.btcAddress}"
+        url = f"https://blockchain.info/multiaddr?active={self.btcAddress}|{self.btcAddress}"
+        with pooled_session(url) as s:
             try:
                 rsp = s.get(url)
             except requests.exceptions.ConnectTimeout:
@@ -110,18 +101,17 @@ class BTCBalanceCurrentSource(DataSource[Any]):
 
     async def block_num_from_timestamp(self, timestamp: int) -> Optional[int]:
         """Fetches next Bitcoin block number after timestamp from API."""
-        with requests.Session() as s:
-            s.mount("https://", adapter)
         ts = timestamp + 480 * 60
 
-        try:
-            rsp = s.get(f"https://blockchain.info/blocks/{ts * 1000}?format=json")
-        except requests.exceptions.ConnectTimeout:
-            logger.error("Connection timeout getting BTC block num from timestamp")
-            return None
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Blockchain.info API error: {e}")
-            return None
+        with pooled_session("https://blockchain.info") as s:
+            try:
+                rsp = s.get(f"https://blockchain.info/blocks/{ts * 1000}?format=json")
+            except requests.exceptions.ConnectTimeout:
+                logger.error("Connection timeout getting BTC block num from timestamp")
+                return None
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Blockchain.info API error: {e}")
+                return None
 
         try:
             blocks = rsp.json()
@@ -157,16 +147,15 @@ class BTCBalanceCurrentSource(DataSource[Any]):
 
     async def block_num_with_delay(self) -> Optional[int]:
         """Fetches the latest Bitcoin block number from API, subtracts block_delay."""
-        with requests.Session() as s:
-            s.mount("https://", adapter)
-        try:
-            rsp = s.get("https://blockchain.info/latestblock")
-        except requests.exceptions.ConnectTimeout:
-            logger.error("Connection timeout getting BTC block num")
-            return None
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Blockchain.info API error: {e}")
-            return None
+        with pooled_session("https://blockchain.info") as s:
+            try:
+                rsp = s.get("https://blockchain.info/latestblock")
+            except requests.exceptions.ConnectTimeout:
+                logger.error("Connection timeout getting BTC block num")
+                return None
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Blockchain.info API error: {e}")
+                return None
 
         try:
             block = rsp.json()
@@ -182,16 +171,15 @@ class BTCBalanceCurrentSource(DataSource[Any]):
 
     async def block_timestamp(self, block_num: int) -> Optional[int]:
         """Fetches the timestamp of a Bitcoin block from API."""
-        with requests.Session() as s:
-            s.mount("https://", adapter)
-        try:
-            rsp = s.get(f"https://blockchain.info/block-height/{block_num}?format=json")
-        except requests.exceptions.ConnectTimeout:
-            logger.error("Connection timeout getting BTC block timestamp")
-            return None
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Blockchain.info API error: {e}")
-            return None
+        with pooled_session("https://blockchain.info") as s:
+            try:
+                rsp = s.get(f"https://blockchain.info/block-height/{block_num}?format=json")
+            except requests.exceptions.ConnectTimeout:
+                logger.error("Connection timeout getting BTC block timestamp")
+                return None
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Blockchain.info API error: {e}")
+                return None
 
         try:
             block = rsp.json()
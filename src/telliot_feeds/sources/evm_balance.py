@@ -15,6 +15,7 @@ from web3.types import BlockData
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.utils.block_index import get_block_index
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.source_utils import update_web3
 
@@ -100,7 +101,7 @@ class EVMBalanceSource(DataSource[Any]):
         return balance
 
     async def search_block_by_timestamp(self) -> Optional[int]:
-        """Binary search for the block closest to the target timestamp
+        """Find the last block mined at or before the target timestamp
 
         Returns:
             The closest block number less than or equal to the target timestamp
@@ -109,38 +110,10 @@ class EVMBalanceSource(DataSource[Any]):
             raise ValueError("Web3 not instantiated")
         if not self.timestamp:
             raise ValueError("Timestamp not provided")
+        if not self.chainId:
+            raise ValueError("Chain ID not provided")
 
-        left_block_number = 0
-        right_block_number: int = self.web3.eth.block_number
-        mid_block_number = (left_block_number + right_block_number) // 2
-        target_timestamp = self.timestamp
-
-        while right_block_number - left_block_number > 2:
-            mid_block = self.get_block(self.web3, mid_block_number)
-            if not mid_block:
-                return None
-            mid_block_timestamp = mid_block["timestamp"]
-
-            # Check for exact match
-            if mid_block_timestamp == target_timestamp:
-                return mid_block_number
-
-            if mid_block_timestamp < target_timestamp:
-                left_block_number = mid_block_number
-            else:
-                right_block_number = mid_block_number
-            mid_block_number = (left_block_number + right_block_number) // 2
-
-        mid_block = self.get_block(self.web3, mid_block_number)
-        if not mid_block:
-            return None
-        mid_block_timestamp = mid_block["timestamp"]
-        if mid_block_timestamp <= target_timestamp:
-            return mid_block_number
-        else:
-            if left_block_number == 0:
-                return None
-            return left_block_number
+        return get_block_index(self.chainId).block_at(self.web3, self.timestamp)
 
     async def fetch_new_datapoint(self) -> OptionalDataPoint[int]:
         """Fetch balance of EVM address at a given timestamp
@@ -8,14 +8,13 @@ from hexbytes import HexBytes
 from telliot_core.apps.telliot_config import TelliotConfig
 from web3 import Web3
 from web3.exceptions import ContractLogicError
-from web3.exceptions import ExtraDataLengthError
-from web3.middleware import ExtraDataToPOAMiddleware
 from web3.types import BlockIdentifier
 from web3.types import Wei
 
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.utils.block_index import get_block_index
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.source_utils import update_web3
 
@@ -49,24 +48,15 @@ class EVMCallSource(DataSource[Any]):
             raise ValueError("Calldata not provided")
         if not self.web3:
             raise ValueError("Web3 not provided")
+        if not self.chainId:
+            raise ValueError("Chain ID not provided")
 
         empty_bytes = HexBytes(bytes(32))
 
-        try:
-            self.web3.eth.get_block(block_number)
-        except ExtraDataLengthError as e:
-            logger.info(f"EVMCall to POA chain detected. Injecting POA middleware in response to exception: {e}")
-
-            try:
-                self.web3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
-            except ValueError as e:
-                logger.warning(f"Unable to inject web3 middleware for POA chain connection: {e}")
-
-        try:
-            block = self.web3.eth.get_block(block_number)
-            ts = int(block["timestamp"])
-        except Exception as e:
-            logger.warning(f"Unable to retrieve current block timestamp: {e}")
+        # also injects POA middleware if needed, before the call below
+        ts = get_block_index(self.chainId).block_timestamp(self.web3, block_number)
+        if ts is None:
+            logger.warning("Unable to retrieve current block timestamp")
             return None
 
         self.contractAddress = self.web3.to_checksum_address(self.contractAddress)
@@ -5,14 +5,15 @@ from typing import Any
 from typing import Optional
 
 import requests
-from requests import Session
-from telliot_core.apps.telliot_config import TelliotConfig
 
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.utils.http_sessions import pooled_session
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.shared_config import get_api_key
+from telliot_feeds.utils.shared_config import get_config
 
 logger = get_logger(__name__)
 
@@ -20,7 +21,7 @@ GYD_USDC_POOL_ADDRESS = "0xC2AA60465BfFa1A88f5bA471a59cA0435c3ec5c1"
 # GYD_USDT_POOL_ADDRESS = "0xfbfaD5fa9E99081da6461F36f229B5cC88A64c63"
 GYD_SDAI_POOL_ADDRESS = "0x2191Df821C198600499aA1f0031b1a7514D7A7D9"
 
-API_KEY = TelliotConfig().api_keys.find(name="thegraph")[0].key
+API_KEY = get_api_key("thegraph")
 
 
 class gydSpotPriceService(WebPriceService):
@@ -31,7 +32,7 @@ class gydSpotPriceService(WebPriceService):
         kwargs["url"] = ""
         kwargs["timeout"] = 10.0
         super().__init__(**kwargs)
-        self.cfg = TelliotConfig()
+        self.cfg = get_config()
 
     async def get_spot_from_pool(self, contractAddress: str) -> Optional[float]:
         endpoint = self.cfg.endpoints.find(chain_id=1)
@@ -97,14 +98,13 @@ class gydSpotPriceService(WebPriceService):
 
         request_url = f"{baseURL}/api/subgraphs/id/C4ayEZP2yTXRAB8vSaTrgN4m9anTe9Mdm2ViyiAuV9TV"
 
-        session = Session()
+        headers = {"Accepts": "application/json"}
         if API_KEY != "":
-            headers = {"Accepts": "application/json", "Authorization": f"Bearer {API_KEY}"}
-            session.headers.update(headers)
+            headers["Authorization"] = f"Bearer {API_KEY}"
         if API_KEY == "":
             logger.warning("No Graph API key found for Balancer data!")
 
-        with requests.Session() as s:
+        with pooled_session(request_url) as s:
             try:
                 r = s.post(request_url, headers=headers, json=json_data, timeout=self.timeout)
                 res = r.json()
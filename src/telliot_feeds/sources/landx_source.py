@@ -4,24 +4,16 @@ from typing import Any
 from typing import Optional
 
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
 
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.utils.http_sessions import pooled_session
 from telliot_feeds.utils.log import get_logger
 
 logger = get_logger(__name__)
 
-retry_strategy = Retry(
-    total=3,
-    backoff_factor=1,
-    status_forcelist=[429, 500, 502, 503, 504],
-    allowed_methods=["GET"],
-)
-adapter = HTTPAdapter(max_retries=retry_strategy)
-
+LANDX_URL = "https://api-testnet.landx.fi/api/public/commodities"
 supported_assets = ["rice", "wheat", "soy", "corn"]
 
 
@@ -35,10 +27,9 @@ class LandXSource(DataSource[Any]):
     asset: Optional[str] = None
 
     def fetch_commodities_prices(self) -> Optional[Any]:
-        with requests.Session() as s:
-            s.mount("https://", adapter)
+        with pooled_session(LANDX_URL) as s:
             try:
-                rsp = s.get("https://api-testnet.landx.fi/api/public/commodities")
+                rsp = s.get(LANDX_URL)
                 return rsp.json()
             except requests.exceptions.ConnectTimeout:
                 logger.error("Connection timeout getting commodities prices")
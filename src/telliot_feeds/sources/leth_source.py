@@ -3,8 +3,6 @@ from dataclasses import field
 from typing import Any
 from typing import Optional
 
-from telliot_core.apps.telliot_config import TelliotConfig
-
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
@@ -13,6 +11,7 @@ from telliot_feeds.sources.price.spot.gemini import GeminiSpotPriceSource
 from telliot_feeds.sources.price.spot.kraken import KrakenSpotPriceSource
 from telliot_feeds.sources.price_aggregator import PriceAggregator
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.shared_config import get_config
 
 logger = get_logger(__name__)
 
@@ -24,7 +23,7 @@ class LETHSpotPriceService(WebPriceService):
         kwargs["name"] = "Custom LETH Price Service"
         kwargs["url"] = ""
         super().__init__(**kwargs)
-        self.cfg = TelliotConfig()
+        self.cfg = get_config()
 
     def get_leth_eth_ratio(self) -> Optional[float]:
         # get endpoint
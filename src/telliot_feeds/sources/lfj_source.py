@@ -4,13 +4,12 @@ from typing import Any
 from typing import List
 from typing import Optional
 
-from telliot_core.apps.telliot_config import TelliotConfig
-
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.shared_config import get_config
 
 logger = get_logger(__name__)
 
@@ -64,7 +63,7 @@ class LFJPriceService(WebPriceService):
         kwargs["name"] = "Custom solvBTC Price Service"
         kwargs["url"] = ""
         super().__init__(**kwargs)
-        self.cfg = TelliotConfig()
+        self.cfg = get_config()
         self.contract_address: Optional[str] = None
         self.contract_abi: Optional[Any] = None
         self.src_len: Optional[int] = None
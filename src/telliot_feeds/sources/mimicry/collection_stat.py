@@ -2,35 +2,35 @@ from dataclasses import dataclass
 from dataclasses import field
 from datetime import datetime
 from datetime import timezone
+from pathlib import Path
 from typing import Any
+from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Union
 
-import requests
+import numpy as np
 from dateutil.relativedelta import relativedelta
-from requests.adapters import HTTPAdapter
-from requests.exceptions import RequestException
-from requests.exceptions import Timeout
-from urllib3.util import Retry
+from telliot_core.utils.home import default_homedir
 
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
-from telliot_feeds.sources.mimicry.tami import tami
+from telliot_feeds.pricing.async_http import async_http_transport
+from telliot_feeds.sources.mimicry.sales_store import RESERVOIR_HEADERS
+from telliot_feeds.sources.mimicry.sales_store import RESYNC_OVERLAP
+from telliot_feeds.sources.mimicry.sales_store import SalesStore
+from telliot_feeds.sources.mimicry.sales_store import sync_reservoir_sales
+from telliot_feeds.sources.mimicry.tami import TamiIndex
 from telliot_feeds.sources.mimicry.types import Transaction
 from telliot_feeds.sources.mimicry.utils import sort_transactions
 from telliot_feeds.utils.log import get_logger
 
 
 logger = get_logger(__name__)
-retry_strategy = Retry(
-    total=3,
-    backoff_factor=1,
-    status_forcelist=[429, 500, 502, 503, 504],
-    allowed_methods=["GET"],
-)
-adapter = HTTPAdapter(max_retries=retry_strategy)
+
+#: Where each collection's sales and TAMI index are kept between reports
+CACHE_DIR: Path = default_homedir() / "cache" / "mimicry"
 
 
 @dataclass
@@ -51,35 +51,64 @@ class MimicryCollectionStatSource(DataSource[float]):
     def get_collection_market_cap(self, transaction_history: TransactionList) -> Optional[float]:
         """calculate the market cap of an NFT series based on a list of Transactions."""
 
-        values: List[Union[int, float]] = []
-
-        sorted_transactions = sort_transactions(transaction_history.transactions)
-
-        sorted_transactions.reverse()
-
-        last_sale_found = []
-
-        for sale in sorted_transactions:
-
-            if sale.itemId in last_sale_found:
-                continue
-
-            # For each token in the collection
-            # calculate its value by taking the greater value
-            # between the collection's floor price and last sale price of that NFT
-            if transaction_history.floor_price < sale.price:
-                values.append(sale.price)
-            else:
-                values.append(transaction_history.floor_price)
-
-            last_sale_found.append(sale.itemId)
-
-        return sum(values)
+        # last sale price of each token in the collection
+        last_sale_price: Dict[Union[float, int, str], Union[float, int]] = {}
+        for sale in sort_transactions(transaction_history.transactions):
+            last_sale_price[sale.itemId] = sale.price
+
+        # For each token in the collection
+        # calculate its value by taking the greater value
+        # between the collection's floor price and last sale price of that NFT
+        prices = np.fromiter(last_sale_price.values(), dtype=float, count=len(last_sale_price))
+        return float(np.maximum(prices, transaction_history.floor_price).sum())
+
+    def cache_path(self, kind: str, suffix: str) -> Path:
+        """File one of the collection's caches is kept in between reports"""
+        address = (self.collectionAddress or "").lower()
+        return CACHE_DIR / f"{kind}_{self.chainId}_{address}{suffix}"
+
+    async def sync_sales(self, contract: str) -> Optional[SalesStore]:
+        """Collection's sales store, with every sale up to now downloaded"""
+        store = SalesStore(self.cache_path("sales", ".sqlite"))
+        if not await sync_reservoir_sales(store, contract):
+            store.close()
+            return None
+        return store
+
+    def update_tami(self, store: SalesStore) -> Optional[float]:
+        """TAMI of the collection, applying only sales not seen in previous reports"""
+        path = self.cache_path("tami", ".npz")
+        index = TamiIndex.load(path)
+        # sales up to RESYNC_OVERLAP older than the latest applied may have been stored since
+        since = index.timestamps[-1] - RESYNC_OVERLAP if len(index.timestamps) else None
+        tami_value = index.update(store.transactions(since=since))
+        try:
+            index.save(path)
+        except OSError as e:
+            logger.warning(f"Unable to save TAMI index {path}: {e}")
+        return tami_value
+
+    async def request_floor_price(self, contract: str) -> Optional[float]:
+        """Floor price of the collection in USD, from Reservoir"""
+        url = (
+            "https://api.reservoir.tools/oracle/collections/floor-ask/v4?kind="
+            f"spot&currency=0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48&twapSeconds=1&collection={contract}"
+        )
+        d = await async_http_transport.get_json(url, timeout=10, headers=RESERVOIR_HEADERS)
+        if "error" in d:
+            logger.error(f"Request to Reservoir FloorPrice API failed: {d['error']}: {d['exception']}")
+            return None
+        try:
+            floor_price: float = d["response"]["price"]
+        except (KeyError, TypeError) as e:
+            logger.error(f"Unable to parse price from Reservoir FloorPrice API response: {str(e)}")
+            return None
+        return floor_price
 
     async def request_historical_sales_data(self, contract: str, all: bool = True) -> Optional[TransactionList]:
         """Requests historical sales
          data of the selected collection.
-         Data retrieved from Reservoir.
+         Data retrieved from Reservoir, and kept on disk so only new sales are downloaded.
 
         Agruments:
             all (bool): if True, see all data for the selected collection (if False, only 12 months)
@@ -88,79 +117,18 @@ class MimicryCollectionStatSource(DataSource[float]):
             TransactionList: formatted historical sales data of a collection retrieved from Reservoir
 
         """
-        continuation_token = ""
-        tx_list = TransactionList()
-        while True:
-            url = f"https://api.reservoir.tools/sales/v4?contract={contract}"
-            headers = {"accept": "*/*", "x-api-key": "demo-api-key"}
-            with requests.Session() as s:
-                s.mount("https://", adapter)
-                if not all:
-                    one_year_ago = datetime.utcnow() - relativedelta(years=1)
-                    start_timestamp = int(one_year_ago.timestamp())
-                    url += f"&startTimestamp={start_timestamp}"
-                else:
-                    url += "&startTimestamp=0"
-                # paginate
-                if continuation_token:
-                    url += "&continuation=" + continuation_token
-                # 1000 sales per page
-                url += "&limit=1000"
-
-                try:
-                    request = s.get(url, timeout=10, headers=headers)
-                    request.raise_for_status()
-                except (RequestException, Timeout) as e:
-                    logger.error(f"Request to Reservoir Sales API failed: {str(e)}")
-                    return None
-                except Exception as e:
-                    logger.error(f"Reservoir API request unsuccessful: {e}")
-                    return None
-
-                try:
-                    sales_data = request.json()["sales"]
-                    continuation_token = request.json()["continuation"]
-                except requests.exceptions.JSONDecodeError as e:
-                    logger.error(f"Unable to parse Reservoir Sales API response: {str(e)}")
-                    return None
-
-                for sale in sales_data:
-
-                    try:
-                        price = sale["price"]["amount"]["usd"]
-                        item_id = sale["token"]["tokenId"]
-                        timestamp = sale["timestamp"]
-                    except KeyError as e:
-                        logger.error("Mimicry: Reservoir Sales API KeyError: " + str(e))
-                        return None
-                    tx = Transaction(
-                        price=price, itemId=item_id, date=datetime.fromtimestamp(timestamp, tz=timezone.utc)
-                    )
-                    tx_list.transactions.append(tx)
-
-                # if on last page
-                if len(sales_data) < 1000:
-                    break
+        store = await self.sync_sales(contract)
+        if store is None:
+            return None
+        since = None if all else (datetime.now(timezone.utc) - relativedelta(years=1)).timestamp()
+        tx_list = TransactionList(transactions=store.transactions(since=since))
+        store.close()
 
         if self.metric == 1:
-            url = (
-                "https://api.reservoir.tools/oracle/collections/floor-ask/v4?kind="
-                f"spot&currency=0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48&twapSeconds=1&collection={contract}"
-            )
-            headers = {"accept": "*/*", "x-api-key": "demo-api-key"}
-
-            try:
-                request = s.get(url, timeout=10, headers=headers)
-                request.raise_for_status()
-            except (RequestException, Timeout) as e:
-                logger.error(f"Request to Reservoir FloorPrice API failed: {str(e)}")
-                return None
-
-            try:
-                tx_list.floor_price = request.json()["price"]
-            except requests.exceptions.JSONDecodeError as e:
-                logger.error(f"Unable to parse price from Reservoir FloorPrice API response: {str(e)}")
+            floor_price = await self.request_floor_price(contract)
+            if floor_price is None:
                 return None
+            tx_list.floor_price = floor_price
 
         return tx_list
 
@@ -179,9 +147,10 @@ class MimicryCollectionStatSource(DataSource[float]):
             return None, None
 
         if self.metric == 0:
-            past_year_sales_data = await self.request_historical_sales_data(contract=self.collectionAddress, all=True)
-            if past_year_sales_data:
-                tami_value = tami(past_year_sales_data.transactions)
+            store = await self.sync_sales(self.collectionAddress)
+            if store is not None:
+                tami_value = self.update_tami(store)
+                store.close()
 
                 if not tami_value:
                     logger.info(
@@ -9,12 +9,12 @@ from aiohttp import ClientError
 from aiohttp import ClientResponseError
 from aiohttp import ClientSession
 from aiohttp import ClientTimeout
-from telliot_core.apps.telliot_config import TelliotConfig
 
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.shared_config import get_config
 
 
 logger = get_logger(__name__)
@@ -107,7 +107,7 @@ class NFTMashupSource(DataSource[str]):
             logger.info("No NFTGo collections specified.")
             return None
 
-        api_key = TelliotConfig().api_keys.find(name="nftgo")
+        api_key = get_config().api_keys.find(name="nftgo")
         if not api_key:
             logger.info("API key required for NFTGo source to fetch collection market cap.")
             return None
@@ -1,28 +1,25 @@
 import asyncio
 from dataclasses import dataclass
 from typing import Any
+from typing import Dict
 from typing import Optional
+from typing import Union
 
-from requests.adapters import HTTPAdapter
-from requests.adapters import Retry
 from requests.exceptions import ConnectionError
 from requests.exceptions import HTTPError
 from requests.exceptions import RequestException
 from requests.exceptions import Timeout
-from requests.sessions import Session
-from telliot_core.apps.telliot_config import TelliotConfig
 
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.utils.http_sessions import pooled_session
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.shared_config import get_config
 
 
 logger = get_logger(__name__)
 
-retry_strat = Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
-adapter = HTTPAdapter(max_retries=retry_strat)
-
 
 @dataclass
 class NFTGoSource(DataSource[str]):
@@ -37,19 +34,23 @@ class NFTGoSource(DataSource[str]):
         """
         Request NFTGo data from the api
         """
-        api_key = TelliotConfig().api_keys.find(name="nftgo")
+        api_key = get_config().api_keys.find(name="nftgo")
         if not api_key:
             logger.info("API key required for NFTGo API to fetch collection market cap.")
             return None
         url = "https://data-api.nftgo.io/eth/v1/market/rank/collection/all"
         headers = {"X-API-KEY": api_key[0].key, "accept": "application/json"}
-        params = {"by": "market_cap", "with_rarity": "false", "asc": "false", "offset": 0, "limit": 50}
+        params: Dict[str, Union[str, int]] = {
+            "by": "market_cap",
+            "with_rarity": "false",
+            "asc": "false",
+            "offset": 0,
+            "limit": 50,
+        }
 
-        with Session() as session:
-            session.headers.update(headers)
-            session.mount("https://", adapter)
+        with pooled_session(url) as session:
             try:
-                response = session.get(url, params=params, timeout=(5, 10))  # type: ignore
+                response = session.get(url, params=params, headers=headers, timeout=(5, 10))
                 response.raise_for_status()
             except (HTTPError, Timeout, ConnectionError, RequestException) as e:
                 logger.error(f"Request errored: {e}.")
@@ -0,0 +1,211 @@
+"""On-disk store of an NFT collection's sales, synced from Reservoir
+
+Reservoir's sales API returns a collection's sales newest first, 1000 per
+page, each page giving a continuation cursor for the next (older) one.
+Downloading the whole history on every report means many pages for a large
+collection, so `SalesStore` keeps the sales in a SQLite file and
+`sync_reservoir_sales` only asks for what isn't stored yet:
+
+- sales are fetched in time windows; a window's continuation cursor is saved
+  after each page, so an interrupted download resumes where it stopped
+- the first sync splits the history into windows fetched concurrently (each
+  window's pages have to be fetched in order)
+- later syncs fetch one window, from shortly before the previous sync to
+  now, which is usually a single small page
+
+Sales are keyed by their Reservoir id, so overlapping windows don't store a
+sale twice.
+"""
+import asyncio
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from telliot_feeds.pricing.async_http import async_http_transport
+from telliot_feeds.sources.mimicry.types import Transaction
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+RESERVOIR_SALES_URL = "https://api.reservoir.tools/sales/v4"
+
+RESERVOIR_HEADERS = {"accept": "*/*", "x-api-key": "demo-api-key"}
+
+#: Sales per page (the most Reservoir returns)
+PAGE_LIMIT = 1000
+
+#: Timestamp the first sync starts from (Ethereum mainnet launch)
+HISTORY_START = 1438214400
+
+#: Length in seconds of the windows the first sync is split into
+BACKFILL_WINDOW = 180 * 86400
+
+#: Seconds before the previous sync that the next one starts, to catch sales indexed late
+RESYNC_OVERLAP = 3600
+
+#: Windows fetched at the same time
+MAX_CONCURRENT_WINDOWS = 4
+
+#: (id, item id, price, timestamp)
+SaleRow = Tuple[str, str, float, int]
+
+
+@dataclass
+class SalesWindow:
+    """Time range (inclusive) still being downloaded, and where its download got to"""
+
+    start: int
+    end: int
+    continuation: Optional[str] = None
+
+
+class SalesStore:
+    """Sales of one collection, and the windows not fully downloaded yet
+
+    Args:
+        path: SQLite file the sales are kept in
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        with self.conn:
+            self.conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS sales (
+                    id TEXT PRIMARY KEY,
+                    item_id TEXT NOT NULL,
+                    price REAL NOT NULL,
+                    timestamp INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS sales_timestamp ON sales (timestamp);
+                CREATE TABLE IF NOT EXISTS windows (
+                    start INTEGER PRIMARY KEY,
+                    end INTEGER NOT NULL,
+                    continuation TEXT
+                );
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+                """
+            )
+
+    def close(self) -> None:
+        self.conn.close()
+
+    @property
+    def planned_until(self) -> Optional[int]:
+        """End of the most recent window planned, or None if nothing was ever synced"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'planned_until'").fetchone()
+        return int(row[0]) if row else None
+
+    @property
+    def complete(self) -> bool:
+        """Whether every planned window has been downloaded"""
+        return self.planned_until is not None and not self.conn.execute("SELECT 1 FROM windows").fetchone()
+
+    def plan(self, now: int) -> List[SalesWindow]:
+        """Add windows up to now and return every window left to download, newest first"""
+        planned_until = self.planned_until
+        if planned_until is None:
+            starts = range(HISTORY_START, now, BACKFILL_WINDOW)
+            windows = [(start, min(start + BACKFILL_WINDOW, now)) for start in starts]
+        elif now > planned_until:
+            windows = [(planned_until - RESYNC_OVERLAP, now)]
+        else:
+            windows = []
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO windows (start, end) VALUES (?, ?)", windows)
+            if windows:
+                self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('planned_until', ?)", (now,))
+        rows = self.conn.execute("SELECT start, end, continuation FROM windows ORDER BY start DESC").fetchall()
+        return [SalesWindow(start, end, continuation) for start, end, continuation in rows]
+
+    def add_page(self, window: SalesWindow, sales: List[SaleRow], continuation: Optional[str]) -> None:
+        """Store a page of a window's sales, and the cursor for its next page (None if it was the last)"""
+        window.continuation = continuation
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO sales VALUES (?, ?, ?, ?)", sales)
+            if continuation is None:
+                self.conn.execute("DELETE FROM windows WHERE start = ?", (window.start,))
+            else:
+                self.conn.execute("UPDATE windows SET continuation = ? WHERE start = ?", (continuation, window.start))
+
+    def transactions(self, since: Optional[float] = None) -> List[Transaction]:
+        """Stored sales (at or after a timestamp, if given) in chronological order"""
+        rows = self.conn.execute(
+            "SELECT item_id, price, timestamp FROM sales WHERE timestamp >= ? ORDER BY timestamp",
+            (since if since is not None else 0,),
+        ).fetchall()
+        return [
+            Transaction(itemId=item_id, price=price, date=datetime.fromtimestamp(timestamp, tz=timezone.utc))
+            for item_id, price, timestamp in rows
+        ]
+
+
+def parse_sales(sales: List[Dict[str, Any]]) -> List[SaleRow]:
+    """Sale rows from a Reservoir sales API page"""
+    return [
+        (str(sale["id"]), str(sale["token"]["tokenId"]), sale["price"]["amount"]["usd"], int(sale["timestamp"]))
+        for sale in sales
+    ]
+
+
+async def fetch_window(store: SalesStore, contract: str, window: SalesWindow) -> bool:
+    """Download a window's remaining pages into the store; False if a request failed"""
+    while True:
+        url = (
+            f"{RESERVOIR_SALES_URL}?contract={contract}&startTimestamp={window.start}"
+            f"&endTimestamp={window.end}&limit={PAGE_LIMIT}"
+        )
+        if window.continuation:
+            url += f"&continuation={window.continuation}"
+
+        d = await async_http_transport.get_json(url, timeout=10, headers=RESERVOIR_HEADERS)
+        if "error" in d:
+            logger.error(f"Request to Reservoir Sales API failed: {d['error']}: {d['exception']}")
+            return False
+        try:
+            sales_data = d["response"]["sales"]
+            sales = parse_sales(sales_data)
+            continuation = d["response"].get("continuation")
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error(f"Mimicry: unable to parse Reservoir Sales API response: {e}")
+            return False
+
+        if len(sales_data) < PAGE_LIMIT:
+            continuation = None
+        store.add_page(window, sales, continuation)
+        if continuation is None:
+            return True
+
+
+async def sync_reservoir_sales(
+    store: SalesStore,
+    contract: str,
+    now: Optional[int] = None,
+    max_concurrency: int = MAX_CONCURRENT_WINDOWS,
+) -> bool:
+    """Download the collection's sales the store doesn't have yet
+
+    Returns:
+        True if the store now has every sale up to now. Otherwise the pages
+        downloaded are kept, and the next sync carries on from there.
+    """
+    windows = store.plan(now or int(time.time()))
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(window: SalesWindow) -> bool:
+        async with semaphore:
+            return await fetch_window(store, contract, window)
+
+    results = await asyncio.gather(*(fetch(window) for window in windows))
+    return all(results)
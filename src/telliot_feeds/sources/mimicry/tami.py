@@ -1,72 +1,103 @@
+"""Time Adjusted Market Index (TAMI) of an NFT collection
+
+The index value after each sale only depends on the last sale price of every
+item seen so far, so `TamiState` keeps a running sum of those prices instead
+of re-adding them for every sale: a collection's history is processed in
+linear time, and a new sale is applied in constant time.
+
+`TamiIndex` builds on that for reporters that compute the TAMI of the same
+collection over and over: it keeps the collection's sales and index state
+(optionally on disk), and only applies sales it hasn't seen. Which items are
+valid (see `filter_valid_transactions`) depends on the current time, and when
+that set changes the index is rebuilt from the stored sales.
+"""
+import datetime
+import os
+from pathlib import Path
 from typing import Any
 from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
 from typing import List
 from typing import Optional
 from typing import Union
 
+import numpy as np
+from dateutil.relativedelta import relativedelta
+
 from telliot_feeds.sources.mimicry.types import IndexValueHistoryItem
 from telliot_feeds.sources.mimicry.types import Transaction
 from telliot_feeds.sources.mimicry.utils import filter_valid_transactions
 from telliot_feeds.sources.mimicry.utils import sort_transactions
+from telliot_feeds.utils.log import get_logger
 
 
-def create_index_value_history(transaction_history: List[Transaction]) -> List[IndexValueHistoryItem]:
-    """Given a list of transactions, this creates a list that contains the index value at the
-    time of each transaction, and includes the transaction as well.
-
-    Args:
-    - transaction_history: A list of transactions sorted by date.
-
-    Returns:
-    - A list of IndexValueHistoryItem objects (itemId, price, indexValue, Transaction)."""
-    transaction_map: Dict[Union[float, int, str], Transaction] = {}
-
-    last_index_value = 0.0
-    last_divisor = 1.0
+logger = get_logger(__name__)
 
-    result = []
+ItemId = Union[float, int, str]
 
-    for i in range(len(transaction_history)):
-        transaction = transaction_history[i]
 
-        is_first_sale = transaction_map.get(transaction.itemId) is None
+class TamiState:
+    """Index state after a chronological sequence of sales"""
 
-        transaction_map[transaction.itemId] = transaction
+    def __init__(self) -> None:
+        #: last sale price of each item, in order of first sale
+        self.last_price: Dict[ItemId, Union[float, int]] = {}
+        #: price / index value at each item's last sale
+        self.last_ratio: Dict[ItemId, float] = {}
+        self.price_sum: Union[float, int] = 0
+        self.divisor = 1.0
+        self.index_value = 0.0
+        self.sales = 0
 
-        item_count = len(transaction_map)
+    def apply(self, item_id: ItemId, price: Union[float, int]) -> float:
+        """Add a sale and return the index value after it
 
-        all_last_sold_value = sum([transaction_map[item].price for item in transaction_map])
+        The divisor is adjusted when an item sells for the first time, so new
+        items don't move the index by themselves.
+        """
+        previous = self.last_price.get(item_id)
+        self.last_price[item_id] = price
+        self.price_sum += price if previous is None else price - previous
+        item_count = len(self.last_price)
 
-        index_value = all_last_sold_value / (item_count * last_divisor)
+        index_value = self.price_sum / (item_count * self.divisor)
+        if previous is None and self.sales:
+            self.divisor = self.divisor * (index_value / self.index_value)
+            index_value = self.price_sum / (item_count * self.divisor)
 
-        if i == 0:
-            last_index_value = index_value
+        self.index_value = index_value
+        self.sales += 1
+        self.last_ratio[item_id] = price / index_value
+        return index_value
 
-            result.append(
-                IndexValueHistoryItem(
-                    itemId=transaction.itemId, price=transaction.price, indexValue=index_value, transaction=transaction
-                )
-            )
-
-            continue
+    def tami(self) -> Optional[float]:
+        """Sum of every item's last sale price adjusted to the current index value"""
+        if not self.sales:
+            return None
+        time_adjusted_market_index: float = sum([self.index_value * ratio for ratio in self.last_ratio.values()])
+        return time_adjusted_market_index
 
-        next_divisor = last_divisor * (index_value / last_index_value) if is_first_sale else last_divisor
 
-        weighted_index_value = all_last_sold_value / (item_count * next_divisor)
+def create_index_value_history(transaction_history: List[Transaction]) -> List[IndexValueHistoryItem]:
+    """Given a list of transactions, this creates a list that contains the index value at the
+    time of each transaction, and includes the transaction as well.
 
-        last_index_value = weighted_index_value
-        last_divisor = next_divisor
+    Args:
+    - transaction_history: A list of transactions sorted by date.
 
-        result.append(
-            IndexValueHistoryItem(
-                itemId=transaction.itemId,
-                price=transaction.price,
-                indexValue=weighted_index_value,
-                transaction=transaction,
-            )
+    Returns:
+    - A list of IndexValueHistoryItem objects (itemId, price, indexValue, Transaction)."""
+    state = TamiState()
+    return [
+        IndexValueHistoryItem(
+            itemId=transaction.itemId,
+            price=transaction.price,
+            indexValue=state.apply(transaction.itemId, transaction.price),
+            transaction=transaction,
         )
-
-    return result
+        for transaction in transaction_history
+    ]
 
 
 def get_index_value(index_value_history: List[IndexValueHistoryItem]) -> Union[float, int]:
@@ -95,13 +126,126 @@ def tami(transaction_history: List[Transaction]) -> Optional[float]:
     """
     sorted_transactions = sort_transactions(transaction_history)
     valid_transactions = filter_valid_transactions(sorted_transactions)
-    index_value_history = create_index_value_history(valid_transactions)
 
-    if len(index_value_history) == 0:
-        return None
+    state = TamiState()
+    for transaction in valid_transactions:
+        state.apply(transaction.itemId, transaction.price)
+    return state.tami()
+
+
+class TamiIndex:
+    """TAMI of one collection, updated with new sales as they come in
 
-    index_value = get_index_value(index_value_history)
-    index_ratios = get_index_ratios(index_value_history)
-    time_adjusted_values = [index_value * item["indexRatio"] for item in index_ratios]
-    time_adjusted_market_index: float = sum(time_adjusted_values)
-    return time_adjusted_market_index
+    Item ids are kept as strings.
+    """
+
+    def __init__(self) -> None:
+        #: every sale seen, in the order applied
+        self.items = np.empty(0, dtype=str)
+        self.prices = np.empty(0, dtype=float)
+        self.timestamps = np.empty(0, dtype=float)
+        #: items whose sales are included in the index
+        self.valid: FrozenSet[str] = frozenset()
+        self.state = TamiState()
+
+    def valid_items(self, now: Optional[datetime.datetime] = None) -> FrozenSet[str]:
+        """Items with at least 2 sales in the last year and one in the last 6 months"""
+        if not len(self.items):
+            return frozenset()
+        now = now or datetime.datetime.now(datetime.UTC)
+        one_year_ago = (now - relativedelta(years=1)).timestamp()
+        six_months_ago = (now - relativedelta(months=6)).timestamp()
+
+        items, codes = np.unique(self.items, return_inverse=True)
+        past_year_sales = np.bincount(codes[self.timestamps >= one_year_ago], minlength=len(items))
+        recent_sales = np.bincount(codes[self.timestamps >= six_months_ago], minlength=len(items))
+        return frozenset(items[(past_year_sales >= 2) & (recent_sales > 0)].tolist())
+
+    def _unseen(self, transactions: Iterable[Transaction]) -> List[Transaction]:
+        """Sales not applied yet, sorted by date
+
+        Only stored sales at or after the earliest given one are compared
+        against, so passing just the newest sales is cheap.
+        """
+        new = sort_transactions(list(transactions))
+        if not new or not len(self.timestamps):
+            return new
+        overlap = self.timestamps >= new[0].date.timestamp()
+        seen = set(zip(self.items[overlap].tolist(), self.prices[overlap].tolist(), self.timestamps[overlap].tolist()))
+        return [tx for tx in new if (str(tx.itemId), float(tx.price), tx.date.timestamp()) not in seen]
+
+    def rebuild(self) -> None:
+        """Recompute the index state from every stored sale of a valid item"""
+        self.state = TamiState()
+        included = np.isin(self.items, list(self.valid))
+        for item_id, price in zip(self.items[included].tolist(), self.prices[included].tolist()):
+            self.state.apply(item_id, price)
+
+    def update(self, transactions: Iterable[Transaction], now: Optional[datetime.datetime] = None) -> Optional[float]:
+        """Add sales and return the collection's TAMI
+
+        Sales already applied are skipped, so the whole history can be passed
+        again. Sales older than the latest one applied (late arrivals) trigger
+        a rebuild, as does a change in which items are valid.
+        """
+        new = self._unseen(transactions)
+        out_of_order = bool(new) and len(self.timestamps) > 0 and new[0].date.timestamp() < self.timestamps[-1]
+        if new:
+            self.items = np.concatenate([self.items, [str(tx.itemId) for tx in new]])
+            self.prices = np.concatenate([self.prices, [tx.price for tx in new]])
+            self.timestamps = np.concatenate([self.timestamps, [tx.date.timestamp() for tx in new]])
+        if out_of_order:
+            order = np.argsort(self.timestamps, kind="stable")
+            self.items, self.prices, self.timestamps = self.items[order], self.prices[order], self.timestamps[order]
+
+        valid = self.valid_items(now)
+        if out_of_order or valid != self.valid:
+            self.valid = valid
+            self.rebuild()
+        else:
+            for tx in new:
+                if str(tx.itemId) in valid:
+                    self.state.apply(str(tx.itemId), float(tx.price))
+        return self.state.tami()
+
+    def save(self, path: Path) -> None:
+        """Write the sales and index state to a .npz file"""
+        state = self.state
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                items=self.items,
+                prices=self.prices,
+                timestamps=self.timestamps,
+                valid=np.array(sorted(self.valid), dtype=str),
+                state_items=np.array(list(state.last_price), dtype=str),
+                state_prices=np.array(list(state.last_price.values()), dtype=float),
+                state_ratios=np.array(list(state.last_ratio.values()), dtype=float),
+                state_scalars=np.array([state.price_sum, state.divisor, state.index_value, state.sales], dtype=float),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "TamiIndex":
+        """Read an index written by `save`; an empty index if there's none or it's unreadable"""
+        index = cls()
+        if not path.exists():
+            return index
+        try:
+            with np.load(path) as saved:
+                index.items = saved["items"]
+                index.prices = saved["prices"]
+                index.timestamps = saved["timestamps"]
+                index.valid = frozenset(saved["valid"].tolist())
+                state_items = saved["state_items"].tolist()
+                state = index.state
+                state.last_price = dict(zip(state_items, saved["state_prices"].tolist()))
+                state.last_ratio = dict(zip(state_items, saved["state_ratios"].tolist()))
+                price_sum, state.divisor, state.index_value, sales = saved["state_scalars"].tolist()
+                state.price_sum, state.sales = price_sum, int(sales)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Unable to read TAMI index {path}, rebuilding it: {e}")
+            return cls()
+        return index
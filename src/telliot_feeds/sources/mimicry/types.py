@@ -5,7 +5,7 @@ from typing import Union
 
 @dataclass
 class Transaction:
-    itemId: Union[float, int]
+    itemId: Union[float, int, str]
     price: Union[float, int]
     date: datetime
 
@@ -9,6 +9,7 @@ import requests
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.utils.http_sessions import pooled_session
 from telliot_feeds.utils.log import get_logger
 
 
@@ -18,7 +19,8 @@ logger = get_logger(__name__)
 def api_call(url: str) -> Union[dict[Any, Any], Any]:
     """Call any API and handle exceptions, return json dict to be parsed"""
     try:
-        r = requests.get(url)
+        with pooled_session(url) as s:
+            r = s.get(url)
         r.raise_for_status()
     except requests.exceptions.HTTPError as e:
         logger.error(e)
@@ -37,7 +37,7 @@ class CoinbaseCurrencyPriceService(WebPriceService):
         try:
             request_url = f"/v2/exchange-rates?currency={asset.upper()}"
 
-            d = self.get_url(request_url)
+            d = await self.fetch_url(request_url)
             if "error" in d:
                 logger.error(d)
                 return None, None
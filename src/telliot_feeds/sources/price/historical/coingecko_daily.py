@@ -1,20 +1,30 @@
+import time
 from dataclasses import dataclass
 from typing import Any
 from urllib.parse import urlencode
 
+import numpy as np
+
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_source import PriceSource
 from telliot_feeds.sources.price.spot.coingecko import coingecko_coin_id
 from telliot_feeds.sources.price.spot.coingecko import CoinGeckoSpotPriceService
+from telliot_feeds.utils.candle_store import CLOSE
+from telliot_feeds.utils.candle_store import get_candle_store
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.stdev_calculator import stdev_calculator
 
 
 logger = get_logger(__name__)
 
+DAY = 86400
+
 
 class CoingeckoDailyHistoricalPriceService(CoinGeckoSpotPriceService):
+    #: result depends on `days`, not just the asset pair
+    cacheable = False
+
     def __init__(self, days: int, **kwargs: Any) -> None:
         self.days = days
         super().__init__(**kwargs)
@@ -35,28 +45,33 @@ class CoingeckoDailyHistoricalPriceService(CoinGeckoSpotPriceService):
         if not coin_id:
             raise Exception("Asset not supported: {}".format(asset))
 
-        url_params = urlencode({"vs_currency": currency, "days": self.days, "interval": "daily"})
-        request_url = f"/api/v3/coins/{coin_id}/market_chart?{url_params}"
-
-        d = self.get_url(request_url)
-
-        if "error" in d:
-            if "api.coingecko.com used Cloudflare to restrict access" in str(d["exception"]):
-                logger.warning("CoinGecko API rate limit exceeded")
-            else:
-                logger.error(d)
-            return None, None
-        elif "response" in d:
-            response = d["response"]
-
-            if len(response["prices"]) < self.days + 1:
-                logger.error(f"Not enough data to generate a {self.days} volatility index")
+        store = get_candle_store("coingecko", f"{asset}{currency}", DAY)
+        now = int(time.time())
+        # the last `days` daily candles and today's
+        start = now // DAY * DAY - self.days * DAY
+
+        fetch_from = store.fetch_from(start, now)
+        if fetch_from is not None:
+            # coingecko returns prices since `days` ago: one at each midnight and the current one
+            days = max(-(-(now - fetch_from) // DAY) - 1, 1)
+            url_params = urlencode({"vs_currency": currency, "days": days, "interval": "daily"})
+            request_url = f"/api/v3/coins/{coin_id}/market_chart?{url_params}"
+
+            d = await self.fetch_url(request_url)
+
+            if "error" in d:
+                if "api.coingecko.com used Cloudflare to restrict access" in str(d["exception"]):
+                    logger.warning("CoinGecko API rate limit exceeded")
+                else:
+                    logger.error(d)
+                return None, None
+            elif "response" not in d:
+                msg = "Invalid response from get_url"
+                logger.error(msg)
                 return None, None
 
             try:
-                close_prices = [float(i[1]) for i in response["prices"]]
-                volatility = stdev_calculator(close_prices)
-                return volatility, datetime_now_utc()
+                prices = np.array(d["response"]["prices"], dtype=np.float64).reshape(-1, 2)
             except KeyError as e:
                 msg = "Error parsing Coingecko API response: KeyError: {}".format(e)
                 logger.error(msg)
@@ -65,10 +80,17 @@ class CoingeckoDailyHistoricalPriceService(CoinGeckoSpotPriceService):
                 logger.error(e)
                 return None, None
 
-        else:
-            msg = "Invalid response from get_url"
-            logger.error(msg)
+            # each price closes the daily candle ending at or after it
+            timestamps = -(-prices[:, 0].astype(np.int64) // 1000 // DAY) * DAY - DAY
+            values = np.full((len(prices), 5), np.nan)
+            values[:, CLOSE] = prices[:, 1]
+            store.append(timestamps, values, fetched_from=fetch_from, now=now)
+
+        close_prices = store.closes(start, now)
+        if len(close_prices) < self.days + 1:
+            logger.error(f"Not enough data to generate a {self.days} volatility index")
             return None, None
+        return stdev_calculator(close_prices), datetime_now_utc()
 
 
 @dataclass
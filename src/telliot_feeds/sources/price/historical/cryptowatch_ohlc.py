@@ -1,9 +1,15 @@
+import time
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Optional
 
+import numpy as np
+
+from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_source import PriceSource
 from telliot_feeds.sources.price.historical.cryptowatch import CryptowatchHistoricalPriceService
+from telliot_feeds.utils.candle_store import get_candle_store
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.stdev_calculator import stdev_calculator
 
@@ -29,31 +35,47 @@ class CryptowatchHistoricalOHLCPriceService(CryptowatchHistoricalPriceService):
         the Cryptowatch API using a timestamp. Historical prices are
         fetched from Cryptowatch's recorded Coinbase-pro data.
 
+        Returns the volatility of the close prices of candles closing in
+        the `period` before `ts`. Candles are kept in the shared candle
+        store, so only the ones that weren't final at the last fetch are
+        requested.
+
         Documentation for Cryptowatch API:
         https://docs.cryptowat.ch/rest-api/markets/ohlc
         """
-        candles, dt = await self.get_candles(
-            asset=asset, currency=currency, ts=ts, period=period, candle_periods=candle_periods
-        )
-        if candles is not None:
+        if ts is None:
+            ts = self.ts
+        store = get_candle_store("cryptowatch", f"{asset}{currency}".lower(), candle_periods)
+        # candles are stored by open time; Cryptowatch gives close times
+        start, end = ts - period - candle_periods, ts - candle_periods + 1
+        dt: Optional[datetime] = datetime_now_utc()
+
+        fetch_from = store.fetch_from(start, end)
+        if fetch_from is not None:
+            candles, dt = await self.get_candles(
+                asset=asset,
+                currency=currency,
+                ts=ts,
+                period=ts - fetch_from - candle_periods,
+                candle_periods=candle_periods,
+            )
+            if candles is None:
+                return None, None
             try:
-                if len(candles) < 30:
-                    logger.warning("Not enough data to calculate volatility.")
-                    return None, None
-                close_prices = [i[4] for i in candles]
-
-                volatility = stdev_calculator(close_prices)
-
-                return volatility, dt
-
-            except IndexError as e:
-                msg = f"Error parsing Cryptowatch API candle data: IndexError: {e}"
-                logger.error(msg)
-
-            except Exception as e:
-                logger.error(e)
-
-        return None, None
+                # [close time, open, high, low, close, volume, quote volume]
+                timestamps = np.array([int(i[0]) - candle_periods for i in candles], dtype=np.int64)
+                values = np.array([i[1:6] for i in candles], dtype=np.float64).reshape(-1, 5)
+            except (IndexError, TypeError, ValueError) as e:
+                logger.error(f"Error parsing Cryptowatch API candle data: {type(e).__name__}: {e}")
+                return None, None
+            # nothing after ts was requested
+            store.append(timestamps, values, fetched_from=fetch_from, now=min(time.time(), ts))
+
+        close_prices = store.closes(start, end)
+        if len(close_prices) < 30:
+            logger.warning("Not enough data to calculate volatility.")
+            return None, None
+        return stdev_calculator(close_prices), dt
 
 
 @dataclass
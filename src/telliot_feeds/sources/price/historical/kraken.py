@@ -11,6 +11,7 @@ from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.utils.http_sessions import pooled_session
 from telliot_feeds.utils.log import get_logger
 
 
@@ -27,6 +28,9 @@ kraken_currencies = {"USD"}
 class KrakenHistoricalPriceService(WebPriceService):
     """Kraken Historical Price Service"""
 
+    #: result depends on `ts`, not just the asset pair
+    cacheable = False
+
     def __init__(
         self,
         timeout: float = 0.5,
@@ -54,7 +58,7 @@ class KrakenHistoricalPriceService(WebPriceService):
 
         request_url = self.url + url
 
-        with requests.Session() as s:
+        with pooled_session(request_url) as s:
             try:
                 r = s.get(request_url, timeout=self.timeout)
                 json_data = r.json()
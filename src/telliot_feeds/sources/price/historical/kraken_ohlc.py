@@ -1,10 +1,18 @@
+import time
 from dataclasses import dataclass
 from typing import Any
 from typing import Optional
+from typing import Tuple
 from urllib.parse import urlencode
 
+import numpy as np
+import numpy.typing as npt
+
+from telliot_feeds.dtypes.datapoint import datetime_now_utc
+from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_source import PriceSource
 from telliot_feeds.sources.price.historical.kraken import KrakenHistoricalPriceService
+from telliot_feeds.utils.candle_store import get_candle_store
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.stdev_calculator import stdev_calculator
 
@@ -19,6 +27,9 @@ kraken_currencies = {"USD"}
 
 
 class KrakenHistoricalPriceServiceOHLC(KrakenHistoricalPriceService):
+    #: Candle length in seconds
+    interval = 86400
+
     def get_request_url(self, asset: str, currency: str, period_start: int) -> str:
         """Assemble Kraken historical trades request url."""
         asset = asset.upper()
@@ -29,7 +40,7 @@ class KrakenHistoricalPriceServiceOHLC(KrakenHistoricalPriceService):
         if currency not in kraken_currencies:
             logger.warning(f"Currency not supported: {currency}")
 
-        url_params = urlencode({"pair": f"{asset}{currency}", "since": period_start, "interval": 1440})
+        url_params = urlencode({"pair": f"{asset}{currency}", "since": period_start, "interval": self.interval // 60})
         # Source: https://docs.kraken.com/rest/#operation/getRecentTrades
         return f"/0/public/OHLC?{url_params}"
 
@@ -54,6 +65,51 @@ class KrakenHistoricalPriceServiceOHLC(KrakenHistoricalPriceService):
             return None
         return volatility
 
+    def resp_candles_parse(
+        self, asset: str, currency: str, resp: dict[Any, Any]
+    ) -> Optional[Tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]]:
+        """Gets open times and [open, high, low, close, volume] of OHLC candles from Kraken API"""
+        pair_key = f"X{asset.upper()}Z{currency.upper()}"
+        try:
+            # [time, open, high, low, close, vwap, volume, count]
+            data = resp["result"][pair_key]
+            timestamps = np.array([int(i[0]) for i in data], dtype=np.int64)
+            values = np.array([[i[1], i[2], i[3], i[4], i[6]] for i in data], dtype=np.float64).reshape(-1, 5)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            logger.error(f"Error parsing Kraken API response: {type(e).__name__}: {e}")
+            return None
+        return timestamps, values
+
+    async def get_price(self, asset: str, currency: str, ts: Optional[int] = None) -> OptionalDataPoint[float]:
+        """Implement PriceServiceInterface
+
+        Returns the volatility of daily close prices since `ts`. Candles
+        are kept in the shared candle store, so only the ones that weren't
+        final at the last fetch are requested.
+        """
+        if ts is None:
+            ts = self.ts
+        store = get_candle_store("kraken", f"{asset}{currency}".lower(), self.interval)
+        now = int(time.time())
+
+        fetch_from = store.fetch_from(ts, now)
+        if fetch_from is not None:
+            # candles opened after `since` are returned
+            d = self.get_url(self.get_request_url(asset, currency, fetch_from - 1))
+            if "error" in d:
+                logger.error(d)
+                return None, None
+            candles = self.resp_candles_parse(asset, currency, d["response"])
+            if candles is None:
+                return None, None
+            store.append(*candles, fetched_from=fetch_from, now=now)
+
+        close_prices = store.closes(ts, now)
+        if len(close_prices) < 30:
+            logger.warning("Not enough data to calculate volatility")
+            return None, None
+        return stdev_calculator(close_prices), datetime_now_utc()
+
 
 @dataclass
 class KrakenHistoricalPriceSourceOHLC(PriceSource):
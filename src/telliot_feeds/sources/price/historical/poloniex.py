@@ -11,6 +11,7 @@ import requests
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.utils.http_sessions import pooled_session
 from telliot_feeds.utils.log import get_logger
 
 
@@ -52,7 +53,7 @@ class PoloniexHistoricalPriceService:
 
         request_url = self.url + url
 
-        with requests.Session() as s:
+        with pooled_session(request_url) as s:
             try:
                 r = s.get(request_url, timeout=self.timeout)
                 json_data = r.json()
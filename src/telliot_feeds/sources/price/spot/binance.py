@@ -33,7 +33,7 @@ class BinanceSpotPriceService(WebPriceService):
 
         request_url = f"/api/v1/klines?{url_params}"
 
-        d = self.get_url(request_url)
+        d = await self.fetch_url(request_url)
 
         if "error" in d:
             logger.error(d)
@@ -40,7 +40,7 @@ class BitfinexSpotPriceService(WebPriceService):
 
         request_url = f"/v2/tickers?symbols=t{asset}{currency}"
 
-        d = self.get_url(request_url)
+        d = await self.fetch_url(request_url)
 
         if "error" in d:
             logger.error(d)
@@ -1,19 +1,18 @@
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
 from urllib.parse import urlencode
 
-from requests import Session
-from requests.exceptions import ConnectionError
-from requests.exceptions import Timeout
-from requests.exceptions import TooManyRedirects
-from telliot_core.apps.telliot_config import TelliotConfig
-
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.pricing.batching import RequestBatcher
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.shared_config import get_api_key
 
 
 logger = get_logger(__name__)
@@ -112,12 +111,15 @@ coingecko_coin_id = {
     "usde": "ethena-usde",
 }
 
-API_KEY = TelliotConfig().api_keys.find(name="coingecko")[0].key
+API_KEY = get_api_key("coingecko")
 
 
 class CoinGeckoSpotPriceService(WebPriceService):
     """CoinGecko Price Service"""
 
+    #: Shared by all instances so concurrent lookups go out as one request
+    batcher: RequestBatcher[Tuple[str, str]] = RequestBatcher()
+
     def __init__(self, **kwargs: Any) -> None:
         kwargs["name"] = "CoinGecko Price Service"
         if API_KEY == "":
@@ -126,6 +128,28 @@ class CoinGeckoSpotPriceService(WebPriceService):
             kwargs["url"] = "https://pro-api.coingecko.com"
         super().__init__(**kwargs)
 
+    async def fetch_prices(self, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Fetch prices for several (coin id, currency) pairs in one request
+
+        `simple/price` returns every requested id in every requested
+        currency, so the same response is handed back for each key.
+        """
+        coin_ids = sorted({coin_id for coin_id, _ in keys})
+        currencies = sorted({currency for _, currency in keys})
+
+        url_params = urlencode({"ids": ",".join(coin_ids), "vs_currencies": ",".join(currencies)})
+        request_url = "/api/v3/simple/price?{}".format(url_params)
+
+        headers = None
+        if API_KEY != "":
+            headers = {
+                "Accepts": "application/json",
+                "x-cg-pro-api-key": API_KEY,
+            }
+
+        d = await self.fetch_url(request_url, headers=headers)
+        return {key: d for key in keys}
+
     async def get_price(self, asset: str, currency: str) -> OptionalDataPoint[float]:
         """Implement PriceServiceInterface
 
@@ -142,30 +166,14 @@ class CoinGeckoSpotPriceService(WebPriceService):
         if not coin_id:
             raise Exception("Asset not supported: {}".format(asset))
 
-        url_params = urlencode({"ids": coin_id, "vs_currencies": currency})
-        request_url = self.url + "/api/v3/simple/price?{}".format(url_params)
-
-        session = Session()
-        if API_KEY != "":
-            headers = {
-                "Accepts": "application/json",
-                "x-cg-pro-api-key": API_KEY,
-            }
-            session.headers.update(headers)
+        d = await self.batcher.fetch((coin_id, currency), self.fetch_prices, self.batch_group())
 
-        try:
-            response = session.get(request_url)
-
-            if response.status_code >= 400:
-                logger.warning(f"CoinGecko Error Status {response.status_code}: {response}")
-                return None, None
-
-            res = response.json()
-
-        except (ConnectionError, Timeout, TooManyRedirects) as e:
-            logger.warning(e)
+        if "error" in d:
+            logger.warning(f"CoinGecko Error {d['error']}: {d['exception']}")
             return None, None
 
+        res = d["response"]
+
         try:
             price = float(res[coin_id][currency])
             return price, datetime_now_utc()
@@ -208,7 +216,7 @@ class CoinGeckoBRC20SpotPriceService(WebPriceService):
         url_params = urlencode({"ids": coin_id, "vs_currencies": currency})
         request_url = "/api/v3/simple/price?{}".format(url_params)
 
-        d = self.get_url(request_url)
+        d = await self.fetch_url(request_url)
 
         if "error" in d:
             if "api.coingecko.com used Cloudflare to restrict access" in str(d["exception"]):
@@ -1,19 +1,18 @@
-import json
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
-
-from requests import Session
-from requests.exceptions import ConnectionError
-from requests.exceptions import Timeout
-from requests.exceptions import TooManyRedirects
-from telliot_core.apps.telliot_config import TelliotConfig
+from typing import Dict
+from typing import List
+from typing import Tuple
+from urllib.parse import urlencode
 
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.pricing.batching import RequestBatcher
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.shared_config import get_api_key
 
 logger = get_logger(__name__)
 
@@ -33,17 +32,41 @@ coinmarketcap_ids = {
     "yusd": "34304",
 }
 
-API_KEY = TelliotConfig().api_keys.find(name="coinmarketcap")[0].key
+API_KEY = get_api_key("coinmarketcap")
 
 
 class CoinMarketCapSpotPriceService(WebPriceService):
     """CoinMarketCap Price Service"""
 
+    #: Shared by all instances so concurrent lookups go out as one request
+    batcher: RequestBatcher[Tuple[str, str]] = RequestBatcher()
+
     def __init__(self, **kwargs: Any) -> None:
         kwargs["name"] = "CoinMarketCap Price Service"
         kwargs["url"] = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest"
         super().__init__(**kwargs)
 
+    async def fetch_quotes(self, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Fetch quotes for several (CoinMarketCap id, currency) pairs in one request
+
+        `quotes/latest` accepts comma-separated ids and conversion currencies
+        and keys the response by id, so the same response is handed back
+        for each key.
+        """
+        ids = sorted({cmc_id for cmc_id, _ in keys})
+        currencies = sorted({currency for _, currency in keys})
+
+        url_params = urlencode({"id": ",".join(ids), "convert": ",".join(currencies)})
+        request_url = f"?{url_params}"
+
+        headers = {
+            "Accepts": "application/json",
+            "X-CMC_PRO_API_KEY": API_KEY,
+        }
+
+        d = await self.fetch_url(request_url, headers=headers)
+        return {key: d for key in keys}
+
     async def get_price(self, asset: str, currency: str) -> OptionalDataPoint[float]:
 
         # check for api key in config
@@ -58,31 +81,16 @@ class CoinMarketCapSpotPriceService(WebPriceService):
         if asset_lower not in coinmarketcap_ids:
             raise Exception(f"Asset not supported: {asset}. Only assets with ID mappings are supported.")
 
-        request_url = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest"
-        parameters = {"id": coinmarketcap_ids[asset_lower]}
         logger.debug(f"Using CoinMarketCap ID {coinmarketcap_ids[asset_lower]} for asset {asset}")
 
-        headers = {
-            "Accepts": "application/json",
-            "X-CMC_PRO_API_KEY": API_KEY,
-        }
-
-        session = Session()
-        session.headers.update(headers)
+        d = await self.batcher.fetch((coinmarketcap_ids[asset_lower], currency), self.fetch_quotes, self.batch_group())
 
-        try:
-            response = session.get(request_url, params=parameters)
-
-            if response.status_code >= 400:
-                logger.warning(f"CoinMarketCap Error Status {response.status_code}")
-                return None, None
-
-            data = json.loads(response.text)
-
-        except (ConnectionError, Timeout, TooManyRedirects) as e:
-            logger.warning(e)
+        if "error" in d:
+            logger.warning(f"CoinMarketCap Error {d['error']}: {d['exception']}")
             return None, None
 
+        data = d["response"]
+
         try:
             # Response is always keyed by the ID when using ID parameter
             data_key = coinmarketcap_ids[asset_lower]
@@ -1,10 +1,15 @@
+import asyncio
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
 from urllib.parse import urlencode
 
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.pricing.batching import RequestBatcher
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
 from telliot_feeds.utils.log import get_logger
@@ -12,15 +17,57 @@ from telliot_feeds.utils.log import get_logger
 
 logger = get_logger(__name__)
 
+#: Distinct coins needed in one batch before the all-tickers endpoint is used
+COINPAPRIKA_BULK_THRESHOLD = 5
+
+#: Max currencies the tickers endpoint accepts in `quotes`
+COINPAPRIKA_MAX_QUOTES = 3
+
 
 class CoinpaprikaSpotPriceService(WebPriceService):
     """Coinpaprika Price Service"""
 
+    #: Shared by all instances so concurrent lookups go out as one request
+    batcher: RequestBatcher[Tuple[str, str]] = RequestBatcher()
+
     def __init__(self, **kwargs: Any) -> None:
         kwargs["name"] = "Coinpaprika Price Service"
         kwargs["url"] = "https://api.coinpaprika.com"
         super().__init__(**kwargs)
 
+    async def fetch_tickers(self, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Fetch tickers for several (coin id, currency) pairs
+
+        The all-tickers endpoint returns every coin, so it is only worth
+        using once enough distinct coins are requested together; smaller
+        batches fetch each coin's ticker (in all requested currencies).
+        """
+        currencies = sorted({currency for _, currency in keys})
+        quotes = urlencode({"quotes": ",".join(currencies)})
+        assets = sorted({asset for asset, _ in keys})
+
+        if len(assets) < COINPAPRIKA_BULK_THRESHOLD or len(currencies) > COINPAPRIKA_MAX_QUOTES:
+            responses = await asyncio.gather(*[self.fetch_url(f"/v1/tickers/{asset}?&{quotes}") for asset in assets])
+            by_asset = dict(zip(assets, responses))
+            return {key: by_asset[key[0]] for key in keys}
+
+        d = await self.fetch_url(f"/v1/tickers?{quotes}")
+        if "error" in d:
+            return {key: d for key in keys}
+        if not isinstance(d["response"], list):
+            # e.g. an error object or rate limit message instead of the ticker list
+            error = {"error": "Unexpected all-tickers response", "exception": Exception(d["response"])}
+            return {key: error for key in keys}
+
+        tickers = {ticker.get("id"): ticker for ticker in d["response"] if isinstance(ticker, dict)}
+        results: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for asset, currency in keys:
+            if asset in tickers:
+                results[(asset, currency)] = {"response": tickers[asset]}
+            else:
+                results[(asset, currency)] = {"error": "Asset not found", "exception": Exception(asset)}
+        return results
+
     async def get_price(self, asset: str, currency: str) -> OptionalDataPoint[float]:
         """Implement PriceServiceInterface
 
@@ -29,11 +76,7 @@ class CoinpaprikaSpotPriceService(WebPriceService):
         asset = asset.lower()
         currency = currency.upper()
 
-        url_params = urlencode({"quotes": f"{currency}"})
-
-        request_url = f"/v1/tickers/{asset}?&{url_params}"
-
-        d = self.get_url(request_url)
+        d = await self.batcher.fetch((asset, currency), self.fetch_tickers, self.batch_group())
 
         if "error" in d:
             logger.error(d)
@@ -68,7 +111,6 @@ class CoinpaprikaSpotPriceSource(PriceSource):
 
 
 if __name__ == "__main__":
-    import asyncio
 
     async def main() -> None:
         source = CoinpaprikaSpotPriceSource(asset="eth-ethereum", currency="btc")
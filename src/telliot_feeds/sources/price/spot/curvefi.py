@@ -1,9 +1,15 @@
+import asyncio
+import time
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
 
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.pricing.async_http import async_http_transport
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
 from telliot_feeds.utils.log import get_logger
@@ -22,6 +28,112 @@ contract_map = {
 }
 
 
+#: Curve API endpoint listing every main-registry pool on Ethereum
+CURVE_POOLS_URL = "https://api.curve.finance/api/getPools/ethereum/main"
+
+#: Seconds a downloaded pool snapshot is reused before it is refreshed
+CURVE_POOLS_REFRESH_INTERVAL = 30.0
+
+
+class CurvePoolSnapshot:
+    """Periodically refreshed index of coin USD prices from Curve's pool list
+
+    The pool list is several MB of JSON, so it is downloaded at most once
+    per `refresh_interval` and reduced to an address -> usdPrice dict that
+    all Curve price lookups share. Concurrent refreshes await one download.
+    """
+
+    def __init__(
+        self,
+        url: str = CURVE_POOLS_URL,
+        refresh_interval: float = CURVE_POOLS_REFRESH_INTERVAL,
+        timeout: float = 10.0,
+    ) -> None:
+        self.url = url
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        self._prices: Dict[str, float] = {}
+        self._updated: Optional[float] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @staticmethod
+    def build_index(pool_data: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Map lowercase coin address to the first usdPrice listed for it"""
+        prices: Dict[str, float] = {}
+        for pool in pool_data:
+            for coin in pool.get("coins") or []:
+                address = coin.get("address")
+                price = coin.get("usdPrice")
+                if address is None or price is None:
+                    continue
+                prices.setdefault(address.lower(), price)
+        return prices
+
+    def is_fresh(self) -> bool:
+        return self._updated is not None and time.monotonic() - self._updated < self.refresh_interval
+
+    async def refresh(self) -> bool:
+        """Download the pool list and rebuild the index
+
+        Returns:
+            True if the index was rebuilt
+        """
+        d = await async_http_transport.get_json(self.url, timeout=self.timeout)
+        if "error" in d:
+            logger.error(d)
+            return False
+
+        data = d["response"].get("data") if isinstance(d["response"], dict) else None
+        if data is None:
+            logger.error("No data in returned response")
+            return False
+        pool_data = data.get("poolData")
+        if pool_data is None:
+            logger.error("Failed to parse response data from Curve Finance API")
+            return False
+
+        self._prices = self.build_index(pool_data)
+        self._updated = time.monotonic()
+        logger.debug(f"Indexed {len(self._prices)} Curve coin prices")
+        return True
+
+    async def prices(self) -> Optional[Dict[str, float]]:
+        """Return the address -> usdPrice index, refreshing it if stale
+
+        Returns None if the snapshot is stale and could not be refreshed.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # asyncio.Lock is bound to the loop it is first used on
+            self._loop = loop
+            self._lock = asyncio.Lock()
+        assert self._lock is not None
+
+        if not self.is_fresh():
+            async with self._lock:
+                # another caller may have refreshed while we waited
+                if not self.is_fresh() and not await self.refresh():
+                    return None
+        return self._prices
+
+    async def get_usd_price(self, address: str) -> Optional[float]:
+        """Return the USD price of a coin address, or None if not listed"""
+        prices = await self.prices()
+        if prices is None:
+            return None
+        return prices.get(address.lower())
+
+    def clear(self) -> None:
+        """Drop the index so the next lookup downloads a new snapshot"""
+        self._prices = {}
+        self._updated = None
+
+
+#: Process-wide snapshot shared by the Curve price services
+curve_pool_snapshot = CurvePoolSnapshot()
+
+
 class CurveFinanceSpotPriceService(WebPriceService):
     """CurveFinance Price Service"""
 
@@ -37,56 +149,26 @@ class CurveFinanceSpotPriceService(WebPriceService):
         if asset not in contract_map:
             logger.error(f"Asset not supported: {asset}")
             return None, None
-        asset_address = contract_map[asset]
+        if currency != "usd" and currency not in contract_map:
+            logger.error(f"Currency not supported: {currency}")
+            return None, None
 
-        request_url = "/api/getPools/ethereum/main"
+        prices = await curve_pool_snapshot.prices()
+        if prices is None:
+            return None, None
 
-        d = self.get_url(request_url)
+        asset_price = prices.get(contract_map[asset].lower())
+        if asset_price is None:
+            logger.error(f"Unable to find price for {asset} from Curve Finance API")
+            return None, None
+        if currency == "usd":
+            return asset_price, datetime_now_utc()
 
-        if "error" in d:
-            logger.error(d)
+        currency_price = prices.get(contract_map[currency].lower())
+        if currency_price is None:
+            logger.error(f"Unable to find price for {currency} from Curve Finance API")
             return None, None
-        elif "response" in d:
-            response = d["response"]
-            data = response.get("data")
-
-            if data is None:
-                logger.error("No data in returned response")
-                return None, None
-            pool_data = data.get("poolData")
-            if pool_data is None:
-                logger.error("Failed to parse response data from Curve Finance API")
-                return None, None
-            asset_price = None
-            for pool in pool_data:
-                for coin in pool["coins"]:
-                    if coin["address"].lower() == asset_address.lower():
-                        asset_price = coin.get("usdPrice")
-                        break
-                if asset_price is not None:
-                    break
-
-            if asset_price is None:
-                logger.error(f"Unable to find price for {asset} from Curve Finance API")
-                return None, None
-            if currency == "usd":
-                return asset_price, datetime_now_utc()
-            else:
-                currency_price = None
-                for pool in pool_data:
-                    for coin in pool["coins"]:
-                        if coin["address"].lower() == contract_map[currency].lower():
-                            currency_price = coin.get("usdPrice")
-                            break
-                    if currency_price is not None:
-                        break
-                if currency_price is None:
-                    logger.error(f"Unable to find price for {currency} from Curve Finance API")
-                    return None, None
-                return asset_price / currency_price, datetime_now_utc()
-
-        else:
-            raise Exception("Invalid response from get_url")
+        return asset_price / currency_price, datetime_now_utc()
 
 
 @dataclass
@@ -97,7 +179,6 @@ class CurveFinanceSpotPriceSource(PriceSource):
 
 
 if __name__ == "__main__":
-    import asyncio
 
     async def main() -> None:
         source = CurveFinanceSpotPriceSource(asset="steth", currency="btc")
@@ -6,6 +6,7 @@ from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.sources.price.spot.curvefi import curve_pool_snapshot
 from telliot_feeds.utils.log import get_logger
 
 
@@ -44,7 +45,11 @@ class CurveFiUSDPriceService(WebPriceService):
         super().__init__(**kwargs)
 
     async def get_price(self, asset: str, currency: str) -> OptionalDataPoint[float]:
-        """This implementation gets the price from the Curve finance API."""
+        """This implementation gets the price from the Curve finance API.
+
+        Coins listed in the shared Curve pool snapshot are priced from it;
+        others are looked up individually on the curve-prices API.
+        """
         asset = asset.lower()
         currency = currency.lower()
         if asset not in ethereum_contract_map:
@@ -56,9 +61,13 @@ class CurveFiUSDPriceService(WebPriceService):
             logger.error("Service for usd pairs only")
             return None, None
 
+        snapshot_price = await curve_pool_snapshot.get_usd_price(asset_address)
+        if snapshot_price is not None:
+            return snapshot_price, datetime_now_utc()
+
         request_url = f"/ethereum/{asset_address}"
 
-        d = self.get_url(request_url)
+        d = await self.fetch_url(request_url)
 
         if "error" in d:
             logger.error(d)
@@ -1,10 +1,15 @@
+import asyncio
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
 from urllib.parse import urlencode
 
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.pricing.batching import RequestBatcher
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
 from telliot_feeds.utils.log import get_logger
@@ -43,11 +48,31 @@ KRAKEN_CURRENCIES = {"USD"}
 class KrakenSpotPriceService(WebPriceService):
     """Kraken Price Service"""
 
+    #: Shared by all instances so concurrent lookups go out as one request
+    batcher: RequestBatcher[Tuple[str, str]] = RequestBatcher()
+
     def __init__(self, **kwargs: Any) -> None:
         kwargs["name"] = "Kraken Price Service"
         kwargs["url"] = "https://api.kraken.com"
         super().__init__(**kwargs)
 
+    async def fetch_tickers(self, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Fetch tickers for several (asset, currency) pairs in one request
+
+        Kraken rejects the whole request if any pair is unknown, in which
+        case each pair is retried on its own so the valid ones still resolve.
+        """
+        pairs = [f"{asset}{currency}" for asset, currency in keys]
+        d = await self.fetch_url(f"/0/public/Ticker?{urlencode({'pair': ','.join(pairs)})}")
+
+        if len(keys) > 1 and "response" in d and d["response"].get("error"):
+            responses = await asyncio.gather(
+                *[self.fetch_url(f"/0/public/Ticker?{urlencode({'pair': pair})}") for pair in pairs]
+            )
+            return dict(zip(keys, responses))
+
+        return {key: d for key in keys}
+
     async def get_price(self, asset: str, currency: str) -> OptionalDataPoint[float]:
         """Implement PriceServiceInterface
 
@@ -61,11 +86,7 @@ class KrakenSpotPriceService(WebPriceService):
         if currency not in KRAKEN_CURRENCIES:
             logger.warning(f"Currency not supported: {currency}")
 
-        url_params = urlencode({"pair": f"{asset}{currency}"})
-
-        request_url = f"/0/public/Ticker?{url_params}"
-
-        d = self.get_url(request_url)
+        d = await self.batcher.fetch((asset, currency), self.fetch_tickers, self.batch_group())
 
         if "error" in d:
             logger.error(d)
@@ -8,6 +8,7 @@ from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.utils.http_sessions import pooled_session
 from telliot_feeds.utils.log import get_logger
 
 
@@ -54,7 +55,7 @@ class MaverickV2PriceService(WebPriceService):
 
         request_url = self.url + "/subgraphs/name/maverickprotocol/maverick-mainnet-app"
 
-        with requests.Session() as s:
+        with pooled_session(request_url) as s:
             try:
                 r = s.post(request_url, headers=headers, json=json_data, timeout=self.timeout)
                 res = r.json()
@@ -10,6 +10,7 @@ from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
 from telliot_feeds.sources.price.spot.coingecko import CoinGeckoSpotPriceSource
+from telliot_feeds.utils.http_sessions import pooled_session
 from telliot_feeds.utils.log import get_logger
 
 
@@ -57,7 +58,7 @@ class OsmosisPoolPriceService(WebPriceService):
         """
         sqs_url = f"{OSMOSIS_SQS_URL}/tokens/prices?base={USDN_IBC}"
         try:
-            with requests.Session() as s:
+            with pooled_session(sqs_url) as s:
                 r = s.get(sqs_url, timeout=self.timeout)
                 if r.status_code != 200:
                     logger.warning(f"Osmosis SQS returned status {r.status_code} for USDN price")
@@ -113,7 +114,7 @@ class OsmosisPoolPriceService(WebPriceService):
         pool_url = f"{self.url}/osmosis/gamm/v1beta1/pools/{STATOM_ATOM_POOL_ID}"
 
         try:
-            with requests.Session() as s:
+            with pooled_session(pool_url) as s:
                 r = s.get(pool_url, timeout=self.timeout)
                 if r.status_code != 200:
                     logger.warning(f"Osmosis LCD returned status {r.status_code} for pool {STATOM_ATOM_POOL_ID}")
@@ -3,14 +3,14 @@ from dataclasses import field
 from typing import Any
 
 import requests
-from requests import Session
-from telliot_core.apps.telliot_config import TelliotConfig
 
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.utils.http_sessions import pooled_session
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.shared_config import get_api_key
 
 
 logger = get_logger(__name__)
@@ -18,7 +18,7 @@ pancakeswap_map = {
     "wbnb": "0xbb4cdb9cbd36b01bd1cbaebf2de08d9173bc095c",
 }
 
-API_KEY = TelliotConfig().api_keys.find(name="thegraph")[0].key
+API_KEY = get_api_key("thegraph")
 
 
 class PancakeswapPriceService(WebPriceService):
@@ -48,14 +48,13 @@ class PancakeswapPriceService(WebPriceService):
 
         request_url = f"{self.url}/api/subgraphs/id/Hv1GncLY5docZoGtXjo4kwbTvxm3MAhVZqBZE4sUT9eZ"
 
-        session = Session()
+        headers = {"Accepts": "application/json"}
         if API_KEY != "":
-            headers = {"Accepts": "application/json", "Authorization": f"Bearer {API_KEY}"}
-            session.headers.update(headers)
+            headers["Authorization"] = f"Bearer {API_KEY}"
         if API_KEY == "":
             logger.warning("No Graph API key found for Uniswap prices!")
 
-        with requests.Session() as s:
+        with pooled_session(request_url) as s:
             try:
                 r = s.post(request_url, headers=headers, json=json_data, timeout=self.timeout)
                 res = r.json()
@@ -3,14 +3,14 @@ from dataclasses import field
 from typing import Any
 
 import requests
-from requests import Session
-from telliot_core.apps.telliot_config import TelliotConfig
 
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.utils.http_sessions import pooled_session
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.shared_config import get_api_key
 
 
 logger = get_logger(__name__)
@@ -20,7 +20,7 @@ uniV3Optimism_map = {
     "op": "0x4200000000000000000000000000000000000042",
 }
 
-API_KEY = TelliotConfig().api_keys.find(name="thegraph")[0].key
+API_KEY = get_api_key("thegraph")
 
 
 class UniV3OptimismPriceService(WebPriceService):
@@ -52,15 +52,13 @@ class UniV3OptimismPriceService(WebPriceService):
 
         request_url = f"{self.url}/api/subgraphs/id/Cghf4LfVqPiFw6fp6Y5X5Ubc8UpmUhSfJL82zwiBFLaj"
 
-        session = Session()
         headers = {"Accepts": "application/json"}
         if API_KEY != "":
             headers["Authorization"] = f"Bearer {API_KEY}"
-            session.headers.update(headers)
         if API_KEY == "":
             logger.warning("No Graph API key found for Uniswap prices!")
 
-        with requests.Session() as s:
+        with pooled_session(request_url) as s:
             try:
                 r = s.post(request_url, headers=headers, json=json_data, timeout=self.timeout)
                 res = r.json()
@@ -3,7 +3,6 @@ from dataclasses import field
 from typing import Any
 from typing import Optional
 
-from telliot_core.apps.telliot_config import TelliotConfig
 from web3 import Web3
 
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
@@ -11,6 +10,7 @@ from telliot_feeds.feeds.eth_usd_feed import eth_usd_median_feed
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.shared_config import get_config
 
 logger = get_logger(__name__)
 
@@ -25,7 +25,7 @@ class RethSpotPriceService(WebPriceService):
         kwargs["name"] = "Custom rETH Price Service"
         kwargs["url"] = ""
         super().__init__(**kwargs)
-        self.cfg = TelliotConfig()
+        self.cfg = get_config()
 
     def get_reth_eth_ratio(self) -> Optional[float]:
         endpoint = self.cfg.endpoints.find(chain_id=1)
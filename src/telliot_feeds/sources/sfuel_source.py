@@ -2,13 +2,12 @@ from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
 
-from telliot_core.apps.telliot_config import TelliotConfig
-
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.shared_config import get_config
 
 logger = get_logger(__name__)
 
@@ -21,7 +20,7 @@ class sFuelHelperService(WebPriceService):
         kwargs["url"] = ""
         kwargs["timeout"] = 10.0
         super().__init__(**kwargs)
-        self.cfg = TelliotConfig()
+        self.cfg = get_config()
 
     async def get_price(self, asset: str, currency: str) -> OptionalDataPoint[float]:
         """Get $1 price for sFUEL (which is free)"""
@@ -4,7 +4,6 @@ from typing import Any
 from typing import Optional
 
 from eth_typing import HexStr
-from telliot_core.apps.telliot_config import TelliotConfig
 from web3 import Web3
 
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
@@ -15,6 +14,7 @@ from telliot_feeds.sources.price.spot.coinpaprika import CoinpaprikaSpotPriceSou
 from telliot_feeds.sources.price.spot.curvefiprice import CurveFiUSDPriceSource
 from telliot_feeds.sources.price_aggregator import PriceAggregator
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.shared_config import get_config
 
 logger = get_logger(__name__)
 
@@ -28,7 +28,7 @@ class sUSDESpotPriceService(WebPriceService):
         kwargs["name"] = "Custom sUSDe Price Service"
         kwargs["url"] = ""
         super().__init__(**kwargs)
-        self.cfg = TelliotConfig()
+        self.cfg = get_config()
 
     def get_susde_usde_ratio(self) -> Optional[float]:
         """Read totalAssets / totalSupply from the sUSDe ERC4626 vault to get the sUSDe/USDe ratio."""
@@ -4,7 +4,6 @@ from typing import Any
 from typing import Optional
 
 from eth_typing import HexStr
-from telliot_core.apps.telliot_config import TelliotConfig
 from web3 import Web3
 
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
@@ -14,6 +13,7 @@ from telliot_feeds.sources.price.spot.coingecko import CoinGeckoSpotPriceSource
 from telliot_feeds.sources.price.spot.coinpaprika import CoinpaprikaSpotPriceSource
 from telliot_feeds.sources.price_aggregator import PriceAggregator
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.shared_config import get_config
 
 logger = get_logger(__name__)
 
@@ -25,7 +25,7 @@ class sUSNSpotPriceService(WebPriceService):
         kwargs["name"] = "Custom sUSN Price Service"
         kwargs["url"] = ""
         super().__init__(**kwargs)
-        self.cfg = TelliotConfig()
+        self.cfg = get_config()
 
     def get_susn_usd_ratio(self) -> Optional[float]:
         # get endpoint
@@ -1,16 +1,16 @@
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
+from typing import Hashable
 from typing import Optional
 
-from telliot_core.apps.telliot_config import TelliotConfig
-
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.feeds.eth_usd_feed import eth_usd_median_feed
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.shared_config import get_config
 
 logger = get_logger(__name__)
 
@@ -25,10 +25,14 @@ class swETHSpotPriceService(WebPriceService):
         kwargs["name"] = "Custom swETH Price Service"
         kwargs["url"] = ""
         super().__init__(**kwargs)
-        self.cfg = TelliotConfig()
+        self.cfg = get_config()
         self.contract: Optional[str] = None
         self.calldata: Optional[str] = None
 
+    def cache_key(self, asset: str, currency: str) -> Hashable:
+        """Include the contract call, which differs between swETH sources"""
+        return (super().cache_key(asset, currency), self.contract, self.calldata)
+
     def get_sweth_eth_ratio(self) -> Optional[float]:
         # get endpoint
         endpoint = self.cfg.endpoints.find(chain_id=1)
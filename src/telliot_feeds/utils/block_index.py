@@ -0,0 +1,277 @@
+"""Per-chain index of block timestamps
+
+Sources that report a value "as of" a timestamp (`EVMBalanceSource`,
+`GasPriceOracleSource`) need the last block mined at or before it. Binary
+searching from genesis to head costs ~25 sequential `get_block` calls per
+lookup. `BlockTimestampIndex` instead:
+
+- remembers the timestamp of every finalized block it has seen, on disk, so
+  repeated and nearby lookups start from a tight bracket (or need no calls)
+- estimates the target block from the average block time, then by
+  interpolating between the bracketing blocks
+- fetches several candidate blocks around each estimate in one JSON-RPC
+  batch request, so each round trip narrows the bracket a lot
+
+Block timestamps never decrease with block number, but several blocks can
+share a timestamp; lookups return the last block with timestamp <= target.
+"""
+import json
+import os
+from bisect import bisect_right
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from telliot_core.utils.home import default_homedir
+from web3 import Web3
+from web3.exceptions import ExtraDataLengthError
+from web3.middleware import ExtraDataToPOAMiddleware
+from web3.types import BlockIdentifier
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Blocks this far behind head are treated as final; only those are remembered
+FINALITY_DEPTH = 128
+
+#: Distance behind head of the block used to measure the average block time
+AVG_BLOCK_WINDOW = 10_000
+
+#: Candidate blocks fetched on each side of an estimate per round trip
+PROBES_PER_SIDE = 4
+
+#: Most block timestamps kept per chain; every other one is dropped when exceeded
+MAX_CACHED_BLOCKS = 200_000
+
+Block = Tuple[int, int]
+
+
+def inject_poa_middleware(w3: Web3, error: ExtraDataLengthError) -> None:
+    """Let web3 parse blocks of proof-of-authority chains"""
+    logger.info(f"POA chain detected. Injecting POA middleware in response to exception: {error}")
+    try:
+        w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+    except ValueError as e:
+        logger.error(f"Unable to inject web3 middleware for POA chain connection: {e}")
+
+
+class BlockTimestampIndex:
+    """Finds blocks by timestamp on one chain, remembering what it has seen
+
+    Args:
+        chain_id: chain the index is for
+        cache_path: json file the known block timestamps are kept in,
+            or None to keep them in memory only
+    """
+
+    def __init__(self, chain_id: int, cache_path: Optional[Path] = None) -> None:
+        self.chain_id = chain_id
+        self.cache_path = cache_path
+        #: known (finalized) block numbers and their timestamps, sorted
+        self._numbers: List[int] = []
+        self._timestamps: List[int] = []
+        self._loaded = False
+        self._dirty = False
+        #: highest block number known to be final
+        self._final = -1
+        self._batching = True
+        #: RPC round trips made, a batch counting as one
+        self.round_trips = 0
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path) as f:
+                cached: Dict[str, int] = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unable to read block timestamp cache {self.cache_path}: {e}")
+            return
+        blocks = sorted((int(number), ts) for number, ts in cached.items())
+        self._numbers = [number for number, _ in blocks]
+        self._timestamps = [ts for _, ts in blocks]
+        if self._numbers:
+            self._final = self._numbers[-1]
+
+    def _save(self) -> None:
+        if self.cache_path is None or not self._dirty:
+            return
+        if len(self._numbers) > MAX_CACHED_BLOCKS:
+            self._numbers = self._numbers[::2]
+            self._timestamps = self._timestamps[::2]
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(dict(zip(map(str, self._numbers), self._timestamps)), f)
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Unable to write block timestamp cache {self.cache_path}: {e}")
+
+    def _record(self, number: int, timestamp: int) -> None:
+        """Remember a block's timestamp if it's final"""
+        if number > self._final:
+            return
+        i = bisect_right(self._numbers, number)
+        if i and self._numbers[i - 1] == number:
+            return
+        self._numbers.insert(i, number)
+        self._timestamps.insert(i, timestamp)
+        self._dirty = True
+
+    def _bracket(self, target: int) -> Tuple[Optional[Block], Optional[Block]]:
+        """Known blocks closest to target: the last at or before it and the first after it"""
+        i = bisect_right(self._timestamps, target)
+        lo = (self._numbers[i - 1], self._timestamps[i - 1]) if i else None
+        hi = (self._numbers[i], self._timestamps[i]) if i < len(self._numbers) else None
+        return lo, hi
+
+    def _fetch_head(self, w3: Web3) -> Optional[Block]:
+        """Latest block number and timestamp; marks blocks FINALITY_DEPTH behind it as final"""
+        self.round_trips += 1
+        try:
+            try:
+                block = w3.eth.get_block("latest")
+            except ExtraDataLengthError as e:
+                inject_poa_middleware(w3, e)
+                block = w3.eth.get_block("latest")
+        except Exception as e:
+            logger.error(f"Error fetching latest block: {e}")
+            return None
+        head = (int(block["number"]), int(block["timestamp"]))
+        self._final = max(self._final, head[0] - FINALITY_DEPTH)
+        return head
+
+    def _fetch_timestamps(self, w3: Web3, numbers: List[int]) -> Optional[Dict[int, int]]:
+        """Timestamps of blocks, in one batch request if the provider supports it"""
+        if self._batching and len(numbers) > 1:
+            self.round_trips += 1
+            try:
+                try:
+                    blocks = self._get_blocks_batch(w3, numbers)
+                except ExtraDataLengthError as e:
+                    inject_poa_middleware(w3, e)
+                    blocks = self._get_blocks_batch(w3, numbers)
+                return {number: int(block["timestamp"]) for number, block in zip(numbers, blocks)}
+            except Exception as e:
+                logger.info(f"Batch request failed, fetching blocks one at a time: {e}")
+                self._batching = False
+
+        timestamps = {}
+        for number in numbers:
+            self.round_trips += 1
+            try:
+                try:
+                    block = w3.eth.get_block(number)
+                except ExtraDataLengthError as e:
+                    inject_poa_middleware(w3, e)
+                    block = w3.eth.get_block(number)
+            except Exception as e:
+                logger.error(f"Error fetching block info: {e}")
+                return None
+            timestamps[number] = int(block["timestamp"])
+        return timestamps
+
+    @staticmethod
+    def _get_blocks_batch(w3: Web3, numbers: List[int]) -> List[Dict[str, int]]:
+        with w3.batch_requests() as batch:
+            for number in numbers:
+                batch.add(w3.eth.get_block(number))
+            return batch.execute()  # type: ignore[return-value]
+
+    def block_timestamp(self, w3: Web3, block: BlockIdentifier = "latest") -> Optional[int]:
+        """Timestamp of a block, without a call if it's already known"""
+        self._load()
+        if isinstance(block, int):
+            i = bisect_right(self._numbers, block)
+            if i and self._numbers[i - 1] == block:
+                return self._timestamps[i - 1]
+            fetched = self._fetch_timestamps(w3, [block])
+            if fetched is None:
+                return None
+            self._record(block, fetched[block])
+            return fetched[block]
+        head = self._fetch_head(w3)
+        return head[1] if head is not None else None
+
+    def block_at(self, w3: Web3, timestamp: float) -> Optional[int]:
+        """Number of the last block with a timestamp at or before the given one
+
+        Returns None if the timestamp is before the first block or blocks can't be fetched.
+        """
+        self._load()
+        target = int(timestamp)
+        lo, hi = self._bracket(target)
+
+        if hi is None:
+            hi = self._fetch_head(w3)
+            if hi is None:
+                return None
+            if hi[1] <= target:
+                return hi[0]
+
+        avg_block_time: Optional[float] = None
+        while lo is None or hi[0] - lo[0] > 1:
+            seeding = lo is None
+            if lo is None:
+                # nothing known before target: fetch genesis and a block to measure recent block time
+                probes = sorted({0, max(hi[0] - AVG_BLOCK_WINDOW, 0)})
+            else:
+                probes = self._probes(target, lo, hi, avg_block_time)
+                avg_block_time = None
+            fetched = self._fetch_timestamps(w3, probes)
+            if fetched is None:
+                return None
+
+            prev_hi = hi
+            for number, ts in fetched.items():
+                self._record(number, ts)
+                if ts <= target and (lo is None or number > lo[0]):
+                    lo = (number, ts)
+                elif ts > target and number < hi[0]:
+                    hi = (number, ts)
+            if lo is None:
+                # genesis is after target
+                self._save()
+                return None
+            if seeding and prev_hi[1] > hi[1]:
+                # genesis is a poor anchor for interpolation; extrapolate from recent block time instead
+                avg_block_time = (prev_hi[1] - hi[1]) / (prev_hi[0] - hi[0])
+
+        self._save()
+        return lo[0]
+
+    @staticmethod
+    def _probes(target: int, lo: Block, hi: Block, avg_block_time: Optional[float]) -> List[int]:
+        """Blocks to fetch next: the estimated target block and some on either side"""
+        (lo_n, lo_ts), (hi_n, hi_ts) = lo, hi
+        if hi_n - lo_n <= 2 * PROBES_PER_SIDE + 2:
+            return list(range(lo_n + 1, hi_n))
+        if avg_block_time:
+            estimate = hi_n - int((hi_ts - target) / avg_block_time)
+        elif hi_ts > lo_ts:
+            estimate = lo_n + (target - lo_ts) * (hi_n - lo_n) // (hi_ts - lo_ts)
+        else:
+            estimate = lo_n
+        estimate = min(max(estimate, lo_n + 1), hi_n - 2)
+        # block times vary, so space candidates out in proportion to the bracket's size
+        step = max(1, (hi_n - lo_n) // (64 * PROBES_PER_SIDE))
+        probes = {estimate, estimate + 1}
+        for k in range(1, PROBES_PER_SIDE + 1):
+            probes.update((estimate - k * step, estimate + 1 + k * step))
+        return sorted(n for n in probes if lo_n < n < hi_n)
+
+
+@lru_cache(maxsize=None)
+def get_block_index(chain_id: int) -> BlockTimestampIndex:
+    """Block timestamp index for a chain, shared by every source using it"""
+    return BlockTimestampIndex(chain_id, default_homedir() / "cache" / f"block_timestamps_{chain_id}.json")
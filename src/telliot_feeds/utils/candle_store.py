@@ -0,0 +1,166 @@
+"""Local store of price candles per (exchange, pair, interval)
+
+Historical sources (e.g. the 30 day volatility sources) used to download
+the whole period's candles on every fetch, though only the latest candle
+changes between fetches. `CandleStore` keeps the candles of one
+exchange's pair on disk and tells a source where its next request has to
+start, so that only candles that weren't final when last fetched are
+downloaded again.
+
+Candles are indexed by the time they open; sources whose API gives close
+times convert them. Columns an exchange doesn't provide are NaN.
+"""
+import os
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+import numpy.typing as npt
+from telliot_core.utils.home import default_homedir
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Values kept for each candle, in column order
+COLUMNS = ("open", "high", "low", "close", "volume")
+
+CLOSE = COLUMNS.index("close")
+
+
+class CandleStore:
+    """Candles of one pair on one exchange
+
+    The store covers a single time range: every candle opened from
+    `covered_from` on is stored, and those opened before `final_until` had
+    closed when they were fetched.
+
+    Args:
+        exchange: name of the exchange (or aggregator) the candles are from
+        pair: asset and currency, e.g. "ethusd"
+        interval: candle length in seconds
+        cache_path: .npz file the candles are kept in, or None to keep them in memory only
+    """
+
+    def __init__(self, exchange: str, pair: str, interval: int, cache_path: Optional[Path] = None) -> None:
+        self.exchange = exchange
+        self.pair = pair
+        self.interval = interval
+        self.cache_path = cache_path
+        self.timestamps: npt.NDArray[np.int64] = np.empty(0, dtype=np.int64)
+        self.values: npt.NDArray[np.float64] = np.empty((0, len(COLUMNS)))
+        self.covered_from: Optional[int] = None
+        self.final_until = 0
+        self._loaded = False
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            with np.load(self.cache_path) as saved:
+                timestamps, values = saved["timestamps"], saved["values"]
+                covered_from, final_until = saved["coverage"].tolist()
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Unable to read candle cache {self.cache_path}: {e}")
+            return
+        self.timestamps, self.values = timestamps, values
+        self.covered_from, self.final_until = int(covered_from), int(final_until)
+
+    def _save(self) -> None:
+        if self.cache_path is None:
+            return
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    timestamps=self.timestamps,
+                    values=self.values,
+                    coverage=np.array([self.covered_from, self.final_until], dtype=np.int64),
+                )
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Unable to write candle cache {self.cache_path}: {e}")
+
+    def fetch_from(self, start: int, end: int) -> Optional[int]:
+        """Open time from which candles have to be fetched for the store to
+        have the final candles opened in [start, end); None if it has them"""
+        self._load()
+        if self.covered_from is None or start < self.covered_from:
+            return start
+        if end <= self.final_until:
+            return None
+        return self.final_until
+
+    def append(
+        self,
+        timestamps: npt.NDArray[np.int64],
+        values: npt.NDArray[np.float64],
+        fetched_from: int,
+        now: Optional[float] = None,
+    ) -> None:
+        """Add candles fetched from a time on; they replace stored candles with the same open time
+
+        The store covers one time range, so if the fetch neither reaches nor
+        continues the stored range, the stored candles are dropped rather
+        than leaving a gap that would be taken as covered.
+
+        Args:
+            timestamps: open time of each candle
+            values: one row of `COLUMNS` per candle
+            fetched_from: open time the fetch started at
+            now: time up to which the fetch saw trades, for telling which candles are final
+        """
+        self._load()
+        now = time.time() if now is None else now
+        seen_until = int(now) // self.interval * self.interval
+        if self.covered_from is not None and (seen_until < self.covered_from or fetched_from > self.final_until):
+            logger.debug(f"Fetched {self.exchange} {self.pair} candles don't adjoin the stored ones; replacing them")
+            self.timestamps, self.values = self.timestamps[:0], self.values[:0]
+            self.covered_from, self.final_until = None, 0
+        timestamps = np.concatenate([self.timestamps, timestamps])
+        values = np.concatenate([self.values, values])
+        # keep the last occurrence of each open time: unique over the reversed arrays
+        _, last = np.unique(timestamps[::-1], return_index=True)
+        keep = len(timestamps) - 1 - last
+        self.timestamps, self.values = timestamps[keep], values[keep]
+
+        if self.covered_from is None or fetched_from < self.covered_from:
+            self.covered_from = fetched_from
+        final_until = seen_until
+        if len(self.timestamps):
+            final_until = min(final_until, int(self.timestamps[-1]) + self.interval)
+        self.final_until = max(self.final_until, final_until)
+        self._save()
+
+    def window(self, start: int, end: int) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+        """Open times and values of the candles opened in [start, end)"""
+        self._load()
+        lo, hi = np.searchsorted(self.timestamps, [start, end])
+        return self.timestamps[lo:hi], self.values[lo:hi]
+
+    def closes(self, start: int, end: int) -> npt.NDArray[np.float64]:
+        """Close prices of the candles opened in [start, end)"""
+        _, values = self.window(start, end)
+        closes: npt.NDArray[np.float64] = values[:, CLOSE]
+        return closes[~np.isnan(closes)]
+
+    def twap(self, start: int, end: int) -> Optional[float]:
+        """Time weighted average of the close prices of the candles opened in [start, end)"""
+        closes = self.closes(start, end)
+        return float(closes.mean()) if len(closes) else None
+
+
+@lru_cache(maxsize=None)
+def get_candle_store(exchange: str, pair: str, interval: int) -> CandleStore:
+    """Candle store for a pair, shared by every source using it"""
+    path = default_homedir() / "cache" / "candles" / f"{exchange}_{pair}_{interval}.npz"
+    return CandleStore(exchange, pair, interval, path)
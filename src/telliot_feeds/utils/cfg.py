@@ -11,10 +11,11 @@ from telliot_core.apps.telliot_config import TelliotConfig
 from telliot_core.model.endpoints import RPCEndpoint
 
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.shared_config import get_api_key
 
 
 logger = get_logger(__name__)
-API_KEY = TelliotConfig().api_keys.find(name="coingecko")[0].key
+API_KEY = get_api_key("coingecko")
 
 
 def setup_config(
@@ -0,0 +1,165 @@
+"""Process-wide registry of pooled `requests` sessions
+
+Opening a new `requests.Session()` for every call pays a fresh TCP and
+TLS handshake each time. Sources that make blocking HTTP calls should use
+`pooled_session` instead, which hands out a long-lived session per host
+(with a connection pool and retry adapter mounted) and keeps it open
+between report cycles. Sessions left unused longer than the idle timeout
+are closed the next time the registry is accessed.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict
+from typing import Iterator
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+
+#: Max connections kept in each host's pool
+DEFAULT_POOL_MAXSIZE = 10
+
+#: Seconds a session may go unused before it is closed
+DEFAULT_IDLE_TIMEOUT = 300.0
+
+
+def default_retry() -> Retry:
+    """Retry strategy mounted on pooled sessions unless configured otherwise
+
+    Final responses are returned rather than raised once retries are
+    exhausted, so callers keep checking `status_code` as before.
+    """
+    return Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+        raise_on_status=False,
+    )
+
+
+@dataclass
+class HostConfig:
+    """Pool size and retry settings for one host"""
+
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE
+    max_retries: Optional[Retry] = None
+
+
+@dataclass
+class _PooledSession:
+    session: requests.Session
+    last_used: float
+
+
+def _host(url: str) -> str:
+    """Return the registry key (lowercase host[:port]) for a URL or bare host"""
+    netloc = urlsplit(url).netloc
+    return (netloc or url).lower()
+
+
+class SessionRegistry:
+    """Long-lived `requests` sessions keyed by host"""
+
+    def __init__(
+        self,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        max_retries: Optional[Retry] = None,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ) -> None:
+        self.default_config = HostConfig(pool_maxsize=pool_maxsize, max_retries=max_retries)
+        self.idle_timeout = idle_timeout
+        self._host_configs: Dict[str, HostConfig] = {}
+        self._sessions: Dict[str, _PooledSession] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, pool_maxsize: Optional[int] = None, max_retries: Optional[Retry] = None) -> None:
+        """Override pool size or retry strategy for a host
+
+        Any existing session for the host is closed so the next request
+        picks up the new settings.
+        """
+        key = _host(host)
+        config = HostConfig(
+            pool_maxsize=pool_maxsize or self.default_config.pool_maxsize,
+            max_retries=max_retries or self.default_config.max_retries,
+        )
+        with self._lock:
+            self._host_configs[key] = config
+            pooled = self._sessions.pop(key, None)
+        if pooled is not None:
+            pooled.session.close()
+
+    def _new_session(self, host: str) -> requests.Session:
+        config = self._host_configs.get(host, self.default_config)
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=config.pool_maxsize,
+            max_retries=config.max_retries or default_retry(),
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def get(self, url: str) -> requests.Session:
+        """Return the shared session for a URL's host, creating it if necessary"""
+        key = _host(url)
+        now = time.monotonic()
+        with self._lock:
+            idle = self._pop_idle(now)
+            pooled = self._sessions.get(key)
+            if pooled is None:
+                pooled = _PooledSession(session=self._new_session(key), last_used=now)
+                self._sessions[key] = pooled
+            pooled.last_used = now
+        for session in idle:
+            session.close()
+        return pooled.session
+
+    def _pop_idle(self, now: float) -> list[requests.Session]:
+        """Remove sessions idle longer than the timeout (caller holds the lock)"""
+        expired = [k for k, p in self._sessions.items() if now - p.last_used > self.idle_timeout]
+        return [self._sessions.pop(k).session for k in expired]
+
+    def evict_idle(self) -> int:
+        """Close sessions idle longer than the timeout
+
+        Returns:
+            Number of sessions closed
+        """
+        with self._lock:
+            idle = self._pop_idle(time.monotonic())
+        for session in idle:
+            session.close()
+        return len(idle)
+
+    def close(self) -> None:
+        """Close every pooled session"""
+        with self._lock:
+            sessions = [p.session for p in self._sessions.values()]
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+#: Process-wide registry shared by all sources
+session_registry = SessionRegistry()
+
+
+@contextmanager
+def pooled_session(url: str) -> Iterator[requests.Session]:
+    """Drop-in replacement for `with requests.Session() as s:`
+
+    Yields the shared session for the URL's host and leaves it open
+    on exit so its connections can be reused.
+    """
+    yield session_registry.get(url)
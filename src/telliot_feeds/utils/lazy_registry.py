@@ -0,0 +1,52 @@
+"""Read-only mappings whose values are imported on first use
+
+Importing every feed module up front means importing every source, web3
+contract wrapper and API client in the package, which dominates CLI
+startup. A `LazyRegistry` only knows the name of each value and calls a
+loader the first time a key is looked up, then caches the result.
+Membership tests, `len()` and key iteration never load anything;
+`values()` and `items()` load every entry.
+"""
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import Mapping
+from typing import TypeVar
+
+
+V = TypeVar("V")
+
+
+class LazyRegistry(Mapping[str, V]):
+    """Mapping of keys to values loaded by name on first access
+
+    Args:
+        loader: returns the value for a name, e.g. by importing its module
+        names: key -> name passed to the loader
+    """
+
+    def __init__(self, loader: Callable[[str], V], names: Dict[str, str]) -> None:
+        self._loader = loader
+        self._names = names
+        self._loaded: Dict[str, V] = {}
+
+    def __getitem__(self, key: str) -> V:
+        try:
+            return self._loaded[key]
+        except KeyError:
+            pass
+        value = self._loader(self._names[key])
+        self._loaded[key] = value
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._names)!r})"
@@ -3,13 +3,9 @@ import pathlib
 import sys
 from pathlib import Path
 
-from telliot_core.apps.telliot_config import TelliotConfig
 from telliot_core.utils.home import default_homedir
 
 
-cfg = TelliotConfig()
-
-
 class DuplicateFilter(logging.Filter):
     """A logger filter for preventing flood of duplicate log messages"""
 
@@ -1,4 +1,14 @@
+"""Resolve query data to query type names, query objects and data feeds
+
+Tip selection looks up the same few query data blobs every cycle, several
+times each. `decoded_query` keeps a bounded LRU cache of `DecodedQuery`
+objects, so the ABI decoding and catalog lookups for a blob run once and
+every helper below reuses them.
+"""
 import ast
+import copy
+from functools import cached_property
+from functools import lru_cache
 from typing import Any
 from typing import Optional
 
@@ -17,6 +27,43 @@ from telliot_feeds.utils.log import get_logger
 
 logger = get_logger(__name__)
 
+#: Max number of distinct query data blobs kept in the decoded query cache
+DECODED_QUERY_CACHE_SIZE = 512
+
+
+class DecodedQuery:
+    """What a query data blob resolves to, each part computed on first use"""
+
+    def __init__(self, qdata: bytes) -> None:
+        self.qdata = bytes(qdata)
+
+    @cached_property
+    def qtype_name(self) -> str:
+        return _decode_typ_name(self.qdata)
+
+    @cached_property
+    def query(self) -> Optional[OracleQuery]:
+        query_object: Optional[OracleQuery] = Registry.registry.get(self.qtype_name)
+        return query_object.get_query_from_data(self.qdata) if query_object is not None else None
+
+    @cached_property
+    def catalog_tag(self) -> Optional[str]:
+        return qtag_from_query_catalog(qid=w3.keccak(self.qdata).hex())
+
+    @cached_property
+    def catalog_feed(self) -> Optional[DataFeed[Any]]:
+        return CATALOG_FEEDS.get(self.catalog_tag) if self.catalog_tag else None
+
+    @cached_property
+    def builder_feed(self) -> Optional[DataFeed[Any]]:
+        return DATAFEED_BUILDER_MAPPING.get(self.qtype_name)
+
+
+@lru_cache(maxsize=DECODED_QUERY_CACHE_SIZE)
+def decoded_query(qdata: bytes) -> DecodedQuery:
+    """Shared, cached resolution of a query data blob"""
+    return DecodedQuery(qdata)
+
 
 def decode_typ_name(qdata: bytes) -> str:
     """Decode query type name from query data
@@ -26,6 +73,10 @@ def decode_typ_name(qdata: bytes) -> str:
 
     Return: string query type name
     """
+    return decoded_query(qdata).qtype_name
+
+
+def _decode_typ_name(qdata: bytes) -> str:
     qtype_name: str
     try:
         qtype_name, _ = decode(["string", "bytes"], qdata)
@@ -62,9 +113,7 @@ def feed_from_catalog_feeds(qdata: bytes) -> Optional[DataFeed[Any]]:
 
     Return: DataFeed
     """
-    qid = w3.keccak(qdata).hex()
-    qtag = qtag_from_query_catalog(qid=qid)
-    return CATALOG_FEEDS.get(qtag) if qtag else None
+    return decoded_query(qdata).catalog_feed
 
 
 def feed_in_feed_builder_mapping(qdata: bytes, skip_manual_feeds: bool = False) -> Optional[DataFeed[Any]]:
@@ -75,13 +124,14 @@ def feed_in_feed_builder_mapping(qdata: bytes, skip_manual_feeds: bool = False)
 
     Return: DataFeed
     """
-    qtyp_name = decode_typ_name(qdata)
+    decoded = decoded_query(qdata)
+    qtyp_name = decoded.qtype_name
     if skip_manual_feeds:
         if qtyp_name in MANUAL_FEEDS:
             logger.info(f"There is a tip for this query type: {qtyp_name}. Query data: {qdata.hex()}, (manual feed)")
             return None
 
-    return DATAFEED_BUILDER_MAPPING.get(qtyp_name)
+    return decoded.builder_feed
 
 
 def get_query_from_qtyp_name(qdata: bytes) -> Optional[OracleQuery]:
@@ -90,12 +140,10 @@ def get_query_from_qtyp_name(qdata: bytes) -> Optional[OracleQuery]:
     Args:
     - qdata: query data in bytes
 
-    Return: query
+    Return: query, a copy callers may modify
     """
-    qtyp_name = decode_typ_name(qdata)
-    query_object: Optional[OracleQuery] = Registry.registry.get(qtyp_name)
-
-    return query_object.get_query_from_data(qdata) if query_object is not None else None
+    query = decoded_query(qdata).query
+    return copy.copy(query) if query is not None else None
 
 
 def query_from_query_catalog(*, qid: Optional[str] = None, qtype_name: Optional[str] = None) -> Optional[OracleQuery]:
@@ -16,6 +16,7 @@ from telliot_core.directory import ContractInfo
 from telliot_core.model.endpoints import RPCEndpoint
 from telliot_core.tellor.tellorflex.oracle import TellorFlexOracleContract
 from telliot_core.tellor.tellorx.oracle import TellorxOracleContract
+from web3 import AsyncWeb3
 from web3 import Web3
 from web3.types import FeeHistory
 from web3.types import Wei
@@ -103,6 +104,20 @@ def alert_placeholder(msg: str) -> None:
     pass
 
 
+def _check_native_token_balance(
+    account: ChecksumAddress, balance: int, alert: Callable[[str], None], min_balance: int
+) -> bool:
+    if balance < min_balance:
+        str_bal = f"{balance / 10**18:.2f}"
+        expected = f"{min_balance / 10**18:.2f}"
+        msg = f"Insufficient native token funds for {account}. Balance: {str_bal} ETH. Expected: {expected} ETH."
+        logger.warning(msg)
+        alert(msg)
+        return False
+
+    return True
+
+
 def has_native_token_funds(
     account: ChecksumAddress,
     web3: Web3,
@@ -116,15 +131,23 @@ def has_native_token_funds(
         logger.warning(f"Error fetching native token balance for {account}: {e}")
         return False
 
-    if balance < min_balance:
-        str_bal = f"{balance / 10**18:.2f}"
-        expected = f"{min_balance / 10**18:.2f}"
-        msg = f"Insufficient native token funds for {account}. Balance: {str_bal} ETH. Expected: {expected} ETH."
-        logger.warning(msg)
-        alert(msg)
+    return _check_native_token_balance(account, balance, alert, min_balance)
+
+
+async def has_native_token_funds_async(
+    account: ChecksumAddress,
+    web3: AsyncWeb3[Any],
+    alert: Callable[[str], None] = alert_placeholder,
+    min_balance: int = 10**18,
+) -> bool:
+    """Check if an account has native token funds using an AsyncWeb3 connection."""
+    try:
+        balance = await web3.eth.get_balance(account)
+    except Exception as e:
+        logger.warning(f"Error fetching native token balance for {account}: {e}")
         return False
 
-    return True
+    return _check_native_token_balance(account, balance, alert, min_balance)
 
 
 def create_custom_contract(
@@ -0,0 +1,28 @@
+"""Process-wide TelliotConfig shared by sources
+
+`TelliotConfig()` reads (and on first run writes) every YAML file in the
+telliot home directory. Sources used to build one each, many of them at
+import time, so loading the feed catalog parsed the same files dozens of
+times. `get_config` loads it once and hands out the same instance.
+
+The shared config is treated as read-only: code that edits endpoints or
+accounts (the CLI, `EVMCall.cfg`, ...) should keep using its own
+`TelliotConfig()`.
+"""
+from functools import lru_cache
+
+from telliot_core.apps.telliot_config import TelliotConfig
+
+
+@lru_cache(maxsize=None)
+def get_config() -> TelliotConfig:
+    """Load the telliot config on first call and return the same instance afterwards"""
+    return TelliotConfig()
+
+
+def get_api_key(name: str) -> str:
+    """Key configured for an api in api_keys.yaml, or "" if there is none"""
+    keys = get_config().api_keys.find(name=name)
+    if not keys:
+        return ""
+    return keys[0].key or ""
@@ -1,18 +1,24 @@
-from statistics import stdev
-from typing import List
 from typing import Optional
+from typing import Sequence
+from typing import Union
 
+import numpy as np
+import numpy.typing as npt
 
-def stdev_calculator(close_prices: List[float]) -> Optional[float]:
+
+def pct_change(close_prices: Union[Sequence[float], npt.NDArray[np.float64]]) -> npt.NDArray[np.float64]:
+    """Percent change between consecutive prices (daily returns for daily close prices)"""
+    prices = np.asarray(close_prices, dtype=np.float64)
+    returns: npt.NDArray[np.float64] = np.diff(prices) / prices[:-1]
+    return returns
+
+
+def stdev_calculator(close_prices: Union[Sequence[float], npt.NDArray[np.float64]]) -> Optional[float]:
     """
     Calculates the percent change(daily returns) for a list of numbers and returns the standard deviation
     """
-
-    pct_change = []
-    for i, j in zip(close_prices[:-1], close_prices[1:]):
-        try:
-            pct = (j - i) / i
-        except ZeroDivisionError:
-            pct = None
-        pct_change.append(pct)
-    return stdev(pct_change)  # type: ignore
+    prices = np.asarray(close_prices, dtype=np.float64)
+    # the sample standard deviation needs at least two returns, and a zero price has no return
+    if len(prices) < 3 or not np.all(prices[:-1]):
+        return None
+    return float(np.std(pct_change(prices), ddof=1))
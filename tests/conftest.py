@@ -15,6 +15,7 @@ from web3 import Web3
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.pricing.price_cache import price_cache
 from telliot_feeds.reporters.tellor_360 import Tellor360Reporter
 
 
@@ -49,6 +50,13 @@ def setup(chain):
     chain.restore(snapshot)
 
 
+@pytest.fixture(autouse=True)
+def clear_price_cache():
+    """Keep cached prices from leaking between tests"""
+    price_cache.clear()
+    yield
+
+
 @pytest.fixture(scope="session")
 def mumbai_test_key_name():
     return "mumbai_test_key"
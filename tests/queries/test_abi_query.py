@@ -1,4 +1,5 @@
 from telliot_feeds.queries.abi_query import AbiQuery
+from telliot_feeds.queries.price.spot_price import SpotPrice
 
 
 def test_get_query_from_data():
@@ -21,3 +22,18 @@ def test_generate_query_data():
         == "00000000000000000000000000000000000000000000000000000000000000400000000000000000000000000000000000000000000000000000000000000080000000000000000000000000000000000000000000000000000000000000000d46616b6551756572795479706500000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000004000000000000000000000000000000000000000000000000000000000000000200000000000000000000000000000000000000000000000000000000000000000"  # noqa: E501
     )
     assert q.query_id.hex() == "b0437cc90a5c0e7aab994a16a941b6823d05ef5067b90085fc19f86f464da3de"
+
+
+def test_encodings_cached_until_params_change():
+    """Descriptor, query data and query id are reused until a parameter is set"""
+    q = SpotPrice(asset="eth", currency="usd")
+    query_id = q.query_id
+    assert q.query_id is query_id
+    assert q.query_data is q.query_data
+    assert q.descriptor is q.descriptor
+
+    q.asset = "btc"
+    assert q.query_id == SpotPrice(asset="btc", currency="usd").query_id
+    assert q.query_id != query_id
+    assert q.descriptor == '{"type":"SpotPrice","asset":"btc","currency":"usd"}'
+    assert q == SpotPrice(asset="btc", currency="usd")
@@ -1,3 +1,5 @@
+from telliot_feeds.queries.catalog import Catalog
+from telliot_feeds.queries.price.spot_price import SpotPrice
 from telliot_feeds.queries.query import OracleQuery
 from telliot_feeds.queries.query_catalog import query_catalog
 
@@ -26,3 +28,35 @@ def test_to_markdown():
     md = query_catalog.to_markdown()
     assert isinstance(md, str)
     print(md)
+
+
+def test_indexed_find_matches_scan():
+    """Indexed lookups give the same entries, in catalog order, as checking every entry"""
+    entries = list(query_catalog._entries.values())
+
+    def scan(tag=None, query_type=None, active=None):
+        return [
+            e
+            for e in entries
+            if (tag is None or tag in e.tag)
+            and (query_type is None or query_type.lower() == e.query_type.lower())
+            and (active is None or active == e.active)
+        ]
+
+    for tag in ["", "et", "eth", "usd-spot", "eth-usd-spot", "not-a-tag"]:
+        assert query_catalog.find(tag=tag) == scan(tag=tag)
+        assert query_catalog.find(tag=tag, query_type="spotprice", active=True) == scan(tag, "SpotPrice", True)
+
+    entry = query_catalog.find(tag="eth-usd-spot")[0]
+    for qid in [entry.query_id, entry.query_id.upper(), entry.query_id[2:]]:
+        assert query_catalog.find(query_id=qid) == [entry]
+    assert query_catalog.find(query_id=entry.query_id, query_type="EVMCall") == []
+
+
+def test_find_new_entry():
+    catalog = Catalog()
+    catalog.add_entry(tag="trb-usd-spot", title="TRB/USD spot price", q=SpotPrice(asset="trb", currency="usd"))
+    assert catalog.find(tag="usd-sp")[0].tag == "trb-usd-spot"
+    catalog.add_entry(tag="eth-usd-spot", title="ETH/USD spot price", q=SpotPrice(asset="eth", currency="usd"))
+    assert [e.tag for e in catalog.find(tag="usd-sp")] == ["trb-usd-spot", "eth-usd-spot"]
+    assert [e.tag for e in catalog.find(query_type="SpotPrice")] == ["trb-usd-spot", "eth-usd-spot"]
@@ -1,3 +1,4 @@
+from unittest.mock import AsyncMock
 from unittest.mock import Mock
 from unittest.mock import PropertyMock
 
@@ -177,3 +178,57 @@ async def test_update_gas_fees(gas_fees_object):
     assert gas.gas_info["maxFeePerGas"] is None
     assert gas.gas_info["maxPriorityFeePerGas"] is None
     assert "Failed to update gas fees: invalid transaction type: 5" in status.error
+
+
+@pytest.fixture
+def async_gas_fees_object():
+    """GasFees in async web3 mode with a mocked AsyncWeb3 connection"""
+    endpoint = Mock(url="http://localhost:8545", _web3=Mock())
+    account = Mock(address="0x" + "11" * 20)
+    gas = GasFees(endpoint=endpoint, account=account, transaction_type=0, use_async_web3=True)
+    gas._async_web3 = Mock()
+    return gas
+
+
+@pytest.mark.asyncio
+async def test_update_gas_fees_async_legacy(async_gas_fees_object):
+    gas: GasFees = async_gas_fees_object
+
+    async def gas_price():
+        return Web3.to_wei(10, "gwei")
+
+    gas._async_web3.eth = Mock(gas_price=gas_price())
+    status = await gas.update_gas_fees_async()
+    assert status.ok
+    assert gas.get_gas_info() == {"gasPrice": int(Web3.to_wei(10, "gwei") * 1.01)}
+    gas.web3.eth.gas_price.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_gas_fees_async_eip1559(async_gas_fees_object):
+    gas: GasFees = async_gas_fees_object
+    gas.transaction_type = 2
+    fee_history = AttributeDict({"baseFeePerGas": [Web3.to_wei(20, "gwei")], "reward": [[Web3.to_wei(1, "gwei")]]})
+    eth = Mock()
+    eth.fee_history = AsyncMock(return_value=fee_history)
+    eth._max_priority_fee = AsyncMock(return_value=Web3.to_wei(2, "gwei"))
+    gas._async_web3.eth = eth
+
+    status = await gas.update_gas_fees_async()
+    assert status.ok
+    assert gas.get_gas_info() == {
+        "maxPriorityFeePerGas": Web3.to_wei(2, "gwei"),
+        "maxFeePerGas": int(Web3.to_wei(20, "gwei") * 1.125),
+    }
+    eth.fee_history.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_update_gas_fees_async_falls_back_to_sync(async_gas_fees_object):
+    gas: GasFees = async_gas_fees_object
+    gas.use_async_web3 = False
+    type(gas.web3.eth).gas_price = PropertyMock(return_value=Web3.to_wei(10, "gwei"))
+
+    status = await gas.update_gas_fees_async()
+    assert status.ok
+    assert gas.get_gas_info()["gasPrice"] == int(Web3.to_wei(10, "gwei") * 1.01)
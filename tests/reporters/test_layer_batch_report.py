@@ -0,0 +1,128 @@
+import base64
+from unittest import mock
+from unittest.mock import AsyncMock
+from unittest.mock import Mock
+
+import pytest
+
+from telliot_feeds.queries.price.spot_price import SpotPrice
+from telliot_feeds.reporters.layer import layer_reporter
+from telliot_feeds.reporters.layer.layer_reporter import LayerReporter
+from telliot_feeds.reporters.layer.submitter import BroadcastResult
+
+ASSETS = ["eth", "btc", "trb", "matic", "link"]
+CYCLE_ASSET = "eth"
+
+
+class FakeLayer:
+    """LCD answering tipped query, cycle list and tx lookups; txs listed in failed_txs fail on chain"""
+
+    def __init__(self, assets):
+        self.feeds = {}
+        for asset in assets:
+            query = SpotPrice(asset, "usd")
+            source = Mock(fetch_new_datapoint=AsyncMock(), latest=(1000.0, None))
+            self.feeds[base64.b64encode(query.query_data).decode()] = Mock(query=query, source=source)
+        self.failed_txs = set()
+        self.broadcasts = []
+
+    def query_data(self, asset):
+        return base64.b64encode(SpotPrice(asset, "usd").query_data).decode()
+
+    async def get(self, endpoint):
+        if endpoint.endswith("tipped_queries"):
+            return {"queries": [{"query_data": q, "amount": "100"} for q in self.feeds]}
+        if endpoint.endswith("current_cyclelist_query"):
+            return {"query_meta": {"id": "1", "query_data": self.query_data(CYCLE_ASSET)}}
+        txhash = endpoint.rsplit("/", 1)[1]
+        return {"tx_response": {"txhash": txhash, "code": 5 if txhash in self.failed_txs else 0}}
+
+    async def submit(self, msgs, gas=None):
+        self.broadcasts.append((len(msgs), gas))
+        return BroadcastResult(txhash=f"HASH{len(self.broadcasts)}", code=0)
+
+    def feed_from_catalog(self, query_data):
+        return self.feeds.get(base64.b64encode(query_data).decode())
+
+
+@pytest.fixture
+def layer():
+    fake = FakeLayer(ASSETS)
+    with mock.patch.object(layer_reporter, "LCDClient"), mock.patch.object(layer_reporter, "RawKey"), mock.patch.object(
+        layer_reporter, "LayerTxSubmitter"
+    ), mock.patch.object(layer_reporter, "feed_from_catalog_feeds", side_effect=fake.feed_from_catalog):
+        yield fake
+
+
+def make_reporter(layer, gas_limit=None, gas_per_report=600_000):
+    reporter = LayerReporter(
+        wait_period=0,
+        endpoint=Mock(url="http://layer", network="layer"),
+        account=Mock(),
+        query_tag=None,
+        batch_tipped=True,
+        gas_per_report=gas_per_report,
+        max_batch_gas=2_000_000,
+    )
+    reporter.client = Mock(_get=AsyncMock(side_effect=layer.get))
+    reporter.submitter = Mock(
+        gas_limit=gas_limit, address="tellor1reporter", submit=AsyncMock(side_effect=layer.submit)
+    )
+    return reporter
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "gas_limit, broadcasts",
+    [
+        # "auto": packed by gas_per_report, each tx simulated for its own gas
+        (None, [(3, None), (2, None)]),
+        # fixed --gas is per report: packed by it, and each tx's limit scales with its reports
+        (500_000, [(4, 2_000_000), (1, 500_000)]),
+    ],
+)
+async def test_reports_packed_by_gas(layer, gas_limit, broadcasts):
+    reporter = make_reporter(layer, gas_limit=gas_limit)
+
+    txn_infos, status = await reporter.report_once()
+
+    assert status.ok
+    assert layer.broadcasts == broadcasts
+    assert len(txn_infos) == len(broadcasts)
+    # the cycle list query is also tipped, so it's reported once
+    assert sum(n for n, _ in layer.broadcasts) == len(ASSETS)
+    assert set(reporter.previously_reported_tipped_query) == {"init", *layer.feeds}
+    assert reporter.previously_reported_id == "1"
+
+
+@pytest.mark.asyncio
+async def test_feed_without_value_left_out_and_retried(layer):
+    reporter = make_reporter(layer)
+    btc = layer.query_data("btc")
+    layer.feeds[btc].source.latest = (None, None)
+
+    await reporter.report_once()
+
+    assert sum(n for n, _ in layer.broadcasts) == len(ASSETS) - 1
+    assert btc not in reporter.previously_reported_tipped_query
+
+    # next loop only the unreported query is tried again
+    layer.broadcasts.clear()
+    layer.feeds[btc].source.latest = (30000.0, None)
+    await reporter.report_once()
+    assert layer.broadcasts == [(1, None)]
+    assert btc in reporter.previously_reported_tipped_query
+
+
+@pytest.mark.asyncio
+async def test_failed_tx_leaves_its_queries_unreported(layer):
+    reporter = make_reporter(layer)
+    # the first tx carries the cycle list query (eth) and btc, trb
+    layer.failed_txs.add("HASH1")
+
+    txn_infos, status = await reporter.report_once()
+
+    assert status.ok and len(txn_infos) == 2
+    reported = set(reporter.previously_reported_tipped_query) - {"init"}
+    assert reported == {layer.query_data(asset) for asset in ["matic", "link"]}
+    assert reporter.previously_reported_id is None
@@ -0,0 +1,78 @@
+import asyncio
+import base64
+from types import SimpleNamespace
+
+import pytest
+
+from telliot_feeds.reporters.layer.submitter import LayerTxSubmitter
+from telliot_feeds.reporters.layer.submitter import SEQUENCE_MISMATCH_CODE
+
+
+class FakeTx:
+    def __init__(self, sequence):
+        self.sequence = sequence
+
+    def to_proto(self):
+        return str(self.sequence).encode()
+
+
+class FakeLCD:
+    """Answers account lookups and sync broadcasts like a Layer LCD with a chain-side sequence"""
+
+    def __init__(self, chain_sequence=5):
+        self.chain_sequence = chain_sequence
+        self.account_lookups = 0
+        self.broadcast_sequences = []
+        self.gas_prices = None
+
+    def wallet(self, key):
+        return SimpleNamespace(
+            key=SimpleNamespace(acc_address="tellor1reporter"),
+            create_and_sign_tx=lambda options: FakeTx(options.sequence),
+        )
+
+    async def _get(self, endpoint):
+        self.account_lookups += 1
+        return {"account": {"account_number": "7", "sequence": str(self.chain_sequence)}}
+
+    async def _post(self, endpoint, data):
+        sequence = int(base64.b64decode(data["tx_bytes"]))
+        self.broadcast_sequences.append(sequence)
+        # let other submissions run while this one is "on the wire"
+        await asyncio.sleep(0)
+        if sequence != self.chain_sequence:
+            log = (
+                f"account sequence mismatch, expected {self.chain_sequence}, got {sequence}: incorrect account sequence"
+            )
+            return {"tx_response": {"txhash": "", "code": SEQUENCE_MISMATCH_CODE, "raw_log": log}}
+        self.chain_sequence += 1
+        return {"tx_response": {"txhash": f"HASH{sequence}", "code": 0, "raw_log": ""}}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submissions_get_consecutive_sequences():
+    lcd = FakeLCD(chain_sequence=5)
+    submitter = LayerTxSubmitter(lcd, key=None)
+
+    results = await asyncio.gather(*(submitter.submit(["msg"]) for _ in range(3)))
+
+    assert [r.sequence for r in results] == [5, 6, 7]
+    assert all(r.ok for r in results)
+    assert lcd.account_lookups == 1
+    assert submitter.sequence == 8
+
+
+@pytest.mark.asyncio
+async def test_sequence_mismatch_resyncs_and_retries():
+    lcd = FakeLCD(chain_sequence=5)
+    submitter = LayerTxSubmitter(lcd, key=None)
+    await submitter.submit(["msg"])
+
+    # another client used the same account
+    lcd.chain_sequence = 9
+    result = await submitter.submit(["msg"])
+
+    assert result.ok
+    assert result.txhash == "HASH9"
+    assert lcd.broadcast_sequences == [5, 6, 9]
+    assert lcd.account_lookups == 1
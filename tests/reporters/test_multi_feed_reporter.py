@@ -0,0 +1,96 @@
+import time
+from unittest import mock
+from unittest.mock import AsyncMock
+
+import pytest
+from telliot_core.utils.response import error_status
+
+from telliot_feeds.datafeed import DataFeed
+from telliot_feeds.queries.price.spot_price import SpotPrice
+from telliot_feeds.reporters.multi_feed import MultiFeedReporter
+
+CHAIN_ID = 80001
+
+
+@pytest.fixture
+def multi_feed_reporter(tellor_360, guaranteed_price_source):
+    contracts, account = tellor_360
+    # both feeds share one source, like feeds built on the same aggregate source
+    datafeeds = [
+        DataFeed(query=SpotPrice("eth", "usd"), source=guaranteed_price_source),
+        DataFeed(query=SpotPrice("btc", "usd"), source=guaranteed_price_source),
+    ]
+    return MultiFeedReporter(
+        datafeeds=datafeeds,
+        oracle=contracts.oracle,
+        token=contracts.token,
+        autopay=contracts.autopay,
+        endpoint=contracts.oracle.node,
+        account=account,
+        chain_id=CHAIN_ID,
+        transaction_type=0,
+        min_native_token_balance=0,
+        ignore_tbr=True,
+        expected_profit="YOLO",
+    )
+
+
+@pytest.mark.asyncio
+async def test_reports_most_rewarding_feed(multi_feed_reporter, guaranteed_price_source, chain):
+    r = multi_feed_reporter
+    eth_feed, btc_feed = r.datafeeds
+    tips = {eth_feed.query.query_id: int(1e18), btc_feed.query.query_id: int(2e18)}
+
+    async def fetch_tip(autopay, datafeed):
+        return tips[datafeed.query.query_id]
+
+    fetch = AsyncMock(wraps=guaranteed_price_source.fetch_new_datapoint)
+    with mock.patch("telliot_feeds.reporters.multi_feed.fetch_feed_tip", side_effect=fetch_tip), mock.patch.object(
+        r, "fetch_token_prices", AsyncMock(return_value=(1.0, 10.0))
+    ), mock.patch.object(guaranteed_price_source, "fetch_new_datapoint", fetch):
+        tx_receipt, status = await r.report_once()
+
+    assert status.ok
+    assert tx_receipt is not None
+    assert list(r.last_reported) == [btc_feed.query.query_id]
+    # the shared source was fetched once for both feeds
+    assert fetch.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_rank_least_recently_reported_first(multi_feed_reporter, chain):
+    r = multi_feed_reporter
+    r.check_rewards = False
+    eth_feed, btc_feed = r.datafeeds
+
+    ranked = await r.rank_feeds()
+    assert [feed for feed, _ in ranked] == [eth_feed, btc_feed]
+
+    r.last_reported[eth_feed.query.query_id] = time.time()
+    ranked = await r.rank_feeds()
+    assert [feed for feed, _ in ranked] == [btc_feed, eth_feed]
+    assert all(reward == 0 for _, reward in ranked)
+
+
+@pytest.mark.asyncio
+async def test_no_feeds_fetched_while_locked():
+    r = MultiFeedReporter.__new__(MultiFeedReporter)
+    source = mock.Mock(fetch_new_datapoint=AsyncMock())
+    r.datafeeds = [DataFeed(query=SpotPrice("eth", "usd"), source=source)]
+    r.check_rewards = True
+    r._fetches = {}
+    r._gas_fees = None
+    locked = error_status("Currently in reporter lock")
+
+    with mock.patch.multiple(
+        r,
+        staking_stage=AsyncMock(return_value=locked),
+        rank_feeds=AsyncMock(),
+        fetch_token_prices=AsyncMock(),
+    ):
+        tx_receipt, status = await r.report_once()
+
+        assert tx_receipt is None and status is locked
+        r.rank_feeds.assert_not_called()
+        r.fetch_token_prices.assert_not_called()
+    source.fetch_new_datapoint.assert_not_called()
@@ -0,0 +1,64 @@
+from unittest import mock
+
+import pytest
+from telliot_core.utils.response import ResponseStatus
+
+from telliot_feeds.reporters.nonce import NonceManager
+from telliot_feeds.reporters.tellor_360 import Tellor360Reporter
+
+
+def test_take_consecutive_nonces():
+    nonces = NonceManager()
+    assert not nonces.synced
+    with pytest.raises(ValueError):
+        nonces.take()
+
+    nonces.sync(7)
+    assert nonces.synced
+    assert [nonces.take() for _ in range(3)] == [7, 8, 9]
+
+    # pending transactions may not be counted on chain yet
+    nonces.sync(8)
+    assert nonces.take() == 10
+    # transactions sent from elsewhere
+    nonces.sync(15)
+    assert nonces.take() == 15
+
+
+def test_release_and_reset():
+    nonces = NonceManager()
+    nonces.sync(3)
+    first = nonces.take()
+    second = nonces.take()
+
+    nonces.release(second)
+    assert nonces.take() == second
+
+    # releasing an earlier nonce would leave a gap, so resync from the chain
+    nonces.release(first)
+    assert not nonces.synced
+
+    nonces.sync(4)
+    nonces.reset()
+    assert not nonces.synced
+
+
+def test_failed_build_releases_nonce():
+    """A transaction that can't be built gives its nonce back"""
+    reporter = Tellor360Reporter.__new__(Tellor360Reporter)
+    reporter.nonces = NonceManager()
+    reporter.nonces.sync(5)
+    contract_function = mock.Mock(build_transaction=mock.Mock(side_effect=ValueError("bad params")))
+
+    with mock.patch.multiple(
+        reporter,
+        assemble_function=mock.Mock(return_value=(contract_function, ResponseStatus())),
+        update_gas_fees=mock.Mock(return_value=ResponseStatus()),
+        estimate_gas_amount=mock.Mock(return_value=(100_000, ResponseStatus())),
+        get_gas_info=mock.Mock(return_value={}),
+        tx_params=mock.Mock(side_effect=lambda **_: ({"nonce": reporter.nonces.take()}, ResponseStatus())),
+    ):
+        tx, status = reporter.build_transaction("submitValue")
+
+    assert tx is None and not status.ok
+    assert reporter.nonces.take() == 5
@@ -0,0 +1,58 @@
+import asyncio
+from unittest import mock
+
+import pytest
+from telliot_core.utils.response import error_status
+
+from telliot_feeds.reporters.pipeline import StageTimer
+from telliot_feeds.reporters.tellor_360 import Tellor360Reporter
+
+
+@pytest.mark.asyncio
+async def test_stages_run_concurrently():
+    timer = StageTimer()
+
+    async def stage(result):
+        await asyncio.sleep(0.1)
+        return result
+
+    a = timer.start("a", stage(1))
+    b = timer.start("b", stage(2))
+    assert await a == 1
+    assert await b == 2
+    assert timer.elapsed < 0.19
+    assert set(timer.durations) == {"a", "b"}
+    assert all(d >= 0.09 for d in timer.durations.values())
+
+
+@pytest.mark.asyncio
+async def test_cancel_pending():
+    timer = StageTimer()
+    slow = timer.start("slow", asyncio.sleep(10))
+    await timer.run("fast", asyncio.sleep(0))
+    timer.cancel_pending()
+
+    with pytest.raises(asyncio.CancelledError):
+        await slow
+    assert "fast: " in timer.summary()
+    assert "slow: " in timer.summary()
+
+
+@pytest.mark.asyncio
+async def test_no_stages_started_while_locked():
+    """A reporter that can't report yet doesn't fetch feeds, tips or prices"""
+    reporter = Tellor360Reporter.__new__(Tellor360Reporter)
+    reporter.check_rewards = True
+    locked = error_status("Currently in reporter lock")
+
+    with mock.patch.multiple(
+        reporter,
+        staking_stage=mock.AsyncMock(return_value=locked),
+        datafeed_stage=mock.AsyncMock(),
+        fetch_token_prices=mock.AsyncMock(),
+    ):
+        tx_receipt, status = await reporter.report_once()
+
+        assert tx_receipt is None and status is locked
+        reporter.datafeed_stage.assert_not_called()
+        reporter.fetch_token_prices.assert_not_called()
@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+import websockets
+
+from telliot_feeds.reporters.layer.tendermint_events import AdaptiveBackoff
+from telliot_feeds.reporters.layer.tendermint_events import TendermintEventStream
+from telliot_feeds.reporters.layer.tendermint_events import websocket_url
+
+
+def new_block(height):
+    return {
+        "jsonrpc": "2.0",
+        "id": 0,
+        "result": {
+            "query": "tm.event='NewBlock'",
+            "data": {"type": "tendermint/event/NewBlock", "value": {"block": {"header": {"height": str(height)}}}},
+        },
+    }
+
+
+def tx_result(txhash, height):
+    return {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "result": {
+            "query": "tm.event='Tx'",
+            "data": {"type": "tendermint/event/Tx", "value": {"TxResult": {"height": str(height), "result": {}}}},
+            "events": {"tx.hash": [txhash], "tm.event": ["Tx"]},
+        },
+    }
+
+
+class MockTendermint:
+    """Local websocket server that acknowledges subscriptions and pushes queued events"""
+
+    def __init__(self):
+        self.subscriptions = []
+        self.events = asyncio.Queue()
+
+    async def handler(self, ws, *args):
+        for _ in range(2):
+            request = json.loads(await ws.recv())
+            self.subscriptions.append(request["params"]["query"])
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": {}}))
+        while (event := await self.events.get()) is not None:
+            await ws.send(json.dumps(event))
+
+
+@pytest_asyncio.fixture(scope="function")
+async def node():
+    mock = MockTendermint()
+    async with websockets.serve(mock.handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        yield mock, f"http://127.0.0.1:{port}"
+        # let the handler return so the server can close
+        await mock.events.put(None)
+
+
+@pytest.mark.asyncio
+async def test_blocks_and_txs_are_pushed(node):
+    mock, url = node
+    stream = TendermintEventStream(url)
+    stream.start()
+    try:
+        assert await stream.wait_connected(timeout=5)
+
+        waiter = asyncio.ensure_future(stream.wait_for_block(timeout=5))
+        await mock.events.put(new_block(10))
+        assert await waiter == 10
+        assert mock.subscriptions == ["tm.event='NewBlock'", "tm.event='Tx'"]
+
+        # tx results are delivered whether the wait starts before or after inclusion
+        tx_waiter = asyncio.ensure_future(stream.wait_for_tx("abcd", timeout=5))
+        await mock.events.put(tx_result("ABCD", 11))
+        await mock.events.put(tx_result("EF01", 11))
+        assert (await tx_waiter)["height"] == "11"
+        assert (await stream.wait_for_tx("ef01", timeout=5))["height"] == "11"
+
+        assert await stream.wait_for_block(timeout=0.1) is None
+    finally:
+        await stream.stop()
+    assert not stream.connected
+
+
+@pytest.mark.asyncio
+async def test_unreachable_node_stays_disconnected():
+    stream = TendermintEventStream("http://127.0.0.1:1", reconnect_delay=0.05)
+    stream.start()
+    try:
+        assert not await stream.wait_connected(timeout=0.2)
+        assert await stream.wait_for_block(timeout=1) is None
+    finally:
+        await stream.stop()
+
+
+@pytest.mark.asyncio
+async def test_adaptive_backoff():
+    backoff = AdaptiveBackoff(min_delay=0.001, max_delay=0.004)
+    for _ in range(4):
+        await backoff.sleep()
+    assert backoff.delay == 0.004
+    backoff.reset()
+    assert backoff.delay == 0.001
+
+
+def test_websocket_url():
+    assert websocket_url("http://127.0.0.1:26657/") == "ws://127.0.0.1:26657/websocket"
+    assert websocket_url("https://rpc.example.com") == "wss://rpc.example.com/websocket"
+    assert websocket_url("ws://127.0.0.1:26657/websocket") == "ws://127.0.0.1:26657/websocket"
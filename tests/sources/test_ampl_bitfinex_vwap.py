@@ -0,0 +1,116 @@
+import random
+from unittest import mock
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+
+import pytest
+
+from telliot_feeds.sources.ampleforth import bitfinex
+from telliot_feeds.sources.ampleforth.bitfinex import build_buckets
+from telliot_feeds.sources.ampleforth.bitfinex import get_value_from_bitfinex
+from telliot_feeds.sources.ampleforth.bitfinex import THOUSAND_MIN
+from telliot_feeds.sources.ampleforth.bitfinex import volume_weighted_average_price
+from telliot_feeds.sources.ampleforth.symbols import SYMBOLS
+
+START = 1675296000000
+END = 1675382399000
+PRICES = {"tAMPUSD": 1.1, "tAMPUST": 1.1, "tUSTUSD": 1.0, "tAMPBTC": 0.00005, "tBTCUSD": 22000.0}
+
+
+def random_trades(price, n, seed, start=START, end=END):
+    rng = random.Random(seed)
+    timestamps = sorted(rng.randint(start, end) for _ in range(n))
+    return [
+        [seed * 1_000_000 + i, ts, rng.uniform(-500, 500), price * rng.uniform(0.95, 1.05)]
+        for i, ts in enumerate(timestamps)
+    ]
+
+
+def legacy_vwap(start, from_list, to_list):
+    """VWAP via a second leg, looking up buckets slot by slot"""
+    from_map, to_map = build_buckets(start, from_list), build_buckets(start, to_list)
+    trades = volume = 0.0
+    for slot, from_slot in from_map.items():
+        s, to_slot = slot, None
+        while not to_slot and s >= 0:
+            to_slot = to_map.get(s)
+            s -= 1
+        if to_slot:
+            trades += abs(to_slot["vwap"] * from_slot["vwap"] * from_slot["volume"])
+            volume += from_slot["volume"]
+    return trades / volume
+
+
+class FakeBitfinex:
+    """Trades API serving recorded trades in pages, oldest first"""
+
+    def __init__(self, trades):
+        self.trades = trades
+        self.requests = []
+
+    async def get_json(self, url, timeout, headers=None):
+        route = urlsplit(url).path.split("/")[3]
+        params = {k: int(v[0]) for k, v in parse_qs(urlsplit(url).query).items()}
+        self.requests.append((route, params["start"], params["end"]))
+        in_range = [t for t in self.trades[route] if params["start"] <= t[1] <= params["end"]]
+        return {"response": in_range[: params["limit"]]}
+
+
+@pytest.fixture
+def fake_bitfinex():
+    trades = {route: random_trades(price, 3000, i) for i, (route, price) in enumerate(PRICES.items(), 1)}
+    # a leg that only trades late in the day
+    trades["tUSTUSD"] = random_trades(1.0, 500, 9, start=START + 600 * THOUSAND_MIN)
+    fake = FakeBitfinex(trades)
+    with mock.patch.object(bitfinex, "async_http_transport", fake), mock.patch.object(bitfinex, "PAGE_LIMIT", 1000):
+        with mock.patch.object(bitfinex, "SCROLL_DELAY", 0), mock.patch.object(bitfinex, "_route_buckets", {}):
+            yield fake
+
+
+def test_vwap_matches_slot_by_slot_merge():
+    from_list = random_trades(1.1, 2000, 1)
+    to_list = random_trades(1.0, 50, 2, start=START + 600 * THOUSAND_MIN)
+    result = volume_weighted_average_price(START, from_list, to_list)
+    assert result["vwap"] == pytest.approx(legacy_vwap(START, from_list, to_list))
+    # trades before the second leg's first bucket are left out
+    first_to_bucket = START + (to_list[0][1] - START) // THOUSAND_MIN * THOUSAND_MIN
+    assert result["volume"] == pytest.approx(sum(abs(t[2]) for t in from_list if t[1] >= first_to_bucket))
+
+
+@pytest.mark.asyncio
+async def test_vwap_from_paged_trades(fake_bitfinex):
+    result = await get_value_from_bitfinex(SYMBOLS["AMPL_USD_via_ALL"], START, END, True)
+    trades = fake_bitfinex.trades
+
+    direct = trades["tAMPUSD"]
+    expected_direct = sum(abs(t[2] * t[3]) for t in direct) / sum(abs(t[2]) for t in direct)
+    assert result["bitFinexVwapDirect"]["vwap"] == pytest.approx(expected_direct)
+    # trades at a page boundary's timestamp are counted once
+    assert result["bitFinexVwapDirect"]["volume"] == pytest.approx(sum(abs(t[2]) for t in direct))
+    assert result["bitFinexVwapViaUST"]["vwap"] == pytest.approx(
+        legacy_vwap(START, trades["tAMPUST"], trades["tUSTUSD"])
+    )
+    assert result["bitFinexVwapViaBTC"]["vwap"] == pytest.approx(
+        legacy_vwap(START, trades["tAMPBTC"], trades["tBTCUSD"])
+    )
+    slots = {(t[1] - START) // THOUSAND_MIN for t in trades["tAMPBTC"]}
+    assert [bucket["slot"] for bucket in result["source"]["bitFinex_AMPLtoBTC"]] == sorted(slots)
+
+
+@pytest.mark.asyncio
+async def test_only_partial_bucket_refetched(fake_bitfinex):
+    first_end = START + 700 * THOUSAND_MIN + 30_000
+    await get_value_from_bitfinex(SYMBOLS["AMPL_USD_via_ALL"], START, first_end, False)
+
+    # same window again: nothing to fetch
+    fake_bitfinex.requests.clear()
+    await get_value_from_bitfinex(SYMBOLS["AMPL_USD_via_ALL"], START, first_end, False)
+    assert fake_bitfinex.requests == []
+
+    # later end: only trades from the start of the unfinished bucket
+    result = await get_value_from_bitfinex(SYMBOLS["AMPL_USD_via_ALL"], START, END, False)
+    assert min(start for _, start, _ in fake_bitfinex.requests) == START + 700 * THOUSAND_MIN
+
+    with mock.patch.object(bitfinex, "_route_buckets", {}):
+        fresh = await get_value_from_bitfinex(SYMBOLS["AMPL_USD_via_ALL"], START, END, False)
+    assert result["overall_vwap"] == pytest.approx(fresh["overall_vwap"])
@@ -58,7 +58,7 @@ async def test_fetch_new_datapoint():
     session_context = mock.MagicMock()
     session_context.__enter__.return_value = session
 
-    with mock.patch("telliot_feeds.sources.bea_gov.requests.Session", return_value=session_context):
+    with mock.patch("telliot_feeds.sources.bea_gov.pooled_session", return_value=session_context):
         source = BEAPCESource(api_key="test-key")
         value, timestamp = await source.fetch_new_datapoint()
 
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from telliot_feeds.sources.price.spot import curvefi
+from telliot_feeds.sources.price.spot.curvefi import contract_map
+from telliot_feeds.sources.price.spot.curvefi import curve_pool_snapshot
+from telliot_feeds.sources.price.spot.curvefi import CurveFinanceSpotPriceService
+from telliot_feeds.sources.price.spot.curvefi import CurvePoolSnapshot
+from telliot_feeds.sources.price.spot.curvefiprice import CurveFiUSDPriceService
+from telliot_feeds.sources.price.spot.curvefiprice import ethereum_contract_map
+
+
+POOLS = {
+    "data": {
+        "poolData": [
+            {
+                "coins": [
+                    {"address": contract_map["eth"], "usdPrice": 3000.0},
+                    {"address": contract_map["steth"].upper().replace("0X", "0x"), "usdPrice": 2990.0},
+                ]
+            },
+            {
+                "coins": [
+                    {"address": contract_map["btc"], "usdPrice": 60000.0},
+                    {"address": contract_map["steth"], "usdPrice": 1.0},
+                    {"address": "0x0000000000000000000000000000000000000001", "usdPrice": None},
+                ]
+            },
+        ]
+    }
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_snapshot():
+    curve_pool_snapshot.clear()
+    yield
+    curve_pool_snapshot.clear()
+
+
+@pytest.fixture
+def mock_pools(monkeypatch):
+    calls = []
+
+    async def get_json(url, timeout, headers=None, max_concurrency=None):
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return {"response": POOLS}
+
+    monkeypatch.setattr(curvefi.async_http_transport, "get_json", get_json)
+    return calls
+
+
+def test_build_index():
+    prices = CurvePoolSnapshot.build_index(POOLS["data"]["poolData"])
+    # first listing wins, addresses are case-insensitive, null prices skipped
+    assert prices[contract_map["steth"].lower()] == 2990.0
+    assert prices[contract_map["btc"].lower()] == 60000.0
+    assert "0x0000000000000000000000000000000000000001" not in prices
+
+
+@pytest.mark.asyncio
+async def test_one_download_serves_many_lookups(mock_pools):
+    service = CurveFinanceSpotPriceService()
+    results = await asyncio.gather(
+        service.get_price("steth", "usd"),
+        service.get_price("steth", "btc"),
+        service.get_price("eth", "usd"),
+        CurveFiUSDPriceService().get_price("steth", "usd"),
+    )
+
+    assert [v for v, _ in results] == [2990.0, 2990.0 / 60000.0, 3000.0, 2990.0]
+    assert len(mock_pools) == 1
+
+
+@pytest.mark.asyncio
+async def test_snapshot_refreshes_when_stale(mock_pools, monkeypatch):
+    monkeypatch.setattr(curve_pool_snapshot, "refresh_interval", 0)
+    service = CurveFinanceSpotPriceService()
+    await service.get_price("eth", "usd")
+    await service.get_price("eth", "usd")
+    assert len(mock_pools) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_download(monkeypatch):
+    async def get_json(url, timeout, headers=None, max_concurrency=None):
+        return {"error": "HTTP Error 503", "exception": Exception("unavailable")}
+
+    monkeypatch.setattr(curvefi.async_http_transport, "get_json", get_json)
+    v, t = await CurveFinanceSpotPriceService().get_price("steth", "usd")
+    assert v is None
+    assert t is None
+
+
+@pytest.mark.asyncio
+async def test_curve_prices_falls_back_to_address_endpoint(mock_pools, monkeypatch):
+    address = ethereum_contract_map["ezeth"]
+    requested = []
+
+    async def fetch_url(self, url="", headers=None):
+        requested.append(url)
+        return {"response": {"data": {"address": address, "usd_price": 3100.0}}}
+
+    monkeypatch.setattr(CurveFiUSDPriceService, "fetch_url", fetch_url)
+    v, _ = await CurveFiUSDPriceService().get_price("ezeth", "usd")
+    assert v == 3100.0
+    assert requested == [f"/ethereum/{address}"]
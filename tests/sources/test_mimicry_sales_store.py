@@ -0,0 +1,90 @@
+from unittest import mock
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+
+import pytest
+
+from telliot_feeds.sources.mimicry.sales_store import HISTORY_START
+from telliot_feeds.sources.mimicry.sales_store import PAGE_LIMIT
+from telliot_feeds.sources.mimicry.sales_store import SalesStore
+from telliot_feeds.sources.mimicry.sales_store import sync_reservoir_sales
+
+NOW = 1_700_000_000
+
+
+class FakeReservoir:
+    """Sales API serving pages newest first, with a continuation cursor"""
+
+    def __init__(self, n_sales, first=1_600_000_000, spacing=3600):
+        self.sales = [self.sale(i, first + i * spacing) for i in range(n_sales)]
+        self.requests = []
+        self.fail = False
+
+    @staticmethod
+    def sale(i, timestamp):
+        return {
+            "id": f"sale{i}",
+            "token": {"tokenId": str(i % 37)},
+            "price": {"amount": {"usd": 100 + i}},
+            "timestamp": timestamp,
+        }
+
+    async def get_json(self, url, timeout, headers=None):
+        self.requests.append(url)
+        if self.fail:
+            return {"error": "Timeout Error", "exception": TimeoutError()}
+        params = {k: v[0] for k, v in parse_qs(urlsplit(url).query).items()}
+        start, end = int(params["startTimestamp"]), int(params["endTimestamp"])
+        offset = int(params.get("continuation", 0))
+        in_window = [s for s in reversed(self.sales) if start <= s["timestamp"] <= end]
+        page = in_window[offset : offset + PAGE_LIMIT]
+        continuation = str(offset + PAGE_LIMIT) if offset + PAGE_LIMIT < len(in_window) else None
+        return {"response": {"sales": page, "continuation": continuation}}
+
+
+@pytest.fixture
+def reservoir():
+    fake = FakeReservoir(5000)
+    with mock.patch("telliot_feeds.sources.mimicry.sales_store.async_http_transport", fake):
+        yield fake
+
+
+@pytest.mark.asyncio
+async def test_first_sync_downloads_history(reservoir, tmp_path):
+    store = SalesStore(tmp_path / "sales.sqlite")
+    assert await sync_reservoir_sales(store, "0xabc", now=NOW)
+    assert store.complete
+
+    transactions = store.transactions()
+    assert len(transactions) == len(reservoir.sales)
+    assert [tx.date.timestamp() for tx in transactions] == sorted(s["timestamp"] for s in reservoir.sales)
+    windows = (NOW - HISTORY_START) // (180 * 86400) + 1
+    assert len(reservoir.requests) < windows + len(reservoir.sales) // PAGE_LIMIT + 2
+
+
+@pytest.mark.asyncio
+async def test_later_syncs_fetch_only_new_sales(reservoir, tmp_path):
+    store = SalesStore(tmp_path / "sales.sqlite")
+    await sync_reservoir_sales(store, "0xabc", now=NOW)
+    store.close()
+
+    reservoir.sales.append(FakeReservoir.sale(5000, NOW + 60))
+    reservoir.requests.clear()
+    store = SalesStore(tmp_path / "sales.sqlite")
+    assert await sync_reservoir_sales(store, "0xabc", now=NOW + 120)
+    assert len(reservoir.requests) == 1
+    assert len(store.transactions()) == len(reservoir.sales)
+    assert [tx.price for tx in store.transactions(since=NOW)] == [5100]
+
+
+@pytest.mark.asyncio
+async def test_interrupted_sync_resumes(reservoir, tmp_path):
+    store = SalesStore(tmp_path / "sales.sqlite")
+    reservoir.fail = True
+    assert not await sync_reservoir_sales(store, "0xabc", now=NOW)
+    assert not store.complete
+
+    reservoir.fail = False
+    assert await sync_reservoir_sales(store, "0xabc", now=NOW)
+    assert store.complete
+    assert len(store.transactions()) == len(reservoir.sales)
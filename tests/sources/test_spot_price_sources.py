@@ -1,12 +1,12 @@
 """ Unit tests for pricing module
 
 """
+
 import os
 from datetime import datetime
 from unittest import mock
 
 import pytest
-from requests import Response
 from requests.exceptions import JSONDecodeError
 from telliot_core.apps.telliot_config import TelliotConfig
 from telliot_core.model.endpoints import RPCEndpoint
@@ -109,12 +109,10 @@ async def test_coinmarketcap(caplog, coinmarketcap_key):
         v, t = await get_price("bct", "usd", service["coinmarketcap"])
         validate_price(v, t)
 
-        def bad_status(*args, **kwargs):
-            r = Response()
-            r.status_code = 404
-            return r
+        async def bad_status(*args, **kwargs):
+            return {"error": "HTTP Error 404", "exception": Exception("Not Found")}
 
-        with mock.patch("requests.Session.get", side_effect=bad_status):
+        with mock.patch("telliot_feeds.pricing.async_http.AsyncHTTPTransport.get_json", side_effect=bad_status):
 
             v, t = await get_price("bct", "usd", service["coinmarketcap"])
             assert v is None
@@ -136,11 +134,11 @@ async def test_gemini(caplog, monkeypatch):
     else:
         validate_price(v, t)
 
-    # mock GeminiSpotPriceService.get_url() to return None
-    def mock_get_url(*args, **kwargs):
+    # mock GeminiSpotPriceService.fetch_url() to return None
+    async def mock_fetch_url(*args, **kwargs):
         return None
 
-    monkeypatch.setattr(GeminiSpotPriceService, "get_url", mock_get_url)
+    monkeypatch.setattr(GeminiSpotPriceService, "fetch_url", mock_fetch_url)
     v, t = await get_price("btc", "usd", service["gemini"])
     assert v is None
     assert t is None
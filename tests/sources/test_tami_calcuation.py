@@ -1,11 +1,15 @@
 import datetime
 
+import pytest
 from dateutil.relativedelta import relativedelta
 
+from telliot_feeds.sources.mimicry.collection_stat import MimicryCollectionStatSource
+from telliot_feeds.sources.mimicry.collection_stat import TransactionList
 from telliot_feeds.sources.mimicry.tami import create_index_value_history
 from telliot_feeds.sources.mimicry.tami import get_index_ratios
 from telliot_feeds.sources.mimicry.tami import get_index_value
 from telliot_feeds.sources.mimicry.tami import tami
+from telliot_feeds.sources.mimicry.tami import TamiIndex
 from telliot_feeds.sources.mimicry.types import IndexValueHistoryItem
 from telliot_feeds.sources.mimicry.types import Transaction
 from telliot_feeds.sources.mimicry.utils import filter_valid_transactions
@@ -124,3 +128,40 @@ def test_tami_with_transaction_data():
 def test_tami_empty_transaction_data():
     value = tami([])
     assert value is None
+
+
+def test_tami_index_applies_only_new_sales(tmp_path):
+    index = TamiIndex()
+    assert index.update(mock_transaction_history[:3], now=now) is None
+
+    value = index.update(mock_transaction_history, now=now)
+    assert value == pytest.approx(expected_values["timeAdjustedMarketIndex"])
+
+    # passing sales again doesn't count them twice
+    assert index.update(mock_transaction_history, now=now) == value
+
+    index.save(tmp_path / "tami.npz")
+    loaded = TamiIndex.load(tmp_path / "tami.npz")
+    new_sale = Transaction(itemId="Hyacinth", price=900, date=now)
+    expected = tami(mock_transaction_history + [new_sale])
+    assert loaded.update([new_sale], now=now) == pytest.approx(expected)
+    assert index.update([new_sale], now=now) == pytest.approx(expected)
+
+
+def test_tami_index_rebuilds_when_valid_items_change():
+    index = TamiIndex()
+    index.update(mock_transaction_history, now=now)
+    assert index.valid == {"Mars", "Hyacinth"}
+
+    # a second recent sale makes Lavender valid, so its earlier sale is included too
+    lavender_sale = Transaction(itemId="Lavender", price=800, date=now)
+    value = index.update([lavender_sale], now=now)
+    assert index.valid == {"Mars", "Hyacinth", "Lavender"}
+    assert value == pytest.approx(tami(mock_transaction_history + [lavender_sale]))
+
+
+def test_collection_market_cap():
+    source = MimicryCollectionStatSource()
+    sales = TransactionList(transactions=mock_transaction_history, floor_price=650)
+    # last sales: Lavender 500, Hyacinth 400, Mars 1200, Nyx 1200; floor price for the first two
+    assert source.get_collection_market_cap(sales) == 650 + 650 + 1200 + 1200
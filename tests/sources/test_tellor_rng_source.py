@@ -1,12 +1,15 @@
+import threading
 from datetime import datetime
 from unittest import mock
 
 import pytest
 import requests
 
+from telliot_feeds.sources import blockhash_aggregator
 from telliot_feeds.sources.blockhash_aggregator import get_btc_hash
 from telliot_feeds.sources.blockhash_aggregator import get_eth_hash
 from telliot_feeds.sources.blockhash_aggregator import get_mainnet_web3
+from telliot_feeds.sources.blockhash_aggregator import RNGResolver
 from telliot_feeds.sources.blockhash_aggregator import TellorRNGManualSource
 
 
@@ -40,6 +43,41 @@ async def test_no_mainnet_configured(caplog, monkeypatch):
     assert "Web3 not connected" in caplog.text
 
 
+@pytest.mark.asyncio
+async def test_resolver_overlaps_lookups_and_caches():
+    """ETH lookups start while the BTC lookup runs, and results are kept per timestamp."""
+    speculated = threading.Event()
+    calls = []
+
+    def btc_hash(timestamp):
+        calls.append(("btc", timestamp))
+        # only returns once the ETH side has been looked up concurrently
+        assert speculated.wait(5)
+        return "btchash", timestamp + 300
+
+    def block_at(w3, timestamp):
+        calls.append(("block_at", timestamp))
+        speculated.set()
+
+    def eth_hash_at(w3, timestamp, head_timestamp):
+        calls.append(("eth", timestamp))
+        return "0xethhash"
+
+    index = mock.Mock(block_at=mock.Mock(side_effect=block_at))
+    with mock.patch.object(blockhash_aggregator, "get_mainnet_w3", return_value=mock.Mock()), mock.patch.object(
+        blockhash_aggregator, "_get_btc_hash", side_effect=btc_hash
+    ), mock.patch.object(blockhash_aggregator, "eth_head_timestamp", return_value=1649770000), mock.patch.object(
+        blockhash_aggregator, "get_block_index", return_value=index
+    ), mock.patch.object(
+        blockhash_aggregator, "eth_hash_at", side_effect=eth_hash_at
+    ):
+        resolver = RNGResolver()
+        assert await resolver.resolve(1649769600) == ("0xethhash", "btchash")
+        assert await resolver.resolve(1649769600) == ("0xethhash", "btchash")
+
+    assert sorted(calls) == [("block_at", 1649769600), ("btc", 1649769600), ("eth", 1649769900)]
+
+
 @pytest.mark.asyncio
 async def test_rng_failures(caplog):
     """Simulate API failures."""
@@ -0,0 +1,137 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from telliot_feeds.pricing.batching import RequestBatcher
+from telliot_feeds.sources.price.spot import coinpaprika
+from telliot_feeds.sources.price.spot.coingecko import CoinGeckoSpotPriceService
+from telliot_feeds.sources.price.spot.coinpaprika import CoinpaprikaSpotPriceService
+from telliot_feeds.sources.price.spot.kraken import KrakenSpotPriceService
+
+
+@pytest.mark.asyncio
+async def test_request_batcher_merges_concurrent_keys():
+    """Keys requested within the window are fetched in one batch"""
+    batcher = RequestBatcher(window=0.01)
+    batches = []
+
+    async def fetch_batch(keys):
+        batches.append(sorted(keys))
+        return {k: k * 2 for k in keys}
+
+    results = await asyncio.gather(*[batcher.fetch(k, fetch_batch) for k in [1, 2, 3, 2]])
+
+    assert results == [2, 4, 6, 4]
+    assert batches == [[1, 2, 3]]
+
+
+@pytest.mark.asyncio
+async def test_request_batcher_max_batch_size():
+    """A full batch is sent without waiting for the window"""
+    batcher = RequestBatcher(window=10, max_batch_size=2)
+    batches = []
+
+    async def fetch_batch(keys):
+        batches.append(sorted(keys))
+        return {k: k for k in keys}
+
+    results = await asyncio.wait_for(asyncio.gather(*[batcher.fetch(k, fetch_batch) for k in [1, 2]]), timeout=1)
+
+    assert results == [1, 2]
+    assert batches == [[1, 2]]
+
+
+@pytest.mark.asyncio
+async def test_request_batcher_propagates_errors():
+    """A failed batch raises for every waiting caller"""
+    batcher = RequestBatcher(window=0.01)
+
+    async def fetch_batch(keys):
+        raise ValueError("upstream down")
+
+    results = await asyncio.gather(*[batcher.fetch(k, fetch_batch) for k in [1, 2]], return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_request_batcher_separates_fetchers():
+    """Lookups with different fetchers or groups are never merged into one batch"""
+    batcher = RequestBatcher(window=0.01)
+    batches = []
+
+    def fetcher(name):
+        async def fetch_batch(keys):
+            batches.append((name, sorted(keys)))
+            return {k: name for k in keys}
+
+        return fetch_batch
+
+    a, b = fetcher("a"), fetcher("b")
+    results = await asyncio.gather(
+        batcher.fetch(1, a),
+        batcher.fetch(2, b),
+        batcher.fetch(3, a),
+        batcher.fetch(4, fetcher("c"), group="shared"),
+        batcher.fetch(5, fetcher("d"), group="shared"),
+    )
+
+    assert results == ["a", "b", "a", "c", "c"]
+    assert sorted(batches) == [("a", [1, 3]), ("b", [2]), ("c", [4, 5])]
+
+
+@pytest.mark.asyncio
+async def test_coinpaprika_unexpected_bulk_response():
+    """A non-list all-tickers response fails each lookup instead of raising for the batch"""
+    fetch_url = mock.AsyncMock(return_value={"response": {"error": "rate limited"}})
+
+    with mock.patch.object(CoinpaprikaSpotPriceService, "fetch_url", fetch_url), mock.patch.object(
+        coinpaprika, "COINPAPRIKA_BULK_THRESHOLD", 2
+    ):
+        prices = await asyncio.gather(
+            CoinpaprikaSpotPriceService().get_price("eth-ethereum", "usd"),
+            CoinpaprikaSpotPriceService().get_price("btc-bitcoin", "usd"),
+        )
+
+    assert prices == [(None, None), (None, None)]
+    fetch_url.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_coingecko_batched_get_price():
+    """Concurrent CoinGecko lookups are sent as a single simple/price request"""
+    response = {"ethereum": {"usd": 3000.0}, "bitcoin": {"usd": 60000.0}, "tellor": {"usd": 50.0}}
+    fetch_url = mock.AsyncMock(return_value={"response": response})
+
+    with mock.patch.object(CoinGeckoSpotPriceService, "fetch_url", fetch_url):
+        service = CoinGeckoSpotPriceService()
+        prices = await asyncio.gather(
+            service.get_price("eth", "usd"),
+            CoinGeckoSpotPriceService().get_price("btc", "usd"),
+            CoinGeckoSpotPriceService().get_price("trb", "usd"),
+        )
+
+    assert [p for p, _ in prices] == [3000.0, 60000.0, 50.0]
+    fetch_url.assert_awaited_once()
+    request_url = fetch_url.call_args.args[0]
+    assert "ids=bitcoin%2Cethereum%2Ctellor" in request_url
+
+
+@pytest.mark.asyncio
+async def test_kraken_batched_get_price():
+    """Concurrent Kraken lookups share one Ticker?pair=a,b request"""
+    response = {
+        "error": [],
+        "result": {"XETHZUSD": {"c": ["3000.0", "1"]}, "LINKUSD": {"c": ["15.0", "1"]}},
+    }
+    fetch_url = mock.AsyncMock(return_value={"response": response})
+
+    with mock.patch.object(KrakenSpotPriceService, "fetch_url", fetch_url):
+        prices = await asyncio.gather(
+            KrakenSpotPriceService().get_price("eth", "usd"),
+            KrakenSpotPriceService().get_price("link", "usd"),
+        )
+
+    assert [p for p, _ in prices] == [3000.0, 15.0]
+    fetch_url.assert_awaited_once()
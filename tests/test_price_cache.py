@@ -0,0 +1,105 @@
+import asyncio
+from dataclasses import dataclass
+from dataclasses import field
+
+import pytest
+
+from telliot_feeds.dtypes.datapoint import datetime_now_utc
+from telliot_feeds.pricing.price_cache import price_cache
+from telliot_feeds.pricing.price_cache import PriceCache
+from telliot_feeds.pricing.price_service import WebPriceService
+from telliot_feeds.pricing.price_source import PriceSource
+
+
+class CountingPriceService(WebPriceService):
+    """Returns a fixed price and counts upstream requests"""
+
+    def __init__(self, **kwargs):
+        super().__init__(name="Counting Price Service", url="https://fakeurl.xyz", **kwargs)
+        self.calls = 0
+
+    async def get_price(self, asset, currency):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return 100.0, datetime_now_utc()
+
+
+@dataclass
+class CountingPriceSource(PriceSource):
+    service: CountingPriceService = field(default_factory=CountingPriceService)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    price_cache.clear()
+    yield
+    price_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_sources_share_cached_price():
+    """Sources for the same service and pair share one request"""
+    service = CountingPriceService()
+    sources = [CountingPriceSource(asset="eth", currency="usd", service=service) for _ in range(3)]
+
+    # concurrent misses coalesce
+    results = await asyncio.gather(*[s.fetch_new_datapoint() for s in sources])
+    assert [v for v, _ in results] == [100.0] * 3
+    assert service.calls == 1
+
+    # later lookups within the TTL are served from the cache
+    v, _ = await CountingPriceSource(asset="ETH", currency="USD", service=service).fetch_new_datapoint()
+    assert v == 100.0
+    assert service.calls == 1
+    assert all(s.latest[0] == 100.0 for s in sources)
+
+    # a different pair is fetched separately
+    await CountingPriceSource(asset="btc", currency="usd", service=service).fetch_new_datapoint()
+    assert service.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_non_cacheable_service_not_cached():
+    service = CountingPriceService()
+    service.cacheable = False
+    source = CountingPriceSource(asset="eth", currency="usd", service=service)
+
+    await source.fetch_new_datapoint()
+    await source.fetch_new_datapoint()
+    assert service.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_price_cache_ttl_and_lru():
+    cache = PriceCache(ttl=0.05, max_entries=2)
+    calls = []
+
+    async def fetch(value):
+        calls.append(value)
+        return value, datetime_now_utc()
+
+    assert (await cache.get_or_fetch("a", lambda: fetch(1.0)))[0] == 1.0
+    assert (await cache.get_or_fetch("a", lambda: fetch(2.0)))[0] == 1.0
+    await asyncio.sleep(0.06)
+    assert (await cache.get_or_fetch("a", lambda: fetch(2.0)))[0] == 2.0
+
+    await cache.get_or_fetch("b", lambda: fetch(3.0))
+    await cache.get_or_fetch("c", lambda: fetch(4.0))
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert calls == [1.0, 2.0, 3.0, 4.0]
+
+
+@pytest.mark.asyncio
+async def test_price_cache_skips_failures():
+    cache = PriceCache()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return None, None
+
+    await cache.get_or_fetch("a", fetch)
+    await cache.get_or_fetch("a", fetch)
+    assert len(calls) == 2
+    assert len(cache) == 0
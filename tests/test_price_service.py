@@ -1,8 +1,13 @@
+import asyncio
+import time
 from unittest import mock
 
 import pytest
 import requests
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 
+from telliot_feeds.pricing.async_http import async_http_transport
 from telliot_feeds.pricing.price_service import WebPriceService
 
 
@@ -26,3 +31,50 @@ async def test_webpriceservice_errors(caplog):
 
         assert "error" in result
         assert "JSON Decode Error" == result["error"]
+
+
+@pytest.mark.asyncio
+async def test_webpriceservice_fetch_url_errors():
+    """Test failures of the non-blocking WebPriceService.fetch_url"""
+
+    class FakePriceService(WebPriceService):
+        async def get_price(self, asset, currency):
+            return None, None
+
+    with mock.patch("aiohttp.ClientSession.get", side_effect=asyncio.TimeoutError):
+        wsp = FakePriceService(name="FakePriceService", url="https://fakeurl.xyz")
+        result = await wsp.fetch_url()
+
+        assert "error" in result
+        assert "Timeout Error" == result["error"]
+
+
+@pytest.mark.asyncio
+async def test_webpriceservice_fetch_url_concurrent():
+    """Concurrent fetches share one pooled session and overlap in time"""
+
+    class FakePriceService(WebPriceService):
+        async def get_price(self, asset, currency):
+            return None, None
+
+    async def slow_price(request):
+        await asyncio.sleep(0.3)
+        return web.json_response({"price": 1.0})
+
+    app = web.Application()
+    app.router.add_get("/price", slow_price)
+
+    async with TestServer(app) as server:
+        url = str(server.make_url(""))
+        services = [FakePriceService(name=f"service {i}", url=url) for i in range(4)]
+
+        start = time.monotonic()
+        results = await asyncio.gather(*[s.fetch_url("/price") for s in services])
+        elapsed = time.monotonic() - start
+
+        assert all(r["response"] == {"price": 1.0} for r in results)
+        # the requests overlap, so the batch takes about as long as one request
+        assert elapsed < 0.3 * len(services)
+        assert len(async_http_transport._clients) >= 1
+
+        await async_http_transport.close()
@@ -0,0 +1,201 @@
+from unittest import mock
+from unittest.mock import AsyncMock
+from unittest.mock import Mock
+
+import pytest
+from eth_abi import encode
+from eth_utils import event_abi_to_log_topic
+from hexbytes import HexBytes
+
+from telliot_feeds.reporters.tips.listener import event_listener
+from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
+from telliot_feeds.reporters.tips.listener.event_listener import _UNINDEXED_NEW_REPORT_ABI
+from telliot_feeds.reporters.tips.listener.event_listener import AUTOPAY_EVENTS_ABI
+from telliot_feeds.reporters.tips.listener.event_listener import AutopayEventListener
+from telliot_feeds.reporters.tips.listener.event_listener import AutopayState
+from telliot_feeds.reporters.tips.listener.event_listener import FeedState
+from telliot_feeds.reporters.tips.listener.event_listener import OneTimeTip
+from telliot_feeds.reporters.tips.listener.event_listener import ORACLE_EVENTS_ABI
+from telliot_feeds.reporters.tips.listener.event_listener import register_event_listener
+from telliot_feeds.reporters.tips.listener.event_listener import sync_event_listener
+from telliot_feeds.reporters.tips.listener.event_listener import synced_event_listener
+from telliot_feeds.reporters.tips.listener.one_time_tips import get_funded_one_time_tips
+
+
+QUERY_ID = b"q" * 32
+FEED_ID = b"f" * 32
+AUTOPAY = "0x" + "22" * 20
+ORACLE = "0x" + "33" * 20
+
+
+def test_one_time_tip_lifecycle():
+    """Tips accumulate until reported, and come back if the report is disputed"""
+    state = AutopayState()
+    state.on_tip_added(QUERY_ID, 10, b"qd", timestamp=100)
+    state.on_tip_added(QUERY_ID, 5, b"qd", timestamp=110)
+    assert state.current_tip(QUERY_ID) == 15
+
+    state.on_new_report(QUERY_ID, 120)
+    assert state.current_tip(QUERY_ID) == 0
+
+    state.on_value_removed(QUERY_ID, 120)
+    assert state.current_tip(QUERY_ID) == 15
+
+    state.on_new_report(QUERY_ID, 130)
+    state.on_tip_added(QUERY_ID, 7, b"qd", timestamp=140)
+    assert state.current_tip(QUERY_ID) == 7
+
+
+def test_feed_balance_follows_funding_and_claims():
+    state = AutopayState()
+    state.on_new_data_feed(QUERY_ID, FEED_ID, b"qd")
+    assert state.feeds_for_query(QUERY_ID) == []
+
+    state.on_data_feed_funded(QUERY_ID, FEED_ID, FeedDetails(1, 100, 0, 60, 10, 0, 0, 1))
+    state.on_tip_claimed(FEED_ID, 30)
+    feeds = state.feeds_for_query(QUERY_ID)
+    assert len(feeds) == 1
+    assert feeds[0].feed_id == FEED_ID
+    assert feeds[0].params.balance == 70
+    assert not state.stale
+
+    # funding a feed the listener has never seen requires a reseed for its query data
+    state.on_data_feed_funded(b"x" * 32, b"y" * 32, FeedDetails(1, 100, 0, 60, 10, 0, 0, 2))
+    assert state.stale
+
+
+def _log(abi, indexed, data_types, data_values, block, index):
+    return {
+        "address": AUTOPAY,
+        "topics": [HexBytes(event_abi_to_log_topic(abi))] + [HexBytes(t) for t in indexed],
+        "data": HexBytes(encode(data_types, data_values)),
+        "blockNumber": block,
+        "logIndex": index,
+        "transactionIndex": 0,
+        "transactionHash": HexBytes(b"\x00" * 32),
+        "blockHash": HexBytes(b"\x00" * 32),
+    }
+
+
+@pytest.mark.asyncio
+async def test_apply_logs_decodes_events():
+    listener = AutopayEventListener(Mock(address=AUTOPAY), oracle_address=ORACLE, web3=Mock())
+    funded_abi, _, _, claimed_abi = AUTOPAY_EVENTS_ABI
+    new_report_abi, _ = ORACLE_EVENTS_ABI
+    details = (1, 100, 0, 60, 10, 0, 0, 1)
+
+    state = AutopayState()
+    state.feeds[FEED_ID] = FeedState(query_id=QUERY_ID, query_data=b"qd", details=FeedDetails(*details))
+    logs = [
+        _log(
+            funded_abi,
+            [QUERY_ID, FEED_ID, encode(["uint256"], [50])],
+            ["address", "(uint256,uint256,uint256,uint256,uint256,uint256,uint256,uint256)"],
+            [ORACLE, (1, 150, 0, 60, 10, 0, 0, 1)],
+            block=1,
+            index=0,
+        ),
+        _log(claimed_abi, [FEED_ID, QUERY_ID, encode(["uint256"], [20])], ["address"], [ORACLE], block=2, index=0),
+        _log(
+            new_report_abi,
+            [QUERY_ID, encode(["uint256"], [500]), encode(["address"], [ORACLE])],
+            ["bytes", "uint256", "bytes"],
+            [b"v", 1, b"qd"],
+            block=2,
+            index=1,
+        ),
+        # TellorPlayground emits NewReport without indexed topics
+        _log(
+            _UNINDEXED_NEW_REPORT_ABI,
+            [],
+            ["bytes32", "uint256", "bytes", "uint256", "bytes", "address"],
+            [QUERY_ID, 600, b"v", 2, b"qd", ORACLE],
+            block=3,
+            index=0,
+        ),
+    ]
+    await listener.apply_logs(state, logs)
+
+    assert state.feeds[FEED_ID].details.balance == 130
+    assert state.report_times[QUERY_ID] == [500, 600]
+
+
+@pytest.mark.asyncio
+async def test_lookups_read_state_synced_once_per_cycle():
+    """Tip lookups don't sync the listener; the reporter syncs it once per cycle"""
+    autopay = Mock(address=AUTOPAY, node=Mock(chain_id=1), read=AsyncMock(return_value=([], Mock(ok=True))))
+    listener = AutopayEventListener(autopay, oracle_address=ORACLE, web3=Mock())
+    listener.state.tips[QUERY_ID] = OneTimeTip(query_data=b"qd", amount=10, timestamp=100)
+
+    with mock.patch.dict(event_listener._listeners, clear=True):
+        register_event_listener(listener)
+        # never synced: lookups fall back to the view functions
+        assert synced_event_listener(autopay) is None
+        assert await get_funded_one_time_tips(autopay) is None
+        autopay.read.assert_awaited_once()
+
+        async def sync():
+            listener.healthy = True
+            return Mock(ok=True)
+
+        with mock.patch.object(listener, "sync", AsyncMock(side_effect=sync)):
+            await sync_event_listener(autopay)
+            assert synced_event_listener(autopay) is listener
+            for _ in range(3):
+                # unsupported query data is filtered out, but the lookup is answered from the listener's state
+                assert await get_funded_one_time_tips(autopay) is None
+            listener.sync.assert_awaited_once()
+            autopay.read.assert_awaited_once()
+
+
+class FakeEth:
+    """Async web3 eth namespace serving fixed logs; get_block fails for blocks in fail_blocks"""
+
+    def __init__(self, head, logs):
+        self.head = head
+        self.logs = logs
+        self.fail_blocks = set()
+
+    @property
+    async def block_number(self):
+        return self.head
+
+    async def get_logs(self, params):
+        return [log for log in self.logs if params["fromBlock"] <= log["blockNumber"] <= params["toBlock"]]
+
+    async def get_block(self, block):
+        if block in self.fail_blocks:
+            raise ConnectionError("rpc down")
+        return {"timestamp": 1000 + block}
+
+
+@pytest.mark.asyncio
+async def test_failed_sync_keeps_state():
+    """A sync failing partway through applies none of its logs, so a retry doesn't count tips twice"""
+    _, _, tip_added_abi, _ = AUTOPAY_EVENTS_ABI
+    logs = [
+        _log(
+            tip_added_abi,
+            [QUERY_ID, encode(["uint256"], [amount])],
+            ["bytes", "address"],
+            [b"qd", ORACLE],
+            block=block,
+            index=0,
+        )
+        for amount, block in [(10, 6), (5, 7)]
+    ]
+    eth = FakeEth(head=10, logs=logs)
+    listener = AutopayEventListener(Mock(address=AUTOPAY), oracle_address=ORACLE, confirmations=0, web3=Mock(eth=eth))
+    listener.checkpoint = 5
+
+    eth.fail_blocks.add(7)
+    status = await listener.sync()
+    assert not status.ok and not listener.healthy
+    assert listener.checkpoint == 5
+    assert listener._confirmed.tips == {} and listener.state.tips == {}
+
+    eth.fail_blocks.clear()
+    assert (await listener.sync()).ok and listener.healthy
+    assert listener.checkpoint == 10
+    assert listener.state.current_tip(QUERY_ID) == 15
+    assert listener._confirmed.tips[QUERY_ID].amount == 15
@@ -0,0 +1,105 @@
+from unittest.mock import Mock
+
+import pytest
+from telliot_core.utils.response import ResponseStatus
+
+from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
+from telliot_feeds.reporters.tips.listener.funded_feed_index import FundedFeedIndex
+from telliot_feeds.reporters.tips.multicall_functions.multicall_autopay import MulticallAutopay
+
+
+QUERY_ID = b"q" * 32
+FEED_ID = b"f" * 32
+NOW = 10_000_000
+MONTH_AGO = NOW - 2_592_000
+
+
+class FakeMulticall(MulticallAutopay):
+    """Answers getMultipleValuesBefore and getRewardClaimStatusList from local state"""
+
+    def __init__(self, reports, claimed=()):
+        self.reports = reports
+        self.claimed = set(claimed)
+        self.calls = []
+        self.autopay = Mock(address="0x" + "22" * 20)
+
+    async def multi_call(self, calls, success=False):
+        resp = {}
+        for c in calls:
+            self.calls.append(c)
+            name = c.function.split("(")[0]
+            if name == "getMultipleValuesBefore":
+                qid, now, max_age, _ = c.args
+                found = [(ts, v) for ts, v in self.reports if now - max_age < ts < now]
+                resp[("values_array", qid)] = [v for _, v in found]
+                resp[("timestamps_array", qid)] = [ts for ts, _ in found]
+            else:
+                feed_id, qid, timestamps = c.args
+                resp[(feed_id, qid)] = [ts in self.claimed for ts in timestamps]
+        return resp, ResponseStatus()
+
+
+def make_feed():
+    return QueryIdandFeedDetails(
+        params=FeedDetails(10, 100, 0, 3600, 600, 0, 0),
+        feed_id=FEED_ID,
+        query_id=QUERY_ID,
+    )
+
+
+@pytest.mark.asyncio
+async def test_seed_then_delta():
+    call = FakeMulticall(reports=[(MONTH_AGO - 10, b"old"), (NOW - 100_000, b"a"), (NOW - 50_000, b"b")])
+    index = FundedFeedIndex()
+
+    feeds, status = await index.sync_reports(call, [make_feed()], NOW, MONTH_AGO)
+    assert status.ok
+    assert [v.value for v in feeds[0].queryid_timestamps_values_list] == [b"a", b"b"]
+    assert feeds[0].current_value_timestamp == NOW - 50_000
+    # full seed keeps the absolute month-old timestamp as max age
+    assert call.calls[0].args[2] == MONTH_AGO
+
+    call.reports.append((NOW + 5, b"c"))
+    feeds, status = await index.sync_reports(call, [make_feed()], NOW + 60, MONTH_AGO + 60)
+    assert status.ok
+    assert [v.value for v in feeds[0].queryid_timestamps_values_list] == [b"a", b"b", b"c"]
+    assert feeds[0].current_queryid_value == b"c"
+    # delta only asks for the disputable tail
+    assert call.calls[1].args[2] == index.dispute_window
+
+
+@pytest.mark.asyncio
+async def test_disputed_report_dropped_on_next_sync():
+    call = FakeMulticall(reports=[(NOW - 100, b"a")])
+    index = FundedFeedIndex()
+    feeds, _ = await index.sync_reports(call, [make_feed()], NOW, MONTH_AGO)
+    assert feeds[0].current_queryid_value == b"a"
+
+    call.reports.clear()
+    feeds, _ = await index.sync_reports(call, [make_feed()], NOW + 10, MONTH_AGO + 10)
+    assert feeds[0].queryid_timestamps_values_list == []
+    assert feeds[0].current_value_timestamp == 0
+
+
+@pytest.mark.asyncio
+async def test_claimed_timestamps_not_rechecked():
+    call = FakeMulticall(reports=[(NOW - 300, b"a"), (NOW - 200, b"b"), (NOW - 100, b"c")], claimed={NOW - 300})
+    index = FundedFeedIndex()
+    feeds, _ = await index.sync_reports(call, [make_feed()], NOW, MONTH_AGO)
+
+    counts, status = await index.unclaimed_counts(call, feeds)
+    assert status.ok
+    assert counts == {(FEED_ID, QUERY_ID): 2}
+
+    call.claimed.add(NOW - 200)
+    counts, _ = await index.unclaimed_counts(call, feeds)
+    assert counts == {(FEED_ID, QUERY_ID): 1}
+    # the timestamp already known to be claimed isn't sent again
+    assert call.calls[-1].args[2] == [NOW - 200, NOW - 100]
+
+    call.claimed.add(NOW - 100)
+    await index.unclaimed_counts(call, feeds)
+    counts, _ = await index.unclaimed_counts(call, feeds)
+    assert counts == {(FEED_ID, QUERY_ID): 0}
+    assert call.calls[-1].args[2] == [NOW - 100]
@@ -0,0 +1,67 @@
+import random
+
+from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import Values
+from telliot_feeds.reporters.tips.listener.funded_feeds_filter import FundedFeedFilter
+
+
+filtr = FundedFeedFilter()
+
+
+def _uint(amount: float) -> bytes:
+    return int(amount * 1e18).to_bytes(32, "big")
+
+
+def _feed(timestamps, values=None, price_threshold=0):
+    values = values or [_uint(1000)] * len(timestamps)
+    return QueryIdandFeedDetails(
+        params=FeedDetails(
+            reward=1,
+            balance=100,
+            startTime=1_000,
+            interval=3_600,
+            window=600,
+            priceThreshold=price_threshold,
+            rewardIncreasePerSecond=0,
+        ),
+        queryid_timestamps_values_list=[Values(value=v, timestamp=ts) for ts, v in zip(timestamps, values)],
+    )
+
+
+def test_filter_matches_window_rule():
+    """Every kept submission is the first in its window, checked one pair at a time"""
+    random.seed(7)
+    timestamps = sorted(random.sample(range(1_000, 1_000 + 30 * 86_400), 2_000))
+    feed = _feed(timestamps)
+
+    filtr.filter_historical_submissions([feed])
+
+    expected = [timestamps[0]] + [
+        current
+        for previous, current in zip(timestamps, timestamps[1:])
+        if filtr.is_timestamp_first_in_window(previous, current, 1_000, 600, 3_600)[0]
+    ]
+    assert [v.timestamp for v in feed.queryid_timestamps_values_list] == expected
+
+
+def test_filter_keeps_price_threshold_submissions():
+    # second report is outside the window but moved 10%; third moved 1%; fourth is unreadable
+    timestamps = [1_000, 2_000, 2_100, 2_200]
+    values = [_uint(1000), _uint(1100), _uint(1111), b""]
+    feed = _feed(timestamps, values, price_threshold=500)
+
+    filtr.filter_historical_submissions([feed])
+
+    assert [v.timestamp for v in feed.queryid_timestamps_values_list] == [1_000, 2_000, 2_200]
+
+
+def test_calculate_true_feed_balance():
+    drained = QueryIdandFeedDetails(params=FeedDetails(10, 50, 0, 1, 1, 0, 0), feed_id=b"a", query_id=b"q")
+    funded = QueryIdandFeedDetails(params=FeedDetails(10, 50, 0, 1, 1, 0, 0), feed_id=b"b", query_id=b"q")
+    unknown = QueryIdandFeedDetails(params=FeedDetails(10, 0, 0, 1, 1, 0, 0), feed_id=b"c", query_id=b"q")
+
+    feeds = filtr.calculate_true_feed_balance([drained, funded, unknown], {(b"a", b"q"): 5, (b"b", b"q"): 2})
+
+    assert feeds == [funded, unknown]
+    assert funded.params.balance == 30
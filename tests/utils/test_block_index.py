@@ -0,0 +1,85 @@
+import random
+from bisect import bisect_right
+
+import pytest
+
+from telliot_feeds.utils.block_index import BlockTimestampIndex
+
+
+class FakeEth:
+    def __init__(self, timestamps):
+        self.timestamps = timestamps
+        self.calls = 0
+
+    def get_block(self, block):
+        self.calls += 1
+        number = len(self.timestamps) - 1 if block == "latest" else block
+        return {"number": number, "timestamp": self.timestamps[number]}
+
+
+class FakeBatch:
+    def __init__(self, eth):
+        self.eth = eth
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def add(self, block):
+        self.blocks.append(block)
+
+    def execute(self):
+        return self.blocks
+
+
+class FakeWeb3:
+    """Chain whose block times drift, with runs of blocks sharing a timestamp"""
+
+    def __init__(self, n_blocks=2_000_000, seed=1):
+        rng = random.Random(seed)
+        timestamps = [1_500_000_000]
+        for i in range(1, n_blocks):
+            block_time = 15 if i < n_blocks // 2 else rng.choice([0, 0, 1, 2, 12])
+            timestamps.append(timestamps[-1] + block_time)
+        self.eth = FakeEth(timestamps)
+
+    def batch_requests(self):
+        return FakeBatch(self.eth)
+
+    def block_at(self, timestamp):
+        return bisect_right(self.eth.timestamps, timestamp) - 1
+
+
+@pytest.fixture(scope="module")
+def w3():
+    return FakeWeb3()
+
+
+def test_block_at_matches_chain(w3):
+    index = BlockTimestampIndex(chain_id=1)
+    timestamps = w3.eth.timestamps
+    rng = random.Random(2)
+    targets = [rng.randint(timestamps[0], timestamps[-1]) for _ in range(200)]
+    targets += [timestamps[0] - 1, timestamps[0], timestamps[-1], timestamps[-1] + 100]
+
+    for target in targets:
+        expected = w3.block_at(target)
+        assert index.block_at(w3, target) == (expected if expected >= 0 else None), target
+
+
+def test_few_round_trips_and_memoized(w3, tmp_path):
+    index = BlockTimestampIndex(chain_id=1, cache_path=tmp_path / "blocks.json")
+    target = w3.eth.timestamps[1_234_567] + 1
+
+    assert index.block_at(w3, target) == w3.block_at(target)
+    assert index.round_trips <= 8
+
+    # a fresh index reads known blocks from disk and needs no calls
+    index = BlockTimestampIndex(chain_id=1, cache_path=tmp_path / "blocks.json")
+    assert index.block_at(w3, target) == w3.block_at(target)
+    assert index.round_trips == 0
+    assert index.block_timestamp(w3, w3.block_at(target)) == w3.eth.timestamps[w3.block_at(target)]
+    assert index.round_trips == 0
@@ -0,0 +1,99 @@
+import statistics
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from telliot_feeds.sources.price.historical.kraken_ohlc import KrakenHistoricalPriceServiceOHLC
+from telliot_feeds.utils.candle_store import CandleStore
+from telliot_feeds.utils.stdev_calculator import stdev_calculator
+
+DAY = 86400
+NOW = 1_700_000_000
+TODAY = NOW // DAY * DAY
+
+
+def candles(start, n, close=100.0):
+    timestamps = np.arange(start, start + n * DAY, DAY, dtype=np.int64)
+    values = np.tile([close, close, close, close, 1.0], (n, 1))
+    values[:, 3] += np.arange(n)
+    return timestamps, values
+
+
+def test_stdev_calculator_matches_statistics():
+    prices = [1200.5, 1205.25, 1202.75, 1190.0, 1250.0]
+    returns = [(j - i) / i for i, j in zip(prices[:-1], prices[1:])]
+    assert stdev_calculator(prices) == pytest.approx(statistics.stdev(returns))
+    assert stdev_calculator(np.array(prices)) == pytest.approx(statistics.stdev(returns))
+    assert stdev_calculator([1.0, 2.0]) is None
+    assert stdev_calculator([1.0, 0.0, 2.0]) is None
+
+
+def test_store_appends_incrementally(tmp_path):
+    store = CandleStore("kraken", "ethusd", DAY, tmp_path / "candles.npz")
+    start = TODAY - 30 * DAY
+    assert store.fetch_from(start, NOW) == start
+
+    # 30 final candles and today's partial one
+    store.append(*candles(start, 31), fetched_from=start, now=NOW)
+    assert store.fetch_from(start, TODAY) is None
+    assert store.fetch_from(start, NOW) == TODAY
+    assert store.fetch_from(start - DAY, NOW) == start - DAY
+
+    # the partial candle is replaced when fetched again
+    timestamps, values = candles(TODAY, 2, close=200.0)
+    store.append(timestamps, values, fetched_from=TODAY, now=NOW + DAY)
+    assert store.fetch_from(start, TODAY + DAY) is None
+    closes = store.closes(start, NOW + DAY)
+    assert len(closes) == 32
+    assert closes[-2:].tolist() == [200.0, 201.0]
+    assert store.twap(TODAY, TODAY + 2 * DAY) == 200.5
+
+    # a fresh store reads the candles and coverage from disk
+    store = CandleStore("kraken", "ethusd", DAY, tmp_path / "candles.npz")
+    assert store.fetch_from(start, TODAY + DAY) is None
+    assert store.closes(start, NOW + DAY).tolist() == closes.tolist()
+
+
+@pytest.mark.asyncio
+async def test_kraken_volatility_fetches_only_new_candles():
+    store = CandleStore("kraken", "ethusd", DAY)
+    service = KrakenHistoricalPriceServiceOHLC(ts=TODAY - 30 * DAY)
+    requests = []
+
+    def get_url(url):
+        requests.append(url)
+        since = int(url.split("since=")[1].split("&")[0])
+        first = since // DAY * DAY + DAY
+        rows = [[ts, "1", "1", "1", str(1000 + ts // DAY % 7), "1", "5", 10] for ts in range(first, NOW, DAY)]
+        return {"response": {"error": [], "result": {"XETHZUSD": rows}}}
+
+    with mock.patch(
+        "telliot_feeds.sources.price.historical.kraken_ohlc.get_candle_store", return_value=store
+    ), mock.patch.object(service, "get_url", side_effect=get_url), mock.patch("time.time", return_value=NOW):
+        volatility, _ = await service.get_price("eth", "usd")
+        assert requests == [f"/0/public/OHLC?pair=ETHUSD&since={TODAY - 30 * DAY - 1}&interval=1440"]
+        again, _ = await service.get_price("eth", "usd")
+
+    assert volatility == again and volatility > 0
+    assert requests[1] == f"/0/public/OHLC?pair=ETHUSD&since={TODAY - 1}&interval=1440"
+
+
+def test_store_earlier_fetch_leaves_no_gap():
+    store = CandleStore("cryptowatch", "ethusd", DAY)
+    start = TODAY - 30 * DAY
+    store.append(*candles(start, 31), fetched_from=start, now=NOW)
+
+    # a fetch for an earlier timestamp that stops well before the stored range
+    early = start - 60 * DAY
+    assert store.fetch_from(early, early + 10 * DAY) == early
+    store.append(*candles(early, 10), fetched_from=early, now=early + 10 * DAY)
+    assert store.fetch_from(early, early + 10 * DAY) is None
+
+    # candles between the two fetches were never stored, so they're fetched
+    assert store.fetch_from(early + 20 * DAY, early + 30 * DAY) == early + 10 * DAY
+    assert store.fetch_from(start, TODAY) == early + 10 * DAY
+
+    # a fetch reaching into the stored range extends it
+    store.append(*candles(early - 5 * DAY, 6), fetched_from=early - 5 * DAY, now=early + DAY)
+    assert store.fetch_from(early - 5 * DAY, early + 10 * DAY) is None
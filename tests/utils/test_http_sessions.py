@@ -0,0 +1,51 @@
+from telliot_feeds.utils.http_sessions import pooled_session
+from telliot_feeds.utils.http_sessions import SessionRegistry
+
+
+def test_sessions_shared_per_host():
+    """Sessions are reused across calls to the same host and kept open"""
+    registry = SessionRegistry()
+
+    s1 = registry.get("https://api.example.com/v1/price?asset=eth")
+    s2 = registry.get("https://API.example.com/v2/other")
+    s3 = registry.get("https://other.example.com/")
+
+    assert s1 is s2
+    assert s1 is not s3
+    assert len(registry) == 2
+
+    registry.close()
+    assert len(registry) == 0
+
+
+def test_pooled_session_stays_open():
+    """Leaving the context manager does not close the shared session"""
+    with pooled_session("https://api.example.com") as s1:
+        pass
+    with pooled_session("https://api.example.com/other") as s2:
+        pass
+
+    assert s1 is s2
+    assert s1.adapters["https://"].max_retries.total == 3
+
+
+def test_idle_eviction():
+    """Sessions unused for longer than the idle timeout are closed"""
+    registry = SessionRegistry(idle_timeout=0.0)
+    s1 = registry.get("https://api.example.com")
+
+    assert registry.evict_idle() == 1
+    assert len(registry) == 0
+    assert registry.get("https://api.example.com") is not s1
+
+
+def test_configure_host():
+    """Per-host pool size overrides replace the existing session"""
+    registry = SessionRegistry()
+    s1 = registry.get("https://api.example.com")
+
+    registry.configure("https://api.example.com", pool_maxsize=2)
+    s2 = registry.get("https://api.example.com")
+
+    assert s1 is not s2
+    assert s2.adapters["https://"]._pool_maxsize == 2
@@ -0,0 +1,54 @@
+import subprocess
+import sys
+
+from telliot_feeds.datafeed import DataFeed
+from telliot_feeds.utils.lazy_registry import LazyRegistry
+
+
+def test_values_loaded_once_on_first_lookup():
+    loaded = []
+
+    def loader(name):
+        loaded.append(name)
+        return name.upper()
+
+    registry = LazyRegistry(loader, {"a-tag": "a_feed", "b-tag": "b_feed"})
+
+    assert "a-tag" in registry
+    assert "c-tag" not in registry
+    assert sorted(registry) == ["a-tag", "b-tag"]
+    assert len(registry) == 2
+    assert loaded == []
+
+    assert registry["a-tag"] == "A_FEED"
+    assert registry.get("a-tag") == "A_FEED"
+    assert registry.get("c-tag") is None
+    assert loaded == ["a_feed"]
+
+    assert dict(registry.items()) == {"a-tag": "A_FEED", "b-tag": "B_FEED"}
+    assert loaded == ["a_feed", "b_feed"]
+
+
+def test_feed_catalog_imports_feeds_on_demand():
+    """Importing the catalog doesn't import feed modules; looking a tag up imports only its module"""
+    code = (
+        "import sys\n"
+        "from telliot_feeds.feeds import CATALOG_FEEDS\n"
+        "loaded = lambda: sorted(m for m in sys.modules if m.startswith('telliot_feeds.feeds.'))\n"
+        "assert loaded() == [], loaded()\n"
+        "assert 'trb-usd-spot' in CATALOG_FEEDS and loaded() == []\n"
+        "CATALOG_FEEDS['trb-usd-spot']\n"
+        "assert loaded() == ['telliot_feeds.feeds.trb_usd_feed'], loaded()\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_feeds_importable_by_name():
+    from telliot_feeds.feeds import CATALOG_FEEDS
+    from telliot_feeds.feeds import DATAFEED_BUILDER_MAPPING
+    from telliot_feeds.feeds import tellor_rng_feed
+    from telliot_feeds.feeds import trb_usd_median_feed
+
+    assert isinstance(tellor_rng_feed, DataFeed)
+    assert DATAFEED_BUILDER_MAPPING["TellorRNG"] is tellor_rng_feed
+    assert CATALOG_FEEDS["trb-usd-spot"] is trb_usd_median_feed
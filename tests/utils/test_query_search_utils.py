@@ -0,0 +1,37 @@
+from unittest import mock
+
+from telliot_feeds.feeds import CATALOG_FEEDS
+from telliot_feeds.feeds import DATAFEED_BUILDER_MAPPING
+from telliot_feeds.queries.price.spot_price import SpotPrice
+from telliot_feeds.utils import query_search_utils
+from telliot_feeds.utils.query_search_utils import decode_typ_name
+from telliot_feeds.utils.query_search_utils import decoded_query
+from telliot_feeds.utils.query_search_utils import feed_from_catalog_feeds
+from telliot_feeds.utils.query_search_utils import feed_in_feed_builder_mapping
+from telliot_feeds.utils.query_search_utils import get_query_from_qtyp_name
+
+
+def test_query_data_decoded_once():
+    """Repeated lookups for the same query data reuse one decoding"""
+    decoded_query.cache_clear()
+    qdata = SpotPrice(asset="eth", currency="usd").query_data
+
+    with mock.patch.object(query_search_utils, "decode", wraps=query_search_utils.decode) as abi_decode:
+        for _ in range(3):
+            assert decode_typ_name(qdata) == "SpotPrice"
+            assert feed_from_catalog_feeds(qdata) is CATALOG_FEEDS["eth-usd-spot"]
+            assert feed_in_feed_builder_mapping(qdata) is DATAFEED_BUILDER_MAPPING["SpotPrice"]
+            assert feed_in_feed_builder_mapping(qdata, skip_manual_feeds=True) is None
+    assert abi_decode.call_count == 1
+    assert decoded_query.cache_info().currsize == 1
+
+
+def test_decoded_query_is_copied():
+    """Callers get their own query object, so changing it doesn't change the cache"""
+    qdata = SpotPrice(asset="btc", currency="usd").query_data
+
+    query = get_query_from_qtyp_name(qdata)
+    query.asset = "eth"
+
+    assert get_query_from_qtyp_name(qdata) == SpotPrice(asset="btc", currency="usd")
+    assert get_query_from_qtyp_name(qdata).query_data == qdata